@@ -0,0 +1,5 @@
+"""Performance benchmarks for tui-notes.
+
+Run a suite with ``python -m benchmarks.<suite>``; every suite writes a
+JSON report that can be compared against a stored baseline.
+"""
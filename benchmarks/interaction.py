@@ -0,0 +1,270 @@
+"""End-to-end interaction latency benchmarks.
+
+Replays recorded keystroke scripts against the app through Textual's
+pilot (the same ``app.run_test()`` driver the tests use) on boards of
+several sizes. For every action type it reports p50/p95/p99 latency from
+the first key press until its messages are handled and the screen is
+painted again, and how many saves reached the storage engine.
+
+A script is a JSON file with a description and a list of actions; each
+action is a type and the space-separated keys that make it up::
+
+    {"description": "...", "actions": [["move_start", "m"], ["move", "right"]]}
+
+Usage::
+
+    python -m benchmarks.interaction -o results.json
+    python -m benchmarks.interaction --script my-recording.json --fills 9
+    python -m benchmarks.interaction --baseline benchmarks/interaction-baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from textual import events
+from textual.pilot import Pilot
+
+from benchmarks.report import add_report_arguments, finish, new_report
+from benchmarks.storage import synthetic_notes, temporary_data_dir
+from tui_notes import storage
+from tui_notes.constants import MAX_NOTES
+
+SCRIPTS_DIR = Path(__file__).parent / "scripts"
+"""Directory of the bundled keystroke scripts."""
+
+_KEY_CHARACTERS = {"enter": "\r", "tab": "\t", "escape": "\x1b"}
+"""Characters of named keys; other names longer than one character have none."""
+
+TERMINAL_SIZE = (120, 40)
+"""Terminal size the app is replayed in, large enough to show the whole grid."""
+
+DEFAULT_FILLS = (1, 5, MAX_NOTES)
+"""Notes on the board when a script starts, by default."""
+
+
+def load_script(path: Path) -> list[tuple[str, list[str]]]:
+    """Read a keystroke script.
+
+    Args:
+        path: Script file.
+
+    Returns:
+        (action type, keys) pairs in replay order.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a valid script.
+    """
+    data = json.loads(path.read_text(encoding="utf-8"))
+    actions = data.get("actions") if isinstance(data, dict) else None
+    if not isinstance(actions, list):
+        raise ValueError(f"{path}: a script needs an actions list")
+    script = []
+    for action in actions:
+        if not (isinstance(action, list) and len(action) == 2 and str(action[1]).split()):
+            raise ValueError(f"{path}: bad action {action!r}")
+        script.append((str(action[0]), str(action[1]).split()))
+    return script
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Return a percentile by the nearest-rank method.
+
+    Args:
+        samples: Measurements, in any order.
+        pct: Percentile between 0 and 100.
+
+    Returns:
+        The smallest sample with at least pct percent of samples at or below it.
+    """
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class SaveCounter:
+    """Counts the saves that reach a storage engine."""
+
+    def __init__(self, engine: storage.StorageEngine) -> None:
+        """Wrap the engine's save method used by save_notes.
+
+        Args:
+            engine: Engine instance the app will save through.
+        """
+        self.count = 0
+        self._save: Callable[..., int] = engine.save_versioned
+        engine.save_versioned = self._counting_save  # type: ignore[method-assign]
+
+    def _counting_save(self, *args: Any, **kwargs: Any) -> int:
+        """Count a save and pass it on."""
+        self.count += 1
+        return self._save(*args, **kwargs)
+
+
+async def settle(pilot: Pilot[Any]) -> None:
+    """Wait until every message caused by a key press is handled and the screen is painted.
+
+    Unlike pilot.pause(), this does not wait for the process to look idle,
+    so the measured time is the app's own work rather than a sleep.
+
+    Args:
+        pilot: Pilot driving the app.
+    """
+    app = pilot.app
+    while True:
+        # pylint: disable=protected-access
+        await pilot._wait_for_screen()
+        pumps = [app, *app.screen.walk_children(with_self=True)]
+        if all(pump._message_queue.empty() for pump in pumps):
+            app.screen._on_timer_update()
+            return
+
+
+async def replay(
+    script: list[tuple[str, list[str]]], notes: list[dict[str, Any]]
+) -> tuple[dict[str, list[float]], dict[str, int], int]:
+    """Replay a script against a fresh app showing the given notes.
+
+    Args:
+        script: Actions to replay.
+        notes: Notes on the board when the app starts.
+
+    Returns:
+        Latencies in seconds and saves per action type, and the total
+        number of saves including the flush on exit.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from tui_notes.app import NotesApp
+
+    with temporary_data_dir():
+        storage.save_notes(notes)
+        counter = SaveCounter(storage.get_engine())
+        latencies: dict[str, list[float]] = {}
+        saves: dict[str, int] = {}
+        app = NotesApp()
+        async with app.run_test(size=TERMINAL_SIZE) as pilot:
+            await pilot.pause()
+            for action, keys in script:
+                before = counter.count
+                start = time.perf_counter()
+                for key in keys:
+                    app.post_message(events.Key(key, _KEY_CHARACTERS.get(key, key[:1])))
+                    await settle(pilot)
+                latencies.setdefault(action, []).append(time.perf_counter() - start)
+                saves[action] = saves.get(action, 0) + counter.count - before
+                # Let debounced saves and workers run between actions, untimed.
+                await pilot.pause()
+        return latencies, saves, counter.count
+
+
+def run_suite(scripts: dict[str, Path], fills: list[int], engine: str) -> dict[str, Any]:
+    """Replay every script on boards of every fill level.
+
+    Args:
+        scripts: Script names and files.
+        fills: Number of notes on the board at the start of each replay.
+        engine: Storage engine the app uses.
+
+    Returns:
+        A report with one row per script, action type and fill level.
+    """
+    report = new_report(
+        "interaction", {"scripts": sorted(scripts), "fills": fills, "engine": engine}
+    )
+    previous = storage.get_storage_engine()
+    storage.set_storage_engine(engine)
+    try:
+        for name, path in scripts.items():
+            script = load_script(path)
+            for fill in fills:
+                notes = synthetic_notes(fill)
+                latencies, saves, total = asyncio.run(replay(script, notes))
+                for action, samples in latencies.items():
+                    report["results"].append(_row(f"{name}/{action}", engine, fill, samples))
+                    report["results"][-1]["saves"] = saves[action]
+                report["results"].append(
+                    {
+                        "name": f"{name}/total",
+                        "engine": engine,
+                        "notes": fill,
+                        "count": len(script),
+                        "saves": total,
+                    }
+                )
+                print(
+                    f"{name:<12} {fill} notes: "
+                    + ", ".join(
+                        f"{action} p95 {percentile(samples, 95) * 1000:.1f} ms"
+                        for action, samples in latencies.items()
+                    )
+                    + f", {total} saves",
+                    file=sys.stderr,
+                )
+    finally:
+        storage.set_storage_engine(previous)
+    return report
+
+
+def _row(name: str, engine: str, fill: int, samples: list[float]) -> dict[str, Any]:
+    """Summarize the latencies of one action type."""
+    return {
+        "name": name,
+        "engine": engine,
+        "notes": fill,
+        "count": len(samples),
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "max_ms": max(samples) * 1000,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the suite from the command line.
+
+    Args:
+        argv: Command-line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        Process exit code: 1 if a comparison found regressions.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.interaction")
+    parser.add_argument(
+        "--script",
+        action="append",
+        type=Path,
+        help="keystroke script to replay; repeatable (default: the bundled scripts)",
+    )
+    parser.add_argument(
+        "--fills",
+        type=lambda text: [int(fill) for fill in text.split(",")],
+        default=list(DEFAULT_FILLS),
+        help=f"comma-separated notes per board, at most {MAX_NOTES} (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--storage",
+        choices=storage.available_storage_engines(),
+        default=storage.get_storage_engine(),
+        help="storage engine (default: %(default)s)",
+    )
+    add_report_arguments(parser)
+    args = parser.parse_args(argv)
+    if any(not 0 <= fill <= MAX_NOTES for fill in args.fills):
+        parser.error(f"--fills must be between 0 and {MAX_NOTES}")
+    paths = args.script or sorted(SCRIPTS_DIR.glob("*.json"))
+    scripts = {path.stem: path for path in paths}
+
+    report = run_suite(scripts, args.fills, args.storage)
+    return finish(report, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""JSON reports shared by the benchmark suites.
+
+A report is a dict with a "meta" section describing the machine and a
+"results" list. Each result has a "name", optional "engine", a "notes"
+scale and numeric metrics; lower is better for every metric listed in
+LOWER_IS_BETTER.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+LOWER_IS_BETTER = (
+    "seconds",
+    "p50_ms",
+    "p95_ms",
+    "p99_ms",
+    "peak_bytes",
+    "bytes_written",
+    "saves",
+    "fsyncs",
+    "stored_bytes",
+)
+"""Metrics compared against the baseline; an increase is a regression."""
+
+DEFAULT_THRESHOLD = 0.25
+"""Relative increase over the baseline reported as a regression."""
+
+
+def new_report(suite: str, params: dict[str, Any]) -> dict[str, Any]:
+    """Create an empty report.
+
+    Args:
+        suite: Name of the benchmark suite.
+        params: Parameters the suite was run with.
+
+    Returns:
+        A report with metadata and no results.
+    """
+    return {
+        "meta": {
+            "suite": suite,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "params": params,
+        },
+        "results": [],
+    }
+
+
+def write_report(report: dict[str, Any], path: str | None) -> None:
+    """Write a report as JSON to a file, or to stdout when path is None or "-".
+
+    Args:
+        report: The report.
+        path: Destination file.
+    """
+    text = json.dumps(report, indent=2) + "\n"
+    if path in (None, "-"):
+        sys.stdout.write(text)
+        return
+    Path(path).write_text(text, encoding="utf-8")
+
+
+def load_report(path: str) -> dict[str, Any]:
+    """Read a report written by write_report.
+
+    Args:
+        path: Report file.
+
+    Returns:
+        The report.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a report.
+    """
+    report = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(report, dict) or not isinstance(report.get("results"), list):
+        raise ValueError(f"{path} is not a benchmark report")
+    return report
+
+
+def _key(result: dict[str, Any]) -> tuple[str, str, int]:
+    """Return the identity of a result across runs."""
+    return (result["name"], result.get("engine") or "", result.get("notes", 0))
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], threshold: float = DEFAULT_THRESHOLD
+) -> list[dict[str, Any]]:
+    """Compare the metrics of two reports.
+
+    Results are matched by name, engine and scale; results present in
+    only one report are ignored.
+
+    Args:
+        current: The new report.
+        baseline: The stored report.
+        threshold: Relative increase counted as a regression.
+
+    Returns:
+        One row per matched metric with the baseline and current values,
+        their ratio and whether it is a regression.
+    """
+    base = {_key(result): result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        old = base.get(_key(result))
+        if old is None:
+            continue
+        for metric in LOWER_IS_BETTER:
+            if metric not in result or not old.get(metric):
+                continue
+            ratio = result[metric] / old[metric]
+            rows.append(
+                {
+                    "name": result["name"],
+                    "engine": result.get("engine"),
+                    "notes": result.get("notes", 0),
+                    "metric": metric,
+                    "baseline": old[metric],
+                    "current": result[metric],
+                    "ratio": ratio,
+                    "regression": ratio > 1 + threshold,
+                }
+            )
+    return rows
+
+
+def format_comparison(rows: list[dict[str, Any]]) -> str:
+    """Render comparison rows as a table.
+
+    Args:
+        rows: Rows returned by compare.
+
+    Returns:
+        A plain-text table, regressions marked with "!".
+    """
+    lines = [f"{'benchmark':<28} {'engine':<8} {'notes':>7} {'metric':<14} {'ratio':>7}"]
+    for row in rows:
+        mark = " !" if row["regression"] else ""
+        lines.append(
+            f"{row['name']:<28} {row['engine'] or '-':<8} {row['notes']:>7} "
+            f"{row['metric']:<14} {row['ratio']:>7.2f}{mark}"
+        )
+    return "\n".join(lines)
+
+
+def add_report_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the output and baseline options every suite shares.
+
+    Args:
+        parser: The suite's argument parser.
+    """
+    parser.add_argument("-o", "--output", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", help="compare against this stored report")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative slowdown counted as a regression (default: %(default)s)",
+    )
+
+
+def finish(report: dict[str, Any], args: argparse.Namespace) -> int:
+    """Write a report and compare it against the baseline, if one was given.
+
+    Args:
+        report: The finished report.
+        args: Parsed arguments from a parser set up by add_report_arguments.
+
+    Returns:
+        Process exit code: 1 if the comparison found regressions.
+    """
+    write_report(report, args.output)
+    if not args.baseline:
+        return 0
+    rows = compare(report, load_report(args.baseline), args.threshold)
+    print(format_comparison(rows), file=sys.stderr)
+    return 1 if any(row["regression"] for row in rows) else 0
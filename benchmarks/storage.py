@@ -0,0 +1,601 @@
+"""Storage and serialization benchmarks.
+
+Builds synthetic boards of 10 to 100,000 notes with realistic body sizes
+and measures, for every storage engine, the throughput, peak memory and
+bytes written of save_notes and load_notes, plus the engine-independent
+validate_note and PostIt.to_dict/from_dict paths and the import
+throughput (notes per second) of Markdown and JSON Lines files. The
+engine rows run without fsync; the save_burst_<mode> rows show what each
+durability mode adds to a burst of single-note saves, with the number of
+fsync calls it made. The history rows record and reconstruct the
+revisions of one long note, with the disk space the history takes. The
+load_notes_daemon row is load_notes in a process that just attached to
+a running daemon, as a new window does, to compare with load_notes.
+The sync_edit row syncs a board with one edited note to a sync
+directory; its pushed_bytes is the size of the batch sent, which
+depends on the edit and not on the board's size.
+
+Usage::
+
+    python -m benchmarks.storage -o results.json
+    python -m benchmarks.storage --baseline benchmarks/baseline.json
+
+Every run uses a throw-away data directory; real notes are never touched.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from benchmarks.report import add_report_arguments, finish, new_report
+from tui_notes import snapshot, storage
+from tui_notes.constants import DEFAULT_BOARD, MAX_NOTES, NUM_COLORS
+from tui_notes.daemon import NotesDaemon, attach
+from tui_notes.durability import DURABILITY_MODES
+from tui_notes.export import write_export
+from tui_notes.history import NoteHistory
+from tui_notes.importer import plan_import
+from tui_notes.sync import DirectoryTarget, NoteSync
+
+DEFAULT_SIZES = (10, 100, 1_000, 10_000, 100_000)
+"""Board sizes benchmarked by default."""
+
+WIDGET_SAMPLE = 10_000
+"""Most PostIt widgets built per measurement; widget construction dominates beyond that."""
+
+SAVE_BURST = 20
+"""Single-note saves per durability measurement, e.g. a note moved across the grid."""
+
+HISTORY_EDITS = 200
+"""Saved edits of one note per revision-history measurement."""
+
+HISTORY_BODY_CHARS = 4000
+"""Length of the note whose revisions are measured."""
+
+_WORDS = (
+    "meeting budget draft review call email deploy fix idea todo groceries plan "
+    "release notes sprint backlog design bug report invoice travel book read"
+).split()
+
+
+def synthetic_notes(count: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Build notes with a realistic mix of titles and body sizes.
+
+    Bodies follow a log-normal length distribution (median about 200
+    characters, a long tail of multi-kilobyte notes) and one in ten is
+    empty.
+
+    Args:
+        count: Number of notes.
+        seed: Random seed, so runs are comparable.
+
+    Returns:
+        Note dicts as save_notes expects them.
+    """
+    rng = random.Random(seed)
+    notes = []
+    for idx in range(count):
+        title = " ".join(rng.choices(_WORDS, k=rng.randint(1, 4))).capitalize()
+        length = 0 if rng.random() < 0.1 else min(int(rng.lognormvariate(5.3, 1.0)), 20_000)
+        words: list[str] = []
+        size = 0
+        while size < length:
+            word = rng.choice(_WORDS)
+            words.append(word)
+            size += len(word) + 1
+        notes.append(
+            {
+                "id": f"{seed:04x}{idx:012x}",
+                "position": idx % MAX_NOTES,
+                "title": title,
+                "content": " ".join(words),
+                "color_index": rng.randrange(NUM_COLORS),
+            }
+        )
+    return notes
+
+
+# ── Measurement ─────────────────────────────────────────────────
+
+
+def _io_written() -> int | None:
+    """Return the bytes this process has written so far, where the OS reports it."""
+    try:
+        with open("/proc/self/io", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _tree_size(path: Path) -> int:
+    """Return the total size of the files below path."""
+    return sum(entry.stat().st_size for entry in path.rglob("*") if entry.is_file())
+
+
+@contextmanager
+def temporary_data_dir() -> Iterator[Path]:
+    """Point tui-notes at a temporary data directory for the duration of the block."""
+    saved = {key: os.environ.get(key) for key in ("HOME", "XDG_CONFIG_HOME")}
+    with tempfile.TemporaryDirectory(prefix="tui-notes-bench-") as tmp:
+        os.environ["HOME"] = os.environ["XDG_CONFIG_HOME"] = tmp
+        try:
+            yield storage.data_file_path().parent
+        finally:
+            storage.close_storage()
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+
+def _measure(  # pylint: disable=too-many-arguments
+    name: str,
+    ops: int,
+    repeat: int,
+    run: Callable[[], Any],
+    *,
+    setup: Callable[[], Any] | None = None,
+    data_dir: Path | None = None,
+) -> dict[str, Any]:
+    """Time a benchmark, then run it once more under tracemalloc.
+
+    Args:
+        name: Benchmark name.
+        ops: Items processed by one run, for the throughput figure.
+        repeat: Timed runs; the best is reported along with the median.
+        run: The code under test.
+        setup: Untimed preparation before every run.
+        data_dir: Data directory whose growth counts as bytes written
+            when the OS does not report written bytes.
+
+    Returns:
+        A result row without name-independent keys (engine, notes).
+    """
+    times = []
+    written: list[int] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        before_io = _io_written() if data_dir is not None else None
+        before_size = _tree_size(data_dir) if data_dir is not None and before_io is None else 0
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+        if data_dir is None:
+            continue
+        after_io = _io_written()
+        if before_io is not None and after_io is not None:
+            written.append(after_io - before_io)
+        else:
+            written.append(max(0, _tree_size(data_dir) - before_size))
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    best = min(times)
+    result = {
+        "name": name,
+        "ops": ops,
+        "seconds": best,
+        "median_seconds": statistics.median(times),
+        "ops_per_second": ops / best if best else None,
+        "peak_bytes": peak,
+    }
+    if written:
+        result["bytes_written"] = min(written)
+    return result
+
+
+# ── Benchmarks ──────────────────────────────────────────────────
+
+
+def bench_engine(engine: str, notes: list[dict[str, Any]], repeat: int) -> list[dict[str, Any]]:
+    """Benchmark save_notes and load_notes with one storage engine.
+
+    Three cases are measured: the first save of a board, a save after
+    one note was edited (what the app does while you type), and a load
+    by a freshly opened engine.
+
+    Args:
+        engine: Storage engine name.
+        notes: The board's notes.
+        repeat: Timed runs per case.
+
+    Returns:
+        Result rows.
+    """
+    previous = storage.get_storage_engine()
+    previous_durability = storage.get_durability()
+    storage.set_storage_engine(engine)
+    storage.set_durability("none")
+    results = []
+    try:
+        with temporary_data_dir() as data_dir:
+
+            def reset() -> None:
+                storage.close_storage()
+                for path in sorted(data_dir.rglob("*"), reverse=True):
+                    if path.is_file():
+                        path.unlink()
+
+            results.append(
+                _measure(
+                    "save_notes",
+                    len(notes),
+                    repeat,
+                    lambda: storage.save_notes(notes),
+                    setup=reset,
+                    data_dir=data_dir,
+                )
+            )
+
+            reset()
+            storage.save_notes(notes)
+            edits = itertools.count()
+
+            def save_edit() -> None:
+                edited = list(notes)
+                edited[0] = {**edited[0], "content": f"edit {next(edits)}"}
+                storage.save_notes(edited)
+
+            results.append(_measure("save_notes_edit", 1, repeat, save_edit, data_dir=data_dir))
+            results.append(
+                _measure(
+                    "load_notes",
+                    len(notes),
+                    repeat,
+                    storage.load_notes,
+                    setup=storage.close_storage,
+                    data_dir=data_dir,
+                )
+            )
+    finally:
+        storage.set_storage_engine(previous)
+        storage.set_durability(previous_durability)
+    for result in results:
+        result["engine"] = engine
+    return results
+
+
+def bench_durability(engine: str, notes: list[dict[str, Any]], repeat: int) -> list[dict[str, Any]]:
+    """Benchmark a burst of single-note saves in every durability mode.
+
+    Each run saves SAVE_BURST edits and then syncs whatever the mode
+    left pending, so batched mode pays for its deferred fsync too.
+
+    Args:
+        engine: Storage engine name.
+        notes: The board's notes.
+        repeat: Timed runs per mode.
+
+    Returns:
+        Result rows, with the fsync calls of one run as "fsyncs". The
+        fsyncs SQLite makes itself in strict mode are not counted.
+    """
+    previous = storage.get_storage_engine()
+    previous_durability = storage.get_durability()
+    storage.set_storage_engine(engine)
+    policy = storage.get_sync_policy()
+    results = []
+    edits = itertools.count()
+
+    def burst() -> None:
+        for _ in range(SAVE_BURST):
+            edited = list(notes)
+            edited[0] = {**edited[0], "content": f"edit {next(edits)}"}
+            storage.save_notes(edited)
+        policy.flush()
+
+    try:
+        with temporary_data_dir() as data_dir:
+            for mode in DURABILITY_MODES:
+                storage.set_durability(mode)
+                storage.save_notes(notes)
+                policy.flush()
+                before = policy.syncs
+                result = _measure(
+                    f"save_burst_{mode}", SAVE_BURST, repeat, burst, data_dir=data_dir
+                )
+                # _measure ran the burst repeat times plus once under tracemalloc.
+                result["fsyncs"] = (policy.syncs - before) // (repeat + 1)
+                results.append(result)
+    finally:
+        storage.set_storage_engine(previous)
+        storage.set_durability(previous_durability)
+    for result in results:
+        result["engine"] = engine
+    return results
+
+
+def bench_daemon(notes: list[dict[str, Any]], repeat: int) -> list[dict[str, Any]]:
+    """Benchmark loading a board from a daemon that already has it in memory.
+
+    Every run attaches a new client, as a newly opened window does, and
+    loads the board through the storage facade.
+
+    Args:
+        notes: The board's notes.
+        repeat: Timed runs.
+
+    Returns:
+        Result rows.
+    """
+    previous_durability = storage.get_durability()
+    storage.set_durability("none")
+    try:
+        with temporary_data_dir() as data_dir:
+            storage.save_notes(notes)
+            daemon = NotesDaemon(data_dir / "bench.sock")
+            daemon.start()
+            try:
+                attach(daemon.path)
+                storage.load_notes()
+
+                def load() -> None:
+                    attach(daemon.path)
+                    storage.load_notes()
+
+                result = _measure(
+                    "load_notes_daemon", len(notes), repeat, load, setup=storage.detach_daemon
+                )
+            finally:
+                storage.detach_daemon()
+                daemon.stop()
+    finally:
+        storage.set_durability(previous_durability)
+    result["engine"] = storage.get_storage_engine()
+    return [result]
+
+
+def bench_sync(notes: list[dict[str, Any]], repeat: int) -> list[dict[str, Any]]:
+    """Benchmark syncing a board after one of its notes was edited.
+
+    The board is synced once beforehand, so every run pushes only the
+    edit read from the change feed.
+
+    Args:
+        notes: The board's notes.
+        repeat: Timed runs.
+
+    Returns:
+        Result rows, with the size of the last batch pushed as
+        "pushed_bytes".
+    """
+    previous_durability = storage.get_durability()
+    storage.set_durability("none")
+    try:
+        with temporary_data_dir() as data_dir:
+            storage.save_notes(notes)
+            target = DirectoryTarget(data_dir.parent / "bench-sync")
+            sync = NoteSync(target)
+            sync.run()
+            edits = itertools.count()
+
+            def edit() -> None:
+                edited = list(notes)
+                edited[0] = {**edited[0], "content": f"edit {next(edits)}"}
+                storage.save_notes(edited)
+
+            result = _measure("sync_edit", 1, repeat, sync.run, setup=edit, data_dir=data_dir)
+            result["pushed_bytes"] = max(
+                (path.stat() for path in (target.root / "batches").iterdir()),
+                key=lambda stat: stat.st_mtime_ns,
+            ).st_size
+    finally:
+        storage.set_durability(previous_durability)
+    result["engine"] = storage.get_storage_engine()
+    return [result]
+
+
+def bench_history(repeat: int) -> list[dict[str, Any]]:
+    """Benchmark recording and reconstructing the revisions of one note.
+
+    Every edit inserts a word into a long note and is recorded as a new
+    revision, as after each save in the app.
+
+    Args:
+        repeat: Timed runs per case.
+
+    Returns:
+        Result rows; the record row has the history's size on disk as
+        "stored_bytes" and the size of as many full copies of the note as
+        "full_copy_bytes", for comparison.
+    """
+    rng = random.Random(0)
+    words: list[str] = []
+    while len(" ".join(words)) < HISTORY_BODY_CHARS:
+        words.append(rng.choice(_WORDS))
+    bodies = []
+    for _ in range(HISTORY_EDITS):
+        words.insert(rng.randrange(len(words) + 1), rng.choice(_WORDS))
+        bodies.append(" ".join(words))
+    previous_durability = storage.get_durability()
+    storage.set_durability("none")
+    try:
+        with temporary_data_dir() as data_dir:
+            root = data_dir / "history"
+            history = NoteHistory(root)
+
+            def reset() -> None:
+                nonlocal history
+                shutil.rmtree(root, ignore_errors=True)
+                history = NoteHistory(root)
+
+            def record() -> None:
+                for body in bodies:
+                    history.record(DEFAULT_BOARD, [{"id": "n", "title": "Note", "content": body}])
+
+            recorded = _measure(
+                "history_record", HISTORY_EDITS, repeat, record, setup=reset, data_dir=data_dir
+            )
+            recorded["stored_bytes"] = _tree_size(root)
+            recorded["full_copy_bytes"] = sum(len(body.encode("utf-8")) for body in bodies)
+            revisions = range(1, HISTORY_EDITS + 1)
+
+            def reconstruct() -> None:
+                fresh = NoteHistory(root)
+                for rev in revisions:
+                    fresh.revision(DEFAULT_BOARD, "n", rev)
+
+            rebuilt = _measure("history_revision", HISTORY_EDITS, repeat, reconstruct)
+    finally:
+        storage.set_durability(previous_durability)
+    return [recorded, rebuilt]
+
+
+def bench_serialization(notes: list[dict[str, Any]], repeat: int) -> list[dict[str, Any]]:
+    """Benchmark note validation and PostIt widget (de)serialization.
+
+    Args:
+        notes: Notes to process; at most WIDGET_SAMPLE become widgets.
+        repeat: Timed runs per case.
+
+    Returns:
+        Result rows.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from tui_notes.widgets.post_it import PostIt
+
+    validate = snapshot.validate_note
+    sample = notes[:WIDGET_SAMPLE]
+    widgets = [PostIt.from_dict(note) for note in sample]
+    return [
+        _measure("validate_note", len(notes), repeat, lambda: [validate(n) for n in notes]),
+        _measure(
+            "postit_from_dict", len(sample), repeat, lambda: [PostIt.from_dict(n) for n in sample]
+        ),
+        _measure("postit_to_dict", len(widgets), repeat, lambda: [w.to_dict() for w in widgets]),
+    ]
+
+
+def bench_import(notes: list[dict[str, Any]], repeat: int) -> list[dict[str, Any]]:
+    """Benchmark parsing, validating and laying out an import, without writing it.
+
+    The notes are exported as one board and imported into an empty
+    store, so ops_per_second is the import throughput in notes per
+    second.
+
+    Args:
+        notes: Notes to import.
+        repeat: Timed runs per case.
+
+    Returns:
+        Result rows.
+    """
+    boards = [{"id": DEFAULT_BOARD, "name": "Main"}]
+    results = []
+    with tempfile.TemporaryDirectory(prefix="tui-notes-bench-") as tmp:
+        for fmt, extension in (("markdown", "md"), ("jsonl", "jsonl")):
+            path = Path(tmp) / f"notes.{extension}"
+            with open(path, "w", encoding="utf-8") as out:
+                write_export(out, fmt, boards, lambda board: notes)
+            results.append(
+                _measure(
+                    f"import_{fmt}",
+                    len(notes),
+                    repeat,
+                    partial(plan_import, [path], boards, lambda board: []),
+                )
+            )
+    return results
+
+
+def run_suite(sizes: list[int], engines: list[str], repeat: int) -> dict[str, Any]:
+    """Run every benchmark at every size.
+
+    Args:
+        sizes: Board sizes in notes.
+        engines: Storage engines to benchmark.
+        repeat: Timed runs per case.
+
+    Returns:
+        A report.
+    """
+    report = new_report("storage", {"sizes": sizes, "engines": engines, "repeat": repeat})
+    for size in sizes:
+        notes = synthetic_notes(size)
+        rows = bench_serialization(notes, repeat) + bench_import(notes, repeat)
+        for engine in engines:
+            rows.extend(bench_engine(engine, notes, repeat))
+            rows.extend(bench_durability(engine, notes, repeat))
+        rows.extend(bench_daemon(notes, repeat))
+        rows.extend(bench_sync(notes, repeat))
+        for row in rows:
+            row["notes"] = size
+            _print_row(row)
+        report["results"].extend(rows)
+    for row in bench_history(repeat):
+        row["notes"] = 1
+        _print_row(row)
+        report["results"].append(row)
+    return report
+
+
+def _print_row(row: dict[str, Any]) -> None:
+    """Print a one-line summary of a result row to stderr."""
+    print(
+        f"{row['name']:<18} {row.get('engine') or '-':<8} {row['notes']:>7} notes "
+        f"{row['seconds'] * 1000:10.2f} ms"
+        + (f" {row['fsyncs']:>5} fsyncs" if "fsyncs" in row else ""),
+        file=sys.stderr,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the suite from the command line.
+
+    Args:
+        argv: Command-line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        Process exit code: 1 if a comparison found regressions.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.storage")
+    parser.add_argument(
+        "--sizes",
+        type=lambda text: [int(size) for size in text.split(",")],
+        default=list(DEFAULT_SIZES),
+        help="comma-separated board sizes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--engines",
+        type=lambda text: text.split(","),
+        default=storage.available_storage_engines(),
+        help="comma-separated storage engines (default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case")
+    add_report_arguments(parser)
+    args = parser.parse_args(argv)
+    unknown = set(args.engines) - set(storage.available_storage_engines())
+    if unknown:
+        parser.error(f"unknown storage engine(s): {', '.join(sorted(unknown))}")
+
+    report = run_suite(args.sizes, args.engines, args.repeat)
+    return finish(report, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
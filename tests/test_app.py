@@ -1,10 +1,22 @@
 """Tests for the TUI Notes app using Textual's async testing."""
 
+import json
+import threading
+
 import pytest
 from textual.pilot import Pilot
+from textual.widgets import Button, TextArea
 
+from tui_notes import instrumentation
 from tui_notes.app import NotesApp
-from tui_notes.widgets import EmptySlot, PostIt
+from tui_notes.constants import BLOB_MIN_CHARS, BLOB_PREVIEW_CHARS
+from tui_notes.drafts import DraftStore
+from tui_notes.history import NoteHistory
+from tui_notes.screens.drafts import DraftRecoveryScreen
+from tui_notes.screens.history import HistoryScreen
+from tui_notes.search import SearchIndex
+from tui_notes.storage import load_notes, read_body, save_notes, split_body
+from tui_notes.widgets import PostIt
 
 
 @pytest.fixture
@@ -12,7 +24,7 @@ def app(tmp_path, monkeypatch):
     """Create app with isolated storage."""
     monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
     monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
-    monkeypatch.setattr("tui_notes.app.load_notes", lambda: [])
+    monkeypatch.setattr("tui_notes.app.load_notes", lambda board="main": [])
     return NotesApp()
 
 
@@ -20,8 +32,8 @@ class TestAppStartup:
     @pytest.mark.asyncio
     async def test_app_starts_with_empty_grid(self, app):
         async with app.run_test() as pilot:
-            post_its = app.query("PostIt")
-            empty_slots = app.query("EmptySlot")
+            post_its = app._get_post_its()
+            empty_slots = app.query(".empty-slot")
             assert len(post_its) == 0
             assert len(empty_slots) == 9
 
@@ -39,14 +51,14 @@ class TestAddNote:
     async def test_add_note_creates_post_it(self, app):
         async with app.run_test() as pilot:
             await pilot.press("a")
-            post_its = app.query("PostIt")
+            post_its = app._get_post_its()
             assert len(post_its) == 1
 
     @pytest.mark.asyncio
     async def test_add_note_removes_empty_slot(self, app):
         async with app.run_test() as pilot:
             await pilot.press("a")
-            empty_slots = app.query("EmptySlot")
+            empty_slots = app.query(".empty-slot")
             assert len(empty_slots) == 8
 
     @pytest.mark.asyncio
@@ -63,7 +75,7 @@ class TestAddNote:
         async with app.run_test() as pilot:
             for _ in range(3):
                 await pilot.press("a")
-            post_its = app.query("PostIt")
+            post_its = app._get_post_its()
             assert len(post_its) == 3
 
     @pytest.mark.asyncio
@@ -71,7 +83,7 @@ class TestAddNote:
         async with app.run_test() as pilot:
             await pilot.press("a")
             await pilot.press("a")
-            post_its = list(app.query("PostIt"))
+            post_its = app._get_post_its()
             titles = [p.title for p in post_its]
             assert len(set(titles)) == 2  # all unique
 
@@ -80,7 +92,7 @@ class TestAddNote:
         async with app.run_test() as pilot:
             for _ in range(10):
                 await pilot.press("a")
-            post_its = app.query("PostIt")
+            post_its = app._get_post_its()
             assert len(post_its) == 9
 
 
@@ -89,13 +101,13 @@ class TestDeleteNote:
     async def test_delete_replaces_with_empty_slot(self, app):
         async with app.run_test() as pilot:
             await pilot.press("a")
-            assert len(app.query("PostIt")) == 1
+            assert len(app._get_post_its()) == 1
             await pilot.press("d")
             # Confirm deletion
             await pilot.press("enter")
             await pilot.pause()
-            assert len(app.query("PostIt")) == 0
-            assert len(app.query("EmptySlot")) == 9
+            assert len(app._get_post_its()) == 0
+            assert len(app.query(".empty-slot")) == 9
 
     @pytest.mark.asyncio
     async def test_delete_grid_stays_9(self, app):
@@ -109,6 +121,251 @@ class TestDeleteNote:
             grid = app.query_one("#notes-grid", Grid)
             assert len(grid.children) == 9
 
+    @pytest.mark.asyncio
+    async def test_add_and_delete_rebind_slots_in_place(self, app):
+        async with app.run_test() as pilot:
+            from textual.containers import Grid
+
+            grid = app.query_one("#notes-grid", Grid)
+            before = list(grid.children)
+            await pilot.press("right", "a")
+            assert list(grid.children) == before
+            assert not before[1].empty and before[1].has_class("post-it-1")
+            await pilot.press("d", "enter")
+            await pilot.pause()
+            assert list(grid.children) == before
+            assert before[1].empty and not before[1].has_class("post-it-1")
+            assert app.focused is before[1]
+
+
+class TestPostItSnapshot:
+    def test_to_dict_is_cached_until_a_field_changes(self):
+        post_it = PostIt(0, title="A", note_id="a")
+        first = post_it.to_dict()
+        assert post_it.to_dict() is first
+        assert not post_it.dirty
+        post_it.content = "Body"
+        assert post_it.dirty
+        assert post_it.to_dict()["content"] == "Body"
+
+    @pytest.mark.parametrize(
+        "field, value",
+        [("title", "B"), ("color_index", 4), ("position", 5), ("note_id", "other")],
+    )
+    def test_every_field_invalidates(self, field, value):
+        post_it = PostIt(0, title="A", note_id="a")
+        post_it.to_dict()
+        setattr(post_it, field, value)
+        key = "id" if field == "note_id" else field
+        assert post_it.to_dict()[key] == value
+
+    def test_cleared_widget_shows_the_next_note_bound_to_it(self):
+        post_it = PostIt.empty_slot(2)
+        assert post_it.empty and post_it.has_class("empty-slot")
+        post_it.bind({"id": "a", "position": 2, "title": "A", "content": "", "color_index": 4})
+        assert not post_it.empty and post_it.has_class("post-it-4")
+        post_it.clear()
+        assert post_it.empty and not post_it.has_class("post-it-4")
+
+    def test_grid_index_overrides_cached_position(self):
+        post_it = PostIt(0, title="A", note_id="a")
+        post_it.to_dict()
+        assert post_it.to_dict(grid_index=7)["position"] == 7
+
+
+class TestUndo:
+    @pytest.mark.asyncio
+    async def test_undo_restores_deleted_note(self, app):
+        async with app.run_test() as pilot:
+            await pilot.press("a", "e", "x", "tab", "tab", "enter")
+            await pilot.pause()
+            before = app._serialize_notes()
+            await pilot.press("d", "enter")
+            await pilot.pause()
+            assert len(app._get_post_its()) == 0
+            await pilot.press("u")
+            await pilot.pause()
+            assert app._serialize_notes() == before
+
+    @pytest.mark.asyncio
+    async def test_undo_edit_rebinds_widget_in_place(self, app):
+        async with app.run_test() as pilot:
+            await pilot.press("a")
+            await pilot.pause()
+            widget = app._get_post_its()[0]
+            title = widget.title
+            await pilot.press("e", "x", "tab", "tab", "enter")
+            await pilot.pause()
+            assert widget.title == "x"
+            await pilot.press("u")
+            await pilot.pause()
+            assert app._get_post_its()[0] is widget
+            assert widget.title == title
+            await pilot.press("U")
+            await pilot.pause()
+            assert widget.title == "x"
+
+    @pytest.mark.asyncio
+    async def test_undo_move_and_color(self, app):
+        async with app.run_test() as pilot:
+            await pilot.press("a")
+            await pilot.press("m", "right", "enter")
+            await pilot.pause()
+            app._apply_color(app._get_post_its()[0], 3)
+            await pilot.pause()
+            assert app._serialize_notes()[0]["position"] == 1
+            await pilot.press("u")
+            await pilot.pause()
+            assert app._serialize_notes()[0]["color_index"] != 3
+            await pilot.press("u")
+            await pilot.pause()
+            assert app._serialize_notes()[0]["position"] == 0
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_undo(self, app):
+        async with app.run_test() as pilot:
+            await pilot.press("u", "U")
+            await pilot.pause()
+            assert len(app._get_post_its()) == 0
+
+    @pytest.mark.asyncio
+    async def test_undo_is_saved(self, app, tmp_path):
+        async with app.run_test() as pilot:
+            await pilot.press("a", "a")
+            await pilot.pause()
+            await pilot.press("u")
+            await pilot.pause()
+            app.flush_saves()
+            assert len(load_notes()) == 1
+
+
+class TestLongNotes:
+    @pytest.fixture
+    def long_app(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+        monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+        body = "line\n" * 5000
+        preview, blob = split_body(body)
+        note = {"id": "a", "position": 0, "title": "Long", "content": preview, "color_index": 0}
+        monkeypatch.setattr(
+            "tui_notes.app.load_notes", lambda board="main": [{**note, "blob": blob}]
+        )
+        return NotesApp(), body
+
+    @pytest.mark.asyncio
+    async def test_edit_screen_loads_full_body(self, long_app):
+        app, body = long_app
+        async with app.run_test() as pilot:
+            widget = app._get_post_its()[0]
+            assert len(widget.content) == BLOB_PREVIEW_CHARS
+            widget.focus()
+            await pilot.press("e")
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            editor = app.screen.query_one("#edit-content-input", TextArea)
+            assert editor.text == body
+            assert not editor.disabled
+
+    @pytest.mark.asyncio
+    async def test_long_edit_is_stored_apart(self, app):
+        async with app.run_test() as pilot:
+            await pilot.press("a")
+            await pilot.pause()
+            widget = app._get_post_its()[0]
+            app._apply_edit(widget, {"title": "Long", "content": "y" * (BLOB_MIN_CHARS + 1)})
+            assert widget.blob is None
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            assert widget.blob is not None
+            assert len(widget.to_dict()["content"]) == BLOB_PREVIEW_CHARS
+            assert read_body(widget.to_dict()) == "y" * (BLOB_MIN_CHARS + 1)
+            app._apply_edit(widget, {"title": "Short", "content": "z"})
+            assert widget.blob is None
+            assert "blob" not in widget.to_dict()
+
+    @pytest.mark.asyncio
+    async def test_long_edit_follows_its_note_while_stored(self, app, monkeypatch):
+        async with app.run_test() as pilot:
+            await pilot.press("a")
+            await pilot.pause()
+            widget = app._get_post_its()[0]
+            note_id = widget.note_id
+            stored = []
+            monkeypatch.setattr(
+                "tui_notes.app.split_body",
+                lambda content: stored.append(content) or ("p", "1" * 64),
+            )
+            app._apply_edit(widget, {"title": "Long", "content": "y" * (BLOB_MIN_CHARS + 1)})
+            app._swap_positions(0, 4)
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            [moved] = app._get_post_its()
+            assert moved.note_id == note_id and moved.position == 4
+            assert (moved.title, moved.content, moved.blob) == ("Long", "p", "1" * 64)
+
+
+class TestDrafts:
+    @pytest.mark.asyncio
+    async def test_edit_is_checkpointed_until_saved(self, app, tmp_path):
+        async with app.run_test() as pilot:
+            await pilot.press("a", "e", "x")
+            app.screen._checkpoint_draft()
+            await app.workers.wait_for_complete()
+            [draft] = DraftStore(tmp_path / "drafts.jsonl").load()
+            assert draft["title"] == "x"
+            await pilot.press("tab", "tab", "enter")
+            await pilot.pause()
+            app._saver.flush()
+            app._close_saved_drafts()
+            assert DraftStore(tmp_path / "drafts.jsonl").load() == []
+
+    @pytest.mark.asyncio
+    async def test_drafts_are_offered_and_restored_on_launch(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+        monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+        save_notes([{"id": "a", "position": 0, "title": "Old", "content": "", "color_index": 0}])
+        DraftStore(tmp_path / "drafts.jsonl").checkpoint("d", "main", "a", "Recovered", "Body")
+        app = NotesApp()
+        async with app.run_test() as pilot:
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            assert isinstance(app.screen, DraftRecoveryScreen)
+            app.screen.query_one("#drafts-restore", Button).press()
+            await pilot.pause()
+            assert app._get_post_its()[0].title == "Recovered"
+            assert app._get_post_its()[0].content == "Body"
+        assert DraftStore(tmp_path / "drafts.jsonl").load() == []
+
+
+class TestHistory:
+    @pytest.mark.asyncio
+    async def test_saved_edits_become_revisions_that_can_be_restored(self, app, tmp_path):
+        async with app.run_test() as pilot:
+            await pilot.press("a")
+            await pilot.pause()
+            app._saver.flush()
+            post_it = app._get_post_its()[0]
+            for title in ("First", "Second"):
+                app._apply_edit(post_it, {"title": title, "content": f"{title} body"})
+                await pilot.pause()
+                app._saver.flush()
+            assert [r["title"] for r in NoteHistory().revisions("main", post_it.note_id)] == [
+                "Second",
+                "First",
+                "Note 1",
+            ]
+            await pilot.press("h")
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            assert isinstance(app.screen, HistoryScreen)
+            await pilot.press("down")
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            app.screen.query_one("#history-restore", Button).press()
+            await pilot.pause()
+            assert post_it.title == "First"
+            assert post_it.content == "First body"
+
 
 class TestMoveMode:
     @pytest.mark.asyncio
@@ -132,11 +389,446 @@ class TestMoveMode:
             await pilot.press("m")
             assert app.move_mode is False
 
+    @pytest.mark.asyncio
+    async def test_move_to_empty_rebinds_slots_in_place(self, app):
+        async with app.run_test() as pilot:
+            await pilot.press("a")
+            await pilot.pause()
+            from textual.containers import Grid
+
+            grid = app.query_one("#notes-grid", Grid)
+            before = list(grid.children)
+            note_id = before[0].note_id
+            await pilot.press("m", "right", "down")
+            await pilot.pause()
+            assert list(grid.children) == before
+            assert before[4].note_id == note_id and before[4].position == 4
+            assert before[4].has_class("moving") and app.focused is before[4]
+            assert before[0].empty and before[0].has_class("empty-slot")
+
 
 class TestColorIndex:
     @pytest.mark.asyncio
     async def test_post_it_has_color(self, app):
         async with app.run_test() as pilot:
             await pilot.press("a")
-            post_it = app.query_one("PostIt", PostIt)
+            post_it = app._get_post_its()[0]
             assert 0 <= post_it.color_index <= 5
+
+
+class TestBoards:
+    @pytest.mark.asyncio
+    async def test_new_board_starts_empty(self, app):
+        async with app.run_test() as pilot:
+            await pilot.press("a")
+            await pilot.press("n")
+            await pilot.press("enter")
+            await pilot.pause()
+            assert len(app._boards) == 2
+            assert app._board_id != "main"
+            assert len(app._get_post_its()) == 0
+            assert len(app.query(".empty-slot")) == 9
+
+    @pytest.mark.asyncio
+    async def test_switching_boards_keeps_notes(self, app):
+        async with app.run_test() as pilot:
+            await pilot.press("a")
+            await pilot.press("n")
+            await pilot.press("enter")
+            await pilot.pause()
+            await pilot.press("left_square_bracket")
+            await pilot.pause()
+            assert app._board_id == "main"
+            assert len(app._get_post_its()) == 1
+            await pilot.press("right_square_bracket")
+            await pilot.pause()
+            assert len(app._get_post_its()) == 0
+
+    @pytest.mark.asyncio
+    async def test_only_active_board_is_loaded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+        monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+        loaded = []
+        monkeypatch.setattr(
+            "tui_notes.app.load_notes", lambda board="main": loaded.append(board) or []
+        )
+        from tui_notes.storage import save_boards
+
+        save_boards([{"id": b, "name": b} for b in ("main", "b1", "b2", "b3", "b4")])
+        # A warm search index means no board has to be read for indexing.
+        index = SearchIndex()
+        for board in ("main", "b1", "b2", "b3", "b4"):
+            index.sync_board(board, [])
+        index.save()
+        app = NotesApp()
+        async with app.run_test() as pilot:
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            assert sorted(loaded) == ["b1", "b4", "main"]
+
+    @pytest.mark.asyncio
+    async def test_cannot_delete_only_board(self, app):
+        async with app.run_test() as pilot:
+            await pilot.press("D")
+            await pilot.pause()
+            assert len(app._boards) == 1
+            assert len(app.screen_stack) == 1
+
+    @pytest.mark.asyncio
+    async def test_deleted_board_is_not_written_back(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+        monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+        app = NotesApp(save_debounce=0.01, save_max_latency=60.0)
+        started, release = threading.Event(), threading.Event()
+        write = app._saver._write_fn
+
+        def slow(post_its, board):
+            started.set()
+            release.wait(5)
+            return write(post_its, board)
+
+        app._saver._write_fn = slow
+        async with app.run_test() as pilot:
+            await pilot.press("n", "enter")
+            await pilot.pause()
+            board = app._board_id
+            await pilot.press("a")
+            for _ in range(50):
+                if started.is_set():
+                    break
+                await pilot.pause(0.02)
+            threading.Timer(0.2, release.set).start()
+            app._do_delete_board(board, True)
+            await app.workers.wait_for_complete()
+            assert board not in {entry["id"] for entry in app._boards}
+        assert not (tmp_path / "boards" / f"{board}.json").exists()
+
+
+class TestOverview:
+    @pytest.mark.asyncio
+    async def test_overview_lists_notes_of_all_boards(self, app):
+        async with app.run_test() as pilot:
+            await pilot.press("a")
+            await pilot.press("n")
+            await pilot.press("enter")
+            await pilot.press("a", "a")
+            await pilot.pause()
+            await pilot.press("o")
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            grid = app.screen.query_one("VirtualNoteGrid")
+            assert grid.note_count == 3
+            await pilot.press("enter")
+            await pilot.pause()
+            assert app._board_id == "main"
+            assert isinstance(app.focused, PostIt)
+
+
+class TestReload:
+    @pytest.mark.asyncio
+    async def test_reload_rebinds_widgets_in_place(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+        monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+        stored = [{"id": "a", "position": 2, "title": "Disk", "content": "", "color_index": 1}]
+        monkeypatch.setattr("tui_notes.app.load_notes", lambda board="main": stored)
+        app = NotesApp()
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            from textual.containers import Grid
+
+            grid = app.query_one("#notes-grid", Grid)
+            before = list(grid.children)
+            stored[0] = dict(stored[0], title="Changed", color_index=3)
+            await pilot.press("ctrl+r")
+            await pilot.pause()
+            assert list(grid.children) == before
+            post_it = app._get_post_its()[0]
+            assert post_it.title == "Changed"
+            assert post_it.has_class("post-it-3")
+
+
+class TestSearch:
+    @pytest.mark.asyncio
+    async def test_search_jumps_to_note_on_other_board(self, app):
+        async with app.run_test() as pilot:
+            await pilot.press("a", "a")
+            await pilot.pause()
+            target = app._get_post_its()[1]
+            app._apply_edit(target, {"title": "Dentist", "content": "Tuesday 10am"})
+            await pilot.press("n")
+            await pilot.press("enter")
+            await pilot.pause()
+            assert app._board_id != "main"
+            await pilot.press("slash")
+            await pilot.press(*"tues")
+            await pilot.pause()
+            await pilot.press("enter")
+            await pilot.pause()
+            await pilot.pause()
+            assert app._board_id == "main"
+            assert app.focused is not None
+            assert app.focused.note_id == target.note_id
+
+    @pytest.mark.asyncio
+    async def test_deleted_note_leaves_index(self, app):
+        async with app.run_test() as pilot:
+            await pilot.press("a")
+            await pilot.pause()
+            assert len(app._index.search("note")) == 1
+            await pilot.press("d")
+            await pilot.press("enter")
+            await pilot.pause()
+            assert app._index.search("note") == []
+
+
+class TestQuickJump:
+    @pytest.mark.asyncio
+    async def test_ctrl_p_jumps_to_fuzzy_match(self, app):
+        async with app.run_test() as pilot:
+            await pilot.press("a", "a")
+            await pilot.pause()
+            target = app._get_post_its()[0]
+            app._apply_edit(target, {"title": "Quarterly report", "content": ""})
+            await pilot.press("n")
+            await pilot.press("enter")
+            await pilot.pause()
+            await pilot.press("ctrl+p")
+            await pilot.press(*"qrtly")
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            await pilot.press("enter")
+            await pilot.pause()
+            await pilot.pause()
+            assert app._board_id == "main"
+            assert app.focused.note_id == target.note_id
+
+
+class TestDebugOverlay:
+    @pytest.mark.asyncio
+    async def test_f12_toggles_overlay_and_collects_metrics(self, app):
+        instrumentation.disable()
+        try:
+            async with app.run_test() as pilot:
+                assert not app.query("#debug-overlay")
+                await pilot.press("f12")
+                overlay = app.query_one("#debug-overlay")
+                assert overlay.display
+                await pilot.press("a", "m", "right", "enter")
+                metrics = instrumentation.active()
+                assert metrics is not None
+                assert metrics.histogram("app.swap_positions").count == 1
+                assert metrics.histogram("app.on_key").count >= 2
+                assert "mount.PostIt" not in metrics.as_dict()["counters"]
+                overlay.refresh_figures()
+                assert "pending writes" in str(overlay.render())
+                await pilot.press("f12")
+                assert not overlay.display
+        finally:
+            instrumentation.disable()
+
+
+class TestExport:
+    @pytest.mark.asyncio
+    async def test_export_dialog_writes_file_in_worker(self, app, tmp_path):
+        target = tmp_path / "out.jsonl"
+        async with app.run_test() as pilot:
+            await pilot.press("a", "a")
+            await pilot.press("ctrl+e")
+            assert type(app.screen).__name__ == "ExportScreen"
+            app.screen.query_one("#export-path").value = str(target)
+            app.screen.query_one("#export-format").query("RadioButton")[2].value = True
+            await pilot.pause()
+            await pilot.press("enter")
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            lines = target.read_text(encoding="utf-8").splitlines()
+            assert len(lines) == 2
+            assert app._export_format == "jsonl"
+
+    @pytest.mark.asyncio
+    async def test_export_cancel_writes_nothing(self, app, tmp_path):
+        async with app.run_test() as pilot:
+            await pilot.press("a", "ctrl+e", "escape")
+            await app.workers.wait_for_complete()
+            assert not [worker for worker in app.workers if worker.name == "export"]
+            assert not list(tmp_path.glob("*export*"))
+
+
+class TestImport:
+    @pytest.mark.asyncio
+    async def test_import_confirms_then_mounts_and_saves(self, app, tmp_path):
+        source = tmp_path / "in.jsonl"
+        source.write_text("\n".join(f'{{"title": "n{i}"}}' for i in range(10)))
+        async with app.run_test() as pilot:
+            await pilot.press("a")
+            await pilot.press("i")
+            app.screen.query_one("#prompt-input").value = str(source)
+            await pilot.press("enter")
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            assert type(app.screen).__name__ == "ConfirmScreen"
+            await pilot.press("enter")
+            await pilot.pause()
+            assert len(app._get_post_its()) == 9
+            assert [board["name"] for board in app._boards] == ["Main", "Main 2"]
+            assert not app._saver.dirty
+            stored = [n["title"] for n in load_notes(app._boards[1]["id"])]
+            assert stored == ["n8", "n9"]
+
+    @pytest.mark.asyncio
+    async def test_declined_import_changes_nothing(self, app, tmp_path):
+        source = tmp_path / "in.md"
+        source.write_text("## A\n## B\n")
+        async with app.run_test() as pilot:
+            await pilot.press("i")
+            app.screen.query_one("#prompt-input").value = str(source)
+            await pilot.press("enter")
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            await pilot.press("escape")
+            await pilot.pause()
+            assert len(app._get_post_its()) == 0
+
+
+class TestExternalChanges:
+    @pytest.fixture
+    def watched_app(self, tmp_path, monkeypatch):
+        from tui_notes import storage
+
+        monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+        monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+        storage.save_notes(
+            [
+                {"id": "a", "position": 0, "title": "A", "content": "", "color_index": 0},
+                {"id": "b", "position": 1, "title": "B", "content": "", "color_index": 1},
+            ]
+        )
+        return NotesApp()
+
+    @staticmethod
+    async def wait_until(pilot, condition):
+        for _ in range(100):
+            if condition():
+                return True
+            await pilot.pause(0.03)
+        return False
+
+    @pytest.mark.asyncio
+    async def test_external_edit_is_applied_in_place(self, watched_app):
+        from tui_notes import storage
+
+        app = watched_app
+        async with app.run_test() as pilot:
+            await self.wait_until(pilot, lambda: app._watcher is not None)
+            grid = app.query_one("#notes-grid")
+            before = list(grid.children)
+            await pilot.press("right", "m")
+            assert app.focused.note_id == "b"
+            storage.save_notes(
+                [
+                    {"id": "b", "position": 0, "title": "B", "content": "", "color_index": 1},
+                    {"id": "a", "position": 4, "title": "A2", "content": "", "color_index": 0},
+                ]
+            )
+            assert await self.wait_until(pilot, lambda: app._serialize_notes()[1]["title"] == "A2")
+            await pilot.pause()
+            assert [n["id"] for n in app._serialize_notes()] == ["b", "a"]
+            # The slots were rebound in place; nothing was remounted or moved.
+            assert list(grid.children) == before
+            assert app.focused.note_id == "b"
+            assert app.move_mode and app._moving_post_it.note_id == "b"
+            assert app._moving_post_it.has_class("moving")
+
+    @pytest.mark.asyncio
+    async def test_own_saves_do_not_reload(self, watched_app):
+        app = watched_app
+        async with app.run_test() as pilot:
+            await self.wait_until(pilot, lambda: app._watcher is not None)
+            reloads = []
+            app._reload_external = lambda: reloads.append(1)
+            await pilot.press("e", "x", "tab", "tab", "enter")
+            app.flush_saves()
+            await pilot.pause(0.4)
+            assert reloads == []
+
+
+class TestConflicts:
+    @pytest.fixture
+    def shared_app(self, tmp_path, monkeypatch):
+        from tui_notes import storage
+
+        monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+        monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+        storage.save_notes(
+            [
+                {"id": "a", "position": 0, "title": "A", "content": "", "color_index": 0},
+                {"id": "b", "position": 1, "title": "B", "content": "", "color_index": 1},
+            ]
+        )
+        return NotesApp(save_debounce=60.0, save_max_latency=60.0)
+
+    @staticmethod
+    def save_elsewhere(notes):
+        """Save as another program would, without this process's merge base."""
+        from tui_notes import storage
+
+        bases = dict(storage._bases)
+        storage._bases.clear()
+        try:
+            storage.save_notes(notes)
+        finally:
+            storage._bases.clear()
+            storage._bases.update(bases)
+
+    @staticmethod
+    def stored_titles(tmp_path):
+        """Read the file directly; load_notes would move this process's merge base."""
+        raw = json.loads((tmp_path / "notes.json").read_text(encoding="utf-8"))
+        return [n["title"] for n in raw["post_its"]]
+
+    @pytest.mark.asyncio
+    async def test_other_programs_note_is_merged_and_shown(self, shared_app, tmp_path):
+        app = shared_app
+        async with app.run_test() as pilot:
+            await TestExternalChanges.wait_until(pilot, lambda: app._watcher is not None)
+            await pilot.press("e", "x", "tab", "tab", "enter")
+            await pilot.pause()
+            self.save_elsewhere(
+                [
+                    {"id": "a", "position": 0, "title": "A", "content": "", "color_index": 0},
+                    {"id": "b", "position": 1, "title": "B", "content": "", "color_index": 1},
+                    {"id": "c", "position": 2, "title": "C", "content": "", "color_index": 2},
+                ]
+            )
+            app.flush_saves()
+            assert await TestExternalChanges.wait_until(
+                pilot, lambda: len(app._serialize_notes()) == 3
+            )
+            titles = self.stored_titles(tmp_path)
+            assert titles == ["x", "B", "C"]
+            assert [n["title"] for n in app._serialize_notes()] == titles
+
+    @pytest.mark.asyncio
+    async def test_conflicting_edit_asks_and_keeps_mine(self, shared_app, tmp_path):
+        from tui_notes.screens import ConflictScreen
+
+        app = shared_app
+        async with app.run_test() as pilot:
+            await TestExternalChanges.wait_until(pilot, lambda: app._watcher is not None)
+            await pilot.press("e", "x", "tab", "tab", "enter")
+            await pilot.pause()
+            self.save_elsewhere(
+                [
+                    {"id": "a", "position": 0, "title": "Theirs", "content": "", "color_index": 0},
+                    {"id": "b", "position": 1, "title": "B", "content": "", "color_index": 1},
+                ]
+            )
+            app.flush_saves()
+            await pilot.pause()
+            assert isinstance(app.screen, ConflictScreen)
+            assert self.stored_titles(tmp_path) == ["Theirs", "B"]
+            await pilot.click("#conflict-mine")
+            await pilot.pause()
+            assert not isinstance(app.screen, ConflictScreen)
+            assert self.stored_titles(tmp_path) == ["x", "B"]
+            assert [n["title"] for n in app._serialize_notes()] == ["x", "B"]
@@ -0,0 +1,138 @@
+"""Tests for the benchmark suites and their reports."""
+
+import json
+
+import pytest
+
+from benchmarks import interaction
+from benchmarks import storage as storage_bench
+from benchmarks.report import compare, load_report, new_report, write_report
+
+
+def report_with(seconds):
+    """Build a one-result report."""
+    report = new_report("test", {})
+    report["results"].append(
+        {"name": "save_notes", "engine": "json", "notes": 10, "seconds": seconds}
+    )
+    return report
+
+
+class TestSyntheticNotes:
+    def test_deterministic_and_valid(self):
+        notes = storage_bench.synthetic_notes(50)
+        assert notes == storage_bench.synthetic_notes(50)
+        assert len({note["id"] for note in notes}) == 50
+        assert any(not note["content"] for note in notes)
+        assert max(len(note["content"]) for note in notes) > 200
+
+
+class TestStorageSuite:
+    def test_small_run_writes_report(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "real"))
+        out = tmp_path / "results.json"
+        code = storage_bench.main(
+            ["--sizes", "5", "--engines", "json,sqlite", "--repeat", "1", "-o", str(out)]
+        )
+        assert code == 0
+        report = load_report(str(out))
+        rows = {(row["name"], row.get("engine")) for row in report["results"]}
+        assert ("save_notes", "sqlite") in rows
+        assert ("load_notes", "json") in rows
+        assert ("load_notes_daemon", "json") in rows
+        [synced] = [row for row in report["results"] if row["name"] == "sync_edit"]
+        assert 0 < synced["pushed_bytes"] < 2000
+        assert ("postit_from_dict", None) in rows
+        assert ("import_markdown", None) in rows
+        assert ("history_revision", None) in rows
+        [recorded] = [row for row in report["results"] if row["name"] == "history_record"]
+        assert recorded["stored_bytes"] < recorded["full_copy_bytes"] / 10
+        bursts = {row["name"]: row for row in report["results"] if row.get("engine") == "json"}
+        assert bursts["save_burst_none"]["fsyncs"] == 0
+        assert bursts["save_burst_strict"]["fsyncs"] > bursts["save_burst_batched"]["fsyncs"]
+        saves = [row for row in report["results"] if row["name"] == "save_notes"]
+        assert all(row["bytes_written"] > 0 for row in saves)
+        # The benchmark never writes to the configured data directory.
+        assert not (tmp_path / "real").exists()
+
+    def test_baseline_regression_sets_exit_code(self, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        report = storage_bench.run_suite([5], ["json"], 1)
+        for row in report["results"]:
+            row["seconds"] /= 1000
+        write_report(report, str(baseline))
+        code = storage_bench.main(
+            [
+                "--sizes",
+                "5",
+                "--engines",
+                "json",
+                "--repeat",
+                "1",
+                "-o",
+                str(tmp_path / "new.json"),
+                "--baseline",
+                str(baseline),
+            ]
+        )
+        assert code == 1
+
+
+class TestCompare:
+    def test_flags_slowdown_beyond_threshold(self):
+        rows = compare(report_with(0.2), report_with(0.1), threshold=0.25)
+        assert rows[0]["ratio"] == 2.0
+        assert rows[0]["regression"]
+
+    def test_ignores_noise_and_unmatched_results(self):
+        current = report_with(0.11)
+        current["results"].append({"name": "other", "notes": 10, "seconds": 5.0})
+        rows = compare(current, report_with(0.1), threshold=0.25)
+        assert len(rows) == 1
+        assert not rows[0]["regression"]
+
+    def test_report_round_trip(self, tmp_path):
+        path = tmp_path / "r.json"
+        write_report(report_with(0.1), str(path))
+        assert json.loads(path.read_text())["results"][0]["seconds"] == 0.1
+
+
+class TestInteraction:
+    def test_bundled_scripts_load(self):
+        for path in interaction.SCRIPTS_DIR.glob("*.json"):
+            assert interaction.load_script(path)
+
+    def test_bad_script_rejected(self, tmp_path):
+        path = tmp_path / "bad.json"
+        path.write_text('{"actions": [["move"]]}')
+        with pytest.raises(ValueError):
+            interaction.load_script(path)
+
+    def test_percentile_nearest_rank(self):
+        samples = [float(n) for n in range(1, 101)]
+        assert interaction.percentile(samples, 50) == 50.0
+        assert interaction.percentile(samples, 99) == 99.0
+        assert interaction.percentile([3.0], 95) == 3.0
+
+    def test_replay_reports_latency_and_saves(self, tmp_path):
+        script = tmp_path / "short.json"
+        script.write_text(
+            json.dumps(
+                {
+                    "description": "test",
+                    "actions": [
+                        ["add", "a"],
+                        ["move_start", "m"],
+                        ["move", "right"],
+                        ["move_end", "enter"],
+                    ],
+                }
+            )
+        )
+        out = tmp_path / "results.json"
+        code = interaction.main(["--script", str(script), "--fills", "2", "-o", str(out)])
+        assert code == 0
+        rows = {row["name"]: row for row in load_report(str(out))["results"]}
+        assert rows["short/move"]["count"] == 1
+        assert rows["short/add"]["p99_ms"] >= rows["short/add"]["p50_ms"] > 0
+        assert rows["short/total"]["saves"] >= 1
@@ -0,0 +1,272 @@
+"""Tests for the headless CLI subcommands."""
+
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from tui_notes.__main__ import main
+from tui_notes.search import SearchIndex
+from tui_notes.storage import load_boards, load_notes, save_boards
+
+
+@pytest.fixture
+def tmp_data_dir(tmp_path, monkeypatch):
+    """Override data dir to use a temporary directory."""
+    monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+    monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+    return tmp_path
+
+
+def run(argv, stdin=""):
+    """Run the CLI and return (exit code, stdout)."""
+    out = io.StringIO()
+    code = 0
+    old_stdin, old_stdout = sys.stdin, sys.stdout
+    sys.stdin, sys.stdout = io.StringIO(stdin), out
+    try:
+        main(argv)
+    except SystemExit as exc:
+        code = exc.code
+    finally:
+        sys.stdin, sys.stdout = old_stdin, old_stdout
+    return code, out.getvalue()
+
+
+class TestAdd:
+    def test_add_single_note(self, tmp_data_dir):
+        code, out = run(["add", "Hello", "-c", "World", "--json"])
+        assert code == 0
+        [note] = json.loads(out)
+        assert note["title"] == "Hello"
+        assert load_notes() == [
+            {
+                "position": 0,
+                "title": "Hello",
+                "content": "World",
+                "color_index": 0,
+                "id": note["id"],
+            }
+        ]
+
+    def test_add_batch_from_stdin(self, tmp_data_dir):
+        stdin = 'First\n\n{"title": "Second", "content": "body", "color_index": 4}\n'
+        code, _ = run(["add", "--stdin"], stdin)
+        assert code == 0
+        notes = load_notes()
+        assert [n["title"] for n in notes] == ["First", "Second"]
+        assert notes[1]["color_index"] == 4
+
+    def test_add_rejects_a_color_that_is_not_a_number(self, tmp_data_dir, capsys):
+        code, _ = run(["add", "--stdin"], 'ok\n{"title": "x", "color_index": "red"}\n')
+        assert code == 1
+        assert "line 2: color_index must be an integer, not 'red'" in capsys.readouterr().err
+        assert load_notes() == []
+
+    def test_add_fills_free_positions(self, tmp_data_dir):
+        run(["add", "A"])
+        run(["add", "B"])
+        code, out = run(["list", "--json"])
+        assert [n["position"] for n in json.loads(out)] == [0, 1]
+
+    def test_full_board_adds_nothing(self, tmp_data_dir):
+        code, _ = run(["add", "--stdin"], "".join(f"N{i}\n" for i in range(10)))
+        assert code == 1
+        assert load_notes() == []
+
+    def test_add_to_named_board(self, tmp_data_dir):
+        save_boards([{"id": "main", "name": "Main"}, {"id": "w1", "name": "Work"}])
+        code, _ = run(["add", "Task", "--board", "work"])
+        assert code == 0
+        assert load_notes("w1")[0]["title"] == "Task"
+
+    def test_unknown_board_fails(self, tmp_data_dir):
+        code, _ = run(["add", "Task", "--board", "nope"])
+        assert code == 1
+
+    def test_invalid_json_line_fails(self, tmp_data_dir):
+        code, _ = run(["add", "--stdin"], '{"title": \n')
+        assert code == 1
+        assert load_notes() == []
+
+
+class TestQueries:
+    def test_list_all_boards(self, tmp_data_dir):
+        save_boards([{"id": "main", "name": "Main"}, {"id": "w1", "name": "Work"}])
+        run(["add", "Home"])
+        run(["add", "Office", "-b", "w1"])
+        _, out = run(["list", "--all", "--json"])
+        assert [(n["board"], n["title"]) for n in json.loads(out)] == [
+            ("main", "Home"),
+            ("w1", "Office"),
+        ]
+
+    def test_show_by_id_prefix(self, tmp_data_dir):
+        _, out = run(["add", "Hello", "-c", "World", "--json"])
+        note_id = json.loads(out)[0]["id"]
+        code, out = run(["show", note_id[:6]])
+        assert code == 0
+        assert out == "Hello\n\nWorld\n"
+
+    def test_show_unknown_id_fails(self, tmp_data_dir):
+        code, _ = run(["show", "deadbeef"])
+        assert code == 1
+
+    def test_long_body_is_shown_and_exported_in_full(self, tmp_data_dir):
+        body = "word " * 5000
+        _, out = run(["add", "Long", "-c", body, "--json"])
+        note_id = json.loads(out)[0]["id"]
+        assert load_notes()[0]["blob"]
+        _, out = run(["show", note_id[:6], "--json"])
+        assert json.loads(out)[0]["content"] == body
+        _, out = run(["export", "--format", "jsonl"])
+        assert json.loads(out)["content"] == body
+        assert "blob" not in json.loads(out)
+
+    def test_unknown_export_format_is_rejected(self, tmp_data_dir, capsys):
+        code, _ = run(["export", "--format", "docx"])
+        assert code == 2
+        assert "choose from markdown" in capsys.readouterr().err
+
+    def test_gc_removes_unused_bodies(self, tmp_data_dir):
+        _, out = run(["add", "Long", "-c", "a" * 20_000, "--json"])
+        run(["rm", json.loads(out)[0]["id"]])
+        for blob in (tmp_data_dir / "blobs").glob("??/*"):
+            os.utime(blob, (0, 0))
+        _, out = run(["gc", "--json"])
+        assert json.loads(out) == {"removed": 1, "history_removed": 0, "feed_removed": 0}
+
+    def test_export_markdown(self, tmp_data_dir):
+        run(["add", "Hello", "-c", "World"])
+        _, out = run(["export"])
+        assert out.startswith("# TUI Notes Export\n")
+        assert "## Hello\n" in out
+
+    def test_export_json_to_file(self, tmp_data_dir):
+        run(["add", "Hello"])
+        target = tmp_data_dir / "out.json"
+        code, out = run(["export", "--format", "json", "-o", str(target)])
+        assert code == 0
+        assert out == ""
+        assert json.loads(target.read_text())[0]["title"] == "Hello"
+
+
+class TestImport:
+    def test_import_round_trips_markdown_export(self, tmp_data_dir):
+        run(["add", "--stdin"], "A\nB\n")
+        _, exported = run(["export"])
+        source = tmp_data_dir / "in.md"
+        source.write_text(exported, encoding="utf-8")
+        code, out = run(["import", str(source)])
+        assert code == 0
+        assert out.splitlines()[-1].startswith("Imported 2 notes from 1 file(s)")
+        assert [n["title"] for n in load_notes()] == ["A", "B", "A", "B"]
+
+    def test_dry_run_writes_nothing(self, tmp_data_dir):
+        source = tmp_data_dir / "in.jsonl"
+        source.write_text("\n".join(json.dumps({"title": f"n{i}"}) for i in range(12)))
+        code, out = run(["import", "-n", "--json", str(source)])
+        report = json.loads(out)
+        assert code == 0
+        assert report["dry_run"] is True
+        assert report["notes"] == 12
+        assert [board["added"] for board in report["boards"]] == [9, 3]
+        assert load_notes() == []
+        assert len(load_boards()) == 1
+
+    def test_overflow_creates_continuation_board(self, tmp_data_dir):
+        source = tmp_data_dir / "in.jsonl"
+        source.write_text("\n".join(json.dumps({"title": f"n{i}"}) for i in range(12)))
+        run(["import", str(source)])
+        boards = load_boards()
+        assert [board["name"] for board in boards] == ["Main", "Main 2"]
+        assert len(load_notes(boards[1]["id"])) == 3
+
+    def test_missing_file_fails(self, tmp_data_dir):
+        code, _ = run(["import", str(tmp_data_dir / "missing.md")])
+        assert code == 2
+
+
+class TestRemove:
+    def test_rm_ids_from_stdin(self, tmp_data_dir):
+        _, out = run(["add", "--stdin", "--json"], "A\nB\nC\n")
+        ids = [n["id"] for n in json.loads(out)]
+        code, _ = run(["rm", "--stdin"], f"{ids[0]}\n{ids[2]}\n")
+        assert code == 0
+        assert [n["title"] for n in load_notes()] == ["B"]
+
+    def test_rm_unknown_id_removes_nothing(self, tmp_data_dir):
+        _, out = run(["add", "A", "--json"])
+        note_id = json.loads(out)[0]["id"]
+        code, _ = run(["rm", note_id, "missing"])
+        assert code == 1
+        assert len(load_notes()) == 1
+
+
+class TestSearchIndexInvalidation:
+    def test_changed_boards_are_reindexed(self, tmp_data_dir):
+        index = SearchIndex()
+        index.sync_board("main", [])
+        index.save()
+        run(["add", "Hello"])
+        assert "main" not in SearchIndex.load().boards
+        assert not (tmp_data_dir / "search-index.stale").exists()
+
+
+class TestSync:
+    def test_sync_with_a_directory(self, tmp_data_dir, tmp_path):
+        run(["add", "Hello"])
+        shared = str(tmp_path / "shared")
+        code, out = run(["sync", shared, "--json"])
+        assert code == 0
+        assert json.loads(out)["pushed"] == 1
+        _, out = run(["--sync", shared, "sync"])
+        assert out == "Pulled 0 and pushed 0 changes, 0 in conflict\n"
+
+    def test_sync_without_a_target_fails(self, tmp_data_dir, monkeypatch):
+        monkeypatch.delenv("TUI_NOTES_SYNC", raising=False)
+        code, _ = run(["sync"])
+        assert code != 0
+
+
+class TestColdStart:
+    @staticmethod
+    def _loaded_by_list(tmp_path, modules):
+        code = (
+            "import sys\n"
+            "from tui_notes.__main__ import main\n"
+            "try:\n"
+            "    main(['list'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "loaded = [m for m in sys.modules if m.split('.')[0] == 'textual'\n"
+            f"          or m in {modules!r}]\n"
+            "print(loaded)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            env={"XDG_CONFIG_HOME": str(tmp_path), "PATH": ""},
+            cwd=Path(__file__).resolve().parent.parent,
+            check=True,
+        )
+        return result.stdout.strip().splitlines()[-1]
+
+    def test_subcommands_do_not_import_textual(self, tmp_path):
+        modules = ("tui_notes.app", "tui_notes.screens", "tui_notes.widgets")
+        assert self._loaded_by_list(tmp_path, modules) == "[]"
+
+    def test_daemon_is_not_imported_when_none_is_running(self, tmp_path):
+        assert self._loaded_by_list(tmp_path, ("tui_notes.daemon",)) == "[]"
+
+    def test_sync_is_not_imported_by_local_subcommands(self, tmp_path):
+        assert self._loaded_by_list(tmp_path, ("tui_notes.sync",)) == "[]"
+
+    def test_feature_modules_are_not_imported_by_list(self, tmp_path):
+        modules = ("tui_notes.export", "tui_notes.history", "tui_notes.importer")
+        assert self._loaded_by_list(tmp_path, modules) == "[]"
@@ -0,0 +1,134 @@
+"""Tests for the notes daemon and the storage facade attached to it."""
+
+import threading
+
+import pytest
+
+from tui_notes import storage
+from tui_notes.__main__ import main
+from tui_notes.app import NotesApp
+from tui_notes.daemon import DaemonClient, NotesDaemon, attach
+from tui_notes.storage import ConflictError, get_daemon, load_boards, load_notes, save_notes
+
+
+def _note(note_id, position, title="T", content=""):
+    return {
+        "id": note_id,
+        "position": position,
+        "title": title,
+        "content": content,
+        "color_index": 0,
+    }
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    """Run a daemon over a temporary data directory."""
+    monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+    monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+    server = NotesDaemon(tmp_path / "d.sock")
+    server.start()
+    yield server
+    server.stop()
+    storage.close_storage()
+
+
+@pytest.fixture
+def clients(daemon):
+    """Connect two clients to the daemon."""
+    connected = [DaemonClient.connect(daemon.path) for _ in range(2)]
+    yield connected
+    for client in connected:
+        client.close()
+
+
+class TestProtocol:
+    def test_saved_notes_are_served_to_other_clients_and_written(self, daemon, clients):
+        first, second = clients
+        first.call("save", board="main", notes=[_note("a", 0, "A")])
+        assert second.call("load", board="main") == [_note("a", 0, "A")]
+        daemon.stop()
+        assert load_notes() == [_note("a", 0, "A")]
+
+    def test_other_clients_are_notified(self, clients):
+        first, second = clients
+        events = []
+        received = threading.Event()
+        second.subscribe(lambda event: (events.append(event), received.set()))
+        first.call("save", board="work", notes=[_note("a", 0)])
+        assert received.wait(2)
+        assert events == [{"event": "changed", "board": "work"}]
+
+    def test_concurrent_edits_of_different_notes_are_merged(self, clients):
+        first, second = clients
+        first.call("save", board="main", notes=[_note("a", 0, "A"), _note("b", 1, "B")])
+        second.call("load", board="main")
+        first.call("save", board="main", notes=[_note("a", 0, "A2"), _note("b", 1, "B")])
+        saved = second.call("save", board="main", notes=[_note("a", 0, "A"), _note("b", 1, "B2")])
+        assert [note["title"] for note in saved] == ["A2", "B2"]
+
+    def test_concurrent_edits_of_one_note_conflict(self, clients):
+        first, second = clients
+        first.call("save", board="main", notes=[_note("a", 0, "A")])
+        second.call("load", board="main")
+        first.call("save", board="main", notes=[_note("a", 0, "mine")])
+        with pytest.raises(ConflictError):
+            second.call("save", board="main", notes=[_note("a", 0, "theirs")])
+        saved = second.call("save", board="main", notes=[_note("a", 0, "theirs")], prefer="mine")
+        assert saved[0]["title"] == "theirs"
+
+    def test_unknown_ops_are_rejected(self, clients):
+        with pytest.raises(ValueError):
+            clients[0].call("format_disk")
+
+    def test_a_second_daemon_refuses_the_socket(self, daemon):
+        with pytest.raises(OSError):
+            NotesDaemon(daemon.path).start()
+
+
+class TestAttachedStorage:
+    def test_facade_goes_through_the_daemon(self, daemon):
+        assert attach(daemon.path)
+        save_notes([_note("a", 0, "A")], "work")
+        storage.save_boards([{"id": "work", "name": "Work"}])
+        assert get_daemon() is not None
+        assert load_notes("work") == [_note("a", 0, "A")]
+        assert load_boards() == [{"id": "work", "name": "Work"}]
+
+    def test_facade_falls_back_to_the_files_when_the_daemon_stops(self, daemon):
+        assert attach(daemon.path)
+        save_notes([_note("a", 0, "A")])
+        daemon.stop()
+        assert load_notes() == [_note("a", 0, "A")]
+        assert get_daemon() is None
+
+    def test_subcommands_attach_to_the_socket_in_the_environment(self, daemon, monkeypatch):
+        monkeypatch.setenv("TUI_NOTES_SOCKET", str(daemon.path))
+        with pytest.raises(SystemExit):
+            main(["add", "from the cli"])
+        assert get_daemon() is not None
+        assert [note["title"] for note in load_notes()] == ["from the cli"]
+
+    def test_attach_without_a_daemon(self, tmp_path):
+        assert not attach(tmp_path / "none.sock")
+        assert get_daemon() is None
+
+
+class TestAttachedApp:
+    @pytest.mark.asyncio
+    async def test_another_clients_save_is_shown(self, daemon, clients):
+        clients[0].call("save", board="main", notes=[_note("a", 0, "A")])
+        assert attach(daemon.path)
+        app = NotesApp()
+        async with app.run_test() as pilot:
+            for _ in range(100):
+                if get_daemon()._listeners:
+                    break
+                await pilot.pause(0.03)
+            assert app._watcher is None
+            clients[0].call("save", board="main", notes=[_note("a", 0, "A2")])
+            for _ in range(100):
+                if app._serialize_notes()[0]["title"] == "A2":
+                    break
+                await pilot.pause(0.03)
+            assert app._serialize_notes()[0]["title"] == "A2"
@@ -0,0 +1,107 @@
+"""Tests for draft checkpoints and their recovery."""
+
+import json
+import os
+
+import pytest
+
+from tui_notes.drafts import DraftStore, restore_draft
+from tui_notes.storage import load_notes, save_notes
+
+BOARDS = [{"id": "main", "name": "Main"}]
+
+
+def _note(note_id, position, title="T", content=""):
+    return {
+        "id": note_id,
+        "position": position,
+        "title": title,
+        "content": content,
+        "color_index": 0,
+    }
+
+
+@pytest.fixture
+def tmp_data_dir(tmp_path, monkeypatch):
+    """Override data dir to use a temporary directory."""
+    monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+    monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+    return tmp_path
+
+
+class TestDraftStore:
+    def test_checkpoints_write_only_what_changed(self, tmp_path):
+        store = DraftStore(tmp_path / "drafts.jsonl")
+        body = "x" * 100_000
+        assert store.checkpoint("d", "main", "a", "Title", body)
+        first = store.path.stat().st_size
+        assert store.checkpoint("d", "main", "a", "Title", body[:500] + "typed" + body[500:])
+        assert store.path.stat().st_size - first < 200
+        assert not store.checkpoint("d", "main", "a", "Title", body[:500] + "typed" + body[500:])
+
+    def test_open_drafts_are_offered_to_the_next_session(self, tmp_path):
+        store = DraftStore(tmp_path / "drafts.jsonl")
+        store.checkpoint("d", "main", "a", "Title", "Hello")
+        store.checkpoint("d", "main", "a", "Title!", "Hello, world")
+        store.checkpoint("e", "main", "b", "Saved", "")
+        store.discard("e")
+        [draft] = DraftStore(store.path).load()
+        assert (draft["id"], draft["note"], draft["title"], draft["content"]) == (
+            "d",
+            "a",
+            "Title!",
+            "Hello, world",
+        )
+        # The session that wrote them does not offer its own drafts.
+        assert store.load() == []
+
+    def test_late_checkpoint_does_not_reopen(self, tmp_path):
+        store = DraftStore(tmp_path / "drafts.jsonl")
+        store.checkpoint("d", "main", "a", "T", "one")
+        store.discard("d")
+        assert not store.checkpoint("d", "main", "a", "T", "two")
+        assert DraftStore(store.path).load() == []
+
+    def test_torn_record_keeps_last_consistent_state(self, tmp_path):
+        store = DraftStore(tmp_path / "drafts.jsonl")
+        store.checkpoint("d", "main", "a", "T", "one")
+        store.checkpoint("d", "main", "a", "T", "one two")
+        with store.path.open("r+b") as fh:
+            fh.truncate(store.path.stat().st_size - 5)
+        store.checkpoint("d", "main", "a", "T", "one two three")
+        [draft] = DraftStore(store.path).load()
+        assert draft["content"] == "one"
+
+    def test_drafts_of_running_instances_are_not_offered(self, tmp_path):
+        path = tmp_path / "drafts.jsonl"
+        record = {"op": "open", "id": "d", "board": "main", "note": "a", "title": "T"}
+        record.update(content="", time=0.0, pid=os.getppid())
+        path.write_text(json.dumps(record) + "\n")
+        assert DraftStore(path).load() == []
+
+    def test_compaction_keeps_open_drafts(self, tmp_path):
+        store = DraftStore(tmp_path / "drafts.jsonl", max_bytes=2000)
+        store.checkpoint("d", "main", "a", "T", "")
+        for i in range(100):
+            store.checkpoint("d", "main", "a", "T", f"edit {i}")
+        assert store.path.stat().st_size < 2000
+        [draft] = DraftStore(store.path).load()
+        assert draft["content"] == "edit 99"
+
+
+class TestRestoreDraft:
+    def test_restores_into_its_note(self, tmp_data_dir):
+        save_notes([_note("a", 0, "Old", "old body")])
+        restore_draft({"board": "main", "note": "a", "title": "New", "content": "new"}, BOARDS)
+        assert load_notes() == [_note("a", 0, "New", "new")]
+
+    def test_deleted_note_comes_back_in_a_free_slot(self, tmp_data_dir):
+        save_notes([_note("b", 0)])
+        draft = {"board": "gone", "note": "a", "title": "Back", "content": ""}
+        assert restore_draft(draft, BOARDS) == "main"
+        assert [(n["id"], n["position"]) for n in load_notes()] == [("b", 0), ("a", 1)]
+
+    def test_full_board_is_an_error(self, tmp_data_dir):
+        save_notes([_note(str(i), i) for i in range(9)])
+        with pytest.raises(ValueError):
+            restore_draft({"board": "main", "note": "a", "title": "T", "content": ""}, BOARDS)
@@ -0,0 +1,83 @@
+"""Tests for the durability modes of the storage layer."""
+
+import time
+
+import pytest
+
+from tui_notes import storage
+from tui_notes.durability import SyncPolicy
+from tui_notes.sqlite_store import SqliteStore
+from tui_notes.storage import get_durability, get_sync_policy, save_notes, set_durability
+
+
+def _note(note_id, position, title="T"):
+    return {"id": note_id, "position": position, "title": title, "content": "", "color_index": 0}
+
+
+@pytest.fixture
+def fsyncs(tmp_path, monkeypatch):
+    """Isolated storage; returns the list of file descriptors fsynced."""
+    monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+    monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+    get_sync_policy().flush()  # what earlier tests left pending
+    synced = []
+    monkeypatch.setattr("tui_notes.durability.os.fsync", synced.append)
+    previous = get_durability()
+    yield synced
+    set_durability(previous)
+
+
+class TestModes:
+    def test_none_never_syncs(self, fsyncs):
+        set_durability("none")
+        save_notes([_note("a", 0)])
+        get_sync_policy().flush()
+        assert fsyncs == []
+
+    def test_strict_syncs_file_and_directory_per_save(self, fsyncs):
+        set_durability("strict")
+        save_notes([_note("a", 0)])
+        assert len(fsyncs) == 2
+        save_notes([_note("a", 0, "Edited")])
+        assert len(fsyncs) == 4
+
+    def test_batched_defers_and_coalesces(self, fsyncs, tmp_path):
+        set_durability("batched")
+        policy = get_sync_policy()
+        for title in ("One", "Two", "Three"):
+            save_notes([_note("a", 0, title)])
+        assert fsyncs == []
+        policy.flush()
+        # notes.json and its directory, once for all three saves.
+        assert len(fsyncs) == 2
+
+    def test_batched_syncs_after_the_interval(self, tmp_path, monkeypatch):
+        synced = []
+        monkeypatch.setattr("tui_notes.durability.os.fsync", synced.append)
+        policy = SyncPolicy("batched", interval=0.05)
+        policy.committed(tmp_path)
+        assert synced == []
+        time.sleep(0.3)
+        assert synced
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            set_durability("paranoid")
+
+    def test_close_storage_flushes(self, fsyncs):
+        set_durability("batched")
+        save_notes([_note("a", 0)])
+        storage.close_storage()
+        assert len(fsyncs) == 2
+
+
+class TestSqlite:
+    def test_synchronous_follows_mode(self, fsyncs, tmp_path):
+        store = SqliteStore(tmp_path / "notes.db")
+        levels = {}
+        for mode in ("none", "strict", "batched"):
+            set_durability(mode)
+            store.save([_note("a", 0, mode)])
+            levels[mode] = store._connect().execute("PRAGMA synchronous").fetchone()[0]
+        store.close()
+        assert levels == {"none": 0, "batched": 1, "strict": 2}
@@ -0,0 +1,118 @@
+"""Tests for streaming export."""
+
+import io
+import json
+
+import pytest
+
+from tui_notes.export import (
+    ExportCancelled,
+    available_export_formats,
+    export_to_file,
+    format_for_path,
+    get_export_format,
+    write_export,
+)
+
+BOARDS = [{"id": "main", "name": "Main"}, {"id": "work", "name": "Work"}]
+NOTES = {
+    "main": [
+        {"id": "b", "title": "Second", "content": "", "color_index": 1, "position": 4},
+        {"id": "a", "title": "First", "content": "body", "color_index": 0, "position": 0},
+    ],
+    "work": [
+        {"id": "c", "title": "<b>Tag</b>", "content": "a & b", "color_index": 8, "position": 2}
+    ],
+}
+
+
+def export(fmt, boards=BOARDS):
+    out = io.StringIO()
+    written = write_export(out, fmt, boards, lambda board: NOTES[board])
+    return written, out.getvalue()
+
+
+class TestFormats:
+    def test_available_formats(self):
+        assert available_export_formats() == ["markdown", "json", "jsonl", "html"]
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            get_export_format("pdf")
+
+    def test_markdown_single_board_has_no_board_heading(self):
+        written, text = export("markdown", BOARDS[:1])
+        assert written == 2
+        assert text == "# TUI Notes Export\n\n## First\n\nbody\n\n## Second\n"
+
+    def test_markdown_all_boards_has_board_headings(self):
+        _, text = export("markdown")
+        assert "\n# Main\n" in text
+        assert "\n# Work\n" in text
+
+    def test_json_is_an_array_in_position_order(self):
+        written, text = export("json")
+        notes = json.loads(text)
+        assert written == 3
+        assert [note["id"] for note in notes] == ["a", "b", "c"]
+        assert notes[2]["board"] == "work"
+
+    def test_json_empty(self):
+        _, text = export("json", [])
+        assert json.loads(text) == []
+
+    def test_jsonl_one_object_per_line(self):
+        _, text = export("jsonl")
+        lines = text.splitlines()
+        assert len(lines) == 3
+        assert json.loads(lines[0])["title"] == "First"
+
+    def test_html_escapes_and_wraps_colors(self):
+        _, text = export("html")
+        assert "&lt;b&gt;Tag&lt;/b&gt;" in text
+        assert "a &amp; b" in text
+        assert 'class="note c2"' in text
+        assert text.count('<section class="board">') == text.count("</section>") == 2
+
+    @pytest.mark.parametrize(
+        "name, fmt",
+        [("a.md", "markdown"), ("a.JSON", "json"), ("a.ndjson", "jsonl"), ("a.htm", "html")],
+    )
+    def test_format_for_path(self, name, fmt):
+        assert format_for_path(name) == fmt
+
+    def test_format_for_unknown_path(self):
+        assert format_for_path("notes.txt") == "markdown"
+
+
+class TestStreaming:
+    def test_loads_one_board_at_a_time(self):
+        loaded = []
+
+        def load(board):
+            loaded.append(board)
+            return NOTES[board]
+
+        progress = []
+        write_export(
+            io.StringIO(), "jsonl", BOARDS, load, progress=lambda *args: progress.append(args)
+        )
+        assert loaded == ["main", "work"]
+        assert progress == [(1, 2, 2), (2, 2, 3)]
+
+    def test_export_to_file(self, tmp_path):
+        target = tmp_path / "out.json"
+        written = export_to_file(target, "json", BOARDS, lambda board: NOTES[board])
+        assert written == 3
+        assert len(json.loads(target.read_text(encoding="utf-8"))) == 3
+        assert list(tmp_path.iterdir()) == [target]
+
+    def test_cancel_leaves_target_untouched(self, tmp_path):
+        target = tmp_path / "out.md"
+        target.write_text("old", encoding="utf-8")
+        with pytest.raises(ExportCancelled):
+            export_to_file(
+                target, "markdown", BOARDS, lambda board: NOTES[board], cancelled=lambda: True
+            )
+        assert target.read_text(encoding="utf-8") == "old"
+        assert list(tmp_path.iterdir()) == [target]
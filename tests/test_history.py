@@ -0,0 +1,117 @@
+"""Tests for the per-note revision history."""
+
+import os
+import time
+
+import pytest
+
+from tui_notes.history import COLD_SUFFIX, HOT_SEGMENT, NoteHistory
+from tui_notes.storage import save_notes, split_body
+
+
+def _note(note_id, position, title="T", content=""):
+    return {
+        "id": note_id,
+        "position": position,
+        "title": title,
+        "content": content,
+        "color_index": 0,
+    }
+
+
+@pytest.fixture
+def tmp_data_dir(tmp_path, monkeypatch):
+    """Override data dir to use a temporary directory."""
+    monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+    monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+    return tmp_path
+
+
+class TestRecord:
+    def test_only_changed_notes_get_revisions(self, tmp_data_dir):
+        history = NoteHistory()
+        board = [_note("a", 0, "A"), _note("b", 1, "B")]
+        assert history.record("main", board) == 2
+        assert history.record("main", board) == 0
+        board[1] = _note("b", 1, "B", "body")
+        assert history.record("main", board) == 1
+        assert [r["rev"] for r in history.revisions("main", "b")] == [2, 1]
+        assert [r["rev"] for r in history.revisions("main", "a")] == [1]
+
+    def test_edits_of_a_long_note_store_only_the_changed_span(self, tmp_data_dir):
+        history = NoteHistory()
+        body = "lorem ipsum " * 1000
+        history.record("main", [_note("a", 0, content=body)])
+        hot = tmp_data_dir / "history" / "main" / "a" / HOT_SEGMENT
+        first = hot.stat().st_size
+        history.record("main", [_note("a", 0, content=body[:6000] + "typed" + body[6000:])])
+        assert hot.stat().st_size - first < 200
+
+    def test_every_revision_is_reconstructed(self, tmp_data_dir):
+        history = NoteHistory(keyframe_interval=4)
+        bodies = [f"{'x' * 50}{i}{'y' * i}" for i in range(11)]
+        for i, body in enumerate(bodies):
+            history.record("main", [_note("a", 0, f"Title {i}", body)])
+        listed = history.revisions("main", "a")
+        assert [r["rev"] for r in listed] == list(range(11, 0, -1))
+        for i, body in enumerate(bodies):
+            revision = history.revision("main", "a", i + 1)
+            assert (revision["title"], revision["content"]) == (f"Title {i}", body)
+        with pytest.raises(ValueError):
+            history.revision("main", "a", 12)
+
+    def test_full_segments_are_compressed(self, tmp_data_dir):
+        history = NoteHistory(keyframe_interval=4)
+        for i in range(9):
+            history.record("main", [_note("a", 0, content="word " * 500 + str(i))])
+        note_dir = tmp_data_dir / "history" / "main" / "a"
+        cold = sorted(path.name for path in note_dir.glob(f"*{COLD_SUFFIX}"))
+        assert cold == [f"00000001{COLD_SUFFIX}", f"00000005{COLD_SUFFIX}"]
+        assert all(path.stat().st_size < 1000 for path in note_dir.glob(f"*{COLD_SUFFIX}"))
+
+    def test_out_of_line_bodies_are_recorded_in_full(self, tmp_data_dir):
+        history = NoteHistory()
+        body = "z" * 20_000
+        content, blob = split_body(body)
+        history.record("main", [{**_note("a", 0, content=content), "blob": blob}])
+        assert history.revision("main", "a", 1)["content"] == body
+
+    def test_another_instance_continues_the_history(self, tmp_data_dir):
+        NoteHistory().record("main", [_note("a", 0, content="one")])
+        other = NoteHistory()
+        other.record("main", [_note("a", 0, content="one")])
+        other.record("main", [_note("a", 0, content="two")])
+        assert [r["rev"] for r in other.revisions("main", "a")] == [2, 1]
+
+    def test_torn_last_record_is_dropped(self, tmp_data_dir):
+        history = NoteHistory()
+        history.record("main", [_note("a", 0, content="one")])
+        history.record("main", [_note("a", 0, content="one two")])
+        hot = tmp_data_dir / "history" / "main" / "a" / HOT_SEGMENT
+        hot.write_bytes(hot.read_bytes()[:-10])
+        restarted = NoteHistory()
+        assert [r["rev"] for r in restarted.revisions("main", "a")] == [1]
+        restarted.record("main", [_note("a", 0, content="three")])
+        assert restarted.revision("main", "a", 2)["content"] == "three"
+        assert restarted.revision("main", "a", 1)["content"] == "one"
+
+
+class TestRetention:
+    def test_revisions_beyond_the_limit_are_deleted(self, tmp_data_dir):
+        history = NoteHistory(keyframe_interval=4, max_revisions=8)
+        for i in range(30):
+            history.record("main", [_note("a", 0, content=str(i))])
+        revs = [r["rev"] for r in history.revisions("main", "a")]
+        assert revs[0] == 30
+        assert 8 <= len(revs) < 8 + 4
+        assert history.revision("main", "a", revs[-1])["content"] == str(revs[-1] - 1)
+
+    def test_prune_deletes_history_of_long_deleted_notes(self, tmp_data_dir):
+        history = NoteHistory(max_age=60)
+        save_notes([_note("kept", 0)])
+        history.record("main", [_note("kept", 0), _note("gone", 1)])
+        for path in (tmp_data_dir / "history" / "main").rglob("*"):
+            os.utime(path, (time.time() - 120,) * 2)
+        assert history.prune() == 1
+        assert not (tmp_data_dir / "history" / "main" / "gone").exists()
+        assert history.revisions("main", "kept")
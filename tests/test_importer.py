@@ -0,0 +1,109 @@
+"""Tests for bulk import."""
+
+import io
+import json
+
+from tui_notes.export import write_export
+from tui_notes.importer import commit_import, import_files, parse_markdown, plan_import
+
+
+def parse(text, name="doc"):
+    return list(parse_markdown(io.StringIO(text), name))
+
+
+class TestParseMarkdown:
+    def test_level_two_headings_under_board_headings(self):
+        entries = parse("# TUI Notes Export\n\n# Work\n\n## A\n\nbody\n\n## B\n\n# Home\n\n## C\n")
+        assert entries == [
+            {"title": "A", "content": "body", "board": "Work"},
+            {"title": "B", "content": "", "board": "Work"},
+            {"title": "C", "content": "", "board": "Home"},
+        ]
+
+    def test_level_one_headings_without_subheadings_are_notes(self):
+        entries = parse("# One\nfirst\n# Two\nsecond\n")
+        assert [(e["title"], e["content"], e["board"]) for e in entries] == [
+            ("One", "first", None),
+            ("Two", "second", None),
+        ]
+
+    def test_document_without_headings_is_one_note(self):
+        assert parse("just text\n", "memo") == [
+            {"title": "memo", "content": "just text", "board": None}
+        ]
+
+    def test_headings_in_fenced_code_are_content(self):
+        entries = parse("## Script\n```\n# comment\n```\n")
+        assert len(entries) == 1
+        assert "# comment" in entries[0]["content"]
+
+    def test_reads_markdown_export_back(self):
+        boards = [{"id": "main", "name": "Main"}, {"id": "work", "name": "Work"}]
+        notes = {
+            "main": [{"title": "A", "content": "x\n\ny", "color_index": 0, "position": 0}],
+            "work": [{"title": "B", "content": "", "color_index": 1, "position": 3}],
+        }
+        out = io.StringIO()
+        write_export(out, "markdown", boards, lambda board: notes[board])
+        entries = parse(out.getvalue())
+        assert [(e["board"], e["title"], e["content"]) for e in entries] == [
+            ("Main", "A", "x\n\ny"),
+            ("Work", "B", ""),
+        ]
+
+
+class TestPlan:
+    BOARDS = [{"id": "main", "name": "Main"}]
+
+    def test_fills_free_slots_and_spills_over(self, tmp_path):
+        source = tmp_path / "in.jsonl"
+        source.write_text("\n".join(json.dumps({"title": f"n{i}"}) for i in range(20)))
+        existing = [{"id": "x", "title": "X", "content": "", "color_index": 0, "position": 4}]
+        plan = plan_import([source], self.BOARDS, lambda board: existing)
+        assert plan.count == 20
+        assert [board["name"] for board in plan.boards] == ["Main", "Main 2", "Main 3"]
+        assert [note["position"] for note in plan.added["main"]] == [0, 1, 2, 3, 5, 6, 7, 8]
+        assert [len(notes) for notes in plan.added.values()] == [8, 9, 3]
+
+    def test_invalid_entries_are_skipped(self, tmp_path):
+        source = tmp_path / "in.jsonl"
+        source.write_text(
+            '{"title": "ok"}\n{"title": ""}\n{"title": "c", "color_index": "x"}\n[1]\n'
+        )
+        plan = plan_import([source], self.BOARDS, lambda board: [])
+        assert plan.count == 1
+        assert len(plan.errors) == 3
+
+    def test_directories_map_to_boards(self, tmp_path):
+        (tmp_path / "Projects").mkdir()
+        (tmp_path / ".hidden").mkdir()
+        (tmp_path / "top.md").write_text("## Top\n")
+        (tmp_path / "Projects" / "p.md").write_text("## P\n")
+        (tmp_path / ".hidden" / "h.md").write_text("## H\n")
+        (tmp_path / "skip.txt").write_text("## S\n")
+        assert [(p.name, board) for p, board in import_files([tmp_path])] == [
+            ("top.md", None),
+            ("p.md", "Projects"),
+        ]
+        plan = plan_import([tmp_path], self.BOARDS, lambda board: [])
+        names = {board["id"]: board["name"] for board in plan.boards}
+        assert {names[b]: [n["title"] for n in notes] for b, notes in plan.added.items()} == {
+            "Main": ["Top"],
+            "Projects": ["P"],
+        }
+
+    def test_commit_writes_each_board_once_then_index(self, tmp_path):
+        source = tmp_path / "in.jsonl"
+        source.write_text("\n".join(json.dumps({"title": f"n{i}"}) for i in range(10)))
+        plan = plan_import([source], self.BOARDS, lambda board: [])
+        calls = []
+        commit_import(
+            plan,
+            lambda notes, board: calls.append(("notes", board, len(notes))),
+            lambda boards: calls.append(("boards", len(boards))),
+        )
+        assert calls == [
+            ("notes", "main", 9),
+            ("notes", plan.new_boards[0]["id"], 1),
+            ("boards", 2),
+        ]
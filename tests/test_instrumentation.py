@@ -0,0 +1,107 @@
+"""Tests for the performance instrumentation layer."""
+
+import pytest
+
+from tui_notes import instrumentation
+from tui_notes.instrumentation import Histogram, Metrics, timed
+
+
+@pytest.fixture(autouse=True)
+def reset_instrumentation():
+    """Leave instrumentation disabled for the next test."""
+    instrumentation.disable()
+    yield
+    instrumentation.disable()
+
+
+class TestHistogram:
+    def test_percentiles_track_bucket_bounds(self):
+        histogram = Histogram()
+        for _ in range(99):
+            histogram.observe(0.001)
+        histogram.observe(0.5)
+        assert histogram.count == 100
+        assert 0.001 <= histogram.percentile(50) < 0.002
+        assert histogram.percentile(100) == 0.5
+        assert histogram.max == 0.5
+        assert histogram.last == 0.5
+
+    def test_empty(self):
+        assert Histogram().percentile(95) == 0.0
+        assert Histogram().as_dict()["count"] == 0
+
+    def test_percentile_never_exceeds_max(self):
+        histogram = Histogram()
+        histogram.observe(0.0003)
+        assert histogram.percentile(99) == 0.0003
+
+
+class TestTimed:
+    def test_disabled_is_a_pass_through(self):
+        calls = []
+
+        @timed("work")
+        def work(value):
+            calls.append(value)
+            return value * 2
+
+        assert work(21) == 42
+        assert calls == [21]
+        assert instrumentation.active() is None
+
+    def test_enabled_records_calls_and_errors(self):
+        metrics = instrumentation.enable()
+
+        @timed("work")
+        def work(fail=False):
+            if fail:
+                raise ValueError("boom")
+
+        work()
+        with pytest.raises(ValueError):
+            work(fail=True)
+        assert metrics.histogram("work").count == 2
+
+    def test_keeps_signature_for_handlers(self):
+        import inspect
+
+        @timed("handler")
+        def handler(self, event):
+            pass
+
+        assert list(inspect.signature(handler).parameters) == ["self", "event"]
+
+
+class TestMetrics:
+    def test_counters_and_summary(self):
+        metrics = Metrics()
+        metrics.count("mount.PostIt", 3)
+        metrics.observe("storage.save_notes", 0.002)
+        data = metrics.as_dict()
+        assert data["counters"] == {"mount.PostIt": 3}
+        assert data["timings"]["storage.save_notes"]["count"] == 1
+        assert "storage.save_notes" in metrics.format()
+
+    def test_storage_calls_are_timed(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+        monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+        from tui_notes.storage import load_notes, save_notes
+
+        metrics = instrumentation.enable()
+        save_notes([{"position": 0, "title": "A", "content": "", "color_index": 0}])
+        load_notes()
+        assert metrics.histogram("storage.save_notes").count == 1
+        assert metrics.histogram("storage.load_notes").count == 1
+
+    @pytest.mark.asyncio
+    async def test_saver_writes_are_timed(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+        monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+        from tui_notes.app import NotesApp
+
+        metrics = instrumentation.enable()
+        app = NotesApp(save_debounce=60.0, save_max_latency=60.0)
+        async with app.run_test() as pilot:
+            await pilot.press("a", "ctrl+s")
+        assert metrics.histogram("saver.write").count == 1
+        assert "app.save_to_disk" not in metrics.as_dict()["timings"]
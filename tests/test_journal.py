@@ -0,0 +1,159 @@
+"""Tests for the journal storage engine."""
+
+import json
+
+import pytest
+
+from tui_notes.changes import diff_notes
+from tui_notes.journal import BoardJournal, JournalStore
+from tui_notes.storage import (
+    load_notes,
+    read_body,
+    save_notes,
+    set_storage_engine,
+    watch_paths,
+)
+
+
+def _note(note_id, position, title="T", content="", color_index=0):
+    return {
+        "id": note_id,
+        "position": position,
+        "title": title,
+        "content": content,
+        "color_index": color_index,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Board journal in a temporary directory."""
+    return BoardJournal(tmp_path / "notes.json", tmp_path / "notes.journal")
+
+
+def _records(store):
+    lines = store.journal_file.read_text(encoding="utf-8").splitlines()
+    return [json.loads(line) for line in lines]
+
+
+class TestDiffNotes:
+    def test_title_change_is_single_edit(self):
+        old = {"a": _note("a", 0, title="Old", content="Long body")}
+        records = diff_notes(old, [_note("a", 0, title="New", content="Long body")])
+        assert records == [{"op": "edit", "id": "a", "title": "New"}]
+
+    def test_position_change_is_move(self):
+        old = {"a": _note("a", 0)}
+        assert diff_notes(old, [_note("a", 4)]) == [{"op": "move", "id": "a", "position": 4}]
+
+    def test_missing_note_is_delete(self):
+        old = {"a": _note("a", 0), "b": _note("b", 1)}
+        assert diff_notes(old, [_note("a", 0)]) == [{"op": "delete", "id": "b"}]
+
+
+class TestBoardJournal:
+    def test_save_appends_only_changes(self, store):
+        store.save([_note("a", 0), _note("b", 1)])
+        store.save([_note("a", 0), _note("b", 1, color_index=3)])
+        ops = [record["op"] for record in _records(store)]
+        assert ops == ["add", "add", "recolor"]
+        assert not store.snapshot_file.exists()
+
+    def test_load_replays_snapshot_and_tail(self, store, tmp_path):
+        store.save([_note("a", 0, title="First"), _note("b", 1)])
+        store.save([_note("a", 2, title="Moved"), _note("b", 1)])
+        reopened = BoardJournal(store.snapshot_file, store.journal_file)
+        loaded = reopened.load()
+        assert [(n["id"], n["position"], n["title"]) for n in loaded] == [
+            ("b", 1, "T"),
+            ("a", 2, "Moved"),
+        ]
+
+    def test_compaction_folds_journal_into_snapshot(self, tmp_path):
+        store = BoardJournal(tmp_path / "notes.json", tmp_path / "notes.journal", max_records=3)
+        store.save([_note("a", 0), _note("b", 1)])
+        assert not store.needs_compaction
+        store.save([_note("a", 0, title="X"), _note("b", 1)])
+        assert store.needs_compaction
+        store.compact()
+        assert not store.journal_file.exists()
+        data = json.loads(store.snapshot_file.read_text(encoding="utf-8"))
+        assert [n["title"] for n in data["post_its"]] == ["X", "T"]
+        assert BoardJournal(store.snapshot_file, store.journal_file).load() == data["post_its"]
+
+    def test_torn_record_is_discarded(self, store):
+        store.save([_note("a", 0)])
+        with store.journal_file.open("a", encoding="utf-8") as fh:
+            fh.write('{"op": "delete", "id"')
+        reopened = BoardJournal(store.snapshot_file, store.journal_file)
+        assert len(reopened.load()) == 1
+        reopened.save([_note("a", 0, title="After crash")])
+        assert BoardJournal(store.snapshot_file, store.journal_file).load()[0]["title"] == (
+            "After crash"
+        )
+
+    def test_corrupt_record_before_the_tail_is_skipped(self, store):
+        store.save([_note("a", 0)])
+        [add] = diff_notes({}, [_note("b", 1)])
+        with store.journal_file.open("a", encoding="utf-8") as fh:
+            fh.write('{"op": "delete", "id"\n' + json.dumps(add) + "\n")
+        size = store.journal_file.stat().st_size
+        reopened = BoardJournal(store.snapshot_file, store.journal_file)
+        assert [n["id"] for n in reopened.load()] == ["a", "b"]
+        assert store.journal_file.stat().st_size == size
+
+    def test_revision_survives_replay_and_compaction(self, store):
+        store.save([_note("a", 0)], revision=1)
+        store.save([_note("a", 0, title="Two")], revision=2)
+        assert _records(store)[-1] == {"op": "revision", "revision": 2}
+        reopened = BoardJournal(store.snapshot_file, store.journal_file)
+        reopened.load()
+        assert reopened.revision == 2
+        reopened.compact()
+        again = BoardJournal(store.snapshot_file, store.journal_file)
+        again.load()
+        assert again.revision == 2
+
+
+class TestJournalEngine:
+    @pytest.fixture(autouse=True)
+    def journal_engine(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+        monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+        monkeypatch.setattr("tui_notes.storage._storage_engine", "json")
+        set_storage_engine("journal")
+
+    def test_watch_paths(self, tmp_path):
+        assert watch_paths() == [tmp_path / "notes.json", tmp_path / "notes.journal"]
+
+    def test_roundtrip(self, tmp_path):
+        notes = [_note("a", 0, title="Hello", content="World", color_index=2)]
+        save_notes(notes)
+        assert (tmp_path / "notes.journal").exists()
+        assert load_notes() == notes
+
+    def test_long_body_moves_in_and_out_of_line(self):
+        body = "z" * 20_000
+        save_notes([_note("a", 0, content=body)])
+        assert read_body(load_notes()[0]) == body
+        save_notes([_note("a", 0, content="short")])
+        assert load_notes() == [_note("a", 0, content="short")]
+
+    def test_boards_have_separate_journals(self, tmp_path):
+        save_notes([_note("a", 0, title="Main")])
+        save_notes([_note("b", 0, title="Work")], board="work")
+        assert (tmp_path / "boards" / "work.journal").exists()
+        assert [n["title"] for n in load_notes("work")] == ["Work"]
+        assert [n["title"] for n in load_notes()] == ["Main"]
+
+    def test_compaction_runs_in_the_background(self, tmp_path):
+        engine = JournalStore(tmp_path / "notes.json", max_records=3)
+        engine.save([_note("a", 0), _note("b", 1)])
+        engine.save([_note("a", 0, title="X"), _note("b", 1)])
+        engine.close()
+        assert not (tmp_path / "notes.journal").exists()
+        assert [n["title"] for n in engine.load()] == ["X", "T"]
+
+    def test_unknown_engine_rejected(self):
+        with pytest.raises(ValueError):
+            set_storage_engine("floppy")
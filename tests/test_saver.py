@@ -0,0 +1,144 @@
+"""Tests for the write-behind saver."""
+
+import threading
+
+import pytest
+
+from tui_notes.app import NotesApp
+
+
+@pytest.fixture
+def writes(tmp_path, monkeypatch):
+    """Record every snapshot handed to the storage layer."""
+    calls = []
+
+    def record(post_its, board="main", prefer=None):
+        calls.append(post_its)
+        return post_its
+
+    monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+    monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+    monkeypatch.setattr("tui_notes.app.load_notes", lambda board="main": [])
+    monkeypatch.setattr("tui_notes.app.save_notes", record)
+    return calls
+
+
+class TestWriteBehind:
+    @pytest.mark.asyncio
+    async def test_burst_of_moves_is_one_write(self, writes):
+        app = NotesApp(save_debounce=1.0, save_max_latency=10.0)
+        async with app.run_test() as pilot:
+            await pilot.press("a", "m")
+            for key in ("right", "right", "down", "left", "left", "down"):
+                await pilot.press(key)
+            assert writes == []
+            await pilot.pause(1.5)
+            await app.workers.wait_for_complete()
+            assert len(writes) == 1
+            assert [note["position"] for note in writes[0]] == [6]
+
+    @pytest.mark.asyncio
+    async def test_max_latency_bounds_deferral(self, writes):
+        app = NotesApp(save_debounce=10.0, save_max_latency=0.0)
+        async with app.run_test() as pilot:
+            await pilot.press("a")
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            assert len(writes) == 1
+
+    @pytest.mark.asyncio
+    async def test_pending_changes_flushed_on_quit(self, writes):
+        app = NotesApp(save_debounce=60.0, save_max_latency=60.0)
+        async with app.run_test() as pilot:
+            await pilot.press("a", "a")
+            assert writes == []
+        assert len(writes) == 1
+        assert len(writes[0]) == 2
+
+    @pytest.mark.asyncio
+    async def test_manual_save_writes_immediately(self, writes):
+        app = NotesApp(save_debounce=60.0, save_max_latency=60.0)
+        async with app.run_test() as pilot:
+            await pilot.press("a", "ctrl+s")
+            assert len(writes) == 1
+
+    @pytest.mark.asyncio
+    async def test_pending_changes_flushed_on_crash(self, writes):
+        app = NotesApp(save_debounce=60.0, save_max_latency=60.0)
+
+        def explode() -> None:
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            async with app.run_test() as pilot:
+                await pilot.press("a")
+                app.call_later(explode)
+                await pilot.pause()
+        assert len(writes) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_write_is_flushed_on_quit(self, writes, monkeypatch):
+        failures = iter([OSError("disk full")])
+
+        def flaky(post_its, board="main", prefer=None):
+            for exc in failures:
+                raise exc
+            writes.append(post_its)
+            return post_its
+
+        monkeypatch.setattr("tui_notes.app.save_notes", flaky)
+        app = NotesApp(save_debounce=0.01, save_max_latency=60.0)
+        async with app.run_test() as pilot:
+            await pilot.press("a")
+            await pilot.pause(0.1)
+            await app.workers.wait_for_complete()
+            assert writes == []
+            assert app._saver.pending_writes == 1
+        assert len(writes) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_write_is_retried(self, writes, monkeypatch):
+        failures = iter([OSError("disk full")])
+
+        def flaky(post_its, board="main", prefer=None):
+            for exc in failures:
+                raise exc
+            writes.append(post_its)
+            return post_its
+
+        monkeypatch.setattr("tui_notes.app.save_notes", flaky)
+        app = NotesApp(save_debounce=0.01, save_max_latency=60.0)
+        async with app.run_test() as pilot:
+            app._saver.retry = 0.1
+            await pilot.press("a")
+            for _ in range(50):
+                await pilot.pause(0.05)
+                await app.workers.wait_for_complete()
+                if writes:
+                    break
+            assert len(writes) == 1
+            assert not app._saver.has_pending("main")
+
+    @pytest.mark.asyncio
+    async def test_quit_waits_for_a_write_in_flight(self, writes, monkeypatch):
+        started, release = threading.Event(), threading.Event()
+        events = []
+
+        def slow(post_its, board="main", prefer=None):
+            started.set()
+            release.wait(5)
+            events.append("written")
+            return post_its
+
+        monkeypatch.setattr("tui_notes.app.save_notes", slow)
+        monkeypatch.setattr("tui_notes.app.close_storage", lambda: events.append("closed"))
+        app = NotesApp(save_debounce=0.01, save_max_latency=60.0)
+        async with app.run_test() as pilot:
+            await pilot.press("a")
+            for _ in range(50):
+                if started.is_set():
+                    break
+                await pilot.pause(0.02)
+            assert started.is_set() and events == []
+            threading.Timer(0.2, release.set).start()
+        assert events == ["written", "closed"]
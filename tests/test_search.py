@@ -0,0 +1,189 @@
+"""Tests for the incremental search index."""
+
+import time
+
+import pytest
+
+from tui_notes import search
+from tui_notes.search import SearchIndex, fuzzy_score, tokenize
+from tui_notes.storage import load_notes, save_notes
+
+
+@pytest.fixture
+def tmp_data_dir(tmp_path, monkeypatch):
+    """Override data dir to use a temporary directory."""
+    monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+    monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+    return tmp_path
+
+
+def note(note_id, title, content="", position=0):
+    return {"id": note_id, "position": position, "title": title, "content": content}
+
+
+def ids(results):
+    return [result["id"] for result in results]
+
+
+class TestTokenize:
+    def test_lowercases_and_splits_words(self):
+        assert tokenize("Buy MILK, eggs!") == ["buy", "milk", "eggs"]
+
+    def test_keeps_unicode_words(self):
+        assert tokenize("Conteúdo acentuação") == ["conteúdo", "acentuação"]
+
+
+class TestSearchIndex:
+    def test_all_words_must_match(self):
+        index = SearchIndex()
+        index.sync_board("main", [note("a", "Groceries", "milk eggs"), note("b", "Milk run")])
+        assert ids(index.search("milk eggs")) == ["a"]
+
+    def test_last_word_matches_prefix(self):
+        index = SearchIndex()
+        index.sync_board("main", [note("a", "Shopping"), note("b", "Shoes"), note("c", "Work")])
+        assert sorted(ids(index.search("sho"))) == ["a", "b"]
+
+    def test_title_matches_rank_first(self):
+        index = SearchIndex()
+        index.sync_board("main", [note("a", "Zebra", "report due"), note("b", "Report")])
+        assert ids(index.search("report")) == ["b", "a"]
+
+    def test_searches_across_boards(self):
+        index = SearchIndex()
+        index.sync_board("main", [note("a", "Plan")])
+        index.sync_board("work", [note("b", "Plan")])
+        assert {(r["board"], r["id"]) for r in index.search("plan")} == {
+            ("main", "a"),
+            ("work", "b"),
+        }
+
+    def test_update_note_replaces_words(self):
+        index = SearchIndex()
+        index.sync_board("main", [note("a", "Old title")])
+        index.update_note("main", note("a", "New title"))
+        assert index.search("old") == []
+        assert ids(index.search("new")) == ["a"]
+
+    def test_update_only_tokenizes_changed_note(self, monkeypatch):
+        index = SearchIndex()
+        notes = [note(str(i), f"Note {i}") for i in range(5)]
+        index.sync_board("main", notes)
+        calls = []
+        monkeypatch.setattr(search, "tokenize", lambda text: calls.append(text) or text.split())
+        notes[2] = note("2", "Changed")
+        index.sync_board("main", notes)
+        assert len(calls) == 2  # title words + all words of the changed note only
+
+    def test_remove_note_and_board(self):
+        index = SearchIndex()
+        index.sync_board("main", [note("a", "Alpha"), note("b", "Alpha beta")])
+        index.sync_board("work", [note("c", "Alpha")])
+        index.remove_note("main", "a")
+        index.remove_board("work")
+        assert ids(index.search("alpha")) == ["b"]
+        assert index.boards == {"main"}
+
+    def test_sync_drops_notes_no_longer_on_board(self):
+        index = SearchIndex()
+        index.sync_board("main", [note("a", "Alpha"), note("b", "Beta")])
+        index.sync_board("main", [note("b", "Beta")])
+        assert index.search("alpha") == []
+        assert len(index) == 1
+
+    def test_limit(self):
+        index = SearchIndex()
+        index.sync_board("main", [note(str(i), "Same") for i in range(20)])
+        assert len(index.search("same", limit=5)) == 5
+
+    def test_out_of_line_body_is_indexed_in_full(self, tmp_data_dir):
+        save_notes([{**note("a", "Long", "filler " * 5000 + "needle"), "color_index": 0}])
+        [stored] = load_notes()
+        assert stored.get("blob") and "needle" not in stored["content"]
+        index = SearchIndex()
+        index.sync_board("main", [stored])
+        assert ids(index.search("needle")) == ["a"]
+
+
+class TestPersistence:
+    def test_roundtrip_without_retokenizing(self, tmp_data_dir, monkeypatch):
+        index = SearchIndex()
+        notes = [note("a", "Persisted", "body text")]
+        index.sync_board("main", notes)
+        index.save()
+        assert (tmp_data_dir / "search-index.json").exists()
+
+        monkeypatch.setattr(search, "tokenize", lambda text: pytest.fail("re-tokenized"))
+        loaded = SearchIndex.load()
+        loaded.sync_board("main", notes)
+        assert loaded.boards == {"main"}
+        assert loaded.dirty is False
+
+    def test_loaded_index_answers_queries(self, tmp_data_dir):
+        index = SearchIndex()
+        index.sync_board("main", [note("a", "Persisted", "body text")])
+        index.save()
+        assert ids(SearchIndex.load().search("body")) == ["a"]
+
+    def test_corrupt_file_gives_empty_index(self, tmp_data_dir):
+        (tmp_data_dir / "search-index.json").write_text("{not json")
+        assert len(SearchIndex.load()) == 0
+
+    def test_clean_index_is_not_rewritten(self, tmp_data_dir):
+        SearchIndex().save()
+        assert not (tmp_data_dir / "search-index.json").exists()
+
+
+class TestScale:
+    def test_query_over_many_notes_is_fast(self):
+        index = SearchIndex()
+        for board in range(2_500):
+            index.sync_board(
+                f"b{board}",
+                [note(f"{board}-{i}", f"Task {board} {i}", f"word{i} common") for i in range(9)],
+            )
+        start = time.perf_counter()
+        results = index.search("common word4")
+        elapsed = time.perf_counter() - start
+        assert len(results) == 50
+        assert elapsed < 0.1
+
+
+class TestFuzzy:
+    def test_subsequence_scoring(self):
+        assert fuzzy_score("shp", "shopping")[1] == [0, 1, 3]
+        assert fuzzy_score("xyz", "shopping") is None
+
+    def test_word_starts_rank_higher(self):
+        index = SearchIndex()
+        index.sync_board("main", [note("a", "Edited"), note("b", "Dentist trip")])
+        assert ids(index.fuzzy("dt"))[0] == "b"
+
+    def test_tolerates_typos_through_shared_trigrams(self):
+        index = SearchIndex()
+        index.sync_board("main", [note("a", "Quarterly report"), note("b", "Groceries")])
+        assert ids(index.fuzzy("quartelry"))[0] == "a"
+
+    def test_renamed_title_updates_trigrams(self):
+        index = SearchIndex()
+        index.sync_board("main", [note("a", "Alpha")])
+        index.update_note("main", note("a", "Omega"))
+        assert index.fuzzy("alph") == []
+        assert ids(index.fuzzy("omeg")) == ["a"]
+
+    def test_cancelled_search_returns_nothing(self):
+        index = SearchIndex()
+        index.sync_board("main", [note("a", "Alpha")])
+        assert index.fuzzy("alp", cancelled=lambda: True) == []
+
+    def test_fuzzy_over_many_notes_is_fast(self):
+        index = SearchIndex()
+        for board in range(2_500):
+            index.sync_board(
+                f"b{board}", [note(f"{board}-{i}", f"Task {board} item {i}") for i in range(9)]
+            )
+        start = time.perf_counter()
+        results = index.fuzzy("tsk 42 itm")
+        elapsed = time.perf_counter() - start
+        assert results
+        assert elapsed < 0.2
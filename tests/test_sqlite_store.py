@@ -0,0 +1,223 @@
+"""Tests for the SQLite storage engine."""
+
+import json
+import sqlite3
+
+import pytest
+
+from tui_notes import sqlite_store
+from tui_notes.sqlite_store import SqliteStore
+from tui_notes.storage import (
+    StorageEngine,
+    load_notes,
+    register_storage_engine,
+    save_boards,
+    save_notes,
+    set_storage_engine,
+)
+
+
+def _note(note_id, position, title="T", content="", color_index=0):
+    return {
+        "id": note_id,
+        "position": position,
+        "title": title,
+        "content": content,
+        "color_index": color_index,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    """SQLite store in a temporary directory."""
+    engine = SqliteStore(tmp_path / "notes.db", legacy_file=tmp_path / "notes.json")
+    yield engine
+    engine.close()
+
+
+def _trace(store):
+    statements = []
+    store._connect().set_trace_callback(statements.append)
+    return statements
+
+
+class TestSqliteStore:
+    def test_roundtrip(self, store):
+        notes = [_note("a", 0, "One", "Body", 2), _note("b", 4, "Two")]
+        store.save(notes)
+        assert store.load() == notes
+
+    def test_uses_wal_mode(self, store):
+        mode = store._connect().execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_edit_is_single_row_update(self, store):
+        store.save([_note("a", 0), _note("b", 1), _note("c", 2)])
+        statements = _trace(store)
+        store.save([_note("a", 0), _note("b", 1, title="Changed"), _note("c", 2)])
+        writes = [s for s in statements if s.startswith(("UPDATE", "INSERT", "DELETE"))]
+        assert writes == ["UPDATE notes SET title = 'Changed' WHERE board = 'main' AND id = 'b'"]
+
+    def test_swap_updates_only_positions(self, store):
+        store.save([_note("a", 0), _note("b", 1)])
+        statements = _trace(store)
+        store.save([_note("b", 0), _note("a", 1)])
+        writes = [s for s in statements if s.startswith(("UPDATE", "INSERT", "DELETE"))]
+        assert len(writes) == 2
+        assert all(s.startswith("UPDATE notes SET position") for s in writes)
+        assert [n["id"] for n in store.load()] == ["b", "a"]
+
+    def test_boards_are_isolated(self, store):
+        store.save([_note("a", 0, "Main")])
+        store.save([_note("b", 0, "Work")], board="work")
+        assert [n["id"] for n in store.load("work")] == ["b"]
+        store.delete_board("work")
+        assert store.load("work") == []
+        assert [n["id"] for n in store.load()] == ["a"]
+
+    def test_notes_without_ids_on_different_boards_are_kept_apart(self, store):
+        untitled = {"position": 0, "title": "T", "content": "", "color_index": 0}
+        store.save([{**untitled, "title": "Main"}])
+        store.save([{**untitled, "title": "Work"}], board="work")
+        store.save([{**untitled, "title": "Main 2"}])
+        store.save([], board="work")
+        store.close()
+        assert [note["title"] for note in store.load()] == ["Main 2"]
+        assert store.load("work") == []
+
+    def test_delete_removes_row(self, store):
+        store.save([_note("a", 0), _note("b", 1)])
+        store.save([_note("a", 0)])
+        assert [n["id"] for n in store.load()] == ["a"]
+
+    def test_revision_is_stored_in_meta(self, store, tmp_path):
+        assert store.save_versioned([_note("a", 0)], revision=3) == 3
+        store.close()
+        reopened = SqliteStore(tmp_path / "notes.db")
+        assert reopened.load_versioned() == ([_note("a", 0)], 3)
+        reopened.delete_board("main")
+        assert reopened.load_versioned() == ([], 0)
+        reopened.close()
+
+    def test_blob_reference_roundtrip(self, store):
+        note = {**_note("a", 0, content="preview"), "blob": "1" * 64}
+        store.save([note])
+        assert store.load() == [note]
+        store.save([_note("a", 0, content="short")])
+        assert store.load() == [_note("a", 0, content="short")]
+
+
+class TestMigration:
+    def test_imports_existing_json_once(self, tmp_path):
+        raw = {"version": "1.0", "post_its": [_note("a", 3, "Legacy", "Old body", 1)]}
+        (tmp_path / "notes.json").write_text(json.dumps(raw))
+        store = SqliteStore(tmp_path / "notes.db", legacy_file=tmp_path / "notes.json")
+        assert store.load() == raw["post_its"]
+        store.save([])
+        store.close()
+
+        reopened = SqliteStore(tmp_path / "notes.db", legacy_file=tmp_path / "notes.json")
+        assert reopened.load() == []
+        reopened.close()
+
+    def test_imports_every_board_of_the_index(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+        monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+        save_boards([{"id": "main", "name": "Main"}, {"id": "b2", "name": "Two"}])
+        save_notes([_note("a", 0, "Main")])
+        save_notes([_note("b", 0, "Two")], "b2")
+        store = SqliteStore(tmp_path / "notes.db", legacy_file=tmp_path / "notes.json")
+        assert store.load("b2") == [_note("b", 0, "Two")]
+        assert store.load() == [_note("a", 0, "Main")]
+        store.save([], "b2")
+        store.close()
+        assert store.load("b2") == []
+        store.close()
+
+    def test_concurrent_migrations_import_once(self, tmp_path, monkeypatch):
+        raw = {"version": "1.0", "post_its": [_note("a", 0, "Legacy")]}
+        (tmp_path / "notes.json").write_text(json.dumps(raw))
+        other = SqliteStore(tmp_path / "notes.db", legacy_file=tmp_path / "notes.json")
+        read_snapshot = sqlite_store.read_snapshot
+        raced = []
+
+        def racing(path):
+            # Another process migrates between this one's check and its import.
+            if not raced:
+                raced.append(path)
+                other._connect()
+            return read_snapshot(path)
+
+        monkeypatch.setattr("tui_notes.sqlite_store.read_snapshot", racing)
+        store = SqliteStore(tmp_path / "notes.db", legacy_file=tmp_path / "notes.json")
+        assert store.load() == raw["post_its"]
+        assert sqlite_store.migrate_json(store._connect(), tmp_path / "notes.json") == 0
+        store.close()
+        other.close()
+
+    def test_failed_migration_is_an_os_error_and_retried(self, tmp_path, monkeypatch):
+        def fail(conn, json_file):
+            raise sqlite3.OperationalError("database is locked")
+
+        raw = {"version": "1.0", "post_its": [_note("a", 0, "Legacy")]}
+        (tmp_path / "notes.json").write_text(json.dumps(raw))
+        monkeypatch.setattr("tui_notes.sqlite_store.migrate_json", fail)
+        store = SqliteStore(tmp_path / "notes.db", legacy_file=tmp_path / "notes.json")
+        with pytest.raises(OSError):
+            store._connect()
+        monkeypatch.undo()
+        assert store.load() == raw["post_its"]
+        store.close()
+
+    def test_adds_blob_column_to_old_database(self, tmp_path):
+        conn = sqlite3.connect(tmp_path / "notes.db")
+        conn.executescript(
+            "CREATE TABLE notes (id TEXT PRIMARY KEY, board TEXT NOT NULL, "
+            "position INTEGER NOT NULL, title TEXT NOT NULL, content TEXT NOT NULL, "
+            "color_index INTEGER NOT NULL);"
+            "INSERT INTO notes VALUES ('a', 'main', 0, 'T', '', 0);"
+        )
+        conn.close()
+        store = SqliteStore(tmp_path / "notes.db")
+        assert store.load() == [_note("a", 0)]
+        store.save([{**_note("a", 0), "blob": "2" * 64}])
+        assert store.load()[0]["blob"] == "2" * 64
+        store.save([_note("a", 0)], board="work")
+        store.close()
+        assert store.load() == [{**_note("a", 0), "blob": "2" * 64}]
+        assert store.load("work") == [_note("a", 0)]
+
+
+class TestEngineRegistry:
+    @pytest.fixture(autouse=True)
+    def isolated(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: tmp_path)
+        monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: tmp_path / "notes.json")
+        monkeypatch.setattr("tui_notes.storage._storage_engine", "json")
+        monkeypatch.setattr("tui_notes.storage._engines", {})
+
+    def test_sqlite_engine_via_facade(self, tmp_path):
+        set_storage_engine("sqlite")
+        save_notes([_note("a", 0, "Hello")])
+        assert (tmp_path / "notes.db").exists()
+        assert load_notes()[0]["title"] == "Hello"
+
+    def test_register_custom_engine(self, monkeypatch):
+        class MemoryStore(StorageEngine):
+            def __init__(self, data_file):
+                self.notes = []
+
+            def load(self, board="main"):
+                return list(self.notes)
+
+            def save(self, post_its, board="main"):
+                self.notes = list(post_its)
+
+            def delete_board(self, board):
+                self.notes = []
+
+        monkeypatch.setattr("tui_notes.storage._engine_factories", {})
+        register_storage_engine("memory", MemoryStore)
+        set_storage_engine("memory")
+        save_notes([_note("a", 0)])
+        assert load_notes() == [_note("a", 0)]
@@ -0,0 +1,100 @@
+"""Startup budget regression tests."""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from tui_notes.profiling import StartupProfile
+
+# Close to the measured cold starts (first paint about 0.6 s, a bare
+# `tui-notes list` 0.07-0.14 s) with headroom; slow CI raises them.
+STARTUP_BUDGET_SECONDS = float(os.environ.get("TUI_NOTES_STARTUP_BUDGET", "1.0"))
+LIST_BUDGET_SECONDS = float(os.environ.get("TUI_NOTES_LIST_BUDGET", "0.25"))
+
+# Runs a cold start in a fresh interpreter, the way `tui-notes
+# --profile-startup json` does, but headless and also reporting which
+# screen and feature modules were imported by the time of the first paint.
+PROFILE_SCRIPT = """
+import json, sys
+from tui_notes.profiling import StartupProfile
+profile = StartupProfile()
+with profile.phase("import"):
+    from tui_notes.app import NotesApp
+NotesApp(startup_profile=profile).run(headless=True)
+screens = sorted(m for m in sys.modules if m.startswith("tui_notes.screens."))
+features = ("export", "importer", "history", "sync")
+loaded = sorted(m for m in features if f"tui_notes.{m}" in sys.modules)
+print(json.dumps({"profile": profile.as_dict(), "screens": screens, "features": loaded}))
+"""
+
+
+def cold_start(tmp_path):
+    """Start the app in a subprocess and return its profile and loaded modules."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROFILE_SCRIPT],
+        capture_output=True,
+        text=True,
+        env={"XDG_CONFIG_HOME": str(tmp_path), "PATH": "", "TERM": "dumb"},
+        cwd=Path(__file__).resolve().parent.parent,
+        check=True,
+        timeout=60,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def list_seconds(tmp_path, runs=3):
+    """Run `tui-notes list` in fresh interpreters and return the fastest wall time."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "tui_notes", "list"],
+            capture_output=True,
+            env={"XDG_CONFIG_HOME": str(tmp_path), "PATH": ""},
+            cwd=Path(__file__).resolve().parent.parent,
+            check=True,
+            timeout=60,
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class TestStartupProfile:
+    def test_phases_add_up(self):
+        profile = StartupProfile()
+        profile.add("css", 0.01)
+        profile.add("css", 0.02)
+        profile.mark_first_paint()
+        timings = profile.as_dict()
+        assert abs(timings["css"] - 0.03) < 1e-9
+        assert timings["first_paint"] >= timings["other"]
+        assert "first_paint" in profile.format()
+
+    def test_wrap_times_calls(self):
+        profile = StartupProfile()
+        assert profile.wrap("work", lambda x: x * 2)(21) == 42
+        assert "work" in profile.as_dict()
+
+
+class TestColdStart:
+    def test_first_paint_within_budget(self, tmp_path):
+        report = cold_start(tmp_path)
+        timings = report["profile"]
+        for phase in ("import", "css", "load_from_disk", "first_paint"):
+            assert phase in timings
+        assert timings["first_paint"] < STARTUP_BUDGET_SECONDS, timings
+
+    def test_screens_not_imported_before_first_paint(self, tmp_path):
+        report = cold_start(tmp_path)
+        assert report["screens"] == []
+
+    def test_feature_modules_not_imported_before_first_paint(self, tmp_path):
+        report = cold_start(tmp_path)
+        assert report["features"] == []
+
+    def test_list_within_budget(self, tmp_path):
+        elapsed = list_seconds(tmp_path)
+        assert elapsed < LIST_BUDGET_SECONDS, f"{elapsed:.3f} s"
@@ -1,11 +1,32 @@
 """Tests for the storage module."""
 
 import json
+import os
+import subprocess
+import sys
+from contextlib import contextmanager
 from pathlib import Path
 
 import pytest
 
-from tui_notes.storage import _get_data_dir, _get_data_file, load_notes, save_notes
+from tui_notes import snapshot, storage
+from tui_notes.changes import merge_notes
+from tui_notes.constants import BLOB_MIN_CHARS, BLOB_PREVIEW_CHARS
+from tui_notes.storage import (
+    ConflictError,
+    _get_data_dir,
+    _get_data_file,
+    delete_board,
+    load_boards,
+    load_notes,
+    prune_blobs,
+    read_body,
+    save_boards,
+    save_notes,
+    split_body,
+    watch_paths,
+    with_body,
+)
 
 
 @pytest.fixture
@@ -16,6 +37,28 @@ def tmp_data_dir(tmp_path, monkeypatch):
     return tmp_path
 
 
+@contextmanager
+def other_process():
+    """Act as a second writer, which knows nothing of this process's reads."""
+    bases = dict(storage._bases)
+    storage._bases.clear()
+    try:
+        yield
+    finally:
+        storage._bases.clear()
+        storage._bases.update(bases)
+
+
+def _note(note_id, position, title="T", content="", color_index=0):
+    return {
+        "id": note_id,
+        "position": position,
+        "title": title,
+        "content": content,
+        "color_index": color_index,
+    }
+
+
 class TestSaveNotes:
     def test_save_creates_file(self, tmp_data_dir):
         save_notes([{"position": 0, "title": "Test", "content": "Hello"}])
@@ -25,7 +68,8 @@ class TestSaveNotes:
         notes = [{"position": 0, "title": "A", "content": "B", "color_index": 2}]
         save_notes(notes)
         data = json.loads((tmp_data_dir / "notes.json").read_text())
-        assert data["version"] == "1.0"
+        assert data["version"] == "2.0"
+        assert data["board"] == "main"
         assert data["post_its"] == notes
 
     def test_save_multiple_notes(self, tmp_data_dir):
@@ -54,6 +98,28 @@ class TestSaveNotes:
         data = json.loads((tmp_data_dir / "notes.json").read_text(encoding="utf-8"))
         assert data["post_its"][0]["title"] == "Nota 📝"
 
+    def test_file_is_pretty_printed_json(self, tmp_data_dir):
+        notes = [_note("a", 0, "Nota 📝", 'Quote " and\nnewline', 2), _note("b", 4)]
+        save_notes(notes)
+        text = (tmp_data_dir / "notes.json").read_text(encoding="utf-8")
+        assert text == json.dumps(json.loads(text), indent=2, ensure_ascii=False)
+
+    def test_only_changed_notes_are_encoded(self, tmp_data_dir, monkeypatch):
+        encoded = []
+        encode_note = snapshot.encode_note
+        monkeypatch.setattr(
+            "tui_notes.snapshot.encode_note",
+            lambda note: encoded.append(note["id"]) or encode_note(note),
+        )
+        notes = [_note(str(i), i) for i in range(9)]
+        save_notes(notes)
+        assert len(encoded) == 9
+        encoded.clear()
+        notes[3] = _note("3", 3, "Changed")
+        save_notes(notes)
+        assert encoded == ["3"]
+        assert load_notes() == notes
+
 
 class TestLoadNotes:
     def test_load_nonexistent_returns_empty(self, tmp_data_dir):
@@ -114,6 +180,186 @@ class TestLoadNotes:
         loaded = load_notes()
         assert loaded == original
 
+    def test_load_preserves_note_id(self, tmp_data_dir):
+        save_notes([{"id": "abc", "position": 1, "title": "T", "content": ""}])
+        assert load_notes()[0]["id"] == "abc"
+
+
+class TestBoards:
+    def test_default_board_index(self, tmp_data_dir):
+        assert load_boards() == [{"id": "main", "name": "Main"}]
+
+    def test_board_index_roundtrip(self, tmp_data_dir):
+        boards = [{"id": "main", "name": "Main"}, {"id": "work", "name": "Work"}]
+        save_boards(boards)
+        assert load_boards() == boards
+
+    def test_boards_stored_in_separate_files(self, tmp_data_dir):
+        save_notes([{"position": 0, "title": "Home"}])
+        save_notes([{"position": 0, "title": "Office"}], board="work")
+        assert (tmp_data_dir / "boards" / "work.json").exists()
+        assert load_notes("work")[0]["title"] == "Office"
+        assert load_notes()[0]["title"] == "Home"
+
+    def test_legacy_file_is_default_board(self, tmp_data_dir):
+        raw = {"version": "1.0", "post_its": [{"position": 0, "title": "Old"}]}
+        (tmp_data_dir / "notes.json").write_text(json.dumps(raw))
+        assert load_notes("main")[0]["title"] == "Old"
+        assert load_notes("other") == []
+
+    def test_watch_paths_are_the_board_files(self, tmp_data_dir):
+        assert watch_paths() == [tmp_data_dir / "notes.json"]
+        assert watch_paths("work") == [tmp_data_dir / "boards" / "work.json"]
+
+    def test_delete_board(self, tmp_data_dir):
+        save_notes([{"position": 0, "title": "Gone"}], board="tmp")
+        delete_board("tmp")
+        assert load_notes("tmp") == []
+
+
+class TestConcurrentWriters:
+    def test_revision_increases_with_every_save(self, tmp_data_dir):
+        save_notes([_note("a", 0)])
+        save_notes([_note("a", 0, "New")])
+        assert json.loads((tmp_data_dir / "notes.json").read_text())["revision"] == 2
+
+    def test_temporary_file_is_unique_to_the_writer(self, tmp_data_dir):
+        other = tmp_data_dir / "notes.tmp"
+        other.write_text("another writer's half-written file")
+        save_notes([_note("a", 0)])
+        assert other.read_text() == "another writer's half-written file"
+        assert not list(tmp_data_dir.glob(".notes.json.*"))
+
+    def test_changes_to_different_notes_are_merged(self, tmp_data_dir):
+        save_notes([_note("a", 0), _note("b", 1)])
+        with other_process():
+            save_notes([_note("a", 0), _note("b", 1, "Theirs")])
+        saved = save_notes([_note("a", 0, "Mine"), _note("b", 1)])
+        assert [n["title"] for n in saved] == ["Mine", "Theirs"]
+        assert load_notes() == saved
+
+    def test_a_merged_save_is_merged_again_until_reloaded(self, tmp_data_dir):
+        save_notes([_note("a", 0)])
+        with other_process():
+            save_notes([_note("a", 0), _note("b", 1)])
+        save_notes([_note("a", 0, "Mine")])
+        # The caller still holds only its own notes; b must survive.
+        save_notes([_note("a", 0, "Mine again")])
+        assert [n["title"] for n in load_notes()] == ["Mine again", "T"]
+
+    def test_notes_added_to_the_same_slot_are_spread(self, tmp_data_dir):
+        save_notes([_note("a", 0)])
+        with other_process():
+            save_notes([_note("a", 0), _note("theirs", 1)])
+        saved = save_notes([_note("a", 0), _note("mine", 1)])
+        assert {n["id"]: n["position"] for n in saved} == {"a": 0, "theirs": 1, "mine": 2}
+
+    def test_conflicting_edits_raise_and_write_nothing(self, tmp_data_dir):
+        save_notes([_note("a", 0)])
+        with other_process():
+            save_notes([_note("a", 0, "Theirs")])
+        with pytest.raises(ConflictError) as info:
+            save_notes([_note("a", 0, "Mine")])
+        assert info.value.board == "main"
+        assert info.value.conflicts[0]["mine"]["title"] == "Mine"
+        assert info.value.conflicts[0]["theirs"]["title"] == "Theirs"
+        assert load_notes()[0]["title"] == "Theirs"
+
+    @pytest.mark.parametrize(
+        "prefer, titles", [("mine", ["Mine"]), ("theirs", ["Theirs"]), ("both", ["Theirs", "Mine"])]
+    )
+    def test_prefer_settles_conflicts(self, tmp_data_dir, prefer, titles):
+        save_notes([_note("a", 0)])
+        with other_process():
+            save_notes([_note("a", 0, "Theirs")])
+        with pytest.raises(ConflictError):
+            save_notes([_note("a", 0, "Mine")])
+        saved = save_notes([_note("a", 0, "Mine")], prefer=prefer)
+        assert [n["title"] for n in saved] == titles
+
+    def test_concurrent_processes_lose_no_notes(self, tmp_path):
+        env = {**os.environ, "XDG_CONFIG_HOME": str(tmp_path)}
+        procs = [
+            subprocess.Popen(
+                [sys.executable, "-m", "tui_notes", "add", f"Note {idx}"],
+                env=env,
+                stdout=subprocess.DEVNULL,
+            )
+            for idx in range(6)
+        ]
+        assert [proc.wait(timeout=60) for proc in procs] == [0] * 6
+        data = json.loads((tmp_path / "tui-notes" / "notes.json").read_text())
+        assert sorted(n["title"] for n in data["post_its"]) == [f"Note {i}" for i in range(6)]
+        assert len({n["position"] for n in data["post_its"]}) == 6
+
+
+class TestBlobs:
+    def test_long_body_is_stored_apart(self, tmp_data_dir):
+        body = "lorem ipsum " * 10_000
+        saved = save_notes([_note("a", 0, content=body)])
+        assert len(saved[0]["content"]) == BLOB_PREVIEW_CHARS
+        assert (tmp_data_dir / "notes.json").stat().st_size < 4 * BLOB_PREVIEW_CHARS
+        [note] = load_notes()
+        assert note["blob"] == saved[0]["blob"]
+        assert read_body(note) == body
+        assert with_body(note) == _note("a", 0, content=body)
+
+    def test_short_body_stays_inline(self, tmp_data_dir):
+        body = "x" * BLOB_MIN_CHARS
+        save_notes([_note("a", 0, content=body)])
+        assert load_notes() == [_note("a", 0, content=body)]
+        assert not (tmp_data_dir / "blobs").exists()
+
+    def test_missing_blob_is_an_error(self, tmp_data_dir):
+        with pytest.raises(OSError):
+            read_body({**_note("a", 0), "blob": "0" * 64})
+
+    def test_prune_keeps_referenced_blobs(self, tmp_data_dir):
+        kept = "k" * (BLOB_MIN_CHARS + 1)
+        save_notes([_note("a", 0, content=kept)])
+        _, orphan = split_body("o" * (BLOB_MIN_CHARS + 1))
+        assert prune_blobs(min_age=3600) == 0
+        assert prune_blobs(min_age=0) == 1
+        assert read_body(load_notes()[0]) == kept
+        with pytest.raises(OSError):
+            read_body({**_note("b", 0), "blob": orphan})
+
+
+class TestMergeNotes:
+    def test_field_level_merge_of_one_note(self):
+        base = [_note("a", 0, "T", "body")]
+        mine = [_note("a", 0, "Mine", "body")]
+        theirs = [_note("a", 0, "T", "Their body", color_index=3)]
+        merged, conflicts = merge_notes(base, mine, theirs)
+        assert conflicts == []
+        assert merged == [_note("a", 0, "Mine", "Their body", 3)]
+
+    def test_body_and_blob_merge_as_one_field(self):
+        base = [{**_note("a", 0, "T", "preview"), "blob": "1" * 64}]
+        mine = [_note("a", 0, "Mine", "preview")]
+        theirs = [{**_note("a", 0, "T", "preview"), "blob": "1" * 64, "color_index": 2}]
+        merged, conflicts = merge_notes(base, mine, theirs)
+        assert conflicts == []
+        assert merged == [_note("a", 0, "Mine", "preview", 2)]
+
+    def test_delete_of_an_untouched_note_wins(self):
+        base = [_note("a", 0), _note("b", 1)]
+        merged, conflicts = merge_notes(base, base, [_note("a", 0)])
+        assert conflicts == []
+        assert [n["id"] for n in merged] == ["a"]
+
+    def test_edit_against_delete_is_a_conflict(self):
+        base = [_note("a", 0)]
+        merged, conflicts = merge_notes(base, [_note("a", 0, "Mine")], [])
+        assert conflicts[0]["theirs"] is None
+        assert merged == []
+
+    def test_full_board_leaves_no_slot(self):
+        base = [_note(str(i), i) for i in range(8)]
+        merged, conflicts = merge_notes(base, base + [_note("m", 8)], base + [_note("t", 8)])
+        assert [c["id"] for c in conflicts] == ["m"]
+        assert merged[-1]["id"] == "t"
+
 
 class TestDataDir:
     def test_get_data_dir_returns_path(self):
@@ -0,0 +1,311 @@
+"""Tests for the change feed and syncing boards between machines."""
+
+import http.client
+import json
+import threading
+
+import pytest
+
+from tui_notes import storage
+from tui_notes.app import NotesApp
+from tui_notes.feed import ChangeFeed, feed_enabled
+from tui_notes.storage import delete_board, load_boards, load_notes, save_boards, save_notes
+from tui_notes.sync import (
+    DirectoryTarget,
+    HttpTarget,
+    NoteSync,
+    StaleFeedError,
+    SyncServer,
+    prune_feed,
+)
+
+
+def _note(note_id, position, title="T", content=""):
+    return {
+        "id": note_id,
+        "position": position,
+        "title": title,
+        "content": content,
+        "color_index": 0,
+    }
+
+
+def _titles(board="main"):
+    return {note["id"]: note["title"] for note in load_notes(board)}
+
+
+@pytest.fixture
+def machine(tmp_path, monkeypatch):
+    """Switch the data directory between machines named by their directory."""
+    current = {}
+
+    def use(name):
+        current["dir"] = tmp_path / name
+        current["dir"].mkdir(exist_ok=True)
+        storage.close_storage()
+
+    monkeypatch.setattr("tui_notes.storage._get_data_dir", lambda: current["dir"])
+    monkeypatch.setattr("tui_notes.storage._get_data_file", lambda: current["dir"] / "notes.json")
+    use("a")
+    yield use
+    storage.close_storage()
+
+
+@pytest.fixture
+def target(tmp_path):
+    return DirectoryTarget(tmp_path / "shared")
+
+
+def _sync(machine, name, target):
+    machine(name)
+    return NoteSync(target).run()
+
+
+class TestChangeFeed:
+    def test_saves_are_recorded_once_enabled(self, machine):
+        save_notes([_note("a", 0)])
+        assert not feed_enabled()
+        feed = ChangeFeed()
+        cursor = feed.enable()
+        save_notes([_note("a", 0), _note("b", 1)])
+        save_notes([_note("b", 1, "B")])
+        records, cursor = feed.read(cursor)
+        assert [(r["id"], r.get("deleted", False)) for r in records] == [
+            ("b", False),
+            ("b", False),
+            ("a", True),
+        ]
+        assert records[1]["note"]["title"] == "B"
+        assert feed.read(cursor) == ([], cursor)
+
+    def test_deleted_board_leaves_tombstones(self, machine):
+        cursor = ChangeFeed().enable()
+        save_notes([_note("a", 0)], "work")
+        delete_board("work")
+        records, _ = ChangeFeed().read(cursor)
+        assert records[-1] == {**records[-1], "board": "work", "id": "a", "deleted": True}
+
+    def test_torn_record_is_skipped(self, machine):
+        feed = ChangeFeed()
+        feed.enable()
+        feed.append([{"board": "main", "id": "a"}])
+        segment = next(feed.root.iterdir())
+        segment.write_bytes(segment.read_bytes()[:-5])
+        assert feed.read(0) == ([], 0)
+        feed.append([{"board": "main", "id": "b"}])
+        records, _ = feed.read(0)
+        assert [r["id"] for r in records] == ["b"]
+
+    def test_segments_roll_over_and_are_pruned(self, machine, monkeypatch):
+        monkeypatch.setattr("tui_notes.feed.FEED_SEGMENT_BYTES", 100)
+        feed = ChangeFeed()
+        feed.enable()
+        for i in range(10):
+            feed.append([{"board": "main", "id": str(i), "pad": "x" * 60}])
+        assert len(list(feed.root.iterdir())) > 3
+        records, end = feed.read(0)
+        assert [r["id"] for r in records] == [str(i) for i in range(10)]
+        middle = feed.read(0)[1] // 2
+        assert feed.prune(middle) > 0
+        assert [r["id"] for r in feed.read(middle)[0]][-1] == "9"
+        assert feed.end() == end
+
+
+class TestDirectorySync:
+    def test_notes_boards_edits_and_deletes_travel(self, machine, target):
+        save_notes([_note("a", 0, "A"), _note("b", 1, "B")])
+        save_boards([{"id": "main", "name": "Main"}, {"id": "work", "name": "Work"}])
+        save_notes([_note("w", 0, "W")], "work")
+        assert _sync(machine, "a", target)["pushed"] == 3
+
+        summary = _sync(machine, "b", target)
+        assert summary["pulled"] == 3 and summary["new_boards"]
+        assert _titles() == {"a": "A", "b": "B"}
+        assert load_boards()[-1] == {"id": "work", "name": "Work"}
+
+        save_notes([_note("a", 0, "A2")])
+        assert _sync(machine, "b", target)["pushed"] == 2
+        _sync(machine, "a", target)
+        assert _titles() == {"a": "A2"}
+
+    def test_only_changed_notes_are_exchanged(self, machine, target):
+        save_notes([_note(str(i), i) for i in range(9)])
+        _sync(machine, "a", target)
+        _sync(machine, "b", target)
+        notes = load_notes()
+        notes[4]["title"] = "edited"
+        save_notes(notes)
+        assert _sync(machine, "b", target)["pushed"] == 1
+        [newest] = sorted((target.root / "batches").iterdir())[-1:]
+        assert [c["id"] for c in json.loads(newest.read_text())["changes"]] == ["4"]
+        assert _sync(machine, "a", target) == {
+            "pulled": 1,
+            "pushed": 0,
+            "conflicts": 0,
+            "waiting": 0,
+            "boards": ["main"],
+            "new_boards": False,
+        }
+
+    def test_pulled_changes_are_not_pushed_back(self, machine, target):
+        save_notes([_note("a", 0)])
+        _sync(machine, "a", target)
+        _sync(machine, "b", target)
+        assert _sync(machine, "b", target)["pushed"] == 0
+        assert len(list((target.root / "batches").iterdir())) == 1
+
+    def test_long_bodies_travel_in_full(self, machine, target):
+        body = "long " * 5000
+        save_notes([_note("a", 0, content=body)])
+        _sync(machine, "a", target)
+        _sync(machine, "b", target)
+        [note] = load_notes()
+        assert note.get("blob") and storage.read_body(note) == body
+
+    def test_malformed_changes_are_skipped(self, machine, target):
+        save_notes([_note("a", 0, "A")])
+        _sync(machine, "a", target)
+        bad = {"board": "main", "id": "x", "time": 1, "replica": "r"}
+        changes = [
+            {**bad, "note": {"position": "x", "title": "X"}},
+            {**bad, "note": {"position": [], "title": "X"}},
+            bad,
+            {**bad, "id": "g", "note": _note("g", 1, "G")},
+        ]
+        target.push(1, {"replica": "r", "time": 1, "changes": changes})
+        _sync(machine, "b", target)
+        assert _titles() == {"a": "A", "g": "G"}
+
+    def test_feed_is_pruned_once_every_target_read_it(self, machine, target, tmp_path):
+        _sync(machine, "a", target)
+        feed = ChangeFeed()
+        for i in range(3):
+            feed.append([{"board": "main", "id": str(i), "pad": "x" * 600_000}])
+        assert prune_feed() == 0
+        _sync(machine, "a", target)
+        assert prune_feed() == 1
+
+
+class TestConflicts:
+    def test_newer_edit_of_a_note_wins_everywhere(self, machine, target):
+        save_notes([_note("a", 0, "A")])
+        _sync(machine, "a", target)
+        _sync(machine, "b", target)
+        machine("a")
+        save_notes([_note("a", 0, "from a")])
+        machine("b")
+        save_notes([_note("a", 0, "from b")])
+        _sync(machine, "a", target)
+        assert _sync(machine, "b", target)["conflicts"] == 1
+        assert _titles() == {"a": "from b"}
+        _sync(machine, "a", target)
+        assert _titles() == {"a": "from b"}
+
+    def test_different_notes_changed_on_both_sides_are_kept(self, machine, target):
+        save_notes([_note("a", 0, "A"), _note("b", 1, "B")])
+        _sync(machine, "a", target)
+        _sync(machine, "b", target)
+        machine("a")
+        save_notes([_note("a", 0, "A2"), _note("b", 1, "B")])
+        machine("b")
+        save_notes([_note("a", 0, "A"), _note("b", 1, "B2"), _note("c", 1, "C")])
+        _sync(machine, "a", target)
+        _sync(machine, "b", target)
+        _sync(machine, "a", target)
+        assert _titles() == {"a": "A2", "b": "B2", "c": "C"}
+        assert len({note["position"] for note in load_notes()}) == 3
+
+    def test_note_without_a_free_slot_waits_for_one(self, machine, target):
+        save_notes([_note(str(i), i) for i in range(8)])
+        _sync(machine, "a", target)
+        _sync(machine, "b", target)
+        machine("a")
+        save_notes([_note(str(i), i) for i in range(8)] + [_note("from a", 8)])
+        machine("b")
+        save_notes([_note(str(i), i) for i in range(8)] + [_note("from b", 8)])
+        _sync(machine, "a", target)
+        assert _sync(machine, "b", target)["waiting"] == 1
+        assert "from a" not in _titles()
+        save_notes([note for note in load_notes() if note["id"] != "0"])
+        assert _sync(machine, "b", target)["waiting"] == 0
+        assert "from a" in _titles()
+
+    def test_push_on_a_stale_base_is_refused(self, target):
+        batch = {"replica": "r", "time": 0, "changes": []}
+        assert target.push(0, batch) == 1
+        with pytest.raises(StaleFeedError):
+            target.push(0, batch)
+
+
+class TestHttpSync:
+    @pytest.fixture
+    def server(self, tmp_path):
+        server = SyncServer(tmp_path / "served")
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    def test_machines_sync_through_the_server(self, machine, server, monkeypatch):
+        monkeypatch.setattr("tui_notes.sync.SYNC_PULL_LIMIT", 2)
+        save_notes([_note("a", 0, "A")])
+        for _ in range(3):
+            _sync(machine, "a", HttpTarget(server.url))
+            notes = load_notes()
+            notes[0]["title"] += "!"
+            save_notes(notes)
+        _sync(machine, "a", HttpTarget(server.url))
+        _sync(machine, "b", HttpTarget(server.url))
+        assert _titles() == {"a": "A!!!"}
+
+    def test_batch_that_is_not_an_object_is_refused(self, monkeypatch):
+        monkeypatch.setattr(HttpTarget, "_request", lambda *args: {"batches": [["x"]]})
+        with pytest.raises(OSError):
+            HttpTarget("http://localhost:1").pull(0)
+
+    def test_dropped_connection_is_an_os_error(self, monkeypatch):
+        def drop(*args, **kwargs):
+            raise http.client.IncompleteRead(b"")
+
+        monkeypatch.setattr("urllib.request.urlopen", drop)
+        with pytest.raises(OSError):
+            HttpTarget("http://localhost:1").pull(0)
+
+    def test_server_refuses_stale_pushes(self, server):
+        client = HttpTarget(server.url)
+        batch = {"replica": "r", "time": 0, "changes": []}
+        assert client.push(0, batch) == 1
+        with pytest.raises(StaleFeedError):
+            client.push(0, batch)
+        assert client.pull(0) == ([{**batch, "seq": 1}], 1)
+
+
+class TestAppSync:
+    @pytest.mark.asyncio
+    async def test_app_applies_pulled_changes_in_the_background(self, machine, target):
+        save_notes([_note("a", 0, "A")])
+        _sync(machine, "b", target)
+        machine("a")
+        app = NotesApp(sync=NoteSync(target))
+        async with app.run_test() as pilot:
+            for _ in range(100):
+                if app._serialize_notes():
+                    break
+                await pilot.pause(0.03)
+            assert [note["title"] for note in app._serialize_notes()] == ["A"]
+
+    @pytest.mark.asyncio
+    async def test_malformed_target_does_not_stop_background_sync(self, machine, target):
+        class Broken(NoteSync):
+            def run(self):
+                raise KeyError("changes")
+
+        app = NotesApp(sync=Broken(target))
+        async with app.run_test() as pilot:
+            for _ in range(100):
+                if app._sync_failed:
+                    break
+                await pilot.pause(0.03)
+            await app.workers.wait_for_complete()
+            assert app._sync_failed and not app._syncing
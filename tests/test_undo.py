@@ -0,0 +1,137 @@
+"""Tests for the undo history."""
+
+import pytest
+
+from tui_notes.undo import UndoError, UndoLog, diff_steps, entry_size
+
+
+def _note(note_id, position, title="T", content="", color_index=0):
+    return {
+        "id": note_id,
+        "position": position,
+        "title": title,
+        "content": content,
+        "color_index": color_index,
+    }
+
+
+class TestDiffSteps:
+    def test_text_edit_keeps_only_the_changed_span(self):
+        body = "x" * 10_000
+        steps = diff_steps(
+            [_note("a", 0, content=body)],
+            [_note("a", 0, content=body[:5000] + "new" + body[5000:])],
+        )
+        assert steps == (("text", "a", "content", 5000, "", "new"),)
+
+    def test_move_recolor_add_and_delete(self):
+        steps = diff_steps([_note("a", 0), _note("b", 1)], [_note("a", 4, color_index=2)])
+        assert steps == (
+            ("delete", _note("b", 1)),
+            ("set", "a", "color_index", 0, 2),
+            ("set", "a", "position", 0, 4),
+        )
+
+    def test_body_moving_out_of_line_is_undoable(self):
+        inline = _note("a", 0, content="long body")
+        apart = {**_note("a", 0, content="long"), "blob": "1" * 64}
+        log = UndoLog()
+        log.record("main", [inline], [apart])
+        assert log.undo("main", [apart]) == [inline]
+        assert log.redo("main", [inline]) == [apart]
+
+    def test_no_change_no_steps(self):
+        assert diff_steps([_note("a", 0)], [_note("a", 0)]) == ()
+
+
+class TestUndoLog:
+    def test_undo_and_redo_roundtrip(self):
+        log = UndoLog()
+        states = [
+            [],
+            [_note("a", 0, "One")],
+            [_note("a", 0, "One, edited")],
+            [_note("a", 3, "One, edited", color_index=4)],
+            [_note("b", 0, "Two"), _note("a", 3, "One, edited", color_index=4)],
+            [_note("b", 0, "Two")],
+        ]
+        for before, after in zip(states, states[1:]):
+            log.record("main", before, after)
+        notes = states[-1]
+        for expected in reversed(states[:-1]):
+            notes = log.undo("main", notes)
+            assert notes == expected
+        assert log.undo("main", notes) is None
+        for expected in states[1:]:
+            notes = log.redo("main", notes)
+            assert notes == expected
+        assert log.redo("main", notes) is None
+
+    def test_new_change_drops_redo(self):
+        log = UndoLog()
+        log.record("main", [], [_note("a", 0)])
+        notes = log.undo("main", [_note("a", 0)])
+        log.record("main", notes, [_note("b", 1)])
+        assert not log.can_redo("main")
+
+    def test_boards_have_separate_histories(self):
+        log = UndoLog()
+        log.record("main", [], [_note("a", 0)])
+        log.record("work", [], [_note("b", 0)])
+        assert log.undo("main", [_note("a", 0)]) == []
+        assert log.can_undo("work")
+
+    def test_memory_cap_evicts_oldest_entries(self):
+        long_body = "lorem ipsum " * 2000
+        log = UndoLog(max_bytes=64 * 1024)
+        notes = [_note("a", 0, content=long_body)]
+        log.record("main", [], notes)
+        for i in range(2000):
+            edited = [_note("a", 0, content=f"{long_body}{i}")]
+            log.record("main", notes, edited)
+            notes = edited
+        assert log.size <= log.max_bytes
+        # The add of the long note was evicted first; the latest edits remain.
+        assert log.undo("main", notes)[0]["content"] == f"{long_body}1998"
+
+    def test_size_is_small_for_edits_of_long_notes(self):
+        long_body = "y" * 100_000
+        steps = diff_steps(
+            [_note("a", 0, content=long_body)], [_note("a", 0, content="z" + long_body)]
+        )
+        assert entry_size(steps) < 1000
+
+    def test_stale_entry_raises_and_clears_history(self):
+        log = UndoLog()
+        log.record("main", [], [_note("a", 0)])
+        log.record("main", [_note("a", 0)], [_note("a", 0, title="Mine")])
+        with pytest.raises(UndoError):
+            log.undo("main", [_note("a", 0, title="Theirs")])
+        assert not log.can_undo("main")
+        assert log.size == 0
+
+    def test_undo_into_a_taken_slot_raises(self):
+        log = UndoLog()
+        log.record("main", [_note("a", 0)], [_note("a", 1)])
+        with pytest.raises(UndoError):
+            log.undo("main", [_note("a", 1), _note("b", 0)])
+
+    def test_persisted_history_survives_restart(self, tmp_path):
+        path = tmp_path / "undo-history.json"
+        log = UndoLog.load(path)
+        log.record("main", [], [_note("a", 0, "One")])
+        log.record("main", [_note("a", 0, "One")], [_note("a", 0, "One!")])
+        log.undo("main", [_note("a", 0, "One!")])
+        log.save()
+
+        restored = UndoLog.load(path)
+        assert restored.redo("main", [_note("a", 0, "One")]) == [_note("a", 0, "One!")]
+        assert restored.undo("main", [_note("a", 0, "One!")]) == [_note("a", 0, "One")]
+        assert restored.undo("main", [_note("a", 0, "One")]) == []
+
+    def test_corrupt_history_file_is_ignored(self, tmp_path):
+        path = tmp_path / "undo-history.json"
+        path.write_text('{"version": 1, "boards": {"main": {"undo": [[["bogus"]]], "redo": []}}}')
+        log = UndoLog.load(path)
+        assert not log.can_undo("main")
+        assert log.path == path
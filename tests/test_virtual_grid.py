@@ -0,0 +1,84 @@
+"""Tests for the virtualized note grid."""
+
+import pytest
+from textual.app import App, ComposeResult
+
+from tui_notes.widgets import PostIt, VirtualNoteGrid
+
+
+def make_notes(count):
+    return [
+        {"id": f"n{i}", "position": i % 9, "title": f"Note {i}", "content": f"Body {i}"}
+        for i in range(count)
+    ]
+
+
+class GridApp(App):
+    def __init__(self, notes):
+        super().__init__()
+        self.notes = notes
+        self.selected = []
+
+    def compose(self) -> ComposeResult:
+        yield VirtualNoteGrid(self.notes, row_height=5, overscan=1)
+
+    def on_virtual_note_grid_selected(self, event):
+        self.selected.append(event.note)
+
+
+def bound_titles(app):
+    return [w.title for w in app.query(PostIt) if not w.has_class("-unbound")]
+
+
+class TestVirtualNoteGrid:
+    @pytest.mark.asyncio
+    async def test_only_visible_rows_are_mounted(self):
+        app = GridApp(make_notes(10_000))
+        async with app.run_test(size=(80, 20)) as pilot:
+            await pilot.pause()
+            # 20 rows / 5 per row = 4 visible rows + 1 overscan row, 3 columns
+            assert len(app.query(PostIt)) == 15
+            assert bound_titles(app)[:3] == ["Note 0", "Note 1", "Note 2"]
+
+    @pytest.mark.asyncio
+    async def test_scrolling_rebinds_without_new_widgets(self):
+        app = GridApp(make_notes(10_000))
+        async with app.run_test(size=(80, 20)) as pilot:
+            await pilot.pause()
+            before = {id(w) for w in app.query(PostIt)}
+            await pilot.press("end")
+            await pilot.pause()
+            assert {id(w) for w in app.query(PostIt)} == before
+            grid = app.query_one(VirtualNoteGrid)
+            assert grid.cursor == 9_999
+            assert "Note 9999" in bound_titles(app)
+            cursor = [w for w in app.query(PostIt) if w.has_class("-cursor")]
+            assert [w.note_id for w in cursor] == ["n9999"]
+
+    @pytest.mark.asyncio
+    async def test_trailing_slots_are_hidden(self):
+        app = GridApp(make_notes(4))
+        async with app.run_test(size=(80, 20)) as pilot:
+            await pilot.pause()
+            assert bound_titles(app) == ["Note 0", "Note 1", "Note 2", "Note 3"]
+
+    @pytest.mark.asyncio
+    async def test_enter_posts_selected_note(self):
+        app = GridApp(make_notes(20))
+        async with app.run_test(size=(80, 20)) as pilot:
+            await pilot.pause()
+            await pilot.press("down", "right", "enter")
+            await pilot.pause()
+            assert [note["id"] for note in app.selected] == ["n4"]
+
+    @pytest.mark.asyncio
+    async def test_set_notes_clamps_cursor(self):
+        app = GridApp(make_notes(100))
+        async with app.run_test(size=(80, 20)) as pilot:
+            await pilot.pause()
+            await pilot.press("end")
+            grid = app.query_one(VirtualNoteGrid)
+            grid.set_notes(make_notes(5))
+            await pilot.pause()
+            assert grid.cursor == 4
+            assert grid.top_row == 0
@@ -0,0 +1,85 @@
+"""Tests for the file watcher."""
+
+import threading
+import time
+
+import pytest
+
+from tui_notes.watcher import FileWatcher, fingerprint
+
+
+def wait_for(event, timeout=3.0):
+    return event.wait(timeout)
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def watcher(request):
+    changed = threading.Event()
+    watcher = FileWatcher(changed.set, poll_interval=0.05, settle=0.02, use_inotify=request.param)
+    watcher.changed = changed
+    yield watcher
+    watcher.stop()
+
+
+class TestFingerprint:
+    def test_missing_file(self, tmp_path):
+        assert fingerprint(tmp_path / "missing") is None
+
+    def test_same_content_same_hash(self, tmp_path):
+        path = tmp_path / "a"
+        path.write_text("x")
+        first = fingerprint(path)
+        path.write_text("x")
+        assert fingerprint(path)[2] == first[2]
+
+
+class TestFileWatcher:
+    def test_reports_external_write(self, watcher, tmp_path):
+        path = tmp_path / "notes.json"
+        path.write_text("old")
+        watcher.watch([path])
+        watcher.start()
+        path.write_text("new")
+        assert wait_for(watcher.changed)
+
+    def test_reports_file_created_and_replaced(self, watcher, tmp_path):
+        path = tmp_path / "notes.json"
+        watcher.watch([path])
+        watcher.start()
+        tmp = tmp_path / "notes.tmp"
+        tmp.write_text("new")
+        tmp.replace(path)
+        assert wait_for(watcher.changed)
+
+    def test_ignores_own_writes_and_touches(self, watcher, tmp_path):
+        path = tmp_path / "notes.json"
+        path.write_text("old")
+        watcher.watch([path])
+        watcher.start()
+        with watcher.writing():
+            path.write_text("mine")
+        path.write_text("mine")
+        time.sleep(0.3)
+        assert not watcher.changed.is_set()
+
+    def test_ignores_other_files(self, watcher, tmp_path):
+        watcher.watch([tmp_path / "notes.json"])
+        watcher.start()
+        (tmp_path / "other.json").write_text("x")
+        time.sleep(0.3)
+        assert not watcher.changed.is_set()
+
+    def test_trigger_reports_without_a_change(self, watcher, tmp_path):
+        path = tmp_path / "notes.json"
+        path.write_text("old")
+        watcher.watch([path])
+        watcher.start()
+        watcher.trigger()
+        assert wait_for(watcher.changed)
+
+    def test_backend(self, watcher, tmp_path):
+        watcher.watch([tmp_path / "notes.json"])
+        watcher.start()
+        assert watcher.backend in ("inotify", "polling")
+        if not watcher._use_inotify:
+            assert watcher.backend == "polling"
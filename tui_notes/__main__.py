@@ -1,12 +1,137 @@
 """Entry point for tui-notes application."""
 
-from tui_notes.app import NotesApp
+from __future__ import annotations
 
+import argparse
+import cProfile
+import json
+import os
+import sys
 
-def main() -> None:
-    """Run the tui-notes application."""
-    app = NotesApp()
-    app.run()
+from tui_notes import instrumentation
+from tui_notes.cli import add_commands, run_command
+from tui_notes.durability import DURABILITY_MODES
+from tui_notes.profiling import StartupProfile
+from tui_notes.storage import (
+    available_storage_engines,
+    daemon_socket_path,
+    get_durability,
+    get_storage_engine,
+    set_durability,
+    set_storage_engine,
+)
+from tui_notes.undo import UndoLog
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run a headless subcommand, or the tui-notes application without one.
+
+    Args:
+        argv: Command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(prog="tui-notes")
+    parser.add_argument(
+        "--storage",
+        choices=available_storage_engines(),
+        default=get_storage_engine(),
+        help="storage engine (default: %(default)s, or $TUI_NOTES_STORAGE)",
+    )
+    parser.add_argument(
+        "--durability",
+        choices=DURABILITY_MODES,
+        default=os.environ.get("TUI_NOTES_DURABILITY", get_durability()),
+        help="when saves are fsynced: never, batched at most once a second, or on every save "
+        "(default: %(default)s, or $TUI_NOTES_DURABILITY)",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const="text",
+        choices=("text", "json"),
+        help="start, exit after the first paint and print startup timings to stderr",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="collect timings of the hot paths and print a summary to stderr on exit",
+    )
+    parser.add_argument(
+        "--pstats",
+        metavar="FILE",
+        help="also run under cProfile and dump the stats to FILE (implies --profile)",
+    )
+    parser.add_argument(
+        "--sync",
+        metavar="TARGET",
+        default=os.environ.get("TUI_NOTES_SYNC"),
+        help="sync with a directory or http(s):// URL in the background while the TUI runs "
+        "(default: $TUI_NOTES_SYNC)",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="use the files directly even if a tui-notes daemon is running",
+    )
+    parser.add_argument(
+        "--keep-undo",
+        action="store_true",
+        help="keep the undo history across restarts (in undo-history.json)",
+    )
+    add_commands(parser)
+    args = parser.parse_args(argv)
+    try:
+        set_storage_engine(args.storage)
+        set_durability(args.durability)
+    except ValueError as exc:
+        parser.error(str(exc))
+    # Without a socket there is no daemon to attach to, so skip importing it.
+    if args.command != "daemon" and not args.no_daemon and daemon_socket_path().exists():
+        from tui_notes.daemon import attach  # pylint: disable=import-outside-toplevel
+
+        attach()
+
+    if args.command is not None:
+        sys.exit(run_command(args))
+
+    _run_app(args)
+
+
+def _run_app(args: argparse.Namespace) -> None:
+    """Start the TUI, with the profiling the arguments ask for.
+
+    Args:
+        args: Parsed arguments.
+    """
+    startup = StartupProfile() if args.profile_startup else None
+    metrics = instrumentation.enable() if args.profile or args.pstats else None
+    # Imported here so the headless subcommands never load Textual.
+    if startup is not None:
+        with startup.phase("import"):
+            from tui_notes.app import NotesApp  # pylint: disable=import-outside-toplevel
+    else:
+        from tui_notes.app import NotesApp  # pylint: disable=import-outside-toplevel
+
+    undo = UndoLog.load() if args.keep_undo else None
+    sync = None
+    if args.sync:
+        from tui_notes.sync import NoteSync, open_target  # pylint: disable=import-outside-toplevel
+
+        sync = NoteSync(open_target(args.sync))
+    app = NotesApp(startup_profile=startup, undo=undo, sync=sync)
+    if args.pstats:
+        profiler = cProfile.Profile()
+        profiler.runcall(app.run)
+        profiler.dump_stats(args.pstats)
+    else:
+        app.run()
+
+    if startup is not None:
+        if args.profile_startup == "json":
+            print(json.dumps(startup.as_dict()), file=sys.stderr)
+        else:
+            print(startup.format(), file=sys.stderr)
+    if metrics is not None:
+        print(metrics.format(), file=sys.stderr)
 
 
 if __name__ == "__main__":
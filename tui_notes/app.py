@@ -2,27 +2,64 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Any
+import threading
+import uuid
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable
 
-from textual.app import App, ComposeResult
+from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Grid
+from textual.css.query import NoMatches
 from textual.events import Key
 from textual.reactive import reactive
-from textual.widgets import Footer, Header
-
-from tui_notes.constants import GRID_COLUMNS, MAX_NOTES
-from tui_notes.screens import ColorPickerScreen, ConfirmScreen, EditPostItScreen, HelpScreen
-from tui_notes.storage import load_notes, save_notes
-from tui_notes.widgets import EmptySlot, PostIt
-
-
-class NotesApp(App):
-    """A TUI application for managing post-it notes in a 3x3 grid."""
+from textual.widgets import Footer, Header, Static
+
+from tui_notes import instrumentation, screens, widgets
+from tui_notes.constants import (
+    BLOB_MIN_CHARS,
+    DEFAULT_BOARD,
+    GRID_COLUMNS,
+    MAX_NOTES,
+    SAVE_DEBOUNCE_SECONDS,
+    SAVE_MAX_LATENCY_SECONDS,
+    SYNC_INTERVAL_SECONDS,
+)
+from tui_notes.mixins import BoardsMixin, DraftsMixin, ExportMixin, ImportMixin, SyncMixin
+from tui_notes.profiling import StartupProfile
+from tui_notes.saver import WriteBehindSaver
+from tui_notes.search import SearchIndex
+from tui_notes.storage import (
+    ConflictError,
+    close_storage,
+    get_daemon,
+    load_boards,
+    load_notes,
+    read_body,
+    save_notes,
+    split_body,
+    watch_paths,
+)
+from tui_notes.undo import UndoError, UndoLog
+from tui_notes.watcher import FileWatcher
+from tui_notes.widgets import PostIt
+
+if TYPE_CHECKING:
+    # Imported where they are used, so starting the app does not load them.
+    from tui_notes.drafts import DraftStore
+    from tui_notes.history import NoteHistory
+    from tui_notes.sync import NoteSync
+
+
+class NotesApp(  # pylint: disable=too-many-ancestors,too-many-public-methods,too-many-instance-attributes
+    BoardsMixin, DraftsMixin, ExportMixin, ImportMixin, SyncMixin
+):
+    """A TUI application for managing post-it notes on boards of 3x3 grids."""
 
     CSS_PATH = "style.tcss"
     TITLE = "TUI Notes"
+    # Ctrl+P opens the note quick-jump palette instead of Textual's command palette.
+    ENABLE_COMMAND_PALETTE = False
 
     BINDINGS = [
         Binding("q", "quit", "Quit"),
@@ -31,33 +68,181 @@ class NotesApp(App):
         Binding("e", "edit_note", "Edit"),
         Binding("enter", "edit_note", "Edit", show=False),
         Binding("c", "change_color", "Color"),
+        Binding("u", "undo", "Undo"),
+        Binding("U", "redo", "Redo", show=False),
+        Binding("h", "history", "History", show=False),
         Binding("m", "toggle_move", "Move"),
         Binding("escape", "cancel_move", "Cancel", show=False),
         Binding("ctrl+s", "save", "Save"),
         Binding("ctrl+r", "reload", "Reload"),
         Binding("ctrl+e", "export", "Export"),
+        Binding("i", "import_notes", "Import"),
+        Binding("left_square_bracket", "prev_board", "Prev board", show=False),
+        Binding("right_square_bracket", "next_board", "Next board", show=False),
+        Binding("n", "new_board", "Board"),
+        Binding("N", "rename_board", "Rename board", show=False),
+        Binding("D", "delete_board", "Delete board", show=False),
+        Binding("o", "overview", "Overview"),
+        Binding("slash", "search", "Search"),
+        Binding("ctrl+p", "quick_jump", "Jump"),
         Binding("question_mark", "help", "Help"),
+        Binding("f12", "toggle_debug", "Debug", show=False),
     ]
 
     move_mode: reactive[bool] = reactive(False)
     _moving_post_it: PostIt | None = None
     _note_counter: int = 0
+    _snapshot_scheduled: bool = False
+    _index_loaded: bool = False
+    _frames_timed: bool = False
+    _closing: bool = False
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        save_debounce: float = SAVE_DEBOUNCE_SECONDS,
+        save_max_latency: float = SAVE_MAX_LATENCY_SECONDS,
+        startup_profile: StartupProfile | None = None,
+        undo: UndoLog | None = None,
+        drafts: DraftStore | None = None,
+        history: NoteHistory | None = None,
+        sync: NoteSync | None = None,
+    ) -> None:
+        """Initialize the app and its write-behind saver.
+
+        Args:
+            save_debounce: Seconds without mutations before notes are written.
+            save_max_latency: Maximum seconds a mutation may wait to be written.
+            startup_profile: If given, time the startup phases into it and
+                exit as soon as the first frame is painted.
+            undo: Undo history to continue, e.g. one loaded from disk. It is
+                saved on exit if it has a path. Defaults to an empty history.
+            drafts: Where edits are checkpointed. Defaults to drafts.jsonl,
+                opened on first use.
+            history: Where revisions of saved notes are kept. Defaults to
+                the history directory, opened on first use.
+            sync: If given, run it in the background on start and every
+                SYNC_INTERVAL_SECONDS.
+        """
+        super().__init__()
+        self._startup_profile = startup_profile
+        if instrumentation.active() is not None:
+            self._time_frames()
+        if startup_profile is not None:
+            self.stylesheet.read_all = startup_profile.wrap(  # type: ignore[method-assign]
+                "css", self.stylesheet.read_all
+            )
+            self.stylesheet.parse = startup_profile.wrap(  # type: ignore[method-assign]
+                "css", self.stylesheet.parse
+            )
+        self._watcher: FileWatcher | None = None
+        self._saver = WriteBehindSaver(
+            self,
+            self._write_notes,
+            debounce=save_debounce,
+            max_latency=save_max_latency,
+            on_error=self._on_save_error,
+            on_conflict=self._on_save_conflict,
+        )
+        self._conflicts: dict[str, ConflictError] = {}
+        self._undo = undo or UndoLog()
+        self._undo_base: list[dict[str, Any]] = []
+        self._drafts = drafts
+        self._unsaved_drafts: list[str] = []
+        self._history = history
+        self._stores_lock = threading.Lock()
+        self._sync = sync
+        self._syncing = False
+        self._sync_failed = False
+        self._boards: list[dict[str, str]] = []
+        self._board_id = DEFAULT_BOARD
+        self._board_cache: dict[str, list[dict[str, Any]]] = {}
+        self._index = SearchIndex()
 
     # ── Lifecycle ───────────────────────────────────────────────
 
     def compose(self) -> ComposeResult:
         """Compose the application layout with header, grid, and footer."""
         yield Header()
+        yield Static(id="board-bar")
         yield Grid(
-            *[EmptySlot() for _ in range(MAX_NOTES)],
+            *[PostIt.empty_slot(idx) for idx in range(MAX_NOTES)],
             id="notes-grid",
         )
         yield Footer()
 
     def on_mount(self) -> None:
-        """Load saved notes from disk and focus the first slot."""
-        self._load_from_disk()
+        """Load the board index and the first board, then focus the first slot.
+
+        Everything the first frame does not need (the search index and the
+        neighbouring boards) is loaded after it is painted.
+        """
+        self._boards = load_boards()
+        self._board_id = self._boards[0]["id"]
+        self._update_board_bar()
+        if self._startup_profile is not None:
+            with self._startup_profile.phase("load_from_disk"):
+                self._load_from_disk()
+        else:
+            self._load_from_disk()
         self._focus_first()
+        self.call_after_refresh(self._after_first_paint)
+
+    def on_ready(self) -> None:
+        """Record the first paint when profiling startup, then exit."""
+        if self._startup_profile is not None:
+            self._startup_profile.mark_first_paint()
+            self.exit()
+
+    def _after_first_paint(self) -> None:
+        """Load the persisted search index and start the background loaders."""
+        self._index = SearchIndex.load()
+        self._index_loaded = True
+        self._index.sync_board(self._board_id, self._serialize_notes())
+        self._prefetch_neighbours()
+        self._index_unindexed_boards()
+        self.run_worker(self._load_drafts, name="drafts-load", thread=True, exit_on_error=False)
+        daemon = get_daemon()
+        if daemon is not None:
+            daemon.subscribe(self._on_daemon_event)
+        else:
+            self._start_watcher()
+        if self._sync is not None:
+            self._start_sync()
+            self.set_interval(SYNC_INTERVAL_SECONDS, self._start_sync)
+
+    def _start_watcher(self) -> None:
+        """Watch the active board's files for changes by other programs."""
+        self._watcher = FileWatcher(self._on_files_changed)
+        self._watcher.watch(watch_paths(self._board_id))
+        self._watcher.start()
+
+    def on_unmount(self) -> None:
+        """Write pending changes before the app shuts down, even after a crash."""
+        self._closing = True
+        daemon = get_daemon()
+        if daemon is not None:
+            daemon.unsubscribe(self._on_daemon_event)
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+        try:
+            self._saver.flush()
+            self._close_saved_drafts()
+        except OSError as exc:
+            self.log.error(f"Save error on exit: {exc}")
+        try:
+            # Until the persisted index is loaded, self._index holds only
+            # the active board and must not overwrite it.
+            if self._index_loaded:
+                self._index.save()
+        except OSError as exc:
+            self.log.error(f"Search index not saved: {exc}")
+        if self._undo.path is not None:
+            try:
+                self._undo.save()
+            except OSError as exc:
+                self.log.error(f"Undo history not saved: {exc}")
+        close_storage()
 
     # ── Grid helpers ────────────────────────────────────────────
 
@@ -65,17 +250,34 @@ class NotesApp(App):
         """Return the notes grid widget.
 
         Returns:
-            The Grid container holding all post-its and empty slots.
+            The Grid container holding the slot widgets.
         """
         return self.query_one("#notes-grid", Grid)
 
+    def _get_slots(self) -> list[PostIt]:
+        """Return the grid's slot widgets, empty or not, in position order.
+
+        Returns:
+            One PostIt per grid position; they are never remounted.
+        """
+        return list(self._get_grid().query_children(PostIt))
+
     def _get_post_its(self) -> list[PostIt]:
-        """Return all active post-it widgets in DOM order.
+        """Return the slot widgets that show a note, in position order.
 
         Returns:
-            List of PostIt widgets currently in the grid.
+            List of PostIt widgets holding notes.
         """
-        return list(self.query(PostIt))
+        return [slot for slot in self._get_slots() if not slot.empty]
+
+    def _focused_note(self) -> PostIt | None:
+        """Return the focused slot if it shows a note.
+
+        Returns:
+            The focused PostIt, or None if an empty slot or nothing has focus.
+        """
+        focused = self.focused
+        return focused if isinstance(focused, PostIt) and not focused.empty else None
 
     def _focus_first(self) -> None:
         """Focus the first child in the grid."""
@@ -86,151 +288,479 @@ class NotesApp(App):
     # ── Persistence ─────────────────────────────────────────────
 
     def _save_to_disk(self) -> None:
-        """Serialize all post-its and save to the JSON file."""
-        grid = self._get_grid()
-        children = list(grid.children)
-        data: list[dict[str, Any]] = [
-            child.to_dict(grid_index=idx)
-            for idx, child in enumerate(children)
-            if isinstance(child, PostIt)
+        """Schedule a write-behind save once pending mounts and removals settle."""
+        self._snapshot_scheduled = True
+        self.call_next(self._submit_snapshot)
+
+    def _write_notes(
+        self, notes: list[dict[str, Any]], board: str, prefer: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Saver write function: save a board without reporting it as an external change.
+
+        If the save merged in another program's changes, the watcher is
+        triggered so the grid picks them up. The saved notes are then
+        added to the revision history.
+
+        Args:
+            notes: Note dicts to persist.
+            board: Board id.
+            prefer: How to settle conflicts, see save_notes.
+
+        Returns:
+            The notes as saved.
+
+        Raises:
+            ConflictError: If another program changed the same notes and
+                prefer is None.
+            OSError: If the notes cannot be written.
+        """
+        watcher = self._watcher
+        if watcher is None:
+            saved = save_notes(notes, board, prefer=prefer)
+        else:
+            with watcher.writing():
+                saved = save_notes(notes, board, prefer=prefer)
+            if saved != notes:
+                watcher.trigger()
+        try:
+            self._get_history().record(board, saved)
+        except OSError as exc:
+            # The notes are saved; only this revision is missing.
+            self.log.error(f"History not written: {exc}")
+        return saved
+
+    def _serialize_notes(self) -> list[dict[str, Any]]:
+        """Serialize the post-its of the active board.
+
+        Returns:
+            Note dicts with positions taken from the grid order.
+        """
+        return [
+            slot.to_dict(grid_index=idx)
+            for idx, slot in enumerate(self._get_slots())
+            if not slot.empty
         ]
+
+    def _submit_snapshot(self) -> None:
+        """Serialize all post-its, record the change for undo and hand them to the saver."""
+        if not self._snapshot_scheduled:
+            return
+        self._snapshot_scheduled = False
+        notes = self._serialize_notes()
+        self._undo.record(self._board_id, self._undo_base, notes)
+        self._undo_base = notes
+        self._saver.submit(notes, self._board_id)
+
+    def flush_saves(self) -> None:
+        """Write pending changes now instead of waiting for the debounce window."""
         try:
-            save_notes(data)
+            self._saver.flush()
         except OSError as exc:
-            self.notify(f"Save error: {exc}", severity="error")
+            self._on_save_error(exc)
+
+    def _on_save_error(self, exc: OSError) -> None:
+        """Report a failed save to the user.
+
+        Args:
+            exc: The error raised while writing the notes file.
+        """
+        self.notify(f"Save error: {exc}", severity="error")
+
+    def _load_board(self, board: str) -> list[dict[str, Any]]:
+        """Read a board through the saver, so its unwritten changes are included.
+
+        Args:
+            board: Board id.
 
+        Returns:
+            The board's note dicts.
+        """
+        return self._saver.load(board, load_notes)
+
+    def _notes_in_memory(self) -> dict[str, list[dict[str, Any]]]:
+        """Return the notes already in memory: the active board and the prefetched ones.
+
+        Returns:
+            Note dicts by board id.
+        """
+        return {**self._board_cache, self._board_id: self._serialize_notes()}
+
+    def _load_known(
+        self, known: dict[str, list[dict[str, Any]]], board: str
+    ) -> list[dict[str, Any]]:
+        """Return a board's notes, read only if they are not among the known ones.
+
+        Safe to call from a worker thread.
+
+        Args:
+            known: Notes already in memory, as returned by _notes_in_memory.
+            board: Board id.
+
+        Returns:
+            The board's note dicts.
+        """
+        notes = known.get(board)
+        return notes if notes is not None else self._load_board(board)
+
+    @instrumentation.timed("app.load_from_disk")
     def _load_from_disk(self) -> None:
-        """Load post-its from disk and place them at their saved positions."""
-        notes = load_notes()
-        if not notes:
-            return
+        """Load the active board's post-its and place them at their saved positions.
 
-        grid = self._get_grid()
-        children = list(grid.children)
-
-        for note in notes:
-            pos = note["position"]
-            if (
-                0 <= pos < MAX_NOTES
-                and pos < len(children)
-                and isinstance(children[pos], EmptySlot)
-            ):
-                post_it = PostIt.from_dict(note)
-                grid.mount(post_it, before=children[pos])
-                children[pos].remove()
-                self._note_counter += 1
+        Only the active board is read; other boards stay on disk until
+        they are prefetched or switched to.
+        """
+        self._show_notes(self._load_board(self._board_id))
+
+    def _show_notes(self, notes: list[dict[str, Any]]) -> None:
+        """Show the given notes by rebinding the slot widgets in place.
+
+        A slot is rebound only if its note differs, so only the reactives
+        of changed fields fire; a slot that stays empty is left alone. No
+        widget is mounted, removed or moved in the grid.
+
+        Args:
+            notes: Note dicts of the board to display.
+        """
+        notes = [note if note.get("id") else {**note, "id": uuid.uuid4().hex} for note in notes]
+        self._undo_base = notes
+        self._index.sync_board(self._board_id, notes)
+        by_position: dict[int, dict[str, Any]] = {}
+        for entry in notes:
+            by_position.setdefault(entry["position"], entry)
+
+        self._note_counter = 0
+        for idx, slot in enumerate(self._get_slots()):
+            note = by_position.get(idx)
+            if note is None:
+                if not slot.empty:
+                    slot.clear()
+                continue
+            self._note_counter += 1
+            if slot.empty or slot.to_dict(grid_index=idx) != note:
+                slot.bind(note)
 
     def action_save(self) -> None:
         """Save notes to disk manually."""
-        self._save_to_disk()
+        self._snapshot_scheduled = True
+        self._submit_snapshot()
+        self.flush_saves()
         self.notify("Notes saved!")
 
     def action_reload(self) -> None:
         """Reload all notes from disk, discarding unsaved changes."""
-        grid = self._get_grid()
-        for child in list(grid.children):
-            child.remove()
-        for _ in range(MAX_NOTES):
-            grid.mount(EmptySlot())
-        self._note_counter = 0
+        self._submit_snapshot()
+        self.flush_saves()
+        if self.move_mode:
+            self._exit_move_mode()
+        self._board_cache.clear()
         self._load_from_disk()
-        self.set_timer(0.1, self._focus_first)
+        self.call_after_refresh(self._focus_first)
+        self._prefetch_neighbours()
         self.notify("Notes reloaded!")
 
+    def _show_notes_in_place(self, notes: list[dict[str, Any]]) -> None:
+        """Show notes of the active board, keeping focus and move mode on their notes.
+
+        Args:
+            notes: The board's new notes.
+        """
+        children = list(self._get_grid().children)
+        focused = self.focused
+        focused_idx = children.index(focused) if focused in children else None
+        note = self._focused_note()
+        focused_id = note.note_id if note is not None else None
+        moving_id = self._moving_post_it.note_id if self._moving_post_it is not None else None
+        with self.batch_update():
+            self._show_notes(notes)
+        self.call_after_refresh(self._restore_selection, focused_id, focused_idx, moving_id)
+
+    # ── Undo ────────────────────────────────────────────────────
+
+    def action_undo(self) -> None:
+        """Undo the active board's latest change."""
+        self._travel(self._undo.undo, "Nothing to undo.")
+
+    def action_redo(self) -> None:
+        """Redo the active board's latest undone change."""
+        self._travel(self._undo.redo, "Nothing to redo.")
+
+    def _travel(
+        self,
+        step: Callable[[str, list[dict[str, Any]]], list[dict[str, Any]] | None],
+        empty_message: str,
+    ) -> None:
+        """Move through the undo history and show the result in place.
+
+        Args:
+            step: UndoLog.undo or UndoLog.redo.
+            empty_message: Shown if there is nothing to step to.
+        """
+        self._submit_snapshot()
+        try:
+            notes = step(self._board_id, self._undo_base)
+        except UndoError as exc:
+            self.notify(f"{exc} Undo history of this board cleared.", severity="warning")
+            return
+        if notes is None:
+            self.notify(empty_message, severity="warning")
+            return
+        self._show_notes_in_place(notes)
+        self._save_to_disk()
+
+    def _restore_selection(
+        self, focused_id: str | None, focused_idx: int | None, moving_id: str | None
+    ) -> None:
+        """Put focus and move mode back on their notes after the grid changed.
+
+        Args:
+            focused_id: Note that had focus, if any.
+            focused_idx: Slot that had focus, used if the note is gone.
+            moving_id: Note being moved in move mode, if any.
+        """
+        by_id = {post_it.note_id: post_it for post_it in self._get_post_its()}
+        if moving_id is not None and self.move_mode:
+            target = by_id.get(moving_id)
+            if self._moving_post_it is not target:
+                if self._moving_post_it is not None:
+                    self._moving_post_it.remove_class("moving")
+                self._moving_post_it = target
+                if target is None:
+                    self.move_mode = False
+                else:
+                    target.add_class("moving")
+        if focused_idx is None:
+            return
+        children = list(self._get_grid().children)
+        target_widget = by_id.get(focused_id or "") or children[min(focused_idx, len(children) - 1)]
+        if self.focused is not target_widget:
+            target_widget.focus()
+
+    # ── Search ──────────────────────────────────────────────────
+
+    def _index_unindexed_boards(self) -> None:
+        """Index, in the background, the boards missing from the persisted index."""
+        missing = [b["id"] for b in self._boards if b["id"] not in self._index.boards]
+        missing = [board for board in missing if board != self._board_id]
+        if missing:
+            self.run_worker(
+                partial(self._index_boards, missing),
+                name="index-boards",
+                group="index",
+                thread=True,
+                exit_on_error=False,
+            )
+
+    def _index_boards(self, boards: list[str]) -> None:
+        """Worker: load boards and add their notes to the search index.
+
+        Args:
+            boards: Board ids to index.
+        """
+        for board in boards:
+            try:
+                self._index.sync_board(board, self._load_board(board))
+            except OSError:
+                continue
+
+    def action_search(self) -> None:
+        """Open the search modal over the notes of every board."""
+        if self.move_mode:
+            self._exit_move_mode()
+        names = {board["id"]: board["name"] for board in self._boards}
+        self.push_screen(
+            screens.SearchScreen(self._index, names), callback=self._open_search_result
+        )
+
+    def action_quick_jump(self) -> None:
+        """Open the fuzzy quick-jump palette over the note titles of every board."""
+        if self.move_mode:
+            self._exit_move_mode()
+        names = {board["id"]: board["name"] for board in self._boards}
+        self.push_screen(
+            screens.QuickJumpScreen(self._index, names), callback=self._open_search_result
+        )
+
+    def _open_search_result(self, result: dict[str, Any] | None) -> None:
+        """Jump to the note picked in the search modal or quick-jump palette.
+
+        Args:
+            result: The chosen search result, or None if cancelled.
+        """
+        if result is not None and any(b["id"] == result["board"] for b in self._boards):
+            self._jump_to_note(result["board"], result["id"])
+
     # ── CRUD actions ────────────────────────────────────────────
 
     def action_add_note(self) -> None:
         """Add a new post-it at the focused position (or next available)."""
-        post_its = self._get_post_its()
-        if len(post_its) >= MAX_NOTES:
+        slots = self._get_slots()
+        empty = [slot for slot in slots if slot.empty]
+        if not empty:
             self.notify("Grid is full! Remove a note first.", severity="warning")
             return
 
         focused = self.focused
-        grid = self._get_grid()
-        children = list(grid.children)
-
-        idx = children.index(focused) if isinstance(focused, EmptySlot) else len(post_its)
+        slot = focused if isinstance(focused, PostIt) and focused in empty else empty[0]
+        idx = slots.index(slot)
 
         self._note_counter += 1
-        new_post_it = PostIt(idx, title=f"Note {self._note_counter}")
-
-        if isinstance(focused, EmptySlot):
-            grid.mount(new_post_it, before=focused)
-            focused.remove()
-        else:
-            empty_slots = list(self.query("EmptySlot"))
-            if empty_slots:
-                empty_slots[-1].remove()
-            grid.mount(new_post_it)
-
-        new_post_it.focus()
-        self.notify(f"Added: {new_post_it.title}")
+        slot.bind({"position": idx, "title": f"Note {self._note_counter}", "content": ""})
+        slot.focus()
+        self._index.update_note(self._board_id, slot.to_dict(grid_index=idx))
+        self.notify(f"Added: {slot.title}")
         self._save_to_disk()
 
     def action_delete_note(self) -> None:
         """Delete the focused post-it after user confirmation."""
-        focused = self.focused
-        if not isinstance(focused, PostIt):
+        focused = self._focused_note()
+        if focused is None:
             self.notify("Select a note to delete.", severity="warning")
             return
 
         self.push_screen(
-            ConfirmScreen(f"Delete '{focused.title}'?"),
+            screens.ConfirmScreen(f"Delete '{focused.title}'?"),
             callback=lambda confirmed: self._do_delete(focused, confirmed),
         )
 
     def _do_delete(self, post_it: PostIt, confirmed: bool) -> None:
-        """Replace the confirmed post-it with an empty slot in-place.
+        """Turn the confirmed post-it's slot into an empty slot in place.
 
         Args:
-            post_it: The PostIt widget to remove.
+            post_it: The PostIt widget showing the note.
             confirmed: Whether the user confirmed the deletion.
         """
         if not confirmed:
             return
 
-        title = post_it.title
+        title, note_id = post_it.title, post_it.note_id
         self._note_counter -= 1
-        grid = self._get_grid()
-        empty = EmptySlot()
-        grid.mount(empty, before=post_it)
-        post_it.remove()
-        empty.focus()
+        post_it.clear()
+        post_it.focus()
+        self._index.remove_note(self._board_id, note_id)
         self.notify(f"Deleted: {title}")
         self._save_to_disk()
 
     def action_edit_note(self) -> None:
         """Open the edit modal for the focused post-it."""
-        focused = self.focused
-        if isinstance(focused, PostIt):
+        focused = self._focused_note()
+        if focused is not None:
+            draft = uuid.uuid4().hex
             self.push_screen(
-                EditPostItScreen(focused.title, focused.content),
-                callback=lambda result: self._apply_edit(focused, result),
+                screens.EditPostItScreen(
+                    focused.title,
+                    focused.content,
+                    partial(read_body, focused.to_dict()) if focused.blob else None,
+                    partial(self._get_drafts().checkpoint, draft, self._board_id, focused.note_id),
+                ),
+                callback=lambda result: self._apply_edit(focused, result, draft),
             )
 
-    def _apply_edit(self, post_it: PostIt, result: dict[str, str] | None) -> None:
+    def _apply_edit(
+        self, post_it: PostIt, result: dict[str, str] | None, draft: str | None = None
+    ) -> None:
         """Apply edits returned from the edit modal.
 
+        A body long enough to be stored out of line is written to the blob
+        store in a worker first; the widget is updated when it is stored.
+
         Args:
             post_it: The PostIt widget being edited.
             result: Dict with 'title' and 'content' keys, or None if cancelled.
+            draft: Id of the edit's draft; it is closed once the edit is on disk.
+        """
+        if result is not None and len(result["content"]) > BLOB_MIN_CHARS:
+            self.run_worker(
+                partial(self._store_body, self._board_id, post_it.note_id, result, draft),
+                name="store-body",
+                group="store-body",
+                thread=True,
+                exit_on_error=False,
+            )
+            return
+        self._finish_edit(post_it, result, None, draft)
+
+    def _store_body(
+        self, board: str, note_id: str, result: dict[str, str], draft: str | None
+    ) -> None:
+        """Worker: store a long body out of line and hand the edit back to the UI thread.
+
+        Args:
+            board: Board of the edited note.
+            note_id: Id of the edited note.
+            result: Dict with 'title' and the full 'content'.
+            draft: Id of the edit's draft.
         """
+        try:
+            content, blob = split_body(result["content"])
+        except OSError as exc:
+            self.call_from_thread(
+                self.notify, f"Cannot store long note apart: {exc}", severity="warning"
+            )
+            content, blob = result["content"], None
+        edit = {"title": result["title"], "content": content}
+        self.call_from_thread(self._apply_stored_edit, board, note_id, edit, blob, draft)
+
+    def _apply_stored_edit(
+        self,
+        board: str,
+        note_id: str,
+        result: dict[str, str],
+        blob: str | None,
+        draft: str | None,
+    ) -> None:
+        """Apply an edit whose long body was stored, wherever its note moved meanwhile.
+
+        If the note left the active board meanwhile, its draft stays open so
+        the edit is offered for recovery on the next start.
+
+        Args:
+            board: Board of the edited note.
+            note_id: Id of the edited note.
+            result: Dict with 'title' and 'content', a preview if blob is set.
+            blob: Reference of the stored body, or None to keep content inline.
+            draft: Id of the edit's draft.
+        """
+        post_it = next((p for p in self._get_post_its() if p.note_id == note_id), None)
+        if board != self._board_id or post_it is None:
+            self.notify("The note changed before the edit was stored.", severity="warning")
+            return
+        self._finish_edit(post_it, result, blob, draft)
+
+    def _finish_edit(
+        self,
+        post_it: PostIt,
+        result: dict[str, str] | None,
+        blob: str | None,
+        draft: str | None,
+    ) -> None:
+        """Show an edit in its widget and save it, then close its draft.
+
+        Args:
+            post_it: The PostIt widget being edited.
+            result: Dict with 'title' and 'content' keys, or None if cancelled.
+            blob: Reference of the out-of-line body, or None if content is the body.
+            draft: Id of the edit's draft; it is closed once the edit is on disk.
+        """
+        if draft is not None:
+            self._unsaved_drafts.append(draft)
+            self.set_timer(self._saver.max_latency, self._close_saved_drafts)
         if result is not None:
             post_it.title = result["title"]
             post_it.content = result["content"]
+            post_it.blob = blob
+            self._index.update_note(self._board_id, post_it.to_dict())
             self._save_to_disk()
 
     # ── Color ───────────────────────────────────────────────────
 
     def action_change_color(self) -> None:
         """Open the color picker for the focused post-it."""
-        focused = self.focused
-        if not isinstance(focused, PostIt):
+        focused = self._focused_note()
+        if focused is None:
             self.notify("Select a note to change color.", severity="warning")
             return
         self.push_screen(
-            ColorPickerScreen(),
+            screens.ColorPickerScreen(),
             callback=lambda idx: self._apply_color(focused, idx),
         )
 
@@ -245,34 +775,30 @@ class NotesApp(App):
             post_it.color_index = color_idx
             self._save_to_disk()
 
-    # ── Export ──────────────────────────────────────────────────
-
-    def action_export(self) -> None:
-        """Export all post-its to a Markdown file in the user's home directory."""
-        post_its = self._get_post_its()
-        if not post_its:
-            self.notify("No notes to export.", severity="warning")
-            return
-
-        lines = ["# TUI Notes Export\n"]
-        for post_it in post_its:
-            lines.append(f"## {post_it.title}\n")
-            if post_it.content:
-                lines.append(f"{post_it.content}\n")
-            lines.append("")
+    # ── Help ────────────────────────────────────────────────────
 
-        export_path = Path.home() / "tui-notes-export.md"
+    def action_toggle_debug(self) -> None:
+        """Show or hide the debug overlay, starting instrumentation on first use."""
         try:
-            export_path.write_text("\n".join(lines), encoding="utf-8")
-            self.notify(f"Exported to {export_path}")
-        except OSError as exc:
-            self.notify(f"Export error: {exc}", severity="error")
-
-    # ── Help ────────────────────────────────────────────────────
+            overlay = self.query_one("#debug-overlay", widgets.DebugOverlay)
+        except NoMatches:
+            overlay = widgets.DebugOverlay(lambda: self._saver.pending_writes, id="debug-overlay")
+            overlay.display = False
+            self.mount(overlay, before=self._get_grid())
+        self._time_frames()
+        overlay.toggle()
+
+    def _time_frames(self) -> None:
+        """Time every frame written to the terminal into the app.frame histogram."""
+        if not self._frames_timed:
+            self._frames_timed = True
+            self._display = instrumentation.wrap(  # type: ignore[method-assign]
+                "app.frame", self._display
+            )
 
     def action_help(self) -> None:
         """Show the help screen with all keyboard shortcuts."""
-        self.push_screen(HelpScreen())
+        self.push_screen(screens.HelpScreen())
 
     # ── Move mode ───────────────────────────────────────────────
 
@@ -286,8 +812,8 @@ class NotesApp(App):
 
     def action_toggle_move(self) -> None:
         """Enter or exit move mode for the focused post-it."""
-        focused = self.focused
-        if not isinstance(focused, PostIt):
+        focused = self._focused_note()
+        if focused is None:
             self.notify("Select a note to move.", severity="warning")
             return
 
@@ -339,6 +865,7 @@ class NotesApp(App):
             return current_idx + 1
         return None
 
+    @instrumentation.timed("app.on_key")
     def on_key(self, event: Key) -> None:
         """Handle arrow keys for grid navigation and move mode.
 
@@ -379,28 +906,28 @@ class NotesApp(App):
 
     # ── Swap logic ──────────────────────────────────────────────
 
+    @instrumentation.timed("app.swap_positions")
     def _swap_positions(self, idx_a: int, idx_b: int) -> None:
-        """Swap two grid positions. Supports PostIt↔PostIt and PostIt↔EmptySlot.
+        """Swap the notes of two grid positions, either of which may be empty.
 
         Args:
             idx_a: First grid index.
             idx_b: Second grid index.
         """
-        grid = self._get_grid()
-        children = list(grid.children)
+        slots = self._get_slots()
 
-        if idx_a >= len(children) or idx_b >= len(children):
+        if idx_a >= len(slots) or idx_b >= len(slots):
             return
 
-        widget_a = children[idx_a]
-        widget_b = children[idx_b]
+        widget_a = slots[idx_a]
+        widget_b = slots[idx_b]
 
-        if isinstance(widget_a, PostIt) and isinstance(widget_b, PostIt):
+        if not widget_a.empty and not widget_b.empty:
             self._swap_post_its(widget_a, widget_b)
-        elif isinstance(widget_a, PostIt) and isinstance(widget_b, EmptySlot):
-            self._move_to_empty(widget_a, widget_b, idx_b, grid)
-        elif isinstance(widget_a, EmptySlot) and isinstance(widget_b, PostIt):
-            self._move_to_empty(widget_b, widget_a, idx_a, grid)
+        elif not widget_a.empty:
+            self._move_to_empty(widget_a, widget_b, idx_b)
+        elif not widget_b.empty:
+            self._move_to_empty(widget_b, widget_a, idx_a)
 
         self._save_to_disk()
 
@@ -411,8 +938,10 @@ class NotesApp(App):
             widget_a: First post-it.
             widget_b: Second post-it.
         """
+        widget_a.note_id, widget_b.note_id = widget_b.note_id, widget_a.note_id
         widget_a.title, widget_b.title = widget_b.title, widget_a.title
         widget_a.content, widget_b.content = widget_b.content, widget_a.content
+        widget_a.blob, widget_b.blob = widget_b.blob, widget_a.blob
         widget_a.color_index, widget_b.color_index = widget_b.color_index, widget_a.color_index
 
         if self._moving_post_it is widget_a:
@@ -420,29 +949,20 @@ class NotesApp(App):
         elif self._moving_post_it is widget_b:
             self._transfer_moving_class(widget_b, widget_a)
 
-    def _move_to_empty(
-        self, post_it: PostIt, empty: EmptySlot, target_idx: int, grid: Grid
-    ) -> None:
-        """Move a PostIt to an EmptySlot position, leaving an EmptySlot behind.
+    def _move_to_empty(self, post_it: PostIt, empty: PostIt, target_idx: int) -> None:
+        """Move a note to an empty slot by rebinding both slots in place.
 
         Args:
-            post_it: The post-it being moved.
+            post_it: The slot showing the note being moved.
             empty: The empty slot at the target position.
             target_idx: The grid index of the target position.
-            grid: The grid container.
         """
-        new_post = PostIt.from_dict(post_it.to_dict(grid_index=target_idx))
-        new_empty = EmptySlot()
-
-        grid.mount(new_post, before=empty)
-        empty.remove()
-        grid.mount(new_empty, before=post_it)
-        post_it.remove()
-
+        empty.bind(post_it.to_dict(grid_index=target_idx))
+        post_it.clear()
         if self._moving_post_it is post_it:
-            self._moving_post_it = new_post
-        new_post.add_class("moving")
-        new_post.focus()
+            self._transfer_moving_class(post_it, empty)
+        else:
+            empty.focus()
 
     def _transfer_moving_class(self, from_widget: PostIt, to_widget: PostIt) -> None:
         """Transfer the 'moving' visual class from one post-it to another.
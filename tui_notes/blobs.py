@@ -0,0 +1,139 @@
+"""Content-addressed store for note bodies kept out of line.
+
+A body is stored once under the SHA-256 digest of its UTF-8 text, in a
+directory named after the first two hex digits. A file is never changed
+after it is written, so readers need no locking and a body shared by
+several notes, boards or undo entries is stored once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Iterable
+
+from tui_notes.durability import SyncPolicy
+
+DIGEST_PATTERN = re.compile(r"[0-9a-f]{64}")
+"""Shape of a blob reference."""
+
+
+def digest_of(text: str) -> str:
+    """Return the reference a body is stored under.
+
+    Args:
+        text: The body.
+
+    Returns:
+        Hex SHA-256 digest of the UTF-8 text.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class BlobStore:
+    """Note bodies in files named by their digest."""
+
+    def __init__(self, root: Path, durability: SyncPolicy | None = None) -> None:
+        """Initialize the store. The directory is created on first write.
+
+        Args:
+            root: Directory holding the blobs.
+            durability: Policy deciding when new blobs are fsynced; none
+                are without one.
+        """
+        self.root = root
+        self.durability = durability
+
+    def path(self, digest: str) -> Path:
+        """Return the file of a blob.
+
+        Args:
+            digest: Blob reference.
+
+        Returns:
+            Path of the blob, which need not exist.
+
+        Raises:
+            ValueError: If the reference is malformed.
+        """
+        if not DIGEST_PATTERN.fullmatch(digest):
+            raise ValueError(f"Not a blob reference: {digest!r}")
+        return self.root / digest[:2] / digest
+
+    def put(self, text: str) -> str:
+        """Store a body unless it is already stored.
+
+        Args:
+            text: The body.
+
+        Returns:
+            Its reference.
+
+        Raises:
+            OSError: If the blob cannot be written.
+        """
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if path.exists():
+            return digest
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_name(f".{digest}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            with open(tmp_file, "wb") as fh:
+                fh.write(data)
+                if self.durability is not None:
+                    self.durability.sync_file(fh)
+            tmp_file.replace(path)
+        except OSError:
+            tmp_file.unlink(missing_ok=True)
+            raise
+        if self.durability is not None:
+            self.durability.committed(path)
+        return digest
+
+    def get(self, digest: str) -> str:
+        """Read a body.
+
+        Args:
+            digest: Blob reference.
+
+        Returns:
+            The body.
+
+        Raises:
+            OSError: If the blob is missing or unreadable.
+            ValueError: If the reference is malformed.
+        """
+        return self.path(digest).read_bytes().decode("utf-8")
+
+    def prune(self, keep: Iterable[str], min_age: float) -> int:
+        """Delete blobs no note refers to any more.
+
+        Blobs younger than min_age are kept, because a writer may have
+        stored one for a note it has not saved yet.
+
+        Args:
+            keep: References still in use.
+            min_age: Seconds a blob must be old to be deleted.
+
+        Returns:
+            Number of blobs deleted.
+        """
+        keep = set(keep)
+        cutoff = time.time() - min_age
+        removed = 0
+        for path in self.root.glob("??/*"):
+            if path.name in keep or not DIGEST_PATTERN.fullmatch(path.name):
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
@@ -0,0 +1,298 @@
+"""Per-note change records shared by the incremental storage engines.
+
+A save hands over the complete board; the incremental engines diff it
+against the state they already hold and persist only the resulting
+records (add, edit, recolor, move, delete). merge_notes combines two
+boards saved concurrently from the same base, note by note, and splice
+reduces an edit of one text field to the single span it replaced.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import Any
+
+from tui_notes.constants import MAX_NOTES
+from tui_notes.snapshot import validate_note
+
+MERGE_FIELDS = ("title", "content", "color_index")
+"""Note fields merged one by one; a field both sides changed differently is a conflict."""
+
+
+def note_key(note: dict[str, Any]) -> str:
+    """Return the identity used to match a note across saves.
+
+    Args:
+        note: A validated note dict.
+
+    Returns:
+        The note id, or a position-based key for notes saved without one.
+    """
+    return note.get("id") or f"@{note['position']}"
+
+
+def splice(old: str, new: str) -> tuple[int, str, str]:
+    """Find the single span that turns one string into another.
+
+    The common prefix and suffix are found by bisection over slice
+    comparisons, so a long note costs a few memcmp calls rather than a
+    Python loop over every character.
+
+    Args:
+        old: Text before the change.
+        new: Text after the change.
+
+    Returns:
+        Start of the span, the text it held before and the text it holds after.
+    """
+    low, high = 0, min(len(old), len(new))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old[:mid] == new[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    start = low
+    low, high = 0, min(len(old), len(new)) - start
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old[len(old) - mid :] == new[len(new) - mid :]:
+            low = mid
+        else:
+            high = mid - 1
+    return start, old[start : len(old) - low], new[start : len(new) - low]
+
+
+def diff_notes(old: dict[str, dict[str, Any]], new: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Compute the change records that turn one board state into another.
+
+    Args:
+        old: Current notes keyed by note identity.
+        new: The notes as they should be after the save.
+
+    Returns:
+        Records with an "op" of add, edit, recolor, move or delete. An
+        edit carries "blob" when the body moved in or out of line; None
+        means it is inline now.
+    """
+    records: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    for note in new:
+        key = note_key(note)
+        seen.add(key)
+        before = old.get(key)
+        if before is None:
+            records.append({"op": "add", "note": note})
+            continue
+        changed = {
+            field: note[field] for field in ("title", "content") if note[field] != before[field]
+        }
+        if note.get("blob") != before.get("blob"):
+            changed["blob"] = note.get("blob")
+        if changed:
+            records.append({"op": "edit", "id": key, **changed})
+        if note["color_index"] != before["color_index"]:
+            records.append({"op": "recolor", "id": key, "color_index": note["color_index"]})
+        if note["position"] != before["position"]:
+            records.append({"op": "move", "id": key, "position": note["position"]})
+    records.extend({"op": "delete", "id": key} for key in old if key not in seen)
+    return records
+
+
+def apply_record(notes: dict[str, dict[str, Any]], record: dict[str, Any]) -> None:
+    """Apply a single journal record to a board state in place.
+
+    Every record sets absolute values, so replaying a record twice is
+    harmless. Records for unknown notes are ignored.
+
+    Args:
+        notes: Notes keyed by note identity.
+        record: A record produced by diff_notes.
+    """
+    op = record.get("op")
+    if op == "add":
+        note = validate_note(record.get("note"))
+        if note is not None:
+            notes[note_key(note)] = note
+        return
+
+    note = notes.get(str(record.get("id")))
+    if note is None:
+        return
+    if op == "edit":
+        for field in ("title", "content"):
+            if field in record:
+                note[field] = str(record[field])
+        if record.get("blob"):
+            note["blob"] = str(record["blob"])
+        elif "blob" in record:
+            note.pop("blob", None)
+    elif op == "recolor":
+        note["color_index"] = int(record["color_index"])
+    elif op == "move":
+        note["position"] = int(record["position"])
+    elif op == "delete":
+        del notes[str(record["id"])]
+
+
+def merge_notes(
+    base: list[dict[str, Any]],
+    mine: list[dict[str, Any]],
+    theirs: list[dict[str, Any]],
+    prefer: str | None = None,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Three-way merge of a board that two writers changed from the same base.
+
+    Notes are matched by identity. A note only one side changed takes
+    that side's version. A note both sides changed is merged field by
+    field, its position following this writer. A field both sides set
+    to different values, or a note one side edited and the other
+    deleted, is a conflict. Of notes that end up in the same slot, the
+    one placed there by the stored board stays and the others move to
+    free slots; a note that finds no free slot is a conflict too.
+
+    Args:
+        base: The board as this writer last read or wrote it.
+        mine: The board this writer wants to save.
+        theirs: The board as it is stored now.
+        prefer: Settle conflicts instead of reporting them: "mine",
+            "theirs", or "both" to keep the stored version and add this
+            writer's as a copy. With "mine" this writer's placement wins
+            slots; notes left without a slot are dropped.
+
+    Returns:
+        The merged notes ordered by position, and the conflicts, each a
+        dict with the note "id" and its "base", "mine" and "theirs"
+        versions (None where the note does not exist). Conflicts are
+        only reported when prefer is None.
+    """
+    base_by = {note_key(note): note for note in base}
+    mine_by = {note_key(note): note for note in mine}
+    theirs_by = {note_key(note): note for note in theirs}
+    merged: list[dict[str, Any]] = []
+    conflicts: list[dict[str, Any]] = []
+    for key in dict.fromkeys([*theirs_by, *mine_by]):
+        versions = {
+            "base": base_by.get(key),
+            "mine": mine_by.get(key),
+            "theirs": theirs_by.get(key),
+        }
+        kept, clash = _merge_note(versions["base"], versions["mine"], versions["theirs"], prefer)
+        if clash and prefer is None:
+            conflicts.append({"id": key, **versions})
+        merged.extend(kept)
+
+    placed, unplaced = _place(merged, mine_by if prefer == "mine" else theirs_by)
+    if prefer is None:
+        conflicts.extend(
+            {
+                "id": key,
+                "base": base_by.get(key),
+                "mine": mine_by.get(key),
+                "theirs": theirs_by.get(key),
+            }
+            for key in map(note_key, unplaced)
+        )
+    return sorted(placed, key=lambda n: n["position"]), conflicts
+
+
+def _merge_note(
+    base: dict[str, Any] | None,
+    mine: dict[str, Any] | None,
+    theirs: dict[str, Any] | None,
+    prefer: str | None,
+) -> tuple[list[dict[str, Any]], bool]:
+    """Merge the three versions of one note.
+
+    Args:
+        base: The note as this writer last saw it, or None.
+        mine: The note this writer saves, or None if it deleted it.
+        theirs: The stored note, or None if it was deleted.
+        prefer: How to settle a conflict, see merge_notes; None keeps
+            the stored side.
+
+    Returns:
+        The notes to keep: none if the note is deleted, two if both
+        versions are kept. And whether both sides changed the same thing.
+    """
+    if theirs in (mine, base):
+        return [mine] if mine is not None else [], False
+    if mine == base:
+        return [theirs] if theirs is not None else [], False
+    if base is None or mine is None or theirs is None:
+        kept = mine if prefer == "mine" or (prefer == "both" and theirs is None) else theirs
+        return [kept] if kept is not None else [], True
+    merged = dict(theirs)
+    clash = False
+    for field in MERGE_FIELDS:
+        ours, old, stored = _field(mine, field), _field(base, field), _field(theirs, field)
+        if ours in (old, stored):
+            continue
+        if stored == old or prefer == "mine":
+            merged[field] = mine[field]
+            if field == "content":
+                merged.pop("blob", None)
+                if mine.get("blob"):
+                    merged["blob"] = mine["blob"]
+        clash = clash or stored != old
+    if mine["position"] != base["position"]:
+        merged["position"] = mine["position"]
+    if clash and prefer == "theirs":
+        return [theirs], True
+    if clash and prefer == "both":
+        return [theirs, {**mine, "id": uuid.uuid4().hex}], True
+    return [merged], clash
+
+
+def _field(note: dict[str, Any], field: str) -> Any:
+    """Return the value of a merged field.
+
+    The body is its content together with its blob reference, so an
+    out-of-line body and its preview always travel together.
+
+    Args:
+        note: A validated note dict.
+        field: One of MERGE_FIELDS.
+
+    Returns:
+        The comparable value of the field.
+    """
+    if field == "content":
+        return note["content"], note.get("blob")
+    return note[field]
+
+
+def _place(
+    notes: list[dict[str, Any]], winner: dict[str, dict[str, Any]]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Give every note a slot of its own.
+
+    Notes the winning side has in the same slot keep it first; of the
+    rest, earlier notes keep theirs first.
+
+    Args:
+        notes: Notes to place.
+        winner: The winning side's notes, keyed by identity.
+
+    Returns:
+        The placed notes, moved to the first free slot where their own
+        was taken, and the notes no free slot was left for.
+    """
+    placed: dict[int, dict[str, Any]] = {}
+    displaced = []
+    for note in sorted(
+        notes, key=lambda n: winner.get(note_key(n), {}).get("position") != n["position"]
+    ):
+        if note["position"] in placed:
+            displaced.append(note)
+        else:
+            placed[note["position"]] = note
+    free = iter([pos for pos in range(MAX_NOTES) if pos not in placed])
+    unplaced = []
+    for note in displaced:
+        pos = next(free, None)
+        if pos is None:
+            unplaced.append(note)
+        else:
+            placed[pos] = {**note, "position": pos}
+    return list(placed.values()), unplaced
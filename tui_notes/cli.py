@@ -0,0 +1,604 @@
+"""Headless subcommands for scripting tui-notes.
+
+The subcommands work directly against tui_notes.storage and never import
+Textual, the app or its screens, so shell hooks and cron jobs pay only
+for reading and writing the notes they touch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator, TextIO
+
+from tui_notes.constants import IMPORT_PROGRESS_SECONDS, MAX_NOTES, NUM_COLORS
+from tui_notes.storage import (
+    ConflictError,
+    load_boards,
+    load_notes,
+    mark_index_stale,
+    prune_blobs,
+    save_boards,
+    save_notes,
+    with_body,
+)
+
+if TYPE_CHECKING:
+    from tui_notes.importer import ImportPlan
+
+
+class CliError(Exception):
+    """A subcommand failed because of bad input; reported without a traceback."""
+
+
+def add_commands(parser: argparse.ArgumentParser) -> None:
+    """Register the headless subcommands on the main argument parser.
+
+    Args:
+        parser: The tui-notes argument parser.
+    """
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    add = subparsers.add_parser("add", help="add notes without starting the TUI")
+    add.add_argument("title", nargs="?", help="note title")
+    add.add_argument("-c", "--content", default="", help="note body")
+    add.add_argument("--color", type=int, choices=range(NUM_COLORS), help="color index")
+    add.add_argument(
+        "--stdin",
+        action="store_true",
+        help="read notes from stdin: one title per line, or JSON objects per line",
+    )
+
+    listing = subparsers.add_parser("list", help="list notes")
+
+    show = subparsers.add_parser("show", help="print notes by id prefix")
+    show.add_argument("ids", nargs="+", metavar="ID")
+
+    rm = subparsers.add_parser("rm", help="delete notes by id prefix")
+    rm.add_argument("ids", nargs="*", metavar="ID")
+    rm.add_argument("--stdin", action="store_true", help="read ids from stdin, one per line")
+
+    export = subparsers.add_parser("export", help="write notes to stdout or a file")
+    export.add_argument(
+        "--format", type=_export_format, default="markdown", help="default: %(default)s"
+    )
+    export.add_argument("-o", "--output", help="destination file (default: stdout)")
+
+    imp = subparsers.add_parser(
+        "import", help="import notes from Markdown, JSON or JSON Lines files and directories"
+    )
+    imp.add_argument("paths", nargs="+", metavar="PATH")
+    imp.add_argument(
+        "-n", "--dry-run", action="store_true", help="show where notes would go, write nothing"
+    )
+
+    gc = subparsers.add_parser(
+        "gc",
+        help="delete unused note bodies, revisions past the retention policy "
+        "and change-feed segments every sync target has read",
+    )
+    gc.add_argument("--json", action="store_true", help="print JSON")
+
+    subparsers.add_parser(
+        "daemon",
+        help="keep the boards in memory and serve them to the TUI and these commands "
+        "over a Unix socket (runs in the foreground)",
+    )
+
+    sync = subparsers.add_parser(
+        "sync", help="exchange changed notes with a directory or sync server, both ways"
+    )
+    sync.add_argument(
+        "target",
+        nargs="?",
+        help="directory or http(s):// URL (default: --sync or $TUI_NOTES_SYNC)",
+    )
+    sync.add_argument("--json", action="store_true", help="print JSON")
+
+    server = subparsers.add_parser(
+        "sync-server",
+        help="serve a sync directory over HTTP, without authentication (runs in the foreground)",
+    )
+    server.add_argument("directory", help="where the synced changes are kept")
+    server.add_argument("--host", default="127.0.0.1", help="address (default: %(default)s)")
+    server.add_argument("--port", type=int, default=8765, help="port (default: %(default)s)")
+
+    for sub in (add, listing, show, rm, export, imp):
+        target = sub.add_mutually_exclusive_group()
+        target.add_argument("-b", "--board", help="board id or name (default: first board)")
+        if sub not in (add, imp):
+            target.add_argument("-a", "--all", action="store_true", help="all boards")
+        sub.add_argument("--json", action="store_true", help="print JSON")
+
+
+def run_command(
+    args: argparse.Namespace, stdin: TextIO | None = None, stdout: TextIO | None = None
+) -> int:
+    """Run a parsed subcommand.
+
+    Args:
+        args: Parsed arguments with a command attribute.
+        stdin: Input for --stdin. Defaults to sys.stdin.
+        stdout: Destination for output. Defaults to sys.stdout.
+
+    Returns:
+        Process exit code.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    handlers = {
+        "add": _cmd_add,
+        "list": _cmd_list,
+        "show": _cmd_show,
+        "rm": _cmd_rm,
+        "export": _cmd_export,
+        "import": _cmd_import,
+        "gc": _cmd_gc,
+        "daemon": _cmd_daemon,
+        "sync": _cmd_sync,
+        "sync-server": _cmd_sync_server,
+    }
+    try:
+        handlers[args.command](args, stdin, stdout)
+    except BrokenPipeError:
+        # The reader (e.g. head) went away; stop quietly like other Unix tools.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    except CliError as exc:
+        print(f"tui-notes {args.command}: {exc}", file=sys.stderr)
+        return 1
+    except ConflictError as exc:
+        print(f"tui-notes {args.command}: {exc}; try again", file=sys.stderr)
+        return 1
+    except OSError as exc:
+        print(f"tui-notes {args.command}: {exc}", file=sys.stderr)
+        return 2
+    return 0
+
+
+# ── Helpers ─────────────────────────────────────────────────────
+
+
+def _export_format(name: str) -> str:
+    """Check an export format name, importing the exporter only when --format is used.
+
+    Args:
+        name: Value of --format.
+
+    Returns:
+        The name.
+
+    Raises:
+        argparse.ArgumentTypeError: If no export format has that name.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from tui_notes.export import available_export_formats
+
+    formats = available_export_formats()
+    if name not in formats:
+        raise argparse.ArgumentTypeError(
+            f"invalid choice: {name!r} (choose from {', '.join(formats)})"
+        )
+    return name
+
+
+def _resolve_board(boards: list[dict[str, str]], ref: str | None) -> dict[str, str]:
+    """Find a board by id or case-insensitive name.
+
+    Args:
+        boards: The board index.
+        ref: Board id or name, or None for the first board.
+
+    Returns:
+        The matching board.
+
+    Raises:
+        CliError: If no board matches.
+    """
+    if ref is None:
+        return boards[0]
+    for board in boards:
+        if ref in (board["id"], board["name"]) or ref.casefold() == board["name"].casefold():
+            return board
+    raise CliError(f"no board named {ref!r}")
+
+
+def _target_boards(args: argparse.Namespace) -> list[dict[str, str]]:
+    """Return the boards a subcommand operates on.
+
+    Args:
+        args: Parsed arguments with board and optionally all.
+
+    Returns:
+        Every board with --all, otherwise the selected board.
+    """
+    boards = load_boards()
+    if getattr(args, "all", False):
+        return boards
+    return [_resolve_board(boards, args.board)]
+
+
+def _iter_notes(boards: list[dict[str, str]]) -> Iterator[dict[str, Any]]:
+    """Yield the notes of some boards, tagged with their board.
+
+    Args:
+        boards: Boards to read, one at a time.
+
+    Yields:
+        Note dicts with board and board_name keys added.
+    """
+    for board in boards:
+        for note in load_notes(board["id"]):
+            yield {**note, "board": board["id"], "board_name": board["name"]}
+
+
+def _find_notes(boards: list[dict[str, str]], refs: list[str]) -> list[dict[str, Any]]:
+    """Resolve id prefixes to notes.
+
+    Args:
+        boards: Boards to search.
+        refs: Note ids or unique id prefixes.
+
+    Returns:
+        The matching notes, in the order of refs.
+
+    Raises:
+        CliError: If a prefix matches no note or more than one.
+    """
+    notes = [note for note in _iter_notes(boards) if note.get("id")]
+    found = []
+    for ref in refs:
+        matches = [note for note in notes if note["id"].startswith(ref)]
+        if not matches:
+            raise CliError(f"no note with id {ref!r}")
+        if len(matches) > 1:
+            raise CliError(f"id {ref!r} is ambiguous")
+        found.append(matches[0])
+    return found
+
+
+def _read_batch(stdin: TextIO) -> Iterator[dict[str, Any]]:
+    """Parse notes from stdin.
+
+    Lines starting with "{" are JSON objects with title and optional
+    content, color_index and board; other non-blank lines are titles.
+
+    Args:
+        stdin: Input stream.
+
+    Yields:
+        Raw note fields.
+
+    Raises:
+        CliError: If a JSON line is malformed, has no title or a
+            color_index that is not an integer.
+    """
+    for number, line in enumerate(stdin, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith("{"):
+            yield {"title": line}
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as exc:
+            raise CliError(f"line {number}: {exc}") from exc
+        if not isinstance(data, dict) or not str(data.get("title", "")).strip():
+            raise CliError(f"line {number}: a note needs a title")
+        color = data.get("color_index")
+        if color is not None:
+            try:
+                data["color_index"] = int(color)
+            except (TypeError, ValueError) as exc:
+                raise CliError(
+                    f"line {number}: color_index must be an integer, not {color!r}"
+                ) from exc
+        yield data
+
+
+def _write_json(stdout: TextIO, data: Any) -> None:
+    """Print data as JSON.
+
+    Args:
+        stdout: Destination stream.
+        data: JSON-serializable value.
+    """
+    json.dump(data, stdout, indent=2, ensure_ascii=False)
+    stdout.write("\n")
+
+
+def _public(note: dict[str, Any]) -> dict[str, Any]:
+    """Return the fields of a note shown in JSON output.
+
+    Args:
+        note: Note dict tagged with its board.
+
+    Returns:
+        Note dict without the board display name.
+    """
+    return {key: value for key, value in note.items() if key != "board_name"}
+
+
+def _new_note(entry: dict[str, Any], position: int) -> dict[str, Any]:
+    """Build a note dict for an entry read from the command line or stdin.
+
+    Args:
+        entry: Raw fields with title and optional content and color_index.
+        position: Free grid position the note goes to.
+
+    Returns:
+        A complete note dict with a fresh id.
+    """
+    color = entry.get("color_index")
+    return {
+        "id": uuid.uuid4().hex,
+        "position": position,
+        "title": str(entry["title"]).strip(),
+        "content": str(entry.get("content") or ""),
+        "color_index": (int(color) if color is not None else position) % NUM_COLORS,
+    }
+
+
+def _plan_additions(
+    entries: list[dict[str, Any]], default_board: str | None
+) -> dict[str, tuple[list[dict[str, Any]], list[dict[str, Any]]]]:
+    """Place new notes in the free slots of their boards without writing anything.
+
+    Every board is checked before any is written, so a batch that does
+    not fit adds nothing.
+
+    Args:
+        entries: Raw note fields, optionally with a board id or name.
+        default_board: Board for entries that name none.
+
+    Returns:
+        For each board id, its current notes and the notes to add.
+
+    Raises:
+        CliError: If a board is unknown or has too few free slots.
+    """
+    boards = load_boards()
+    by_board: dict[str, list[dict[str, Any]]] = {}
+    for entry in entries:
+        board = _resolve_board(boards, entry.get("board") or default_board)
+        by_board.setdefault(board["id"], []).append(entry)
+
+    plans = {}
+    for board_id, batch in by_board.items():
+        notes = load_notes(board_id)
+        free = sorted(set(range(MAX_NOTES)) - {note["position"] for note in notes})
+        if len(batch) > len(free):
+            raise CliError(f"board {board_id!r} has room for {len(free)} more note(s)")
+        plans[board_id] = (notes, [_new_note(e, pos) for e, pos in zip(batch, free)])
+    return plans
+
+
+# ── Subcommands ─────────────────────────────────────────────────
+
+
+def _cmd_add(args: argparse.Namespace, stdin: TextIO, stdout: TextIO) -> None:
+    """Add one note, or a batch from stdin, saving each board once."""
+    if args.stdin:
+        entries = list(_read_batch(stdin))
+    elif args.title:
+        entries = [{"title": args.title, "content": args.content, "color_index": args.color}]
+    else:
+        raise CliError("give a title or --stdin")
+
+    plans = _plan_additions(entries, args.board)
+    created: list[dict[str, Any]] = []
+    for board_id, (notes, added) in plans.items():
+        # Another writer may have taken the planned slots; report where the notes went.
+        saved = {
+            note.get("id"): note
+            for note in save_notes(sorted(notes + added, key=lambda n: n["position"]), board_id)
+        }
+        created.extend({**saved.get(note["id"], note), "board": board_id} for note in added)
+    mark_index_stale(plans)
+
+    if args.json:
+        _write_json(stdout, created)
+    else:
+        for note in created:
+            stdout.write(f"{note['id']}\t{note['board']}:{note['position']}\t{note['title']}\n")
+
+
+def _cmd_list(args: argparse.Namespace, stdin: TextIO, stdout: TextIO) -> None:
+    """List notes as tab-separated id, board, position and title."""
+    notes = list(_iter_notes(_target_boards(args)))
+    if args.json:
+        _write_json(stdout, [_public(note) for note in notes])
+        return
+    for note in notes:
+        stdout.write(
+            f"{note.get('id', '')[:8]}\t{note['board_name']}\t"
+            f"{note['position']}\t{note['title']}\n"
+        )
+
+
+def _cmd_show(args: argparse.Namespace, stdin: TextIO, stdout: TextIO) -> None:
+    """Print the title and content of notes."""
+    notes = [with_body(note) for note in _find_notes(_target_boards(args), args.ids)]
+    if args.json:
+        _write_json(stdout, [_public(note) for note in notes])
+        return
+    for idx, note in enumerate(notes):
+        if idx:
+            stdout.write("\n")
+        stdout.write(f"{note['title']}\n")
+        if note["content"]:
+            stdout.write(f"\n{note['content']}\n")
+
+
+def _cmd_rm(args: argparse.Namespace, stdin: TextIO, stdout: TextIO) -> None:
+    """Delete notes, saving each affected board once."""
+    refs = list(args.ids)
+    if args.stdin:
+        refs.extend(line.strip() for line in stdin if line.strip())
+    if not refs:
+        raise CliError("give note ids or --stdin")
+
+    removed = _find_notes(_target_boards(args), refs)
+    by_board: dict[str, set[str]] = {}
+    for note in removed:
+        by_board.setdefault(note["board"], set()).add(note["id"])
+    for board_id, ids in by_board.items():
+        save_notes([n for n in load_notes(board_id) if n.get("id") not in ids], board_id)
+    mark_index_stale(by_board)
+
+    if args.json:
+        _write_json(stdout, [_public(note) for note in removed])
+    else:
+        for note in removed:
+            stdout.write(f"{note['id']}\t{note['title']}\n")
+
+
+def _cmd_export(args: argparse.Namespace, stdin: TextIO, stdout: TextIO) -> None:
+    """Stream notes as Markdown, JSON, JSON Lines or HTML, one board at a time."""
+    # pylint: disable-next=import-outside-toplevel
+    from tui_notes.export import export_to_file, write_export
+
+    boards = _target_boards(args)
+    fmt = "json" if args.json else args.format
+    if args.output:
+        export_to_file(args.output, fmt, boards, load_notes)
+    else:
+        write_export(stdout, fmt, boards, load_notes)
+
+
+def _cmd_import(args: argparse.Namespace, stdin: TextIO, stdout: TextIO) -> None:
+    """Import files and directory trees, writing each touched board once."""
+    # pylint: disable-next=import-outside-toplevel
+    from tui_notes.importer import commit_import, plan_import
+
+    boards = load_boards()
+    last_report = time.monotonic()
+
+    def progress(files: int, notes: int) -> None:
+        nonlocal last_report
+        if sys.stderr.isatty() and time.monotonic() - last_report >= IMPORT_PROGRESS_SECONDS:
+            last_report = time.monotonic()
+            print(f"\r{files} file(s), {notes} notes…", end="", file=sys.stderr, flush=True)
+
+    plan = plan_import(
+        args.paths,
+        boards,
+        load_notes,
+        default_board=_resolve_board(boards, args.board),
+        progress=progress,
+    )
+    if not args.dry_run:
+        start = time.perf_counter()
+        commit_import(plan, save_notes, save_boards)
+        plan.seconds += time.perf_counter() - start
+        mark_index_stale(plan.added)
+
+    if args.json:
+        _write_json(stdout, _import_report(plan, args.dry_run))
+        return
+    for error in plan.errors:
+        print(f"tui-notes import: {error}", file=sys.stderr)
+    new_ids = {board["id"] for board in plan.new_boards}
+    for board in plan.boards:
+        if board["id"] in plan.added:
+            new = " (new)" if board["id"] in new_ids else ""
+            stdout.write(f"{board['name']}{new}\t{len(plan.added[board['id']])}\n")
+    stdout.write(f"{'Would import' if args.dry_run else 'Imported'} {plan.summary()}\n")
+
+
+def _import_report(plan: ImportPlan, dry_run: bool) -> dict[str, Any]:
+    """Describe an import for --json.
+
+    Args:
+        plan: The planned or committed import.
+        dry_run: Whether the plan was left unwritten.
+
+    Returns:
+        Counts, throughput, the touched boards and the skipped entries.
+    """
+    new_ids = {board["id"] for board in plan.new_boards}
+    return {
+        "dry_run": dry_run,
+        "notes": plan.count,
+        "files": plan.files,
+        "seconds": plan.seconds,
+        "notes_per_second": plan.rate,
+        "boards": [
+            {**board, "new": board["id"] in new_ids, "added": len(plan.added[board["id"]])}
+            for board in plan.boards
+            if board["id"] in plan.added
+        ],
+        "skipped": plan.errors,
+    }
+
+
+def _cmd_gc(args: argparse.Namespace, stdin: TextIO, stdout: TextIO) -> None:
+    """Delete unused out-of-line note bodies, old revisions and change-feed segments."""
+    # pylint: disable=import-outside-toplevel
+    from tui_notes.history import NoteHistory
+    from tui_notes.sync import prune_feed
+
+    removed = prune_blobs()
+    revisions = NoteHistory().prune()
+    segments = prune_feed()
+    if args.json:
+        _write_json(
+            stdout, {"removed": removed, "history_removed": revisions, "feed_removed": segments}
+        )
+    else:
+        stdout.write(
+            f"Removed {removed} unused note bodies, {revisions} history files "
+            f"and {segments} change-feed segments\n"
+        )
+
+
+def _cmd_daemon(args: argparse.Namespace, stdin: TextIO, stdout: TextIO) -> None:
+    """Serve the boards to other tui-notes processes until interrupted."""
+    from tui_notes.daemon import NotesDaemon  # pylint: disable=import-outside-toplevel
+
+    daemon = NotesDaemon()
+    daemon.start()
+    stdout.write(f"Serving notes on {daemon.path}\n")
+    stdout.flush()
+    daemon.serve_forever()
+
+
+def _cmd_sync(args: argparse.Namespace, stdin: TextIO, stdout: TextIO) -> None:
+    """Pull other machines' changes from a target and push the local ones."""
+    from tui_notes.sync import NoteSync, open_target  # pylint: disable=import-outside-toplevel
+
+    spec = args.target or getattr(args, "sync", None)
+    if not spec:
+        raise CliError("no sync target: pass one, or set --sync or $TUI_NOTES_SYNC")
+    summary = NoteSync(open_target(spec)).run()
+    if args.json:
+        _write_json(stdout, summary)
+        return
+    stdout.write(
+        f"Pulled {summary['pulled']} and pushed {summary['pushed']} changes, "
+        f"{summary['conflicts']} in conflict\n"
+    )
+    if summary["waiting"]:
+        stdout.write(f"{summary['waiting']} pulled notes wait for a free slot on their board\n")
+
+
+def _cmd_sync_server(args: argparse.Namespace, stdin: TextIO, stdout: TextIO) -> None:
+    """Serve a sync directory over HTTP until interrupted."""
+    from tui_notes.sync import SyncServer  # pylint: disable=import-outside-toplevel
+
+    server = SyncServer(Path(args.directory), args.host, args.port)
+    stdout.write(f"Serving sync on {server.url}\n")
+    stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -18,3 +18,105 @@ COLORS: list[tuple[str, str]] = [
 
 NUM_COLORS: int = len(COLORS)
 """Total number of available colors."""
+
+SAVE_DEBOUNCE_SECONDS: float = 0.5
+"""Quiet period after the last mutation before pending notes are written."""
+
+SAVE_MAX_LATENCY_SECONDS: float = 3.0
+"""Upper bound on how long a pending save may be deferred by continuous edits."""
+
+SAVE_RETRY_SECONDS: float = 5.0
+"""Delay before a background save that failed is tried again."""
+
+DEFAULT_STORAGE_ENGINE: str = "json"
+"""Storage engine used unless TUI_NOTES_STORAGE or --storage selects another."""
+
+DEFAULT_DURABILITY: str = "batched"
+"""Durability mode used unless TUI_NOTES_DURABILITY or --durability selects another."""
+
+DURABILITY_BATCH_SECONDS: float = 1.0
+"""Longest time a batched-durability save stays in the page cache before it is fsynced."""
+
+DRAFT_CHECKPOINT_SECONDS: float = 2.0
+"""Interval at which the edit screen checkpoints a changed draft."""
+
+DRAFT_COMPACT_BYTES: int = 256 * 1024
+"""Size of drafts.jsonl after which it is rewritten with only the open drafts."""
+
+JOURNAL_MAX_RECORDS: int = 500
+"""Journal records after which the journal is folded into the snapshot."""
+
+JOURNAL_MAX_BYTES: int = 1024 * 1024
+"""Journal size in bytes after which the journal is folded into the snapshot."""
+
+DEFAULT_BOARD: str = "main"
+"""Board that holds notes created before boards existed."""
+
+DEFAULT_BOARD_NAME: str = "Main"
+"""Display name of the default board."""
+
+OVERVIEW_ROW_HEIGHT: int = 7
+"""Height in cells of one row of notes in the overview grid."""
+
+OVERVIEW_OVERSCAN_ROWS: int = 1
+"""Rows of note widgets kept bound below the viewport of the overview grid."""
+
+SEARCH_MAX_RESULTS: int = 50
+"""Maximum number of results a search returns."""
+
+FUZZY_MAX_CANDIDATES: int = 2000
+"""Trigram candidates scored per quick-jump query; bounds the work per keystroke."""
+
+EXPORT_BUFFER_BYTES: int = 64 * 1024
+"""Write buffer of an export file; exports stream through it one board at a time."""
+
+EXPORT_PROGRESS_SECONDS: float = 1.0
+"""Minimum interval between progress notifications of a running export."""
+
+IMPORT_PROGRESS_SECONDS: float = 1.0
+"""Minimum interval between progress reports of a running import."""
+
+WATCH_POLL_SECONDS: float = 1.0
+"""Interval between checks of the active board's files when inotify is unavailable."""
+
+WATCH_SETTLE_SECONDS: float = 0.1
+"""Quiet time after a file event before the change is checked, so one save reloads once."""
+
+UNDO_MAX_BYTES: int = 512 * 1024
+"""Approximate memory budget of the undo history; the oldest changes are forgotten beyond it."""
+
+BLOB_MIN_CHARS: int = 8 * 1024
+"""Note bodies longer than this are stored out of line, with only a preview in the board."""
+
+BLOB_PREVIEW_CHARS: int = 500
+"""Characters of an out-of-line body kept in the board for the grid and search."""
+
+BLOB_PRUNE_SECONDS: float = 7 * 24 * 3600.0
+"""Age after which a body no note refers to any more may be deleted."""
+
+HISTORY_KEYFRAME_INTERVAL: int = 16
+"""Revisions per history segment; each segment starts with a full copy of the note."""
+
+HISTORY_MAX_REVISIONS: int = 500
+"""Revisions of a note kept at most; older segments are deleted."""
+
+HISTORY_MAX_AGE_SECONDS: float = 90 * 24 * 3600.0
+"""Age after which a note's old revisions, or the history of a deleted note, are deleted."""
+
+DAEMON_TIMEOUT_SECONDS: float = 10.0
+"""Longest wait for the notes daemon to answer a request."""
+
+FEED_SEGMENT_BYTES: int = 1024 * 1024
+"""Size after which the local change feed starts a new segment file."""
+
+SYNC_INTERVAL_SECONDS: float = 60.0
+"""Interval between background syncs while the app runs with a sync target."""
+
+SYNC_TIMEOUT_SECONDS: float = 10.0
+"""Longest wait for a sync server to answer a request."""
+
+SYNC_PULL_LIMIT: int = 500
+"""Most batches the reference sync server returns per request."""
+
+SYNC_MAX_ATTEMPTS: int = 5
+"""Pulls a sync makes when other machines keep pushing before it can push."""
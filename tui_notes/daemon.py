@@ -0,0 +1,586 @@
+"""Optional daemon that keeps the boards in memory and owns their persistence.
+
+`tui-notes daemon` listens on a Unix domain socket. While it runs, the
+TUI and the headless subcommands attach to it on start: the storage
+facade (load_notes, save_notes, load_boards, save_boards, delete_board)
+sends its calls over the socket instead of reading and writing files.
+A new window then gets boards the daemon has already parsed and
+validated. Every open window is told when a board changes, instead of
+watching the files.
+
+The protocol is one compact JSON object per line in each direction:
+
+- a request carries an "id", an "op" and the op's arguments;
+- its reply carries the same "id" and a "result" or an "error";
+- a notification carries an "event" ("changed" with a "board", or
+  "boards" when the board index changed) and no id.
+
+Each connection has its own base per board, like a process without the
+daemon, so a save is merged with what other clients saved since this
+one loaded the board (see storage.save_notes). Programs that write the
+files directly are still noticed, through a FileWatcher.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import queue
+import signal
+import socket
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+from tui_notes import storage
+from tui_notes.changes import merge_notes
+from tui_notes.constants import DAEMON_TIMEOUT_SECONDS
+from tui_notes.storage import (
+    ConflictError,
+    _delete_board_local,
+    _load_local,
+    _prepare_notes,
+    _save_local,
+    daemon_socket_path,
+    load_boards_local,
+    save_boards_local,
+)
+from tui_notes.watcher import FileWatcher
+
+PROTOCOL_VERSION = 1
+"""Version of the wire protocol; a client refuses a daemon speaking another."""
+
+
+def _compact(value: Any) -> bytes:
+    """Encode a value as compact JSON."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _encode(message: dict[str, Any]) -> bytes:
+    """Encode a message as one line of compact JSON."""
+    return _compact(message) + b"\n"
+
+
+# ── Daemon ──────────────────────────────────────────────────────
+
+
+class _Connection:
+    """One attached client as seen by the daemon."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        """Initialize the connection.
+
+        Args:
+            sock: The accepted socket.
+        """
+        self.sock = sock
+        # Board id -> (daemon revision the client last loaded or saved,
+        # or None if its next save must be merged, and the client's notes).
+        self.bases: dict[str, tuple[int | None, list[dict[str, Any]]]] = {}
+        self._send_lock = threading.Lock()
+
+    def send(self, message: dict[str, Any] | bytes) -> bool:
+        """Send a message or an encoded line, reporting whether the client is still there."""
+        data = message if isinstance(message, bytes) else _encode(message)
+        try:
+            with self._send_lock:
+                self.sock.sendall(data)
+        except OSError:
+            return False
+        return True
+
+    def close(self) -> None:
+        """Close the socket, ending the client's reader."""
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class NotesDaemon:  # pylint: disable=too-many-instance-attributes
+    """Serve the boards to clients over a Unix domain socket.
+
+    Requests are handled one at a time under one lock, so the daemon
+    needs no locking of its own beyond what storage already does.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        """Initialize the daemon; nothing is opened until start().
+
+        Args:
+            path: Socket to listen on. Defaults to daemon_socket_path().
+        """
+        self.path = path or daemon_socket_path()
+        self._server: socket.socket | None = None
+        self._watcher: FileWatcher | None = None
+        self._connections: set[_Connection] = set()
+        self._cache: dict[str, tuple[int, list[dict[str, Any]]]] = {}
+        # Board id -> (revision, the board's notes as JSON), built on first load.
+        self._encoded: dict[str, tuple[int, bytes]] = {}
+        self._boards: list[dict[str, str]] | None = None
+        self._revisions = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Listen on the socket and start accepting clients.
+
+        A socket left behind by a daemon that is gone is replaced.
+
+        Raises:
+            OSError: If another daemon is listening on the socket, or it
+                cannot be created.
+        """
+        if self.path.exists():
+            try:
+                DaemonClient.connect(self.path).close()
+            except OSError:
+                self.path.unlink()
+            else:
+                raise OSError(f"A daemon is already listening on {self.path}")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(self.path))
+        os.chmod(self.path, 0o600)
+        server.listen()
+        self._server = server
+        self._watcher = FileWatcher(self._on_files_changed)
+        self._watcher.watch(self._watch_paths())
+        self._watcher.start()
+        threading.Thread(target=self._accept, name="tui-notes-daemon", daemon=True).start()
+
+    def serve_forever(self) -> None:
+        """Serve until SIGINT, SIGTERM or stop(), starting first unless start() was called.
+
+        Raises:
+            OSError: If the daemon cannot start, see start().
+        """
+        if self._server is None:
+            self.start()
+        signal.signal(signal.SIGTERM, lambda *_: self._stopped.set())
+        try:
+            self._stopped.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """Disconnect every client, stop listening and remove the socket."""
+        self._stopped.set()
+        if self._server is not None:
+            # Wake the accept thread first: closing alone leaves it blocked on
+            # a descriptor number the next socket may reuse.
+            try:
+                self._server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._server.close()
+            self._server = None
+            self.path.unlink(missing_ok=True)
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+        with self._lock:
+            connections, self._connections = self._connections, set()
+            storage.close_storage()
+        for conn in connections:
+            conn.close()
+
+    def _accept(self) -> None:
+        """Accept clients until the server socket is closed."""
+        while (server := self._server) is not None:
+            try:
+                sock, _ = server.accept()
+            except OSError:
+                return
+            conn = _Connection(sock)
+            with self._lock:
+                self._connections.add(conn)
+            threading.Thread(
+                target=self._serve, args=(conn,), name="tui-notes-daemon-client", daemon=True
+            ).start()
+
+    def _serve(self, conn: _Connection) -> None:
+        """Answer one client's requests until it disconnects.
+
+        Args:
+            conn: The client.
+        """
+        try:
+            with conn.sock.makefile("rb") as reader:
+                for line in reader:
+                    try:
+                        request = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(request, dict) and not conn.send(self._reply(conn, request)):
+                        break
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self._connections.discard(conn)
+            conn.close()
+
+    def _reply(self, conn: _Connection, request: dict[str, Any]) -> dict[str, Any] | bytes:
+        """Run one request and build its reply, turning failures into errors.
+
+        Args:
+            conn: The client that sent it.
+            request: The decoded request.
+
+        Returns:
+            The reply, or the encoded reply line if the result came encoded.
+        """
+        try:
+            result = self._handle(conn, request)
+            if isinstance(result, bytes):
+                return b'{"id":%s,"result":%s}\n' % (_compact(request.get("id")), result)
+            return {"id": request.get("id"), "result": result}
+        except ConflictError as exc:
+            error = {
+                "kind": "conflict",
+                "message": str(exc),
+                "conflicts": exc.conflicts,
+                "notes": exc.notes,
+            }
+        except (KeyError, TypeError, ValueError) as exc:
+            error = {"kind": "value", "message": str(exc)}
+        except OSError as exc:
+            error = {"kind": "os", "message": str(exc)}
+        return {"id": request.get("id"), "error": error}
+
+    def _handle(self, conn: _Connection, request: dict[str, Any]) -> Any:
+        """Run one request.
+
+        Args:
+            conn: The client that sent it.
+            request: The decoded request.
+
+        Returns:
+            The result to send back; bytes are a result already encoded.
+
+        Raises:
+            ConflictError: If a save conflicts with another writer's changes.
+            KeyError: If the request lacks an argument.
+            OSError: If storage fails.
+            ValueError: If the op is unknown.
+        """
+        op = request["op"]
+        with self._lock:
+            if op == "hello":
+                return {"version": PROTOCOL_VERSION, "pid": os.getpid()}
+            if op == "load":
+                board = request["board"]
+                revision, notes = self._board(board)
+                conn.bases[board] = (revision, notes)
+                encoded = self._encoded.get(board)
+                if encoded is None or encoded[0] != revision:
+                    encoded = self._encoded[board] = (revision, _compact(notes))
+                return encoded[1]
+            if op == "save":
+                return self._save(conn, request["board"], request["notes"], request.get("prefer"))
+            if op == "boards":
+                if self._boards is None:
+                    self._boards = load_boards_local()
+                return self._boards
+            if op == "save_boards":
+                self._boards = [dict(board) for board in request["boards"]]
+                with self._writing():
+                    save_boards_local(self._boards)
+                self._broadcast({"event": "boards"}, skip=conn)
+                return None
+            if op == "delete_board":
+                with self._writing():
+                    _delete_board_local(request["board"])
+                self._cache.pop(request["board"], None)
+                self._encoded.pop(request["board"], None)
+                self._refresh_watches()
+                self._broadcast({"event": "changed", "board": request["board"]}, skip=conn)
+                return None
+        raise ValueError(f"Unknown op: {op!r}")
+
+    def _board(self, board: str) -> tuple[int, list[dict[str, Any]]]:
+        """Return a board from memory, reading it on first use; the caller holds the lock.
+
+        Args:
+            board: Board id.
+
+        Returns:
+            The board's revision in this daemon and its notes.
+
+        Raises:
+            OSError: If the board cannot be read.
+        """
+        cached = self._cache.get(board)
+        if cached is None:
+            cached = self._cache[board] = (next(self._revisions), _load_local(board))
+            self._refresh_watches()
+        return cached
+
+    def _save(
+        self, conn: _Connection, board: str, notes: list[dict[str, Any]], prefer: str | None
+    ) -> list[dict[str, Any]]:
+        """Save a client's notes, merged with what others saved since it read the board.
+
+        Args:
+            conn: The client.
+            board: Board id.
+            notes: The notes to save, as the client sent them.
+            prefer: How to settle conflicts, see storage.save_notes.
+
+        Returns:
+            The notes as saved.
+
+        Raises:
+            ConflictError: If both sides changed the same note and prefer is None.
+            OSError: If the board cannot be written.
+        """
+        notes = _prepare_notes(notes)
+        revision, stored = self._board(board)
+        base = conn.bases.get(board)
+        merged = notes
+        if base is not None and base[0] != revision:
+            merged, conflicts = merge_notes(base[1], notes, stored, prefer)
+            if conflicts:
+                raise ConflictError(board, conflicts, notes)
+        with self._writing():
+            saved = _save_local(merged, board, prefer)
+        revision = next(self._revisions)
+        self._cache[board] = (revision, saved)
+        conn.bases[board] = (revision if saved == notes else None, notes)
+        event = {"event": "changed", "board": board}
+        self._broadcast(event, skip=conn)
+        if saved != notes:
+            # The client's grid lacks the merged-in changes.
+            conn.send(event)
+        return saved
+
+    def _broadcast(self, event: dict[str, Any], skip: _Connection | None = None) -> None:
+        """Notify every client but one; the caller holds the lock.
+
+        Args:
+            event: The notification.
+            skip: The client that caused it, which already knows.
+        """
+        for conn in list(self._connections):
+            if conn is not skip and not conn.send(event):
+                self._connections.discard(conn)
+
+    def _writing(self) -> Any:
+        """Return a context in which the daemon's own writes are not reported as changes."""
+        assert self._watcher is not None
+        return self._watcher.writing()
+
+    def _watch_paths(self) -> list[Path]:
+        """Return the files of the boards in memory and the board index."""
+        paths = [storage.boards_file_path()]
+        for board in self._cache:
+            paths.extend(storage.get_engine().watch_paths(board))
+        return paths
+
+    def _refresh_watches(self) -> None:
+        """Watch the files of every board in memory; the caller holds the lock."""
+        if self._watcher is not None:
+            self._watcher.watch(self._watch_paths())
+
+    def _on_files_changed(self) -> None:
+        """Watcher callback: reread what another program changed and tell every client."""
+        with self._lock:
+            boards = load_boards_local()
+            if self._boards is not None and boards != self._boards:
+                self._boards = boards
+                self._broadcast({"event": "boards"})
+            for board, (_, notes) in list(self._cache.items()):
+                try:
+                    fresh = _load_local(board)
+                except OSError:
+                    continue
+                if fresh != notes:
+                    self._cache[board] = (next(self._revisions), fresh)
+                    self._broadcast({"event": "changed", "board": board})
+
+
+# ── Client ──────────────────────────────────────────────────────
+
+
+class DaemonClient:  # pylint: disable=too-many-instance-attributes
+    """Connection of a TUI or CLI process to the daemon.
+
+    Calls may come from any thread. A reader thread matches replies to
+    calls and queues notifications for a dispatch thread, which runs the
+    subscribed callbacks; they may call the daemon themselves.
+    """
+
+    def __init__(self, sock: socket.socket, timeout: float = DAEMON_TIMEOUT_SECONDS) -> None:
+        """Start reading from a connected socket.
+
+        Args:
+            sock: Socket connected to the daemon.
+            timeout: Seconds to wait for a reply.
+        """
+        self.timeout = timeout
+        self._sock = sock
+        self._ids = itertools.count(1)
+        self._waiting: dict[int, threading.Event] = {}
+        self._replies: dict[int, dict[str, Any]] = {}
+        self._listeners: list[Callable[[dict[str, Any]], None]] = []
+        self._send_lock = threading.Lock()
+        self._closed = False
+        self._events: queue.SimpleQueue[dict[str, Any] | None] = queue.SimpleQueue()
+        threading.Thread(target=self._read, name="tui-notes-daemon-reader", daemon=True).start()
+        threading.Thread(target=self._dispatch, name="tui-notes-daemon-events", daemon=True).start()
+
+    @classmethod
+    def connect(cls, path: Path | None = None) -> DaemonClient:
+        """Connect to a running daemon and check that it speaks this protocol.
+
+        Args:
+            path: The daemon's socket. Defaults to daemon_socket_path().
+
+        Returns:
+            The connected client.
+
+        Raises:
+            OSError: If no daemon listens there or it speaks another protocol.
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix domain sockets are not available")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(str(path or daemon_socket_path()))
+        except OSError:
+            sock.close()
+            raise
+        client = cls(sock)
+        try:
+            hello = client.call("hello")
+            if hello.get("version") != PROTOCOL_VERSION:
+                raise OSError(f"The daemon speaks protocol {hello.get('version')}")
+        except OSError:
+            client.close()
+            raise
+        return client
+
+    def call(self, op: str, **args: Any) -> Any:
+        """Send a request and wait for its reply.
+
+        Args:
+            op: The operation.
+            **args: Its arguments.
+
+        Returns:
+            The result.
+
+        Raises:
+            ConflictError: If a save conflicts with another writer's changes.
+            ConnectionError: If the daemon went away.
+            OSError: If the daemon's storage failed or it did not answer in time.
+            ValueError: If the daemon rejected the request.
+        """
+        request_id = next(self._ids)
+        waiter = threading.Event()
+        self._waiting[request_id] = waiter
+        try:
+            with self._send_lock:
+                if self._closed:
+                    raise ConnectionError("Not connected to the notes daemon")
+                self._sock.sendall(_encode({"id": request_id, "op": op, **args}))
+            if not waiter.wait(self.timeout):
+                raise TimeoutError(f"The notes daemon did not answer {op!r}")
+        finally:
+            self._waiting.pop(request_id, None)
+        reply = self._replies.pop(request_id, None)
+        if reply is None:
+            raise ConnectionError("The notes daemon went away")
+        error = reply.get("error")
+        if error is None:
+            return reply.get("result")
+        if error.get("kind") == "conflict":
+            raise ConflictError(args["board"], error["conflicts"], error["notes"])
+        if error.get("kind") == "value":
+            raise ValueError(error.get("message"))
+        raise OSError(error.get("message"))
+
+    def subscribe(self, callback: Callable[[dict[str, Any]], None]) -> None:
+        """Call back on the dispatch thread for every notification.
+
+        When the connection ends, callbacks get a last {"event": "disconnected"}.
+
+        Args:
+            callback: Receives the notification dict.
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[dict[str, Any]], None]) -> None:
+        """Stop calling a subscribed callback.
+
+        Args:
+            callback: A callback passed to subscribe.
+        """
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def close(self) -> None:
+        """Disconnect; pending and later calls raise ConnectionError."""
+        with self._send_lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+    def _read(self) -> None:
+        """Thread entry point: dispatch replies and notifications until disconnected."""
+        try:
+            with self._sock.makefile("rb") as reader:
+                for line in reader:
+                    try:
+                        message = json.loads(line)
+                    except ValueError:
+                        continue
+                    if "event" in message:
+                        self._events.put(message)
+                        continue
+                    waiter = self._waiting.get(message.get("id"))
+                    if waiter is not None:
+                        self._replies[message["id"]] = message
+                        waiter.set()
+        except OSError:
+            pass
+        finally:
+            with self._send_lock:
+                self._closed = True
+            for waiter in list(self._waiting.values()):
+                waiter.set()
+            self._events.put({"event": "disconnected"})
+            self._events.put(None)
+
+    def _dispatch(self) -> None:
+        """Thread entry point: run the callbacks for each notification in order."""
+        while (event := self._events.get()) is not None:
+            for callback in list(self._listeners):
+                callback(event)
+
+
+def attach(path: Path | None = None) -> bool:
+    """Route the storage facade through a running daemon, if there is one.
+
+    Args:
+        path: The daemon's socket. Defaults to daemon_socket_path().
+
+    Returns:
+        Whether a daemon was found and attached.
+    """
+    try:
+        client = DaemonClient.connect(path)
+    except OSError:
+        return False
+    storage.attach_daemon(client)
+    return True
@@ -0,0 +1,309 @@
+"""Crash-safe drafts of notes being edited.
+
+The edit screen checkpoints its title and body every few seconds while
+they change. A checkpoint appends one JSON line to drafts.jsonl with
+only what changed since the draft's previous checkpoint: the first one
+carries the whole note, later ones a changed title and the changed span
+of the body. Saving or cancelling the edit closes the draft. Drafts
+still open at the next start were cut short by a crash, a closed
+terminal or a dropped connection, and are offered for recovery.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from tui_notes import storage
+from tui_notes.changes import splice
+from tui_notes.constants import DRAFT_COMPACT_BYTES, MAX_NOTES, NUM_COLORS
+from tui_notes.files import board_lock, write_text
+from tui_notes.storage import get_sync_policy, split_body
+
+
+def _get_drafts_file() -> Path:
+    """Return the path of the drafts file.
+
+    Returns:
+        Path to drafts.jsonl next to notes.json.
+    """
+    return storage.data_file_path().with_name("drafts.jsonl")
+
+
+def _replay(lines: list[bytes]) -> dict[str, dict[str, Any]]:
+    """Rebuild the open drafts from the lines of a drafts file.
+
+    A torn or malformed line is skipped. An edit that does not fit its
+    draft, because a record before it was lost, leaves the draft at its
+    last consistent state.
+
+    Args:
+        lines: Lines of the file.
+
+    Returns:
+        Open drafts keyed by draft id, in the order they were opened.
+    """
+    drafts: dict[str, dict[str, Any]] = {}
+    broken: set[str] = set()
+    for line in lines:
+        record = None
+        try:
+            record = json.loads(line)
+            draft_id = str(record["id"])
+            op = record["op"]
+            if op == "open":
+                drafts[draft_id] = {
+                    "id": draft_id,
+                    "board": str(record["board"]),
+                    "note": str(record["note"]),
+                    "title": str(record["title"]),
+                    "content": str(record["content"]),
+                    "time": float(record["time"]),
+                    "pid": int(record["pid"]),
+                }
+            elif op == "close":
+                drafts.pop(draft_id, None)
+            elif op == "edit" and draft_id in drafts and draft_id not in broken:
+                _apply_edit(drafts[draft_id], record)
+        except (KeyError, TypeError, ValueError):
+            if isinstance(record, dict) and record.get("op") == "edit":
+                broken.add(str(record.get("id")))
+            continue
+    return drafts
+
+
+def _apply_edit(draft: dict[str, Any], record: dict[str, Any]) -> None:
+    """Apply an edit record to a draft in place.
+
+    Args:
+        draft: The draft.
+        record: An edit record written by DraftStore.checkpoint.
+
+    Raises:
+        ValueError: If the record does not fit the draft.
+    """
+    title = str(record.get("title", draft["title"]))
+    content = draft["content"]
+    if "start" in record:
+        start, removed = int(record["start"]), int(record["removed"])
+        if not 0 <= start <= start + removed <= len(content):
+            raise ValueError("edit outside the draft")
+        content = content[:start] + str(record["inserted"]) + content[start + removed :]
+        if len(content) != int(record["length"]):
+            raise ValueError("edit does not fit the draft")
+    draft.update(title=title, content=content, time=float(record["time"]))
+
+
+class DraftStore:
+    """Drafts of the notes being edited, in an append-only file shared by all instances."""
+
+    def __init__(self, path: Path | None = None, max_bytes: int = DRAFT_COMPACT_BYTES) -> None:
+        """Initialize the store. Nothing is read or written until it is used.
+
+        Args:
+            path: The drafts file. Defaults to drafts.jsonl in the data directory.
+            max_bytes: File size after which it is rewritten with only the
+                drafts still open.
+        """
+        self.path = path or _get_drafts_file()
+        self.max_bytes = max_bytes
+        self._drafts: dict[str, dict[str, Any]] = {}
+        self._closed: set[str] = set()
+        self._lock = threading.Lock()
+
+    def checkpoint(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self, draft_id: str, board: str, note_id: str, title: str, content: str
+    ) -> bool:
+        """Record the current state of a draft, writing only what changed.
+
+        Safe to call from a worker thread. A draft already closed is not
+        reopened, so a checkpoint that finishes after the edit ended is
+        dropped.
+
+        Args:
+            draft_id: Id of the edit session.
+            board: Board of the note being edited.
+            note_id: Id of the note being edited.
+            title: Current title.
+            content: Current body.
+
+        Returns:
+            Whether anything was written.
+
+        Raises:
+            OSError: If the drafts file cannot be written.
+        """
+        now = time.time()
+        with self._lock:
+            if draft_id in self._closed:
+                return False
+            last = self._drafts.get(draft_id)
+            if last is None:
+                draft = {
+                    "id": draft_id,
+                    "board": board,
+                    "note": note_id,
+                    "title": title,
+                    "content": content,
+                    "time": now,
+                    "pid": os.getpid(),
+                }
+                record = {"op": "open", **draft}
+            else:
+                if title == last["title"] and content == last["content"]:
+                    return False
+                record = {"op": "edit", "id": draft_id, "time": now}
+                if title != last["title"]:
+                    record["title"] = title
+                if content != last["content"]:
+                    start, removed, inserted = splice(last["content"], content)
+                    record.update(
+                        start=start, removed=len(removed), inserted=inserted, length=len(content)
+                    )
+                draft = {**last, "title": title, "content": content, "time": now}
+            self._append(record)
+            self._drafts[draft_id] = draft
+        return True
+
+    def discard(self, draft_id: str) -> None:
+        """Close a draft because its edit was saved, cancelled or recovered.
+
+        Args:
+            draft_id: Id of the edit session or recovered draft.
+
+        Raises:
+            OSError: If the drafts file cannot be written.
+        """
+        with self._lock:
+            self._closed.add(draft_id)
+            if self._drafts.pop(draft_id, None) is not None:
+                self._append({"op": "close", "id": draft_id})
+
+    def load(self) -> list[dict[str, Any]]:
+        """Read the drafts left open by sessions that are no longer running.
+
+        Returns:
+            Drafts with id, board, note, title, content, time (seconds
+            since the epoch of the last checkpoint) and pid, newest first.
+
+        Raises:
+            OSError: If the drafts file exists but cannot be read.
+        """
+        with self._lock:
+            try:
+                with board_lock(self._lock_file(), shared=True):
+                    lines = self.path.read_bytes().splitlines(keepends=True)
+            except FileNotFoundError:
+                return []
+            found = {
+                key: draft
+                for key, draft in _replay(lines).items()
+                if key not in self._drafts
+                and key not in self._closed
+                and not _running(draft["pid"])
+            }
+            self._drafts.update(found)
+        return sorted(({**d} for d in found.values()), key=lambda d: d["time"], reverse=True)
+
+    def _lock_file(self) -> Path:
+        """Return the lock file guarding the drafts file."""
+        return self.path.parent / "locks" / ".drafts.lock"
+
+    def _append(self, record: dict[str, Any]) -> None:
+        """Append a record, compacting the file when it grew too large; the caller holds the lock.
+
+        Args:
+            record: The record.
+
+        Raises:
+            OSError: If the drafts file cannot be written.
+        """
+        durability = get_sync_policy()
+        line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+        with board_lock(self._lock_file()):
+            created = not self.path.exists()
+            with self.path.open("a+b") as fh:
+                size = fh.tell()
+                if size:
+                    fh.seek(size - 1)
+                    if fh.read(1) != b"\n":
+                        # Finish a line torn by a crash, so this record stays readable.
+                        line = b"\n" + line
+                fh.write(line)
+                durability.sync_file(fh)
+                size = fh.tell()
+            durability.committed(self.path, renamed=created)
+            if size > self.max_bytes:
+                # Other instances append to the file too, so the open
+                # drafts are read back from it rather than taken from memory.
+                drafts = _replay(self.path.read_bytes().splitlines(keepends=True))
+                write_text(
+                    self.path,
+                    "".join(
+                        json.dumps({"op": "open", **draft}, ensure_ascii=False) + "\n"
+                        for draft in drafts.values()
+                    ),
+                )
+
+
+def _running(pid: int) -> bool:
+    """Whether a process, e.g. another instance still editing its draft, is alive.
+
+    Args:
+        pid: Process id.
+
+    Returns:
+        True if the process exists; always False where this cannot be
+        checked without side effects.
+    """
+    if pid == os.getpid():
+        return False
+    if os.name != "posix":
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def restore_draft(draft: dict[str, Any], boards: list[dict[str, str]]) -> str:
+    """Write a recovered draft into its note, or into a new note if that is gone.
+
+    Args:
+        draft: A draft returned by DraftStore.load.
+        boards: The existing boards; a draft whose board was deleted goes
+            to the first one.
+
+    Returns:
+        Id of the board the draft was written to.
+
+    Raises:
+        OSError: If the board cannot be read or written.
+        ValueError: If the note is gone and its board has no free slot.
+    """
+    board = draft["board"] if any(b["id"] == draft["board"] for b in boards) else boards[0]["id"]
+    notes = storage.load_notes(board)
+    content, blob = split_body(draft["content"])
+    fields = {"title": draft["title"], "content": content}
+    note = next((n for n in notes if n.get("id") == draft["note"]), None)
+    if note is not None:
+        note.pop("blob", None)
+        note.update(fields)
+    else:
+        taken = {n["position"] for n in notes}
+        free = next((pos for pos in range(MAX_NOTES) if pos not in taken), None)
+        if free is None:
+            raise ValueError("the board has no free slot")
+        note = {"id": draft["note"], "position": free, "color_index": free % NUM_COLORS, **fields}
+        notes.append(note)
+    if blob is not None:
+        note["blob"] = blob
+    storage.save_notes(notes, board)
+    return board
@@ -0,0 +1,154 @@
+"""When saved notes are forced from the page cache to the disk.
+
+An atomic replace protects a file against a crash of the program, but
+until the data and the directory entry are fsynced a power loss can
+still leave an old or empty file. Forcing that on every save is slow, so
+the storage layer hands every write to one SyncPolicy:
+
+- none: never fsync; the OS writes the data back when it likes.
+- batched: fsync the files written since the last sync, at most once per
+  interval and at the latest one interval after a write. A power loss
+  loses at most that interval of saves.
+- strict: fsync each file before it is renamed into place and its
+  directory after, so a save that returned survives a power loss.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any
+
+from tui_notes.constants import DEFAULT_DURABILITY, DURABILITY_BATCH_SECONDS
+
+DURABILITY_MODES = ("none", "batched", "strict")
+"""Available durability levels, from fastest to safest."""
+
+
+def fsync_path(path: Path) -> None:
+    """Flush a file or directory to the disk.
+
+    Directories are skipped where the OS cannot open them (Windows).
+
+    Args:
+        path: File or directory.
+
+    Raises:
+        OSError: If the path cannot be opened or flushed.
+    """
+    if path.is_dir() and os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class SyncPolicy:
+    """Applies one durability mode to every file the storage layer writes.
+
+    Writers call sync_file on a file they are about to rename into place
+    or close, and committed once the file is in place. syncs counts the
+    fsync calls made, for the benchmarks.
+    """
+
+    def __init__(
+        self, mode: str = DEFAULT_DURABILITY, interval: float = DURABILITY_BATCH_SECONDS
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            mode: One of DURABILITY_MODES.
+            interval: Seconds between batched syncs.
+
+        Raises:
+            ValueError: If the mode is unknown.
+        """
+        self.mode = DEFAULT_DURABILITY
+        self.interval = interval
+        self.syncs = 0
+        self._pending: set[Path] = set()
+        self._last_sync = 0.0
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        self.set_mode(mode)
+
+    def set_mode(self, mode: str) -> None:
+        """Switch to another mode, syncing what the old one left pending.
+
+        Args:
+            mode: One of DURABILITY_MODES.
+
+        Raises:
+            ValueError: If the mode is unknown.
+        """
+        if mode not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {mode!r}")
+        self.flush()
+        self.mode = mode
+
+    def sync_file(self, fh: IO[Any]) -> None:
+        """Flush an open file's data before it is renamed into place or closed.
+
+        Only strict mode syncs here; batched mode syncs the file once it
+        is committed.
+
+        Args:
+            fh: File open for writing.
+
+        Raises:
+            OSError: If the file cannot be flushed.
+        """
+        if self.mode == "strict":
+            fh.flush()
+            os.fsync(fh.fileno())
+            self.syncs += 1
+
+    def committed(self, path: Path, renamed: bool = True) -> None:
+        """Record that a file was written and is in place.
+
+        Args:
+            path: The file.
+            renamed: Whether its directory entry changed (a replace or a
+                new file), so the directory needs syncing too.
+
+        Raises:
+            OSError: In strict mode, if the directory cannot be flushed.
+        """
+        if self.mode == "strict":
+            if renamed:
+                fsync_path(path.parent)
+                self.syncs += 1
+        elif self.mode == "batched":
+            with self._lock:
+                self._pending.add(path)
+                wait = self._last_sync + self.interval - time.monotonic()
+                if wait > 0:
+                    if self._timer is None:
+                        self._timer = threading.Timer(wait, self.flush)
+                        self._timer.daemon = True
+                        self._timer.start()
+                    return
+            self.flush()
+
+    def flush(self) -> None:
+        """Sync every file committed since the last sync, and their directories.
+
+        Files deleted or unreadable since are skipped; there is no one to
+        report the error to when the flush runs on the timer.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, set()
+            self._last_sync = time.monotonic()
+        for path in [*pending, *{path.parent for path in pending}]:
+            try:
+                fsync_path(path)
+            except OSError:
+                continue
+            self.syncs += 1
@@ -0,0 +1,131 @@
+"""The interface every storage engine implements.
+
+tui_notes.storage selects an engine by name and hands it every load and
+save; see register_storage_engine.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any
+
+from tui_notes.constants import DEFAULT_BOARD
+
+
+class StorageEngine(ABC):
+    """Interface implemented by every storage backend.
+
+    Engines receive the complete board on each save; incremental
+    engines diff it against the state they hold and persist only the
+    notes that changed. Boards are stored independently so loading one
+    never reads the others.
+    """
+
+    @abstractmethod
+    def load(self, board: str = DEFAULT_BOARD) -> list[dict[str, Any]]:
+        """Load all notes of a board.
+
+        Args:
+            board: Board id.
+
+        Returns:
+            List of validated note dicts ordered by position.
+        """
+
+    @abstractmethod
+    def save(self, post_its: list[dict[str, Any]], board: str = DEFAULT_BOARD) -> None:
+        """Persist the complete list of notes of a board.
+
+        Args:
+            post_its: List of note dicts.
+            board: Board id.
+
+        Raises:
+            OSError: If the notes cannot be written.
+        """
+
+    @abstractmethod
+    def delete_board(self, board: str) -> None:
+        """Remove every note stored for a board.
+
+        Args:
+            board: Board id.
+
+        Raises:
+            OSError: If the board cannot be removed.
+        """
+
+    def close(self) -> None:
+        """Release files or connections held by the engine."""
+
+    def load_versioned(self, board: str = DEFAULT_BOARD) -> tuple[list[dict[str, Any]], int]:
+        """Load a board's notes with the revision they were saved as.
+
+        Args:
+            board: Board id.
+
+        Returns:
+            The notes, as load() returns them, and the revision; 0 for
+            engines that keep no revision.
+        """
+        return self.load(board), 0
+
+    def save_versioned(
+        self, post_its: list[dict[str, Any]], board: str = DEFAULT_BOARD, revision: int = 0
+    ) -> int:
+        """Persist a board's notes as a new revision.
+
+        Args:
+            post_its: List of note dicts.
+            board: Board id.
+            revision: Revision to record.
+
+        Returns:
+            The revision now stored.
+
+        Raises:
+            OSError: If the notes cannot be written.
+        """
+        self.save(post_its, board)
+        return revision
+
+    def stamp(self, board: str = DEFAULT_BOARD) -> Any:
+        """Return a token that changes whenever a board's files are written.
+
+        Compared before a save, so an unchanged board is not read again.
+
+        Args:
+            board: Board id.
+
+        Returns:
+            Inode, mtime and size of every watched file, or None if the
+            engine has no files to check, which makes every save read the
+            board first.
+        """
+        paths = self.watch_paths(board)
+        if not paths:
+            return None
+        stamps: list[tuple[int, int, int] | None] = []
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                stamps.append(None)
+            else:
+                stamps.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+        return tuple(stamps)
+
+    def watch_paths(self, board: str = DEFAULT_BOARD) -> list[Path]:
+        """Return the files whose changes can change a board's notes.
+
+        Used to notice edits made by other programs; an engine that
+        returns no paths is never watched.
+
+        Args:
+            board: Board id.
+
+        Returns:
+            Files that need not exist yet.
+        """
+        return []
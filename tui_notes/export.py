@@ -0,0 +1,348 @@
+"""Streaming export of notes to Markdown, JSON, JSON Lines and HTML.
+
+Boards are loaded and written one at a time through a buffered file, so
+memory stays bounded by the largest board however many boards are
+exported. The module does not import Textual: the TUI runs export_to_file
+in a worker thread and the headless CLI calls it directly.
+"""
+
+from __future__ import annotations
+
+import html
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, TextIO
+
+from tui_notes.constants import COLORS, EXPORT_BUFFER_BYTES, NUM_COLORS
+from tui_notes.storage import with_body
+
+Loader = Callable[[str], list[dict[str, Any]]]
+"""Returns the notes of a board id."""
+
+Progress = Callable[[int, int, int], None]
+"""Called with boards done, boards in total and notes written so far."""
+
+EXPORT_TITLE = "TUI Notes Export"
+"""Document title; tui_notes.importer skips it when reading an export back."""
+
+
+class ExportCancelled(Exception):
+    """The export was cancelled before it finished; no file was written."""
+
+
+class ExportFormat(ABC):
+    """Writes notes in one file format, one piece at a time."""
+
+    extension = ""
+    """File extension, including the dot, used for default destinations."""
+
+    def __init__(self, board_headings: bool = True) -> None:
+        """Initialize the format.
+
+        Args:
+            board_headings: Whether to mark where each board starts, for
+                formats that show boards as sections.
+        """
+        self.board_headings = board_headings
+
+    def begin(self, out: TextIO) -> None:
+        """Write whatever comes before the first note.
+
+        Args:
+            out: Destination stream.
+        """
+
+    def board(self, out: TextIO, board: dict[str, str]) -> None:
+        """Write the start of a board's section.
+
+        Args:
+            out: Destination stream.
+            board: The board, with id and name.
+        """
+
+    @abstractmethod
+    def note(self, out: TextIO, note: dict[str, Any], board: dict[str, str]) -> None:
+        """Write one note.
+
+        Args:
+            out: Destination stream.
+            note: The note.
+            board: The board the note belongs to.
+        """
+
+    def end(self, out: TextIO) -> None:
+        """Write whatever comes after the last note.
+
+        Args:
+            out: Destination stream.
+        """
+
+
+class MarkdownFormat(ExportFormat):
+    """A level-2 heading per note, under a level-1 heading per board."""
+
+    extension = ".md"
+
+    def begin(self, out: TextIO) -> None:
+        out.write(f"# {EXPORT_TITLE}\n")
+
+    def board(self, out: TextIO, board: dict[str, str]) -> None:
+        if self.board_headings:
+            out.write(f"\n# {board['name']}\n")
+
+    def note(self, out: TextIO, note: dict[str, Any], board: dict[str, str]) -> None:
+        out.write(f"\n## {note['title']}\n")
+        if note["content"]:
+            out.write(f"\n{note['content']}\n")
+
+
+def _public(note: dict[str, Any], board: dict[str, str]) -> dict[str, Any]:
+    """Return a note as written by the JSON formats, tagged with its board."""
+    return {**note, "board": board["id"]}
+
+
+class JsonFormat(ExportFormat):
+    """A single JSON array of notes."""
+
+    extension = ".json"
+
+    def __init__(self, board_headings: bool = True) -> None:
+        super().__init__(board_headings)
+        self._first = True
+
+    def begin(self, out: TextIO) -> None:
+        out.write("[")
+
+    def note(self, out: TextIO, note: dict[str, Any], board: dict[str, str]) -> None:
+        out.write("\n  " if self._first else ",\n  ")
+        self._first = False
+        out.write(json.dumps(_public(note, board), ensure_ascii=False))
+
+    def end(self, out: TextIO) -> None:
+        out.write("]\n" if self._first else "\n]\n")
+
+
+class JsonLinesFormat(ExportFormat):
+    """One JSON object per line; the format `tui-notes add --stdin` reads."""
+
+    extension = ".jsonl"
+
+    def note(self, out: TextIO, note: dict[str, Any], board: dict[str, str]) -> None:
+        out.write(json.dumps(_public(note, board), ensure_ascii=False))
+        out.write("\n")
+
+
+class HtmlFormat(ExportFormat):
+    """A standalone HTML page showing each board as a grid of coloured notes."""
+
+    extension = ".html"
+
+    _COLORS = ("#fff59d", "#a5d6a7", "#90caf9", "#f48fb1", "#ffcc80", "#ce93d8")
+
+    def __init__(self, board_headings: bool = True) -> None:
+        super().__init__(board_headings)
+        self._in_board = False
+
+    def begin(self, out: TextIO) -> None:
+        rules = "".join(f".c{idx}{{background:{color}}}" for idx, color in enumerate(self._COLORS))
+        out.write(
+            '<!DOCTYPE html>\n<html><head><meta charset="utf-8">'
+            f"<title>{EXPORT_TITLE}</title><style>"
+            "body{font-family:sans-serif;margin:2em;background:#fafafa}"
+            ".board{display:grid;grid-template-columns:repeat(3,1fr);gap:1em}"
+            ".note{padding:.5em 1em;border-radius:4px;color:#212121}"
+            ".note p{white-space:pre-wrap}"
+            f"{rules}</style></head><body>\n<h1>{EXPORT_TITLE}</h1>\n"
+        )
+
+    def board(self, out: TextIO, board: dict[str, str]) -> None:
+        self._close_board(out)
+        if self.board_headings:
+            out.write(f"<h2>{html.escape(board['name'])}</h2>\n")
+        out.write('<section class="board">\n')
+        self._in_board = True
+
+    def note(self, out: TextIO, note: dict[str, Any], board: dict[str, str]) -> None:
+        color = note.get("color_index", 0) % NUM_COLORS
+        out.write(
+            f'<article class="note c{color}" title="{COLORS[color][0]}">'
+            f"<h3>{html.escape(note['title'])}</h3>"
+        )
+        if note["content"]:
+            out.write(f"<p>{html.escape(note['content'])}</p>")
+        out.write("</article>\n")
+
+    def end(self, out: TextIO) -> None:
+        self._close_board(out)
+        out.write("</body></html>\n")
+
+    def _close_board(self, out: TextIO) -> None:
+        """Close the open board section, if any."""
+        if self._in_board:
+            out.write("</section>\n")
+            self._in_board = False
+
+
+_export_formats: dict[str, type[ExportFormat]] = {
+    "markdown": MarkdownFormat,
+    "json": JsonFormat,
+    "jsonl": JsonLinesFormat,
+    "html": HtmlFormat,
+}
+
+
+def register_export_format(name: str, format_cls: type[ExportFormat]) -> None:
+    """Make an export format available by name.
+
+    Args:
+        name: Format name used by --format and the export dialog.
+        format_cls: ExportFormat subclass.
+    """
+    _export_formats[name] = format_cls
+
+
+def available_export_formats() -> list[str]:
+    """Return the names of all registered export formats.
+
+    Returns:
+        Format names in registration order.
+    """
+    return list(_export_formats)
+
+
+def get_export_format(name: str, board_headings: bool = True) -> ExportFormat:
+    """Create a writer for a format.
+
+    Args:
+        name: One of available_export_formats().
+        board_headings: Whether to mark where each board starts.
+
+    Returns:
+        A fresh ExportFormat; each export needs its own.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    format_cls = _export_formats.get(name)
+    if format_cls is None:
+        raise ValueError(f"Unknown export format: {name!r}")
+    return format_cls(board_headings)
+
+
+def format_for_path(path: str | Path, default: str = "markdown") -> str:
+    """Guess the export format from a file name.
+
+    Args:
+        path: Destination file.
+        default: Format for unknown extensions.
+
+    Returns:
+        The format whose extension matches, or default.
+    """
+    suffix = Path(path).suffix.lower()
+    aliases = {".markdown": "markdown", ".htm": "html", ".ndjson": "jsonl"}
+    if suffix in aliases:
+        return aliases[suffix]
+    for name, format_cls in _export_formats.items():
+        if format_cls.extension == suffix:
+            return name
+    return default
+
+
+def default_export_path(fmt: str) -> Path:
+    """Return the default destination for a format.
+
+    Args:
+        fmt: Export format name.
+
+    Returns:
+        tui-notes-export with the format's extension, in the home directory.
+    """
+    extension = _export_formats[fmt].extension if fmt in _export_formats else ".txt"
+    return Path.home() / f"tui-notes-export{extension}"
+
+
+def write_export(  # pylint: disable=too-many-arguments
+    out: TextIO,
+    fmt: str,
+    boards: list[dict[str, str]],
+    load: Loader,
+    *,
+    progress: Progress | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> int:
+    """Stream the notes of some boards to a text stream.
+
+    Args:
+        out: Destination stream.
+        fmt: Export format name.
+        boards: Boards to export, in order.
+        load: Returns a board's notes; called once per board. Bodies
+            stored out of line are read one note at a time.
+        progress: Called after each board.
+        cancelled: Polled before each board; returning True stops the export.
+
+    Returns:
+        Number of notes written.
+
+    Raises:
+        OSError: If an out-of-line body cannot be read.
+        ValueError: If the format is unknown.
+        ExportCancelled: If cancelled returned True.
+    """
+    writer = get_export_format(fmt, board_headings=len(boards) > 1)
+    written = 0
+    writer.begin(out)
+    for done, board in enumerate(boards):
+        if cancelled is not None and cancelled():
+            raise ExportCancelled()
+        notes = sorted(load(board["id"]), key=lambda note: note["position"])
+        writer.board(out, board)
+        for note in notes:
+            writer.note(out, with_body(note), board)
+        written += len(notes)
+        if progress is not None:
+            progress(done + 1, len(boards), written)
+    writer.end(out)
+    return written
+
+
+def export_to_file(  # pylint: disable=too-many-arguments
+    path: str | Path,
+    fmt: str,
+    boards: list[dict[str, str]],
+    load: Loader,
+    *,
+    progress: Progress | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> int:
+    """Stream an export to a file, replacing it atomically when complete.
+
+    Args:
+        path: Destination file.
+        fmt: Export format name.
+        boards: Boards to export, in order.
+        load: Returns a board's notes; called once per board.
+        progress: Called after each board.
+        cancelled: Polled before each board; returning True stops the export.
+
+    Returns:
+        Number of notes written.
+
+    Raises:
+        OSError: If the file cannot be written.
+        ValueError: If the format is unknown.
+        ExportCancelled: If cancelled returned True; the file is untouched.
+    """
+    target = Path(path).expanduser()
+    tmp_file = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_file, "w", encoding="utf-8", buffering=EXPORT_BUFFER_BYTES) as out:
+            written = write_export(out, fmt, boards, load, progress=progress, cancelled=cancelled)
+        tmp_file.replace(target)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    return written
@@ -0,0 +1,228 @@
+"""Local feed of note changes, the input of sync.
+
+Once sync is set up, every save appends a record for each note it added,
+changed or deleted: {"board", "id", "time", "note"}, with "deleted"
+instead of "note" for a tombstone and an "origin" when the save applied
+changes pulled from a sync target. Reading the feed from a cursor costs
+only the records written since, however large the boards are.
+
+The feed is a series of JSON Lines segments named after the position of
+their first byte in the feed, so a cursor is a byte position and stays
+valid when old segments are deleted. A record torn by a crash is skipped.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from tui_notes import storage
+from tui_notes.constants import FEED_SEGMENT_BYTES
+from tui_notes.files import board_lock
+from tui_notes.storage import get_sync_policy
+
+SEGMENT_SUFFIX = ".jsonl"
+"""Suffix of a feed segment, named after its first byte's position in the feed."""
+
+
+def _get_feed_dir() -> Path:
+    """Return the directory holding the change feed.
+
+    Returns:
+        Path to the feed directory next to notes.json.
+    """
+    return storage.data_file_path().with_name("feed")
+
+
+def feed_enabled() -> bool:
+    """Return whether saves are recorded in the change feed, i.e. whether sync was set up."""
+    return _get_feed_dir().is_dir()
+
+
+def diff_records(
+    board: str, before: list[dict[str, Any]], after: list[dict[str, Any]], origin: str | None
+) -> list[dict[str, Any]]:
+    """Return the feed records of a save.
+
+    Args:
+        board: Board id.
+        before: The board's notes before the save.
+        after: The board's notes as saved.
+        origin: Tag for the records, e.g. the sync target whose changes
+            the save applied.
+
+    Returns:
+        A record for every note with an id that the save added, changed
+        or removed.
+    """
+    now = time.time()
+    old = {note["id"]: note for note in before if note.get("id")}
+    records = []
+    for note in after:
+        if note.get("id") and old.pop(note["id"], None) != note:
+            records.append({"board": board, "id": note["id"], "time": now, "note": note})
+    records.extend({"board": board, "id": key, "time": now, "deleted": True} for key in old)
+    if origin is not None:
+        for record in records:
+            record["origin"] = origin
+    return records
+
+
+class ChangeFeed:
+    """Append-only log of note changes, read from a cursor.
+
+    Any number of instances and processes may share the directory.
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        """Initialize the feed. Nothing is read or written until it is used.
+
+        Args:
+            root: Directory of the feed. Defaults to feed next to notes.json.
+        """
+        self.root = root or _get_feed_dir()
+
+    def enable(self) -> int:
+        """Start recording saves, if not done yet.
+
+        Returns:
+            The cursor of the end of the feed.
+
+        Raises:
+            OSError: If the directory cannot be created.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        return self.end()
+
+    def end(self) -> int:
+        """Return the cursor just past the last record."""
+        starts = self._starts()
+        if not starts:
+            return 0
+        return starts[-1] + _file_size(self._segment(starts[-1]))
+
+    def append(self, records: Iterable[dict[str, Any]]) -> None:
+        """Append records in one write, starting a new segment when the last is full.
+
+        Args:
+            records: The records.
+
+        Raises:
+            OSError: If the feed cannot be written.
+        """
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        if not data:
+            return
+        durability = get_sync_policy()
+        with board_lock(self.root.parent / "locks" / ".feed.lock"):
+            starts = self._starts() or [0]
+            path = self._segment(starts[-1])
+            size = _finish_torn_line(path)
+            if size >= FEED_SEGMENT_BYTES:
+                path = self._segment(starts[-1] + size)
+            with path.open("ab") as fh:
+                fh.write(data.encode("utf-8"))
+                durability.sync_file(fh)
+            durability.committed(path, renamed=False)
+
+    def read(self, cursor: int) -> tuple[list[dict[str, Any]], int]:
+        """Read the records written since a cursor.
+
+        Args:
+            cursor: A cursor returned by enable, end or read. One from
+                before the oldest segment left reads from that segment.
+
+        Returns:
+            The records in order, and the cursor past the last complete
+            one; a record still being written is left for the next read.
+
+        Raises:
+            OSError: If a segment cannot be read.
+        """
+        starts = self._starts()
+        index = max(0, bisect.bisect_right(starts, cursor) - 1)
+        records: list[dict[str, Any]] = []
+        for start in starts[index:]:
+            offset = max(0, cursor - start)
+            with self._segment(start).open("rb") as fh:
+                fh.seek(offset)
+                data = fh.read()
+            complete = data[: data.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and record.get("board") and record.get("id"):
+                    records.append(record)
+            cursor = start + offset + len(complete)
+            if len(complete) < len(data):
+                break
+        return records, cursor
+
+    def prune(self, cursor: int) -> int:
+        """Delete the segments every record of which lies before a cursor.
+
+        Args:
+            cursor: The oldest cursor any reader still needs.
+
+        Returns:
+            Number of segments deleted.
+        """
+        starts = self._starts()
+        removed = 0
+        for start, following in zip(starts, starts[1:]):
+            if following > cursor:
+                break
+            self._segment(start).unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def _starts(self) -> list[int]:
+        """Return the starting cursors of the segments, in order."""
+        try:
+            names = [path.name for path in self.root.iterdir()]
+        except OSError:
+            return []
+        return sorted(
+            int(name.removesuffix(SEGMENT_SUFFIX))
+            for name in names
+            if name.endswith(SEGMENT_SUFFIX) and name.removesuffix(SEGMENT_SUFFIX).isdigit()
+        )
+
+    def _segment(self, start: int) -> Path:
+        """Return the segment file starting at a cursor."""
+        return self.root / f"{start:012d}{SEGMENT_SUFFIX}"
+
+
+def _finish_torn_line(path: Path) -> int:
+    """End a segment's last line if a crash tore it, so the reader skips it and moves on.
+
+    Args:
+        path: A segment; it need not exist.
+
+    Returns:
+        The segment's size afterwards.
+
+    Raises:
+        OSError: If the segment cannot be repaired.
+    """
+    size = _file_size(path)
+    if size:
+        with path.open("r+b") as fh:
+            fh.seek(size - 1)
+            if fh.read(1) != b"\n":
+                fh.write(b"\n")
+                size += 1
+    return size
+
+
+def _file_size(path: Path) -> int:
+    """Return a file's size, 0 if it does not exist."""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
@@ -0,0 +1,172 @@
+"""Atomic file writes and the advisory locks that guard each board.
+
+Every file tui-notes writes goes through one SyncPolicy
+(tui_notes.durability), which decides whether and when it is fsynced;
+tui_notes.storage selects its mode with set_durability.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: locking falls back to this process only
+    fcntl = None  # type: ignore[assignment]
+
+from tui_notes.durability import SyncPolicy
+
+_local_lock = threading.Lock()
+_policy = SyncPolicy()
+atexit.register(_policy.flush)
+
+
+def get_sync_policy() -> SyncPolicy:
+    """Return the policy every storage write goes through.
+
+    Returns:
+        The shared SyncPolicy.
+    """
+    return _policy
+
+
+def write_json(path: Path, data: dict[str, Any]) -> None:
+    """Write a JSON document using atomic write.
+
+    Args:
+        path: Destination JSON file.
+        data: Document to write.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    write_text(path, json.dumps(data, indent=2, ensure_ascii=False))
+
+
+def write_text(path: Path, text: str) -> None:
+    """Write a text file using atomic write.
+
+    Writes to a temporary file first, then atomically replaces the
+    target file to prevent data corruption on failures. The temporary
+    name is unique to the writer, so concurrent writers never write
+    into each other's file. The durability mode decides whether the
+    file and its directory are fsynced now, later or never.
+
+    Args:
+        path: Destination file.
+        text: Contents to write.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    write_bytes(path, text.encode("utf-8"))
+
+
+def write_bytes(path: Path, data: bytes) -> None:
+    """Write a binary file using atomic write, like write_text.
+
+    Args:
+        path: Destination file.
+        data: Contents to write.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_file = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(tmp_file, "wb") as fh:
+            fh.write(data)
+            _policy.sync_file(fh)
+        tmp_file.replace(path)
+    except OSError:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    _policy.committed(path)
+
+
+def lock_file(data_file: Path, board: str) -> Path:
+    """Return the lock file guarding one board.
+
+    Args:
+        data_file: Path to notes.json.
+        board: Board id.
+
+    Returns:
+        Path to the board's lock file in the locks directory.
+    """
+    return data_file.parent / "locks" / f"{board}.lock"
+
+
+@contextmanager
+def board_lock(path: Path, shared: bool = False) -> Iterator[int]:
+    """Hold an advisory lock on a board for one read or read-compare-write.
+
+    The lock file also holds a token that every save replaces, so a save
+    notices another writer's save even if it left the same mtime and size.
+
+    Args:
+        path: The board's lock file.
+        shared: Take a shared lock, for reads, instead of an exclusive one.
+
+    Yields:
+        A file descriptor of the lock file, for read_token and write_token,
+        or -1 for a read from a data directory that cannot hold one.
+
+    Raises:
+        OSError: If the lock file for a write cannot be opened.
+    """
+    try:
+        if not shared:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError:
+        if not shared:
+            raise
+        # Nothing can have been saved where no lock file can be created.
+        yield -1
+        return
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            yield fd
+        else:
+            with _local_lock:
+                yield fd
+    finally:
+        os.close(fd)
+
+
+def read_token(fd: int) -> bytes:
+    """Return the write token stored in a lock file.
+
+    Args:
+        fd: Descriptor yielded by board_lock.
+
+    Returns:
+        The token, empty if no save has written one yet.
+    """
+    return os.pread(fd, 64, 0) if fd >= 0 else b""
+
+
+def write_token(fd: int) -> bytes:
+    """Store a fresh write token in a lock file.
+
+    Args:
+        fd: Descriptor yielded by an exclusive board_lock.
+
+    Returns:
+        The new token.
+    """
+    token = uuid.uuid4().hex.encode()
+    os.ftruncate(fd, 0)
+    os.pwrite(fd, token, 0)
+    return token
@@ -0,0 +1,551 @@
+"""Revision history of every note.
+
+Each saved change of a note's title or body becomes a revision. The
+revisions of a note are kept in segments of HISTORY_KEYFRAME_INTERVAL
+revisions. The first revision of a segment is a keyframe holding the
+whole note; every other one holds the title and only the span of the
+body that changed since the revision before it.
+
+The newest segment is a JSON Lines file that revisions are appended to.
+Once it is full it is compressed with zlib and a new segment is started,
+so reconstructing any revision reads a single segment and replays at
+most one segment's deltas. Segments whose revisions are all older than
+HISTORY_MAX_AGE_SECONDS, or older than the newest HISTORY_MAX_REVISIONS,
+are deleted.
+
+The history lives in its own directory next to notes.json and is written
+after a board is saved, so loading a board never reads it.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import re
+import shutil
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Iterable
+
+from tui_notes import storage
+from tui_notes.changes import splice
+from tui_notes.constants import (
+    HISTORY_KEYFRAME_INTERVAL,
+    HISTORY_MAX_AGE_SECONDS,
+    HISTORY_MAX_REVISIONS,
+)
+from tui_notes.files import board_lock, write_bytes, write_text
+from tui_notes.storage import get_sync_policy, read_body
+
+HOT_SEGMENT = "current.jsonl"
+"""File name of a note's newest, uncompressed segment."""
+
+COLD_SUFFIX = ".jsonl.z"
+"""Suffix of a compressed segment, named after its first revision."""
+
+_SAFE_NAME = re.compile(r"[A-Za-z0-9_-]{1,64}")
+_CACHED_SEGMENTS = 8
+
+
+def _get_history_dir() -> Path:
+    """Return the directory holding the revision history.
+
+    Returns:
+        Path to the history directory next to notes.json.
+    """
+    return storage.data_file_path().with_name("history")
+
+
+def _safe_name(ident: str) -> str:
+    """Return a file name for a board or note id.
+
+    Args:
+        ident: The id; imported notes may carry any string.
+
+    Returns:
+        The id itself if it is a plain name, else its SHA-1 digest.
+    """
+    if _SAFE_NAME.fullmatch(ident):
+        return ident
+    return hashlib.sha1(ident.encode("utf-8")).hexdigest()
+
+
+def _parse_segment(data: bytes) -> tuple[list[dict[str, Any]], bool]:
+    """Read the records of a segment, up to the first one that does not fit.
+
+    A record is checked against the body length the records before it
+    leave, so a lost or torn record ends the segment instead of
+    corrupting the revisions after it.
+
+    Args:
+        data: The segment's uncompressed JSON lines.
+
+    Returns:
+        The usable records in order, and whether every line was usable.
+    """
+    records: list[dict[str, Any]] = []
+    length = 0
+    for line in data.splitlines():
+        try:
+            record = json.loads(line)
+            rev = int(record["rev"])
+            record["time"] = float(record["time"])
+            record["title"] = str(record["title"])
+            if not isinstance(record.get("content", record.get("inserted", "")), str):
+                raise TypeError("text is not a string")
+            if "content" in record:
+                if records and rev <= records[-1]["rev"]:
+                    raise ValueError("revisions out of order")
+                length = len(record["content"])
+            else:
+                if not records or rev != records[-1]["rev"] + 1:
+                    raise ValueError("delta without the revision before it")
+                if "start" in record:
+                    start, removed = int(record["start"]), int(record["removed"])
+                    if not 0 <= start <= start + removed <= length:
+                        raise ValueError("delta outside the body")
+                    length += len(record["inserted"]) - removed
+                if length != int(record["length"]):
+                    raise ValueError("delta does not fit the body")
+        except (KeyError, TypeError, ValueError):
+            return records, False
+        records.append(record)
+    return records, True
+
+
+def _replay(records: list[dict[str, Any]], until: int | None = None) -> str:
+    """Reconstruct a body from the records of one segment.
+
+    Args:
+        records: Records returned by _parse_segment.
+        until: Revision to stop at. Defaults to the last one.
+
+    Returns:
+        The body at that revision.
+    """
+    content = ""
+    for record in records:
+        if "content" in record:
+            content = record["content"]
+        elif "start" in record:
+            start = record["start"]
+            content = content[:start] + record["inserted"] + content[start + record["removed"] :]
+        if record["rev"] == until:
+            break
+    return content
+
+
+def _newest_mtime(note_dir: Path) -> float:
+    """Return when a note's history was last written.
+
+    Args:
+        note_dir: The note's history directory.
+
+    Returns:
+        Modification time of its newest file, 0 if it has none.
+    """
+    times = []
+    for path in note_dir.iterdir():
+        try:
+            times.append(path.stat().st_mtime)
+        except OSError:
+            continue
+    return max(times, default=0.0)
+
+
+class NoteHistory:
+    """Revision history of the notes of every board.
+
+    record is called with each saved board and appends a revision for
+    every note whose title or body changed. revisions lists a note's
+    revisions and revision reconstructs one of them. All three are safe
+    to call from worker threads, and several instances may share the
+    directory.
+    """
+
+    def __init__(
+        self,
+        root: Path | None = None,
+        keyframe_interval: int = HISTORY_KEYFRAME_INTERVAL,
+        max_revisions: int = HISTORY_MAX_REVISIONS,
+        max_age: float = HISTORY_MAX_AGE_SECONDS,
+    ) -> None:
+        """Initialize the history. Nothing is read or written until it is used.
+
+        Args:
+            root: Directory of the history. Defaults to history next to notes.json.
+            keyframe_interval: Revisions per segment.
+            max_revisions: Revisions of a note kept at least; older
+                segments are deleted.
+            max_age: Seconds after which a segment, or the history of a
+                deleted note, is deleted.
+        """
+        self.root = root or _get_history_dir()
+        self.keyframe_interval = keyframe_interval
+        self.max_revisions = max_revisions
+        self.max_age = max_age
+        self._tips: dict[tuple[str, str], dict[str, Any]] = {}
+        self._segments: dict[Path, tuple[tuple[int, int], list[dict[str, Any]], bool]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, board: str, notes: Iterable[dict[str, Any]]) -> int:
+        """Add a revision for every note of a saved board that changed since its last one.
+
+        Notes whose title, body and blob reference match what this
+        history last recorded are skipped without touching the disk, so
+        a save that changed one note costs one append.
+
+        Args:
+            board: Board id.
+            notes: The board's notes as saved.
+
+        Returns:
+            Number of revisions written.
+
+        Raises:
+            OSError: If the history cannot be written.
+        """
+        written = 0
+        with self._lock:
+            changed = [
+                note
+                for note in notes
+                if note.get("id")
+                and self._tips.get((board, note["id"]), {}).get("key") != _note_key(note)
+            ]
+            if not changed:
+                return 0
+            with board_lock(self._lock_file(board)):
+                for note in changed:
+                    try:
+                        body = read_body(note)
+                    except OSError:
+                        # The body's blob is gone; there is nothing to keep.
+                        continue
+                    written += self._append(board, note["id"], note["title"], body)
+                    self._tips[(board, note["id"])]["key"] = _note_key(note)
+        return written
+
+    def revisions(self, board: str, note_id: str) -> list[dict[str, Any]]:
+        """List the revisions of a note without reconstructing their bodies.
+
+        Args:
+            board: Board id.
+            note_id: Note id.
+
+        Returns:
+            Dicts with rev, time (seconds since the epoch), title and
+            length (of the body), newest first.
+
+        Raises:
+            OSError: If a segment cannot be read.
+        """
+        listed: dict[int, dict[str, Any]] = {}
+        with self._lock:
+            for path in self._segment_files(self._note_dir(board, note_id)):
+                for record in self._read_segment(path)[0]:
+                    length = record["length"] if "length" in record else len(record["content"])
+                    listed[record["rev"]] = {
+                        "rev": record["rev"],
+                        "time": record["time"],
+                        "title": record["title"],
+                        "length": length,
+                    }
+        return [listed[rev] for rev in sorted(listed, reverse=True)]
+
+    def revision(self, board: str, note_id: str, rev: int) -> dict[str, Any]:
+        """Reconstruct one revision of a note.
+
+        Reads the one segment holding the revision, found by its name, and
+        replays it from that segment's keyframe.
+
+        Args:
+            board: Board id.
+            note_id: Note id.
+            rev: Revision number, as listed by revisions.
+
+        Returns:
+            Dict with rev, time, title and content.
+
+        Raises:
+            OSError: If the segment cannot be read.
+            ValueError: If the note has no such revision (any more).
+        """
+        with self._lock:
+            *cold, hot = self._segment_files(self._note_dir(board, note_id))
+            records = self._read_segment(hot)[0]
+            if not records or rev < records[0]["rev"]:
+                # Compressed segments are named after their first revision.
+                firsts = [int(path.name.removesuffix(COLD_SUFFIX)) for path in cold]
+                index = bisect.bisect_right(firsts, rev) - 1
+                records = self._read_segment(cold[index])[0] if index >= 0 else []
+            for record in records:
+                if record["rev"] == rev:
+                    return {
+                        "rev": rev,
+                        "time": record["time"],
+                        "title": record["title"],
+                        "content": _replay(records, rev),
+                    }
+        raise ValueError(f"Note {note_id!r} has no revision {rev}")
+
+    def prune(self) -> int:
+        """Apply the retention policy to every note, including deleted ones.
+
+        Old segments are otherwise only deleted when a note gets a new
+        segment. The history of a note that no board holds any more is
+        deleted once it was last written max_age ago.
+
+        Returns:
+            Number of files deleted.
+
+        Raises:
+            OSError: If a board cannot be read; nothing is deleted then.
+        """
+        engine = storage.get_engine()
+        keep = {
+            (_safe_name(board["id"]), _safe_name(note["id"]))
+            for board in storage.load_boards()
+            for note in engine.load(board["id"])
+            if note.get("id")
+        }
+        cutoff = time.time() - self.max_age
+        removed = 0
+        with self._lock:
+            self._segments.clear()
+            self._tips.clear()
+            for note_dir in list(self.root.glob("*/*")):
+                if not note_dir.is_dir():
+                    continue
+                if (note_dir.parent.name, note_dir.name) not in keep:
+                    if _newest_mtime(note_dir) < cutoff:
+                        removed += sum(1 for _ in note_dir.iterdir())
+                        shutil.rmtree(note_dir, ignore_errors=True)
+                    continue
+                records = self._read_segment(note_dir / HOT_SEGMENT)[0]
+                if records:
+                    removed += self._enforce_retention(
+                        note_dir, records[0]["rev"], records[-1]["rev"]
+                    )
+        return removed
+
+    def _note_dir(self, board: str, note_id: str) -> Path:
+        """Return the directory of a note's history."""
+        return self.root / _safe_name(board) / _safe_name(note_id)
+
+    def _lock_file(self, board: str) -> Path:
+        """Return the lock file guarding the history of a board."""
+        return self.root.parent / "locks" / f".history-{_safe_name(board)}.lock"
+
+    def _append(self, board: str, note_id: str, title: str, body: str) -> int:
+        """Append a revision of a note unless it equals the latest one; the caller holds the locks.
+
+        Args:
+            board: Board id.
+            note_id: Note id.
+            title: The note's title.
+            body: The note's full body.
+
+        Returns:
+            1 if a revision was written, else 0.
+
+        Raises:
+            OSError: If the history cannot be written.
+        """
+        note_dir = self._note_dir(board, note_id)
+        hot = note_dir / HOT_SEGMENT
+        size = _file_size(hot)
+        tip = self._tips.get((board, note_id))
+        if tip is None or tip["size"] != size:
+            # First use, or another instance appended since.
+            tip = self._load_tip(note_dir, size)
+            self._tips[(board, note_id)] = tip
+        if tip["rev"] and title == tip["title"] and body == tip["content"]:
+            return 0
+        rev = tip["rev"] + 1
+        now = time.time()
+        if tip["clean"] and 0 < tip["count"] < self.keyframe_interval:
+            record: dict[str, Any] = {"rev": rev, "time": now, "title": title, "length": len(body)}
+            if body != tip["content"]:
+                start, removed, inserted = splice(tip["content"], body)
+                record.update(start=start, removed=len(removed), inserted=inserted)
+            _append_line(hot, json.dumps(record, ensure_ascii=False))
+            tip["count"] += 1
+        else:
+            if tip["count"]:
+                self._archive(note_dir, tip["first"], rev)
+            record = {"rev": rev, "time": now, "title": title, "content": body}
+            write_text(hot, json.dumps(record, ensure_ascii=False) + "\n")
+            tip.update(first=rev, count=1, clean=True)
+        tip.update(rev=rev, title=title, content=body, size=_file_size(hot))
+        return 1
+
+    def _load_tip(self, note_dir: Path, size: int) -> dict[str, Any]:
+        """Read the latest revision of a note from its newest segment.
+
+        Args:
+            note_dir: The note's history directory.
+            size: Size of its newest segment, 0 if there is none.
+
+        Returns:
+            The segment's first and last revision, its number of usable
+            records, whether all of it was usable, the title and body of
+            the last revision and the segment's size.
+
+        Raises:
+            OSError: If the segment cannot be read.
+        """
+        records, clean = self._read_segment(note_dir / HOT_SEGMENT) if size else ([], True)
+        if records:
+            first, rev = records[0]["rev"], records[-1]["rev"]
+            title, content = records[-1]["title"], _replay(records)
+        else:
+            # Keep numbering after the compressed segments, should the
+            # newest one have been lost.
+            cold = self._segment_files(note_dir)[:-1]
+            last = self._read_segment(cold[-1])[0] if cold else []
+            first, rev, title, content = 0, last[-1]["rev"] if last else 0, "", ""
+        return {
+            "first": first,
+            "rev": rev,
+            "count": len(records),
+            "clean": clean,
+            "title": title,
+            "content": content,
+            "size": size,
+        }
+
+    def _archive(self, note_dir: Path, first: int, next_rev: int) -> None:
+        """Compress a note's full newest segment and apply the retention policy.
+
+        The compressed copy is written before the segment is replaced,
+        so a crash in between leaves a revision in both, never in neither.
+
+        Args:
+            note_dir: The note's history directory.
+            first: First revision of the segment.
+            next_rev: The revision about to start the next segment.
+
+        Raises:
+            OSError: If the segment cannot be read or written.
+        """
+        data = (note_dir / HOT_SEGMENT).read_bytes()
+        write_bytes(note_dir / f"{first:08d}{COLD_SUFFIX}", zlib.compress(data, 9))
+        self._enforce_retention(note_dir, next_rev, next_rev)
+
+    def _enforce_retention(self, note_dir: Path, hot_first: int, newest: int) -> int:
+        """Delete the compressed segments of a note the retention policy no longer keeps.
+
+        Args:
+            note_dir: The note's history directory.
+            hot_first: First revision of the newest segment.
+            newest: The note's latest revision.
+
+        Returns:
+            Number of segments deleted.
+        """
+        cold = self._segment_files(note_dir)[:-1]
+        firsts = [int(path.name.removesuffix(COLD_SUFFIX)) for path in cold] + [hot_first]
+        cutoff = time.time() - self.max_age
+        removed = 0
+        for path, next_first in zip(cold, firsts[1:]):
+            try:
+                # A segment is compressed right after its last revision,
+                # so its mtime bounds the age of every revision in it.
+                expired = path.stat().st_mtime < cutoff
+                if expired or newest - (next_first - 1) >= self.max_revisions:
+                    path.unlink()
+                    self._segments.pop(path, None)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def _segment_files(self, note_dir: Path) -> list[Path]:
+        """Return a note's segments, oldest first; the newest segment is always last.
+
+        Args:
+            note_dir: The note's history directory.
+
+        Returns:
+            The compressed segments in revision order, then the newest
+            segment, which need not exist.
+        """
+        cold = sorted(note_dir.glob(f"*{COLD_SUFFIX}")) if note_dir.is_dir() else []
+        return [*cold, note_dir / HOT_SEGMENT]
+
+    def _read_segment(self, path: Path) -> tuple[list[dict[str, Any]], bool]:
+        """Read a segment, from the cache while the file is unchanged.
+
+        Args:
+            path: A compressed or the newest segment.
+
+        Returns:
+            Its usable records and whether all of it was usable; no
+            records if it does not exist.
+
+        Raises:
+            OSError: If the segment cannot be read.
+        """
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return [], True
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._segments.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1], cached[2]
+        data = path.read_bytes()
+        if path.name.endswith(COLD_SUFFIX):
+            try:
+                data = zlib.decompress(data)
+            except zlib.error:
+                data = b""
+        records, clean = _parse_segment(data)
+        self._segments.pop(path, None)
+        while len(self._segments) >= _CACHED_SEGMENTS:
+            del self._segments[next(iter(self._segments))]
+        self._segments[path] = (stamp, records, clean)
+        return records, clean
+
+
+def _note_key(note: dict[str, Any]) -> tuple[Any, ...]:
+    """Return what identifies a saved state of a note without reading its body."""
+    return note["title"], note.get("content", ""), note.get("blob")
+
+
+def _file_size(path: Path) -> int:
+    """Return the size of a file, 0 if it does not exist."""
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _append_line(path: Path, line: str) -> None:
+    """Append a JSON line to a segment through the durability policy.
+
+    A line torn by a crash is finished first, so the new one stays
+    readable; the reader stops at the torn one either way.
+
+    Args:
+        path: The newest segment of a note.
+        line: The record, without a newline.
+
+    Raises:
+        OSError: If the segment cannot be written.
+    """
+    durability = get_sync_policy()
+    data = line.encode("utf-8") + b"\n"
+    with path.open("a+b") as fh:
+        size = fh.tell()
+        if size:
+            fh.seek(size - 1)
+            if fh.read(1) != b"\n":
+                data = b"\n" + data
+        fh.write(data)
+        durability.sync_file(fh)
+    durability.committed(path, renamed=False)
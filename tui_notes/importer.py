@@ -0,0 +1,409 @@
+"""Bulk import of notes from Markdown, JSON, JSON Lines and directory trees.
+
+Files are parsed as streams of entries, one file at a time, and every
+entry is validated and placed in a free slot of its board as it is
+read. A board that fills up spills over into continuation boards
+("Work 2", "Work 3", ...). Planning writes nothing, so a dry run is a
+plan that is never committed, and committing costs one write per
+touched board plus one of the board index. Like tui_notes.export, the
+module does not import Textual.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from tui_notes.constants import MAX_NOTES, NUM_COLORS
+from tui_notes.export import EXPORT_TITLE
+from tui_notes.snapshot import validate_note
+from tui_notes.storage import new_board_id
+
+Loader = Callable[[str], list[dict[str, Any]]]
+"""Returns the notes of a board id."""
+
+Progress = Callable[[int, int], None]
+"""Called after each file with files read and notes planned so far."""
+
+IMPORT_FORMATS = {
+    ".md": "markdown",
+    ".markdown": "markdown",
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+"""Format of each file extension picked up when walking a directory."""
+
+_HEADING = re.compile(r"^(#{1,2})[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$")
+_FENCE = re.compile(r"^[ \t]*(```|~~~)")
+
+
+class ImportCancelled(Exception):
+    """The import was cancelled while planning; nothing was written."""
+
+
+# ── Parsing ─────────────────────────────────────────────────────
+
+
+def import_files(paths: Iterable[str | Path]) -> Iterator[tuple[Path, str | None]]:
+    """Expand files and directory trees into the files to import.
+
+    Directories are walked in sorted order, skipping hidden entries and
+    files whose extension is not in IMPORT_FORMATS.
+
+    Args:
+        paths: Files and directories.
+
+    Yields:
+        Each file with the board it defaults to: the directory path
+        relative to the imported directory, or None for top-level files.
+    """
+    for path in paths:
+        path = Path(path).expanduser()
+        if not path.is_dir():
+            yield path, None
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(name for name in dirs if not name.startswith("."))
+            relative = Path(root).relative_to(path).as_posix()
+            for name in sorted(files):
+                if not name.startswith(".") and Path(name).suffix.lower() in IMPORT_FORMATS:
+                    yield Path(root) / name, None if relative == "." else relative
+
+
+def _markdown_note(title: str, body: list[str], board: str | None) -> dict[str, Any]:
+    """Build an entry from a Markdown section."""
+    return {"title": title, "content": "".join(body).strip("\n"), "board": board}
+
+
+def parse_markdown(lines: Iterable[str], name: str = "") -> Iterator[dict[str, Any]]:
+    """Parse Markdown into entries, reading what MarkdownFormat writes.
+
+    Level-2 headings are notes and the level-1 heading above them names
+    their board. A level-1 heading without level-2 headings under it is
+    a note itself, and a file without headings is a single note titled
+    name. Headings inside fenced code blocks are content.
+
+    Args:
+        lines: Lines of the document, with their line endings.
+        name: Title for a document without headings.
+
+    Yields:
+        Entries with title, content and board (None for the default board).
+    """
+    board: str | None = None
+    top: str | None = None  # level-1 heading not yet known to be a board or a note
+    title: str | None = None
+    body: list[str] = []
+    in_fence = found = False
+    for line in lines:
+        match = None if in_fence else _HEADING.match(line)
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        if match is None:
+            body.append(line if line.endswith("\n") else line + "\n")
+            continue
+        text = match.group(2)
+        if match.group(1) == "##" and top is not None:
+            board, top = top, None
+        elif title is not None or top is not None:
+            found = True
+            yield _markdown_note(title if title is not None else str(top), body, board)
+            title = top = None
+        body = []
+        if match.group(1) == "##":
+            title = text
+        elif text != EXPORT_TITLE:
+            top = text
+    if title is not None or top is not None:
+        yield _markdown_note(title if title is not None else str(top), body, board)
+    elif not found and "".join(body).strip():
+        yield _markdown_note(name, body, None)
+
+
+def parse_json_lines(
+    lines: Iterable[str], name: str, errors: list[str]
+) -> Iterator[dict[str, Any]]:
+    """Parse one JSON object per line, as JsonLinesFormat writes them.
+
+    Args:
+        lines: Lines of the file.
+        name: File name used in error messages.
+        errors: Receives a message for each malformed line, which is skipped.
+
+    Yields:
+        The objects, with title and optional content, color_index and board.
+    """
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as exc:
+            errors.append(f"{name}:{number}: {exc}")
+            continue
+        if not isinstance(data, dict):
+            errors.append(f"{name}:{number}: not a JSON object")
+            continue
+        yield data
+
+
+def read_entries(path: Path, errors: list[str]) -> Iterator[dict[str, Any]]:
+    """Parse one file into entries, choosing the parser by extension.
+
+    Files with an unknown extension are read as Markdown.
+
+    Args:
+        path: File to read.
+        errors: Receives a message for each skipped line or unreadable file.
+
+    Yields:
+        Raw entries.
+
+    Raises:
+        OSError: If the file cannot be opened.
+    """
+    fmt = IMPORT_FORMATS.get(path.suffix.lower(), "markdown")
+    with open(path, encoding="utf-8") as source:
+        try:
+            if fmt == "jsonl":
+                yield from parse_json_lines(source, str(path), errors)
+            elif fmt == "json":
+                data = json.load(source)
+                if not isinstance(data, list):
+                    errors.append(f"{path}: not a JSON array")
+                    return
+                yield from (entry for entry in data if isinstance(entry, dict))
+            else:
+                yield from parse_markdown(source, path.stem)
+        except ValueError as exc:  # includes UnicodeDecodeError
+            errors.append(f"{path}: {exc}")
+
+
+# ── Planning ────────────────────────────────────────────────────
+
+
+class ImportPlan:  # pylint: disable=too-many-instance-attributes
+    """Where each imported note goes, worked out without writing anything."""
+
+    def __init__(
+        self, boards: list[dict[str, str]], load: Loader, default_board: dict[str, str]
+    ) -> None:
+        """Start an empty plan.
+
+        Args:
+            boards: The current board index.
+            load: Returns the current notes of a board.
+            default_board: Board for entries that name none.
+        """
+        self.base_ids = [board["id"] for board in boards]
+        self.new_boards: list[dict[str, str]] = []
+        self.added: dict[str, list[dict[str, Any]]] = {}
+        self.errors: list[str] = []
+        self.files = 0
+        self.seconds = 0.0
+        self._load = load
+        self._default = default_board
+        self._existing: dict[str, list[dict[str, Any]]] = {}
+        self._free: dict[str, list[int]] = {}
+        self._base = [dict(board) for board in boards]
+        self._by_id = {board["id"]: board for board in self._base}
+        self._by_name = {board["name"].casefold(): board for board in reversed(self._base)}
+        self._after: dict[str, list[dict[str, str]]] = {}
+        self._spill: dict[str, dict[str, str]] = {}
+
+    @property
+    def boards(self) -> list[dict[str, str]]:
+        """The board index after the import: new boards follow the board they continue."""
+        boards = []
+        for board in self._base + self._after.get("", []):
+            boards.append(board)
+            boards.extend(self._after.get(board["id"], []))
+        return boards
+
+    @property
+    def count(self) -> int:
+        """Number of notes the plan adds."""
+        return sum(len(notes) for notes in self.added.values())
+
+    @property
+    def rate(self) -> float:
+        """Notes planned per second."""
+        return self.count / self.seconds if self.seconds else 0.0
+
+    def board_notes(self, board_id: str) -> list[dict[str, Any]]:
+        """Return a touched board's notes after the import.
+
+        Args:
+            board_id: Id of a board in added.
+
+        Returns:
+            Existing and added notes, by position.
+        """
+        notes = self._existing.get(board_id, []) + self.added[board_id]
+        return sorted(notes, key=lambda note: note["position"])
+
+    def add(self, entry: dict[str, Any], board: str | None = None, source: str = "") -> bool:
+        """Validate an entry and place it in the first free slot of its board.
+
+        Args:
+            entry: Raw fields: title and optional content, color_index and board.
+            board: Board id or name for entries that name none.
+            source: Where the entry came from, for error messages.
+
+        Returns:
+            True if the entry was added, False if it was invalid.
+        """
+        try:
+            note = validate_note(
+                {
+                    **entry,
+                    "position": 0,
+                    "title": str(entry.get("title") or ""),
+                    "content": str(entry.get("content") or ""),
+                }
+            )
+        except (TypeError, ValueError):
+            note = None
+        if note is None or not note["title"].strip():
+            self.errors.append(f"{source}: skipped an entry without a valid title")
+            return False
+        target, position = self._place(self._resolve(entry.get("board") or board))
+        color = entry.get("color_index")
+        note.update(
+            id=uuid.uuid4().hex,
+            position=position,
+            title=note["title"].strip(),
+            color_index=(note["color_index"] if color is not None else position) % NUM_COLORS,
+        )
+        self.added.setdefault(target["id"], []).append(note)
+        return True
+
+    def summary(self) -> str:
+        """Describe the plan in one line.
+
+        Returns:
+            Notes, files, boards, skipped entries and throughput.
+        """
+        return (
+            f"{self.count} notes from {self.files} file(s) into {len(self.added)} board(s) "
+            f"({len(self.new_boards)} new), {len(self.errors)} skipped, "
+            f"{self.rate:,.0f} notes/s"
+        )
+
+    def _resolve(self, ref: Any) -> dict[str, str]:
+        """Find a board by id or case-insensitive name, planning it if it is new."""
+        if not ref:
+            return self._default
+        ref = str(ref).strip()
+        board = self._by_id.get(ref) or self._by_name.get(ref.casefold())
+        return board or self._new_board(ref, "")
+
+    def _new_board(self, name: str, anchor: str) -> dict[str, str]:
+        """Plan a board after the boards of anchor, or at the end if anchor is ""."""
+        board = {"id": new_board_id(), "name": name}
+        self._after.setdefault(anchor, []).append(board)
+        self._by_id[board["id"]] = board
+        self.new_boards.append(board)
+        self._by_name[name.casefold()] = board
+        self._existing[board["id"]] = []
+        return board
+
+    def _place(self, board: dict[str, str]) -> tuple[dict[str, str], int]:
+        """Return the board and position for the next note aimed at board.
+
+        Full boards spill over into continuation boards, found by name or
+        planned after the board they continue.
+        """
+        base = board
+        board = self._spill.get(base["id"], base)
+        while not self._free_slots(board["id"]):
+            name = board["name"]
+            match = re.fullmatch(r"(.*) (\d+)", name) if board is not base else None
+            number = int(match.group(2)) + 1 if match else 2
+            stem = match.group(1) if match else base["name"]
+            name = f"{stem} {number}"
+            board = self._by_name.get(name.casefold()) or self._new_board(name, base["id"])
+            self._spill[base["id"]] = board
+        return board, self._free_slots(board["id"]).pop(0)
+
+    def _free_slots(self, board_id: str) -> list[int]:
+        """Return a board's free positions, loading the board on first use."""
+        free = self._free.get(board_id)
+        if free is None:
+            if board_id not in self._existing:
+                self._existing[board_id] = self._load(board_id)
+            taken = {note["position"] for note in self._existing[board_id]}
+            free = self._free[board_id] = [pos for pos in range(MAX_NOTES) if pos not in taken]
+        return free
+
+
+def plan_import(  # pylint: disable=too-many-arguments
+    paths: Iterable[str | Path],
+    boards: list[dict[str, str]],
+    load: Loader,
+    *,
+    default_board: dict[str, str] | None = None,
+    progress: Progress | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> ImportPlan:
+    """Parse files and lay their notes out across boards, writing nothing.
+
+    Args:
+        paths: Files and directories to import.
+        boards: The current board index.
+        load: Returns the current notes of a board; called once per touched board.
+        default_board: Board for top-level entries that name none. Defaults
+            to the first board.
+        progress: Called after each file.
+        cancelled: Polled before each file; returning True stops planning.
+
+    Returns:
+        The plan.
+
+    Raises:
+        OSError: If a file cannot be opened.
+        ImportCancelled: If cancelled returned True.
+    """
+    start = time.perf_counter()
+    plan = ImportPlan(boards, load, default_board or boards[0])
+    for path, board in import_files(paths):
+        if cancelled is not None and cancelled():
+            raise ImportCancelled()
+        for entry in read_entries(path, plan.errors):
+            plan.add(entry, board, str(path))
+        plan.files += 1
+        if progress is not None:
+            progress(plan.files, plan.count)
+    plan.seconds = time.perf_counter() - start
+    return plan
+
+
+def commit_import(
+    plan: ImportPlan,
+    save_notes: Callable[[list[dict[str, Any]], str], Any],
+    save_boards: Callable[[list[dict[str, str]]], None],
+) -> None:
+    """Write a plan: each touched board once, then the board index if it grew.
+
+    Notes are written before the index, so a failure part way never
+    lists a board whose notes are missing.
+
+    Args:
+        plan: The plan to write.
+        save_notes: Persists a board's notes.
+        save_boards: Persists the board index.
+
+    Raises:
+        OSError: If a write fails.
+    """
+    for board_id in plan.added:
+        save_notes(plan.board_notes(board_id), board_id)
+    if plan.new_boards:
+        save_boards(plan.boards)
@@ -0,0 +1,258 @@
+"""Lightweight performance counters and latency histograms.
+
+Hot paths are wrapped with timed(), and code that only needs a tally
+calls count(). Both are no-ops costing a single global lookup until
+enable() installs a Metrics registry, so instrumentation stays compiled
+into normal runs. The registry is shared by the UI thread and the save
+worker, and is read by the debug overlay and the --profile summary.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import threading
+import time
+from typing import Any, Callable, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_BUCKET_BOUNDS = tuple(2**exp / 1_000_000 for exp in range(25))
+"""Upper bounds of the histogram buckets: 1 µs doubling up to about 17 s."""
+
+
+class Histogram:
+    """Latency histogram with logarithmic buckets and a fixed memory footprint."""
+
+    def __init__(self) -> None:
+        """Create an empty histogram."""
+        self.buckets = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.last = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one measurement.
+
+        Args:
+            seconds: Measured duration.
+        """
+        self.buckets[bisect.bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.last = seconds
+
+    def percentile(self, pct: float) -> float:
+        """Estimate a percentile.
+
+        Args:
+            pct: Percentile between 0 and 100.
+
+        Returns:
+            The upper bound of the bucket holding the percentile, capped
+            at the largest measurement; 0.0 when empty.
+        """
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for index, hits in enumerate(self.buckets):
+            seen += hits
+            if hits and seen >= rank:
+                bound = _BUCKET_BOUNDS[index] if index < len(_BUCKET_BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict[str, float]:
+        """Return summary statistics in milliseconds.
+
+        Returns:
+            count, mean, p50, p95, p99 and max.
+        """
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class Metrics:
+    """Thread-safe registry of named counters and histograms."""
+
+    def __init__(self) -> None:
+        """Create an empty registry."""
+        self.counters: dict[str, int] = {}
+        self.histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add to a counter.
+
+        Args:
+            name: Counter name.
+            amount: Value to add.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a duration in a histogram.
+
+        Args:
+            name: Histogram name.
+            seconds: Measured duration.
+        """
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def histogram(self, name: str) -> Histogram:
+        """Return a histogram, empty if nothing was recorded under the name.
+
+        Args:
+            name: Histogram name.
+
+        Returns:
+            The histogram.
+        """
+        with self._lock:
+            return self.histograms.get(name) or Histogram()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return every counter and histogram summary.
+
+        Returns:
+            {"counters": {...}, "timings": {name: summary}}.
+        """
+        with self._lock:
+            return {
+                "counters": dict(sorted(self.counters.items())),
+                "timings": {
+                    name: histogram.as_dict() for name, histogram in sorted(self.histograms.items())
+                },
+            }
+
+    def format(self) -> str:
+        """Return a human-readable summary.
+
+        Returns:
+            A table of timings followed by the counters.
+        """
+        data = self.as_dict()
+        lines = [
+            f"{'timing':<28} {'count':>7} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+        ]
+        for name, stats in data["timings"].items():
+            lines.append(
+                f"{name:<28} {stats['count']:>7} {stats['mean_ms']:>8.2f} "
+                f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} "
+                f"{stats['p99_ms']:>8.2f} {stats['max_ms']:>8.2f}"
+            )
+        if data["counters"]:
+            lines.append("")
+            lines.extend(f"{name:<28} {value:>7}" for name, value in data["counters"].items())
+        return "\n".join(lines) + "\n(times in ms)"
+
+
+_metrics: Metrics | None = None  # pylint: disable=invalid-name
+
+
+def enable() -> Metrics:
+    """Start collecting metrics, keeping what was already collected.
+
+    Returns:
+        The active registry.
+    """
+    global _metrics  # pylint: disable=global-statement
+    if _metrics is None:
+        _metrics = Metrics()
+    return _metrics
+
+
+def disable() -> None:
+    """Stop collecting metrics and drop the registry."""
+    global _metrics  # pylint: disable=global-statement
+    _metrics = None
+
+
+def active() -> Metrics | None:
+    """Return the active registry.
+
+    Returns:
+        The registry, or None while instrumentation is disabled.
+    """
+    return _metrics
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add to a counter if instrumentation is enabled.
+
+    Args:
+        name: Counter name.
+        amount: Value to add.
+    """
+    metrics = _metrics
+    if metrics is not None:
+        metrics.count(name, amount)
+
+
+def observe(name: str, seconds: float) -> None:
+    """Record a duration if instrumentation is enabled.
+
+    Args:
+        name: Histogram name.
+        seconds: Measured duration.
+    """
+    metrics = _metrics
+    if metrics is not None:
+        metrics.observe(name, seconds)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorate a function so its calls are timed into a histogram.
+
+    Args:
+        name: Histogram name.
+
+    Returns:
+        A decorator. The wrapper keeps the function's signature, so it
+        can decorate Textual message handlers.
+    """
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            metrics = _metrics
+            if metrics is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.observe(name, time.perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def wrap(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """Return func timed into a histogram; used to time code we do not own.
+
+    Args:
+        name: Histogram name.
+        func: Function to time.
+
+    Returns:
+        The timed function.
+    """
+    return timed(name)(func)
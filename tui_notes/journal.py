@@ -0,0 +1,353 @@
+"""Append-only journal storage engine for tui-notes.
+
+Each board lives in a snapshot file (the regular board JSON format)
+plus a journal of JSON Lines records describing every change since the
+snapshot was written. Saving appends one small record per changed note
+instead of rewriting the board; once a journal grows past a size or
+record-count threshold a background thread folds it back into its
+snapshot, so the save that crossed it does not pay for rewriting the
+board. A versioned
+save ends with a revision record, so the board's revision is the
+snapshot's, or that of the last revision record after it.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+from tui_notes.changes import apply_record, diff_notes, note_key
+from tui_notes.constants import DEFAULT_BOARD, JOURNAL_MAX_BYTES, JOURNAL_MAX_RECORDS
+from tui_notes.files import board_lock, lock_file
+from tui_notes.snapshot import read_versioned_snapshot, validate_note, write_snapshot
+from tui_notes.storage import StorageEngine, _board_file, get_sync_policy
+
+
+class BoardJournal:  # pylint: disable=too-many-instance-attributes
+    """Snapshot plus append-only journal for a single board."""
+
+    def __init__(
+        self,
+        snapshot_file: Path,
+        journal_file: Path,
+        board: str = DEFAULT_BOARD,
+        max_records: int = JOURNAL_MAX_RECORDS,
+        max_bytes: int = JOURNAL_MAX_BYTES,
+    ) -> None:
+        """Initialize the journal.
+
+        Args:
+            snapshot_file: JSON snapshot in the regular board file format.
+            journal_file: JSON Lines file holding records since the snapshot.
+            board: Board id recorded in the snapshot.
+            max_records: Journal record count that triggers compaction.
+            max_bytes: Journal size in bytes that triggers compaction.
+        """
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file
+        self.board = board
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self._notes: dict[str, dict[str, Any]] | None = None
+        self._records = 0
+        self.revision = 0
+
+    def load(self) -> list[dict[str, Any]]:
+        """Replay the snapshot and journal tail from disk.
+
+        Returns:
+            List of validated note dicts ordered by position.
+        """
+        return self._sorted(self._replay())
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Whether the journal crossed the record-count or size threshold."""
+        return self._records >= self.max_records or self._journal_size() >= self.max_bytes
+
+    def save(self, post_its: list[dict[str, Any]], revision: int | None = None) -> None:
+        """Append records for every note that changed since the last save.
+
+        The journal is not compacted here; see needs_compaction.
+
+        Args:
+            post_its: The complete list of notes for the board.
+            revision: Revision to record after the changes, if any.
+
+        Raises:
+            OSError: If the journal or snapshot cannot be written.
+        """
+        notes = self._notes if self._notes is not None else self._replay()
+        new = [v for note in post_its if (v := validate_note(note)) is not None]
+        records = diff_notes(notes, new)
+        if not records:
+            return
+        if revision is not None:
+            records.append({"op": "revision", "revision": revision})
+            self.revision = revision
+
+        self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+        lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        created = not self.journal_file.exists()
+        durability = get_sync_policy()
+        with self.journal_file.open("a", encoding="utf-8") as fh:
+            fh.write(lines)
+            durability.sync_file(fh)
+        durability.committed(self.journal_file, renamed=created)
+        for record in records:
+            apply_record(notes, record)
+        self._records += len(records)
+
+    def compact(self) -> None:
+        """Fold the journal into the snapshot and truncate it.
+
+        The snapshot is replaced atomically before the journal is
+        removed; a crash in between only leaves records that replay to
+        the same state.
+
+        Raises:
+            OSError: If the snapshot cannot be written.
+        """
+        notes = self._notes if self._notes is not None else self._replay()
+        write_snapshot(self.snapshot_file, self._sorted(notes), self.board, self.revision)
+        self.journal_file.unlink(missing_ok=True)
+        self._records = 0
+
+    def delete(self) -> None:
+        """Remove the snapshot and journal files."""
+        self.journal_file.unlink(missing_ok=True)
+        self.snapshot_file.unlink(missing_ok=True)
+        self._notes = {}
+        self._records = 0
+        self.revision = 0
+
+    def _replay(self) -> dict[str, dict[str, Any]]:
+        """Rebuild the board state from the snapshot and journal.
+
+        A torn last record (from a crash mid-append) is cut off so the
+        next append starts on a clean line. A corrupt record before the
+        last one is skipped; the records after it still apply.
+
+        Returns:
+            Notes keyed by note identity.
+        """
+        snapshot, revision = read_versioned_snapshot(self.snapshot_file)
+        notes = {note_key(note): note for note in snapshot}
+        count = 0
+        good_bytes = 0
+        bad_bytes = 0
+        try:
+            with self.journal_file.open("rb") as fh:
+                for line in fh:
+                    # A bad record followed by another one is corrupt, not torn; keep it.
+                    good_bytes += bad_bytes
+                    bad_bytes = 0
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        bad_bytes = len(line)
+                        continue
+                    if not line.endswith(b"\n"):
+                        bad_bytes = len(line)
+                        continue
+                    good_bytes += len(line)
+                    count += 1
+                    if isinstance(record, dict):
+                        try:
+                            if record.get("op") == "revision":
+                                revision = int(record["revision"])
+                            else:
+                                apply_record(notes, record)
+                        except (KeyError, TypeError, ValueError):
+                            continue
+            if good_bytes < self._journal_size():
+                with self.journal_file.open("r+b") as fh:
+                    fh.truncate(good_bytes)
+        except FileNotFoundError:
+            pass
+        self._notes = notes
+        self._records = count
+        self.revision = revision
+        return notes
+
+    def _journal_size(self) -> int:
+        """Return the journal size in bytes, or 0 if it doesn't exist."""
+        try:
+            return self.journal_file.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def _sorted(notes: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
+        """Return copies of the notes ordered by grid position.
+
+        Args:
+            notes: Notes keyed by note identity.
+
+        Returns:
+            List of note dicts.
+        """
+        return [dict(note) for note in sorted(notes.values(), key=lambda n: n["position"])]
+
+
+class JournalStore(StorageEngine):
+    """Journal engine: one BoardJournal per board, opened on first use.
+
+    A save that leaves a journal past its threshold queues the board for
+    the compactor thread, which folds it into the snapshot under the
+    board's lock, like a save of another process would.
+    """
+
+    def __init__(
+        self,
+        data_file: Path,
+        max_records: int = JOURNAL_MAX_RECORDS,
+        max_bytes: int = JOURNAL_MAX_BYTES,
+    ) -> None:
+        """Initialize the engine.
+
+        Args:
+            data_file: Path to notes.json, the default board's snapshot.
+            max_records: Journal record count that triggers compaction.
+            max_bytes: Journal size in bytes that triggers compaction.
+        """
+        self.data_file = data_file
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self._journals: dict[str, BoardJournal] = {}
+        self._lock = threading.Lock()
+        self._to_compact: set[str] = set()
+        self._compactor: threading.Thread | None = None
+
+    @classmethod
+    def for_data_file(cls, data_file: Path) -> JournalStore:
+        """Create the engine that keeps journals next to the board files.
+
+        Args:
+            data_file: Path to notes.json.
+
+        Returns:
+            A new JournalStore.
+        """
+        return cls(data_file)
+
+    def journal(self, board: str = DEFAULT_BOARD) -> BoardJournal:
+        """Return the journal of a board.
+
+        Args:
+            board: Board id.
+
+        Returns:
+            The board's BoardJournal.
+        """
+        journal = self._journals.get(board)
+        if journal is None:
+            snapshot = _board_file(self.data_file, board)
+            journal = BoardJournal(
+                snapshot,
+                snapshot.with_suffix(".journal"),
+                board,
+                max_records=self.max_records,
+                max_bytes=self.max_bytes,
+            )
+            self._journals[board] = journal
+        return journal
+
+    def load(self, board: str = DEFAULT_BOARD) -> list[dict[str, Any]]:
+        """Replay a board's snapshot and journal tail."""
+        with self._lock:
+            return self.journal(board).load()
+
+    def save(self, post_its: list[dict[str, Any]], board: str = DEFAULT_BOARD) -> None:
+        """Append records for every note of the board that changed."""
+        with self._lock:
+            self.journal(board).save(post_its)
+            self._schedule_compaction(board)
+
+    def load_versioned(self, board: str = DEFAULT_BOARD) -> tuple[list[dict[str, Any]], int]:
+        """Replay a board and return its notes with the last recorded revision."""
+        with self._lock:
+            journal = self.journal(board)
+            return journal.load(), journal.revision
+
+    def save_versioned(
+        self, post_its: list[dict[str, Any]], board: str = DEFAULT_BOARD, revision: int = 0
+    ) -> int:
+        """Append the changed notes followed by a revision record.
+
+        A save that changes nothing appends nothing and keeps the revision.
+        """
+        with self._lock:
+            journal = self.journal(board)
+            journal.save(post_its, revision)
+            self._schedule_compaction(board)
+            return journal.revision
+
+    def delete_board(self, board: str) -> None:
+        """Remove a board's snapshot and journal."""
+        with self._lock:
+            self.journal(board).delete()
+            del self._journals[board]
+            self._to_compact.discard(board)
+
+    def watch_paths(self, board: str = DEFAULT_BOARD) -> list[Path]:
+        """Return the board's snapshot and journal."""
+        snapshot = _board_file(self.data_file, board)
+        return [snapshot, snapshot.with_suffix(".journal")]
+
+    def compact(self) -> None:
+        """Fold every open journal into its snapshot.
+
+        Raises:
+            OSError: If a snapshot cannot be written.
+        """
+        with self._lock:
+            for journal in self._journals.values():
+                journal.compact()
+
+    def close(self) -> None:
+        """Wait for the compactor to finish the boards queued so far."""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def _schedule_compaction(self, board: str) -> None:
+        """Queue a board for the compactor once its journal crossed the threshold.
+
+        The caller holds the engine lock.
+
+        Args:
+            board: Board id.
+        """
+        if not self._journals[board].needs_compaction:
+            return
+        self._to_compact.add(board)
+        if self._compactor is None:
+            self._compactor = threading.Thread(
+                target=self._compact_queued, name="journal-compactor", daemon=True
+            )
+            self._compactor.start()
+
+    def _compact_queued(self) -> None:
+        """Compactor thread: compact the queued boards until none is left."""
+        while True:
+            with self._lock:
+                if not self._to_compact:
+                    self._compactor = None
+                    return
+                board = self._to_compact.pop()
+            try:
+                with board_lock(lock_file(self.data_file, board)):
+                    with self._lock:
+                        journal = self._journals.get(board)
+                        if journal is None:
+                            continue
+                        # Another process may have appended since this one last read the board.
+                        journal.load()
+                        if journal.needs_compaction:
+                            journal.compact()
+            except OSError:
+                # The journal stays as it is; the next save past the threshold retries.
+                continue
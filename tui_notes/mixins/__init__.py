@@ -0,0 +1,15 @@
+"""Feature mixins NotesApp is assembled from.
+
+Each mixin holds the actions and workers of one feature; NotesApp keeps
+the lifecycle, the grid and persistence.
+"""
+
+from __future__ import annotations
+
+from tui_notes.mixins.boards import BoardsMixin
+from tui_notes.mixins.drafts import DraftsMixin
+from tui_notes.mixins.export import ExportMixin
+from tui_notes.mixins.imports import ImportMixin
+from tui_notes.mixins.sync import SyncMixin
+
+__all__ = ["BoardsMixin", "DraftsMixin", "ExportMixin", "ImportMixin", "SyncMixin"]
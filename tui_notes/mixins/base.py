@@ -0,0 +1,100 @@
+"""The state and helpers of NotesApp its feature mixins build on."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+from textual.app import App
+
+if TYPE_CHECKING:
+    import threading
+
+    from textual.reactive import reactive
+
+    from tui_notes.drafts import DraftStore
+    from tui_notes.history import NoteHistory
+    from tui_notes.saver import WriteBehindSaver
+    from tui_notes.search import SearchIndex
+    from tui_notes.storage import ConflictError
+    from tui_notes.sync import NoteSync
+    from tui_notes.undo import UndoLog
+    from tui_notes.watcher import FileWatcher
+    from tui_notes.widgets import PostIt
+
+Notes = list[dict[str, Any]]
+
+
+class AppBase(App):
+    """Base of NotesApp and its mixins.
+
+    NotesApp sets up the state and defines the grid and persistence
+    helpers; they are declared here, for type checking only, so each
+    mixin can use them. Helpers one mixin provides to another are
+    declared here as well; helpers all of them share are defined here.
+    """
+
+    if TYPE_CHECKING:
+        move_mode: reactive[bool]
+        _boards: list[dict[str, str]]
+        _board_id: str
+        _board_cache: dict[str, Notes]
+        _index: SearchIndex
+        _saver: WriteBehindSaver
+        _undo: UndoLog
+        _undo_base: Notes
+        _watcher: FileWatcher | None
+        _snapshot_scheduled: bool
+        _closing: bool
+        _conflicts: dict[str, ConflictError]
+        _drafts: DraftStore | None
+        _unsaved_drafts: list[str]
+        _history: NoteHistory | None
+        _stores_lock: threading.Lock
+        _sync: NoteSync | None
+        _syncing: bool
+        _sync_failed: bool
+
+        # Helpers defined by NotesApp, and by one mixin for the others.
+        _start_watcher: Callable[[], None]
+        _get_post_its: Callable[[], list[PostIt]]
+        _focused_note: Callable[[], PostIt | None]
+        _focus_first: Callable[[], None]
+        _load_board: Callable[[str], Notes]
+        _load_known: Callable[[dict[str, Notes], str], Notes]
+        _notes_in_memory: Callable[[], dict[str, Notes]]
+        _write_notes: Callable[[Notes, str, str | None], Notes]
+        _serialize_notes: Callable[[], Notes]
+        _submit_snapshot: Callable[[], None]
+        flush_saves: Callable[[], None]
+        _on_save_error: Callable[[OSError], None]
+        _show_notes: Callable[[Notes], None]
+        _show_notes_in_place: Callable[[Notes], None]
+        _apply_edit: Callable[[PostIt, dict[str, str] | None], None]
+        _exit_move_mode: Callable[[], None]
+        _board_index: Callable[[], int]
+        _update_board_bar: Callable[[], None]
+        _prefetch_neighbours: Callable[[], None]
+        _switch_board: Callable[[str], None]
+        _save_board_index: Callable[[], bool]
+        _reload_external: Callable[[], None]
+
+    def _progress_reporter(self, interval: float) -> Callable[[str], None]:
+        """Return a function a worker calls to show its progress, at most every interval seconds.
+
+        Args:
+            interval: Minimum seconds between two messages; none is shown
+                before the first interval has passed.
+
+        Returns:
+            Function that notifies the message unless one was shown too recently.
+        """
+        last_report = time.monotonic()
+
+        def report(message: str) -> None:
+            nonlocal last_report
+            if time.monotonic() - last_report >= interval:
+                last_report = time.monotonic()
+                self.call_from_thread(self.notify, message)
+
+        return report
@@ -0,0 +1,283 @@
+"""Board handling of NotesApp: switching, prefetching and editing the board index."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import Any
+
+from rich.text import Text
+from textual.widgets import Static
+
+from tui_notes import screens
+from tui_notes.mixins.base import AppBase
+from tui_notes.storage import delete_board, new_board_id, save_boards, watch_paths
+
+
+class BoardsMixin(AppBase):
+    """Switch boards, keep their neighbours prefetched, and add, rename and delete boards."""
+
+    _prefetch_epoch: int = 0
+
+    def _board_index(self) -> int:
+        """Return the position of the active board in the board list.
+
+        Returns:
+            Index into the board list.
+        """
+        for idx, board in enumerate(self._boards):
+            if board["id"] == self._board_id:
+                return idx
+        return 0
+
+    def _neighbour_ids(self) -> set[str]:
+        """Return the ids of the boards before and after the active one.
+
+        Returns:
+            Set of at most two board ids, excluding the active board.
+        """
+        idx = self._board_index()
+        total = len(self._boards)
+        return {self._boards[(idx + step) % total]["id"] for step in (-1, 1)} - {self._board_id}
+
+    def _update_board_bar(self) -> None:
+        """Render the board names with the active board highlighted."""
+        labels = Text()
+        for board in self._boards:
+            style = "bold reverse" if board["id"] == self._board_id else "dim"
+            labels.append(f" {board['name']} ", style=style)
+            labels.append(" ")
+        self.query_one("#board-bar", Static).update(labels)
+
+    def _prefetch_neighbours(self) -> None:
+        """Load the neighbouring boards in the background so switching is instant.
+
+        The cache only ever holds the neighbours of the active board, so
+        memory stays constant however many boards exist.
+        """
+        self._prefetch_epoch += 1
+        neighbours = self._neighbour_ids()
+        self._board_cache = {b: n for b, n in self._board_cache.items() if b in neighbours}
+        missing = [board for board in neighbours if board not in self._board_cache]
+        if missing:
+            self.run_worker(
+                partial(self._prefetch_boards, missing, self._prefetch_epoch),
+                name="prefetch-boards",
+                group="prefetch",
+                thread=True,
+                exclusive=True,
+                exit_on_error=False,
+            )
+
+    def _prefetch_boards(self, boards: list[str], epoch: int) -> None:
+        """Worker: read boards from storage and hand them to the UI thread.
+
+        Args:
+            boards: Board ids to load.
+            epoch: Prefetch generation the results belong to.
+        """
+        for board in boards:
+            try:
+                notes = self._load_board(board)
+            except OSError:
+                continue
+            self._index.sync_board(board, notes)
+            self.call_from_thread(self._store_prefetched, board, notes, epoch)
+
+    def _store_prefetched(self, board: str, notes: list[dict[str, Any]], epoch: int) -> None:
+        """Cache a prefetched board unless the active board changed meanwhile.
+
+        Args:
+            board: Board id.
+            notes: Note dicts loaded for the board.
+            epoch: Prefetch generation the results belong to.
+        """
+        if epoch == self._prefetch_epoch and board not in self._board_cache:
+            self._board_cache[board] = notes
+
+    def _switch_board(self, board_id: str) -> None:
+        """Make another board active, using prefetched notes when available.
+
+        Args:
+            board_id: Id of the board to show.
+        """
+        if board_id == self._board_id:
+            return
+        if self.move_mode:
+            self._exit_move_mode()
+        self._submit_snapshot()
+        self._board_cache[self._board_id] = self._serialize_notes()
+
+        self._board_id = board_id
+        if self._watcher is not None:
+            self._watcher.watch(watch_paths(board_id))
+        notes = self._board_cache.pop(board_id, None)
+        if notes is None:
+            notes = self._load_board(board_id)
+        self._show_notes(notes)
+        self._update_board_bar()
+        self.call_after_refresh(self._focus_first)
+        self._prefetch_neighbours()
+
+    def _save_board_index(self) -> bool:
+        """Write the board index, reporting failures.
+
+        Returns:
+            True if the index was written.
+        """
+        try:
+            save_boards(self._boards)
+        except OSError as exc:
+            self._on_save_error(exc)
+            return False
+        return True
+
+    def action_next_board(self) -> None:
+        """Switch to the next board."""
+        idx = self._board_index()
+        self._switch_board(self._boards[(idx + 1) % len(self._boards)]["id"])
+
+    def action_prev_board(self) -> None:
+        """Switch to the previous board."""
+        idx = self._board_index()
+        self._switch_board(self._boards[(idx - 1) % len(self._boards)]["id"])
+
+    def action_new_board(self) -> None:
+        """Ask for a name and create a board after the active one."""
+        self.push_screen(
+            screens.PromptScreen("New board name", f"Board {len(self._boards) + 1}"),
+            callback=self._create_board,
+        )
+
+    def _create_board(self, name: str | None) -> None:
+        """Create a board and switch to it.
+
+        Args:
+            name: Board name, or None if cancelled.
+        """
+        if name is None:
+            return
+        board = {"id": new_board_id(), "name": name}
+        self._boards.insert(self._board_index() + 1, board)
+        if self._save_board_index():
+            self._switch_board(board["id"])
+            self.notify(f"Created board: {name}")
+
+    def action_rename_board(self) -> None:
+        """Ask for a new name for the active board."""
+        current = self._boards[self._board_index()]
+        self.push_screen(
+            screens.PromptScreen("Rename board", current["name"]),
+            callback=self._rename_board,
+        )
+
+    def _rename_board(self, name: str | None) -> None:
+        """Rename the active board.
+
+        Args:
+            name: New board name, or None if cancelled.
+        """
+        if name is None:
+            return
+        self._boards[self._board_index()]["name"] = name
+        self._save_board_index()
+        self._update_board_bar()
+
+    def action_delete_board(self) -> None:
+        """Delete the active board and its notes after user confirmation."""
+        if len(self._boards) == 1:
+            self.notify("Cannot delete the only board.", severity="warning")
+            return
+        current = self._boards[self._board_index()]
+        self.push_screen(
+            screens.ConfirmScreen(f"Delete board '{current['name']}' and its notes?"),
+            callback=lambda confirmed: self._do_delete_board(current["id"], confirmed),
+        )
+
+    def _do_delete_board(self, board_id: str, confirmed: bool) -> None:
+        """Remove a board from the index and storage.
+
+        Args:
+            board_id: Id of the board to delete.
+            confirmed: Whether the user confirmed the deletion.
+        """
+        if not confirmed:
+            return
+        idx = self._board_index()
+        name = self._boards[idx]["name"]
+        self._snapshot_scheduled = False
+        self._switch_board(self._boards[idx - 1 if idx > 0 else 1]["id"])
+        self._board_cache.pop(board_id, None)
+        self._saver.discard(board_id)
+        self._undo.forget(board_id)
+        self._index.remove_board(board_id)
+        self._boards = [board for board in self._boards if board["id"] != board_id]
+        try:
+            delete_board(board_id)
+        except OSError as exc:
+            self._on_save_error(exc)
+        self._save_board_index()
+        self._update_board_bar()
+        self._prefetch_neighbours()
+        self.notify(f"Deleted board: {name}")
+
+    def action_overview(self) -> None:
+        """Show the notes of every board in a scrollable overview."""
+        if self.move_mode:
+            self._exit_move_mode()
+        boards = [dict(board) for board in self._boards]
+        known = self._notes_in_memory()
+        self.push_screen(
+            screens.OverviewScreen(partial(self._collect_notes, boards, known)),
+            callback=self._open_from_overview,
+        )
+
+    def _collect_notes(
+        self, boards: list[dict[str, str]], known: dict[str, list[dict[str, Any]]]
+    ) -> list[dict[str, Any]]:
+        """Worker: gather the notes of all boards for the overview.
+
+        Args:
+            boards: Board index to walk, in order.
+            known: Notes already in memory (active and prefetched boards), by board id.
+
+        Returns:
+            Note dicts tagged with board and board_name keys.
+        """
+        notes: list[dict[str, Any]] = []
+        for board in boards:
+            notes.extend(
+                {**note, "board": board["id"], "board_name": board["name"]}
+                for note in self._load_known(known, board["id"])
+            )
+        return notes
+
+    def _open_from_overview(self, note: dict[str, Any] | None) -> None:
+        """Switch to the board of a note picked in the overview and focus it.
+
+        Args:
+            note: The chosen note, or None if the overview was closed.
+        """
+        if note is None or not any(b["id"] == note["board"] for b in self._boards):
+            return
+        self._jump_to_note(note["board"], note["id"])
+
+    def _jump_to_note(self, board: str, note_id: str) -> None:
+        """Switch to a board and focus one of its notes.
+
+        Args:
+            board: Id of the board holding the note.
+            note_id: Id of the note to focus.
+        """
+        self._switch_board(board)
+        self.call_after_refresh(self._focus_note, note_id)
+
+    def _focus_note(self, note_id: str) -> None:
+        """Focus the post-it showing a note, if it is on the active board.
+
+        Args:
+            note_id: Id of the note.
+        """
+        for post_it in self._get_post_its():
+            if post_it.note_id == note_id:
+                post_it.focus()
+                return
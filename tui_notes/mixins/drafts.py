@@ -0,0 +1,112 @@
+"""Drafts and revision history of NotesApp."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from tui_notes import screens
+from tui_notes.mixins.base import AppBase
+
+if TYPE_CHECKING:
+    from tui_notes.drafts import DraftStore
+    from tui_notes.history import NoteHistory
+
+
+class DraftsMixin(AppBase):
+    """Checkpoint edits as drafts, recover them after a crash and browse saved revisions."""
+
+    # ── Drafts ──────────────────────────────────────────────────
+
+    def _get_drafts(self) -> DraftStore:
+        """Return the draft store, opening the default one on first use.
+
+        Returns:
+            The DraftStore edits are checkpointed into.
+        """
+        # Workers and the UI thread both get here; only one store may exist.
+        with self._stores_lock:
+            if self._drafts is None:
+                from tui_notes.drafts import DraftStore  # pylint: disable=import-outside-toplevel
+
+                self._drafts = DraftStore()
+            return self._drafts
+
+    def _close_saved_drafts(self) -> None:
+        """Close the drafts of finished edits once no save of the board is pending."""
+        if self._snapshot_scheduled or self._saver.pending_writes:
+            self.set_timer(self._saver.max_latency, self._close_saved_drafts)
+            return
+        drafts, self._unsaved_drafts = self._unsaved_drafts, []
+        for draft in drafts:
+            try:
+                self._get_drafts().discard(draft)
+            except OSError as exc:
+                self.log.error(f"Draft not closed: {exc}")
+
+    def _load_drafts(self) -> None:
+        """Worker: offer the drafts an interrupted session left behind."""
+        try:
+            drafts = self._get_drafts().load()
+        except OSError as exc:
+            self.log.error(f"Drafts not read: {exc}")
+            return
+        if drafts:
+            self.call_from_thread(
+                self.push_screen,
+                screens.DraftRecoveryScreen(drafts, {b["id"]: b["name"] for b in self._boards}),
+                partial(self._recover_drafts, drafts),
+            )
+
+    def _recover_drafts(self, drafts: list[dict[str, Any]], choice: str | None) -> None:
+        """Write the drafts into their notes, or drop them, as chosen.
+
+        Args:
+            drafts: Drafts as returned by DraftStore.load.
+            choice: "restore", "discard" or "later" to decide on the next start.
+        """
+        for draft in drafts if choice in ("restore", "discard") else []:
+            try:
+                if choice == "restore":
+                    # pylint: disable-next=import-outside-toplevel
+                    from tui_notes.drafts import restore_draft
+
+                    board = restore_draft(draft, self._boards)
+                    self._board_cache.pop(board, None)
+                self._get_drafts().discard(draft["id"])
+            except (OSError, ValueError) as exc:
+                self.notify(f"Draft {draft['title']!r} not restored: {exc}", severity="error")
+        if choice == "restore":
+            self._reload_external()
+
+    # ── History ─────────────────────────────────────────────────
+
+    def _get_history(self) -> NoteHistory:
+        """Return the revision history, opening the default one on first use.
+
+        Returns:
+            The NoteHistory saved notes are recorded into.
+        """
+        with self._stores_lock:
+            if self._history is None:
+                from tui_notes.history import NoteHistory  # pylint: disable=import-outside-toplevel
+
+                self._history = NoteHistory()
+            return self._history
+
+    def action_history(self) -> None:
+        """Browse the saved revisions of the focused post-it and restore one."""
+        focused = self._focused_note()
+        if focused is None:
+            return
+        # The latest change becomes a revision only once it is written.
+        self.flush_saves()
+        history = self._get_history()
+        self.push_screen(
+            screens.HistoryScreen(
+                focused.title,
+                partial(history.revisions, self._board_id, focused.note_id),
+                partial(history.revision, self._board_id, focused.note_id),
+            ),
+            callback=lambda result: self._apply_edit(focused, result),
+        )
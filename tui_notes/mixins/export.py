@@ -0,0 +1,101 @@
+"""Export of NotesApp."""
+
+from __future__ import annotations
+
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from textual.worker import get_current_worker
+
+from tui_notes import screens
+from tui_notes.constants import EXPORT_PROGRESS_SECONDS
+from tui_notes.mixins.base import AppBase
+
+
+class ExportMixin(AppBase):
+    """Stream the active board or every board into an export file in the background."""
+
+    _export_format: str = "markdown"
+    _export_all_boards: bool = False
+
+    def action_export(self) -> None:
+        """Ask for the export format, destination and scope, then export in the background."""
+        if self.move_mode:
+            self._exit_move_mode()
+        self.push_screen(
+            screens.ExportScreen(self._export_format, self._export_all_boards),
+            callback=self._start_export,
+        )
+
+    def _start_export(self, options: dict[str, Any] | None) -> None:
+        """Start streaming an export in a worker thread.
+
+        Only one export runs at a time; starting another cancels it.
+
+        Args:
+            options: Format, path and all_boards chosen in the dialog, or None.
+        """
+        if options is None:
+            return
+        self._export_format = options["format"]
+        self._export_all_boards = options["all_boards"]
+        known = self._notes_in_memory()
+        if self._export_all_boards:
+            boards = [dict(board) for board in self._boards]
+        else:
+            boards = [dict(self._boards[self._board_index()])]
+            if not known[self._board_id]:
+                self.notify("No notes to export.", severity="warning")
+                return
+        path = Path(options["path"]).expanduser()
+        self.notify(f"Exporting to {path}…")
+        self.run_worker(
+            partial(self._export, path, options["format"], boards, known),
+            name="export",
+            group="export",
+            thread=True,
+            exclusive=True,
+            exit_on_error=False,
+        )
+
+    def _export(
+        self,
+        path: Path,
+        fmt: str,
+        boards: list[dict[str, str]],
+        known: dict[str, list[dict[str, Any]]],
+    ) -> None:
+        """Worker: stream boards into the export file, reporting progress.
+
+        Args:
+            path: Destination file.
+            fmt: Export format name.
+            boards: Boards to export, in order.
+            known: Notes already in memory (active and prefetched boards), by board id.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from tui_notes.export import ExportCancelled, export_to_file
+
+        worker = get_current_worker()
+        report = self._progress_reporter(EXPORT_PROGRESS_SECONDS)
+
+        def progress(done: int, total: int, written: int) -> None:
+            if done < total:
+                report(f"Exporting… {done}/{total} boards, {written} notes")
+
+        try:
+            written = export_to_file(
+                path,
+                fmt,
+                boards,
+                partial(self._load_known, known),
+                progress=progress,
+                cancelled=lambda: worker.is_cancelled,
+            )
+        except ExportCancelled:
+            return
+        except (OSError, ValueError) as exc:
+            self.call_from_thread(self.notify, f"Export error: {exc}", severity="error")
+            return
+        self.call_from_thread(self.notify, f"Exported {written} notes to {path}")
@@ -0,0 +1,166 @@
+"""Import of NotesApp."""
+
+from __future__ import annotations
+
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from textual.worker import get_current_worker
+
+from tui_notes import screens
+from tui_notes.constants import IMPORT_PROGRESS_SECONDS
+from tui_notes.mixins.base import AppBase
+
+if TYPE_CHECKING:
+    from tui_notes.importer import ImportPlan
+
+
+class ImportMixin(AppBase):
+    """Plan an import in the background, confirm it and add the notes to their boards."""
+
+    _import_path: str = "~"
+
+    def action_import_notes(self) -> None:
+        """Ask for a file or directory tree to import notes from."""
+        if self.move_mode:
+            self._exit_move_mode()
+        self.push_screen(
+            screens.PromptScreen("Import notes from file or directory", self._import_path),
+            callback=self._start_import,
+        )
+
+    def _start_import(self, path: str | None) -> None:
+        """Parse and lay out an import in a worker thread.
+
+        Args:
+            path: File or directory to import, or None if cancelled.
+        """
+        if path is None or not path.strip():
+            return
+        self._import_path = path.strip()
+        boards = [dict(board) for board in self._boards]
+        known = self._notes_in_memory()
+        self.notify(f"Reading {self._import_path}…")
+        self.run_worker(
+            partial(
+                self._plan_import,
+                Path(self._import_path).expanduser(),
+                boards,
+                boards[self._board_index()],
+                known,
+            ),
+            name="import",
+            group="import",
+            thread=True,
+            exclusive=True,
+            exit_on_error=False,
+        )
+
+    def _plan_import(
+        self,
+        path: Path,
+        boards: list[dict[str, str]],
+        default_board: dict[str, str],
+        known: dict[str, list[dict[str, Any]]],
+    ) -> None:
+        """Worker: plan an import, then ask for confirmation on the UI thread.
+
+        Args:
+            path: File or directory to import.
+            boards: Board index at the time the import started.
+            default_board: Board for notes that name none.
+            known: Notes already in memory (active and prefetched boards), by board id.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from tui_notes.importer import ImportCancelled, plan_import
+
+        worker = get_current_worker()
+        report = self._progress_reporter(IMPORT_PROGRESS_SECONDS)
+
+        def progress(files: int, notes: int) -> None:
+            report(f"Reading… {files} file(s), {notes} notes")
+
+        try:
+            plan = plan_import(
+                [path],
+                boards,
+                partial(self._load_known, known),
+                default_board=default_board,
+                progress=progress,
+                cancelled=lambda: worker.is_cancelled,
+            )
+        except ImportCancelled:
+            return
+        except OSError as exc:
+            self.call_from_thread(self.notify, f"Import error: {exc}", severity="error")
+            return
+        self.call_from_thread(self._confirm_import, plan)
+
+    def _confirm_import(self, plan: ImportPlan) -> None:
+        """Show what an import would do and write it only once confirmed.
+
+        Args:
+            plan: The planned import.
+        """
+        if plan.errors:
+            self.notify(f"Skipped: {plan.errors[0]}", severity="warning")
+        if not plan.count:
+            self.notify("Nothing to import.", severity="warning")
+            return
+        self.push_screen(
+            screens.ConfirmScreen(f"Import {plan.summary()}?"),
+            callback=partial(self._commit_import, plan),
+        )
+
+    def _commit_import(self, plan: ImportPlan, confirmed: bool) -> None:
+        """Apply a confirmed import with one batched write and one batched mount.
+
+        Imported notes are merged into the boards as they are now, so edits
+        made while the import was planned are kept. If a slot the plan uses
+        was filled in the meantime, nothing is imported.
+
+        Args:
+            plan: The planned import.
+            confirmed: Whether the user confirmed.
+        """
+        if not confirmed:
+            return
+        if self.move_mode:
+            self._exit_move_mode()
+        current: dict[str, list[dict[str, Any]]] = {}
+        for board_id, added in plan.added.items():
+            if board_id == self._board_id:
+                notes = self._serialize_notes()
+            elif board_id in plan.base_ids:
+                notes = self._board_cache.get(board_id) or self._load_board(board_id)
+            else:
+                notes = []
+            taken = {note["position"] for note in notes}
+            if [board["id"] for board in self._boards] != plan.base_ids or any(
+                note["position"] in taken for note in added
+            ):
+                self.notify(
+                    "Notes changed while importing; nothing was imported.", severity="error"
+                )
+                return
+            current[board_id] = sorted(notes + added, key=lambda note: note["position"])
+
+        by_id = {board["id"]: board for board in self._boards}
+        self._boards = [by_id.get(board["id"], board) for board in plan.boards]
+        self._submit_snapshot()
+        for board_id, notes in current.items():
+            self._board_cache.pop(board_id, None)
+            if board_id == self._board_id:
+                self._undo.record(board_id, self._undo_base, notes)
+                with self.batch_update():
+                    self._show_notes(notes)
+            else:
+                self._index.sync_board(board_id, notes)
+            self._saver.submit(notes, board_id)
+        self.flush_saves()
+        if plan.new_boards:
+            self._save_board_index()
+        self._update_board_bar()
+        self._prefetch_neighbours()
+        self.notify(f"Imported {plan.summary()}")
@@ -0,0 +1,221 @@
+"""How NotesApp picks up changes made elsewhere.
+
+Other programs writing the files, other clients of the daemon and other
+machines reached through a sync target all end in _reload_external.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from tui_notes import screens
+from tui_notes.constants import WATCH_POLL_SECONDS
+from tui_notes.mixins.base import AppBase
+from tui_notes.storage import ConflictError, load_boards, load_notes
+
+if TYPE_CHECKING:
+    from tui_notes.sync import NoteSync
+
+
+class SyncMixin(AppBase):
+    """Settle save conflicts and apply changes from the files, the daemon and sync targets."""
+
+    # ── Conflicts ───────────────────────────────────────────────
+
+    def _on_save_conflict(self, exc: ConflictError) -> None:
+        """Ask how to settle notes another program changed as well.
+
+        The board's unwritten snapshots are dropped: the answer is saved
+        together with the board as it is then. On exit there is no one to
+        ask, so both versions are kept.
+
+        Args:
+            exc: The conflict raised by the save.
+        """
+        self._saver.discard(exc.board)
+        if self._closing:
+            try:
+                self._write_notes(exc.notes, exc.board, "both")
+            except OSError as err:
+                self.log.error(f"Save error on exit: {err}")
+            return
+        prompt_open = exc.board in self._conflicts
+        self._conflicts[exc.board] = exc
+        if not prompt_open:
+            self.push_screen(
+                screens.ConflictScreen(exc.conflicts), partial(self._resolve_conflict, exc.board)
+            )
+
+    def _resolve_conflict(self, board: str, prefer: str | None) -> None:
+        """Save a board that had conflicts, settling them the chosen way.
+
+        Args:
+            board: Board id.
+            prefer: "mine", "theirs" or "both".
+        """
+        exc = self._conflicts.pop(board)
+        notes = self._serialize_notes() if board == self._board_id else exc.notes
+        try:
+            saved = self._write_notes(notes, board, prefer or "both")
+        except OSError as err:
+            self._on_save_error(err)
+            self._saver.submit(notes, board)
+            return
+        if board == self._board_id:
+            self._apply_external(board, saved)
+        elif board in self._board_cache:
+            self._board_cache[board] = saved
+
+    # ── External changes ────────────────────────────────────────
+
+    def _on_files_changed(self) -> None:
+        """Watcher callback: another program changed the active board's files."""
+        try:
+            self.call_from_thread(self._reload_external)
+        except RuntimeError:  # app is no longer running
+            pass
+
+    def _on_daemon_event(self, event: dict[str, Any]) -> None:
+        """Daemon callback: another client changed a board or the board list."""
+        try:
+            self.call_from_thread(self._apply_daemon_event, event)
+        except RuntimeError:  # app is no longer running
+            pass
+
+    def _apply_daemon_event(self, event: dict[str, Any]) -> None:
+        """Bring the board, the caches or the board list up to date with the daemon.
+
+        Once the daemon goes away storage uses the files again, so they are
+        watched from then on.
+
+        Args:
+            event: The daemon's notification.
+        """
+        kind = event.get("event")
+        if kind == "disconnected":
+            if self._watcher is None and not self._closing:
+                self._start_watcher()
+        elif kind == "boards":
+            self._reload_board_list()
+        elif event.get("board") == self._board_id:
+            self._reload_external()
+        else:
+            self._board_cache.pop(event.get("board", ""), None)
+
+    def _reload_board_list(self) -> None:
+        """Show the board list another client saved, leaving the active board if it is gone."""
+        boards = load_boards()
+        self._boards = boards
+        gone = self._board_id
+        if all(board["id"] != gone for board in boards):
+            self._snapshot_scheduled = False
+            self._saver.discard(gone)
+            self._switch_board(boards[0]["id"])
+            self._board_cache.pop(gone, None)
+            self._undo.forget(gone)
+            self._index.remove_board(gone)
+            self.notify("The active board was deleted in another window.")
+        self._update_board_bar()
+
+    def _reload_external(self) -> None:
+        """Read the active board from disk and apply it.
+
+        Reading the board makes it the base the next save is merged
+        against, so it is read on the UI thread and only while no local
+        snapshot is waiting: one queued in between would be compared with
+        the new base and overwrite the other program's edits.
+        """
+        board = self._board_id
+        if self._snapshot_scheduled or self._saver.has_pending(board):
+            return
+        if len(self.screen_stack) > 1:
+            self.set_timer(WATCH_POLL_SECONDS, self._reload_external)
+            return
+        try:
+            notes = load_notes(board)
+        except OSError as exc:
+            self.log.error(f"Reload error: {exc}")
+            return
+        self._apply_external(board, notes)
+
+    def _apply_external(self, board: str, notes: list[dict[str, Any]]) -> None:
+        """Show notes changed by another program as a minimal diff of the grid.
+
+        Only changed notes are rebound and only slots that became empty or
+        filled touch the DOM. Focus and move mode follow their notes.
+        Unsaved local edits win over the file, and while a dialog is open
+        the reload waits, because the dialog may be editing a slot.
+
+        Args:
+            board: Board the notes were loaded for.
+            notes: The board's notes as stored.
+        """
+        if board != self._board_id or self._snapshot_scheduled or self._saver.has_pending(board):
+            return
+        if len(self.screen_stack) > 1:
+            self.set_timer(WATCH_POLL_SECONDS, self._reload_external)
+            return
+        self._show_notes_in_place(notes)
+
+    # ── Sync ────────────────────────────────────────────────────
+
+    def _start_sync(self) -> None:
+        """Sync in a worker thread unless the previous sync is still running."""
+        if self._sync is None or self._syncing or self._closing:
+            return
+        self._syncing = True
+        self.run_worker(
+            partial(self._run_sync, self._sync),
+            name="sync",
+            group="sync",
+            thread=True,
+            exit_on_error=False,
+        )
+
+    def _run_sync(self, sync: NoteSync) -> None:
+        """Worker: sync with the target and hand the outcome to the UI thread.
+
+        Args:
+            sync: The sync to run.
+        """
+        summary: dict[str, Any] | None = None
+        error: Exception | None = None
+        try:
+            summary = sync.run()
+        except OSError as exc:
+            error = exc
+        except (KeyError, TypeError, ValueError) as exc:
+            # The target holds data NoteSync does not expect.
+            error = exc
+        finally:
+            try:
+                self.call_from_thread(self._on_synced, summary, error)
+            except RuntimeError:  # app is no longer running
+                pass
+            # Cleared even if the sync raised something unexpected, so the
+            # next timer tick syncs again instead of stopping for good.
+            self._syncing = False
+
+    def _on_synced(self, summary: dict[str, Any] | None, error: Exception | None) -> None:
+        """Show what a sync changed, or report the first of a run of failures.
+
+        Args:
+            summary: What NoteSync.run returned, None if it failed.
+            error: Why it failed.
+        """
+        if summary is None:
+            if not self._sync_failed:
+                self.notify(f"Sync failed: {error}", severity="warning")
+            self._sync_failed = True
+            return
+        self._sync_failed = False
+        if summary["new_boards"]:
+            self._reload_board_list()
+        for board in summary["boards"]:
+            if board == self._board_id:
+                self._reload_external()
+            else:
+                self._board_cache.pop(board, None)
+        if summary["boards"]:
+            self._prefetch_neighbours()
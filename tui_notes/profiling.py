@@ -0,0 +1,117 @@
+"""Startup profiling for tui-notes.
+
+StartupProfile collects how long the phases of a cold start take, from
+process start to the first frame being painted. It only uses the
+standard library so it can be created before Textual is imported.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+
+def process_age() -> float | None:
+    """Return the seconds since the current process started, if the OS tells us.
+
+    Returns:
+        Seconds since process creation on Linux, otherwise None.
+    """
+    try:
+        with open("/proc/self/stat", encoding="ascii") as fh:
+            # The command name may contain spaces; fields resume after ")".
+            fields = fh.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime", encoding="ascii") as fh:
+            uptime = float(fh.read().split()[0])
+        start_ticks = int(fields[19])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupProfile:
+    """Timings of the phases of one app start."""
+
+    def __init__(self) -> None:
+        """Start the clock, back-dated to process start where the OS allows."""
+        now = time.perf_counter()
+        age = process_age()
+        self.origin = now - age if age is not None and age > 0 else now
+        self.phases: dict[str, float] = {}
+        if now > self.origin:
+            # Interpreter start-up and everything imported before this point.
+            self.phases["interpreter"] = now - self.origin
+        self.first_paint: float | None = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block and add it to a phase.
+
+        Args:
+            name: Phase name; repeated blocks with the same name add up.
+
+        Yields:
+            Nothing.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add time to a phase.
+
+        Args:
+            name: Phase name.
+            seconds: Time spent.
+        """
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Return a function that times every call of func as a phase.
+
+        Args:
+            name: Phase name.
+            func: Function to time.
+
+        Returns:
+            The timed function.
+        """
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            with self.phase(name):
+                return func(*args, **kwargs)
+
+        return timed
+
+    def mark_first_paint(self) -> None:
+        """Record that the first frame was painted."""
+        if self.first_paint is None:
+            self.first_paint = time.perf_counter() - self.origin
+
+    def as_dict(self) -> dict[str, float]:
+        """Return the timings in seconds.
+
+        Returns:
+            Each phase, "other" for untracked time, and "first_paint" for
+            the total from process start (when known).
+        """
+        result = dict(self.phases)
+        if self.first_paint is not None:
+            result["other"] = max(0.0, self.first_paint - sum(self.phases.values()))
+            result["first_paint"] = self.first_paint
+        return result
+
+    def format(self) -> str:
+        """Return a human-readable report.
+
+        Returns:
+            One line per phase, in milliseconds.
+        """
+        lines = ["Startup profile (ms):"]
+        for name, seconds in self.as_dict().items():
+            lines.append(f"  {name:<16} {seconds * 1000:8.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,319 @@
+"""Write-behind saver that coalesces bursts of note mutations."""
+
+from __future__ import annotations
+
+import threading
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable
+
+from tui_notes import instrumentation
+from tui_notes.constants import (
+    DEFAULT_BOARD,
+    SAVE_DEBOUNCE_SECONDS,
+    SAVE_MAX_LATENCY_SECONDS,
+    SAVE_RETRY_SECONDS,
+)
+from tui_notes.storage import ConflictError
+
+if TYPE_CHECKING:
+    from textual.app import App
+    from textual.timer import Timer
+
+
+class WriteBehindSaver:  # pylint: disable=too-many-instance-attributes
+    """Defer note saves and write them from a Textual worker thread.
+
+    Every mutation hands over a snapshot of a board's notes. Snapshots
+    are kept in memory, one per board, and only the latest one of each
+    board is written once no new mutation has arrived for the debounce
+    window, so a burst of edits costs a single disk write. The
+    max-latency bound stops a continuous stream of edits from deferring
+    the write forever. A snapshot that conflicts with another program's
+    changes is not written; it is handed to the conflict callback. A
+    snapshot whose write failed stays pending and is retried.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        app: App[Any],
+        write: Callable[[list[dict[str, Any]], str], Any],
+        debounce: float = SAVE_DEBOUNCE_SECONDS,
+        max_latency: float = SAVE_MAX_LATENCY_SECONDS,
+        on_error: Callable[[OSError], None] | None = None,
+        on_conflict: Callable[[ConflictError], None] | None = None,
+        retry: float = SAVE_RETRY_SECONDS,
+    ) -> None:
+        """Initialize the saver.
+
+        Args:
+            app: The app whose timers and workers run the saves.
+            write: Function that persists a board's list of note dicts.
+            debounce: Seconds without mutations before a write starts.
+            max_latency: Maximum seconds a snapshot may stay pending.
+            on_error: Called on the UI thread when a background write fails.
+            on_conflict: Called on the UI thread when a write raised
+                ConflictError; without it conflicts are dropped.
+            retry: Seconds before a failed background write is tried again.
+        """
+        self._app = app
+        self._write_fn = write
+        self.debounce = debounce
+        self.max_latency = max_latency
+        self.retry = retry
+        self._on_error = on_error
+        self._on_conflict = on_conflict
+        self._pending: dict[str, list[dict[str, Any]]] = {}
+        self._dirty_since: float | None = None
+        self._timer: Timer | None = None
+        self._generation = 0
+        self._written_generation: dict[str, int] = {}
+        self._in_flight: dict[str, tuple[int, list[dict[str, Any]]]] = {}
+        self._state_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @property
+    def dirty(self) -> bool:
+        """Whether a snapshot is waiting to be written."""
+        return bool(self._pending)
+
+    @property
+    def pending_writes(self) -> int:
+        """Number of board snapshots waiting to be written or being written."""
+        with self._state_lock:
+            return len(self._pending.keys() | self._in_flight.keys())
+
+    def has_pending(self, board: str) -> bool:
+        """Whether a snapshot of a board is waiting to be written or being written.
+
+        Args:
+            board: Board id.
+
+        Returns:
+            True while the file may still change to local edits.
+        """
+        with self._state_lock:
+            return board in self._pending or board in self._in_flight
+
+    def submit(self, post_its: list[dict[str, Any]], board: str = DEFAULT_BOARD) -> None:
+        """Record a new snapshot and schedule a deferred write.
+
+        Args:
+            post_its: Note dicts to persist, replacing the board's pending snapshot.
+            board: Board the notes belong to.
+        """
+        now = time.monotonic()
+        with self._state_lock:
+            self._pending[board] = post_its
+        if self._dirty_since is None:
+            self._dirty_since = now
+
+        remaining = self.max_latency - (now - self._dirty_since)
+        self._cancel_timer()
+        if remaining <= 0:
+            self._start_write()
+        else:
+            self._timer = self._app.set_timer(min(self.debounce, remaining), self._start_write)
+
+    def load(
+        self, board: str, loader: Callable[[str], list[dict[str, Any]]]
+    ) -> list[dict[str, Any]]:
+        """Return the newest notes of a board, including unwritten changes.
+
+        Safe to call from any thread. A snapshot that is pending or being
+        written wins over the file, so switching back to a board right
+        after editing it never shows stale notes.
+
+        Args:
+            board: Board id.
+            loader: Function that reads the board from storage.
+
+        Returns:
+            List of note dicts.
+        """
+        with self._state_lock:
+            data = self._pending.get(board)
+            if data is None and board in self._in_flight:
+                data = self._in_flight[board][1]
+        if data is not None:
+            return [dict(note) for note in data]
+        return loader(board)
+
+    def discard(self, board: str) -> None:
+        """Drop a board's snapshots, e.g. because the board was deleted.
+
+        Waits for a write in progress, and marks the snapshots of workers
+        that have not started yet as written, so no snapshot of the board
+        reaches the disk after this returns.
+
+        Args:
+            board: Board id.
+        """
+        with self._write_lock, self._state_lock:
+            self._pending.pop(board, None)
+            self._in_flight.pop(board, None)
+            self._written_generation[board] = self._generation
+
+    def flush(self) -> None:
+        """Write any pending snapshot synchronously.
+
+        Waits for an in-flight background write to finish first, and
+        writes the snapshots of workers that have not started yet, so the
+        files hold the latest snapshots when this returns. Conflicts are
+        reported to the conflict callback before this returns.
+
+        Raises:
+            OSError: If the file cannot be written. The snapshot stays
+                pending so a later flush can retry it.
+        """
+        self._cancel_timer()
+        with self._write_lock:
+            # Holding the write lock, no worker is writing: every snapshot
+            # still in flight belongs to a worker that has not started, and
+            # one whose write failed is pending again.
+            self._take_pending()
+            with self._state_lock:
+                batch = {board: data for board, (_, data) in self._in_flight.items()}
+                generation = self._generation
+            if not batch:
+                return
+            try:
+                conflicts = self._write_locked(batch, generation)
+            except OSError:
+                self._dirty_since = time.monotonic()
+                raise
+        if self._on_conflict is not None:
+            for conflict in conflicts:
+                self._on_conflict(conflict)
+
+    def _cancel_timer(self) -> None:
+        """Stop the debounce timer if one is running."""
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+
+    def _take_pending(self) -> tuple[dict[str, list[dict[str, Any]]], int]:
+        """Detach the pending snapshots and tag them with a new generation.
+
+        Returns:
+            Pending snapshots keyed by board, and their generation number.
+        """
+        with self._state_lock:
+            batch = self._pending
+            self._pending = {}
+            if batch:
+                self._generation += 1
+                for board, data in batch.items():
+                    self._in_flight[board] = (self._generation, data)
+        if batch and self._dirty_since is not None:
+            instrumentation.observe("saver.delay", time.monotonic() - self._dirty_since)
+        self._dirty_since = None
+        return batch, self._generation
+
+    def _schedule_retry(self) -> None:
+        """Arm the timer to write the snapshots of a failed write again."""
+        if self._dirty_since is None:
+            self._dirty_since = time.monotonic()
+        if self._timer is None and self._pending:
+            self._timer = self._app.set_timer(self.retry, self._start_write)
+
+    def _start_write(self) -> None:
+        """Hand the pending snapshots to a background worker."""
+        self._timer = None
+        batch, generation = self._take_pending()
+        if not batch:
+            return
+        self._app.run_worker(
+            partial(self._write_in_worker, batch, generation),
+            name="save-notes",
+            group="saver",
+            thread=True,
+            exit_on_error=False,
+        )
+
+    def _write(
+        self, batch: dict[str, list[dict[str, Any]]], generation: int
+    ) -> list[ConflictError]:
+        """Write each board's snapshot unless a newer one was already written.
+
+        Args:
+            batch: Note dicts to persist, keyed by board.
+            generation: Generation number of the snapshots.
+
+        Returns:
+            The conflicts of the snapshots that were not written.
+
+        Raises:
+            OSError: If a snapshot cannot be written. It and the snapshots
+                after it are pending again, unless newer ones replaced them.
+        """
+        with self._write_lock:
+            return self._write_locked(batch, generation)
+
+    @instrumentation.timed("saver.write")
+    def _write_locked(
+        self, batch: dict[str, list[dict[str, Any]]], generation: int
+    ) -> list[ConflictError]:
+        """Write a batch like _write; the caller holds the write lock.
+
+        Args:
+            batch: Note dicts to persist, keyed by board.
+            generation: Generation number of the snapshots.
+
+        Returns:
+            The conflicts of the snapshots that were not written.
+
+        Raises:
+            OSError: If a snapshot cannot be written.
+        """
+        conflicts = []
+        written = set()
+        try:
+            for board, data in batch.items():
+                if generation > self._written_generation.get(board, 0):
+                    try:
+                        self._write_fn(data, board)
+                    except ConflictError as exc:
+                        conflicts.append(exc)
+                    else:
+                        self._written_generation[board] = generation
+                written.add(board)
+        except OSError:
+            with self._state_lock:
+                for board, data in batch.items():
+                    if board not in written:
+                        self._pending.setdefault(board, data)
+            raise
+        finally:
+            with self._state_lock:
+                for board in batch:
+                    in_flight = self._in_flight.get(board)
+                    if in_flight is not None and in_flight[0] <= generation:
+                        del self._in_flight[board]
+        return conflicts
+
+    def _write_in_worker(self, batch: dict[str, list[dict[str, Any]]], generation: int) -> None:
+        """Worker entry point: write and report failures to the UI thread.
+
+        A failed write is retried after the retry delay, and by flush on quit.
+
+        Args:
+            batch: Note dicts to persist, keyed by board.
+            generation: Generation number of the snapshots.
+        """
+        try:
+            conflicts = self._write(batch, generation)
+        except OSError as exc:
+            try:
+                self._app.call_from_thread(self._schedule_retry)
+                if self._on_error is not None:
+                    self._app.call_from_thread(self._on_error, exc)
+            except RuntimeError:  # app is no longer running
+                pass
+            return
+        if self._on_conflict is not None:
+            for conflict in conflicts:
+                try:
+                    self._app.call_from_thread(self._on_conflict, conflict)
+                except RuntimeError:  # app is no longer running
+                    pass
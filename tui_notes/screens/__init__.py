@@ -1,8 +1,74 @@
-"""Screen components for tui-notes."""
+"""Screen components for tui-notes.
 
-from tui_notes.screens.color_picker import ColorPickerScreen
-from tui_notes.screens.confirm import ConfirmScreen
-from tui_notes.screens.edit_post_it import EditPostItScreen
-from tui_notes.screens.help import HelpScreen
+Screens are imported on first attribute access (PEP 562), so starting
+the app does not pay for modals that may never be opened.
+"""
 
-__all__ = ["ColorPickerScreen", "ConfirmScreen", "EditPostItScreen", "HelpScreen"]
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from tui_notes.screens.color_picker import ColorPickerScreen
+    from tui_notes.screens.confirm import ConfirmScreen
+    from tui_notes.screens.conflict import ConflictScreen
+    from tui_notes.screens.drafts import DraftRecoveryScreen
+    from tui_notes.screens.edit_post_it import EditPostItScreen
+    from tui_notes.screens.export import ExportScreen
+    from tui_notes.screens.help import HelpScreen
+    from tui_notes.screens.history import HistoryScreen
+    from tui_notes.screens.overview import OverviewScreen
+    from tui_notes.screens.prompt import PromptScreen
+    from tui_notes.screens.quick_jump import QuickJumpScreen
+    from tui_notes.screens.search import SearchScreen
+
+_MODULES = {
+    "ColorPickerScreen": "color_picker",
+    "ConfirmScreen": "confirm",
+    "ConflictScreen": "conflict",
+    "DraftRecoveryScreen": "drafts",
+    "EditPostItScreen": "edit_post_it",
+    "ExportScreen": "export",
+    "HelpScreen": "help",
+    "HistoryScreen": "history",
+    "OverviewScreen": "overview",
+    "PromptScreen": "prompt",
+    "QuickJumpScreen": "quick_jump",
+    "SearchScreen": "search",
+}
+
+__all__ = [
+    "ColorPickerScreen",
+    "ConfirmScreen",
+    "ConflictScreen",
+    "DraftRecoveryScreen",
+    "EditPostItScreen",
+    "ExportScreen",
+    "HelpScreen",
+    "HistoryScreen",
+    "OverviewScreen",
+    "PromptScreen",
+    "QuickJumpScreen",
+    "SearchScreen",
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a screen class the first time it is used.
+
+    Args:
+        name: Attribute requested from the package.
+
+    Returns:
+        The screen class.
+
+    Raises:
+        AttributeError: If the name is not a screen of this package.
+    """
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
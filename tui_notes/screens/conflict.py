@@ -0,0 +1,70 @@
+"""Modal screen for settling notes changed here and in another program."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Container, Horizontal
+from textual.screen import ModalScreen
+from textual.widgets import Button, Static
+
+
+def describe_conflict(conflict: dict[str, Any]) -> str:
+    """Summarize one conflicting note in a line.
+
+    Args:
+        conflict: A conflict as reported by merge_notes.
+
+    Returns:
+        The note's title and what happened to it on each side.
+    """
+    mine, theirs = conflict["mine"], conflict["theirs"]
+    title = (mine or theirs or conflict["base"] or {}).get("title") or "(untitled)"
+    if mine is None:
+        return f"{title}: deleted here, edited elsewhere"
+    if theirs is None:
+        return f"{title}: edited here, deleted elsewhere"
+    if conflict["base"] is None:
+        return f"{title}: no free slot left for it"
+    return f"{title}: edited here and elsewhere"
+
+
+class ConflictScreen(ModalScreen[str]):
+    """Ask which version of notes changed on both sides to keep.
+
+    Dismisses with "mine", "theirs" or "both"; escape keeps both.
+    """
+
+    BINDINGS = [
+        Binding("escape", "keep_both", "Keep both"),
+    ]
+
+    def __init__(self, conflicts: list[dict[str, Any]]) -> None:
+        """Initialize with the conflicts to show.
+
+        Args:
+            conflicts: Conflicts as reported by merge_notes.
+        """
+        super().__init__()
+        self._conflicts = conflicts
+
+    def compose(self) -> ComposeResult:
+        """Compose the dialog layout."""
+        lines = "\n".join(describe_conflict(conflict) for conflict in self._conflicts)
+        with Container(id="conflict-modal"):
+            yield Static("These notes were also changed by another program:", id="conflict-message")
+            yield Static(lines, id="conflict-list")
+            with Horizontal(id="conflict-buttons"):
+                yield Button("Keep mine", variant="primary", id="conflict-mine")
+                yield Button("Keep theirs", variant="default", id="conflict-theirs")
+                yield Button("Keep both", variant="default", id="conflict-both")
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Dismiss with the chosen side."""
+        self.dismiss((event.button.id or "conflict-both").removeprefix("conflict-"))
+
+    def action_keep_both(self) -> None:
+        """Dismiss keeping both versions."""
+        self.dismiss("both")
@@ -0,0 +1,70 @@
+"""Modal screen offering drafts left by an interrupted edit."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Container, Horizontal
+from textual.screen import ModalScreen
+from textual.widgets import Button, Static
+
+
+def describe_draft(draft: dict[str, Any], board_names: dict[str, str]) -> str:
+    """Summarize one draft in a line.
+
+    Args:
+        draft: A draft as returned by DraftStore.load.
+        board_names: Board names keyed by board id.
+
+    Returns:
+        The draft's title, its board and when it was last checkpointed.
+    """
+    title = draft["title"] or "(untitled)"
+    board = board_names.get(draft["board"], "deleted board")
+    when = time.strftime("%Y-%m-%d %H:%M", time.localtime(draft["time"]))
+    return f"{title} ({board}, {when})"
+
+
+class DraftRecoveryScreen(ModalScreen[str]):
+    """Ask what to do with edits that were never saved.
+
+    Dismisses with "restore", "discard" or "later"; escape asks again on
+    the next start.
+    """
+
+    BINDINGS = [
+        Binding("escape", "later", "Later"),
+    ]
+
+    def __init__(self, drafts: list[dict[str, Any]], board_names: dict[str, str]) -> None:
+        """Initialize with the drafts to show.
+
+        Args:
+            drafts: Drafts as returned by DraftStore.load.
+            board_names: Board names keyed by board id.
+        """
+        super().__init__()
+        self._drafts = drafts
+        self._board_names = board_names
+
+    def compose(self) -> ComposeResult:
+        """Compose the dialog layout."""
+        lines = "\n".join(describe_draft(draft, self._board_names) for draft in self._drafts)
+        with Container(id="drafts-modal"):
+            yield Static("These edits were not saved before the app stopped:", id="drafts-message")
+            yield Static(lines, id="drafts-list")
+            with Horizontal(id="drafts-buttons"):
+                yield Button("Restore", variant="primary", id="drafts-restore")
+                yield Button("Discard", variant="default", id="drafts-discard")
+                yield Button("Later", variant="default", id="drafts-later")
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Dismiss with the chosen action."""
+        self.dismiss((event.button.id or "drafts-later").removeprefix("drafts-"))
+
+    def action_later(self) -> None:
+        """Dismiss, keeping the drafts for the next start."""
+        self.dismiss("later")
@@ -2,41 +2,129 @@
 
 from __future__ import annotations
 
+from functools import partial
+from typing import Any, Callable
+
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Horizontal
 from textual.screen import ModalScreen
 from textual.widgets import Button, Input, Static, TextArea
+from textual.worker import Worker, WorkerState
+
+from tui_notes.constants import DRAFT_CHECKPOINT_SECONDS
 
 
 class EditPostItScreen(ModalScreen[dict | None]):
-    """Modal screen for editing a post-it note's title and content."""
+    """Modal screen for editing a post-it note's title and content.
+
+    A body stored out of line is read in a background thread; until it
+    arrives the editor shows the preview and cannot be saved. While the
+    title or body change, they are handed to the checkpoint function
+    every few seconds, in a worker thread and never two at once, so a
+    draft survives a crash without slowing down typing.
+    """
 
     BINDINGS = [
         Binding("escape", "cancel", "Cancel"),
     ]
 
-    def __init__(self, title: str, content: str) -> None:
+    def __init__(
+        self,
+        title: str,
+        content: str,
+        loader: Callable[[], str] | None = None,
+        checkpoint: Callable[[str, str], Any] | None = None,
+    ) -> None:
         """Initialize with the current note values.
 
         Args:
             title: Current note title.
-            content: Current note content.
+            content: Current note content, or its preview if loader is given.
+            loader: Called in a worker thread; returns the full body.
+            checkpoint: Called in a worker thread with the title and body
+                after they changed.
         """
         super().__init__()
         self._edit_title = title
         self._edit_content = content
+        self._loader = loader
+        self._checkpoint = checkpoint
+        self._changed = False
+        self._checkpointing = False
+        self._drafted = False
 
     def compose(self) -> ComposeResult:
         """Compose the edit modal layout."""
+        loading = self._loader is not None
         with Container(id="edit-modal"):
             yield Static("Edit Note", id="edit-modal-title")
             yield Input(value=self._edit_title, placeholder="Title", id="edit-title-input")
-            yield TextArea(self._edit_content, id="edit-content-input")
+            yield TextArea(self._edit_content, id="edit-content-input", disabled=loading)
             with Horizontal(id="edit-buttons"):
-                yield Button("Save", variant="primary", id="edit-save")
+                yield Button("Save", variant="primary", id="edit-save", disabled=loading)
                 yield Button("Cancel", variant="default", id="edit-cancel")
 
+    def on_mount(self) -> None:
+        """Start reading an out-of-line body and checkpointing drafts."""
+        if self._checkpoint is not None:
+            self.set_interval(DRAFT_CHECKPOINT_SECONDS, self._checkpoint_draft)
+        if self._loader is not None:
+            self.run_worker(
+                self._loader,
+                name="edit-load",
+                thread=True,
+                exclusive=True,
+                exit_on_error=False,
+            )
+
+    def on_input_changed(self) -> None:
+        """Mark the draft changed when the title is edited."""
+        self._changed = True
+
+    def on_text_area_changed(self) -> None:
+        """Mark the draft changed when the body is edited."""
+        self._changed = True
+
+    def _checkpoint_draft(self) -> None:
+        """Hand the title and body to the checkpoint function if they changed."""
+        editor = self.query_one("#edit-content-input", TextArea)
+        if self._checkpoint is None or not self._changed or self._checkpointing:
+            return
+        if editor.disabled:
+            return
+        self._changed = False
+        title = self.query_one("#edit-title-input", Input).value
+        content = editor.text
+        if not self._drafted and (title, content) == (self._edit_title, self._edit_content):
+            return
+        self._drafted = self._checkpointing = True
+        self.run_worker(
+            partial(self._checkpoint, title, content),
+            name="edit-draft",
+            thread=True,
+            exit_on_error=False,
+        )
+
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        """Track draft checkpoints; show the full body once it is read, or give up."""
+        if event.worker.name == "edit-draft" and event.worker.is_finished:
+            self._checkpointing = False
+            # A failed checkpoint is retried with the next one.
+            self._changed = self._changed or event.state != WorkerState.SUCCESS
+            return
+        if event.worker.name != "edit-load":
+            return
+        if event.state == WorkerState.ERROR:
+            self.notify(f"Cannot read note: {event.worker.error}", severity="error")
+            self.dismiss(None)
+        elif event.state == WorkerState.SUCCESS:
+            editor = self.query_one("#edit-content-input", TextArea)
+            self._edit_content = event.worker.result or ""
+            editor.load_text(self._edit_content)
+            editor.disabled = False
+            self.query_one("#edit-save", Button).disabled = False
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle Save or Cancel button clicks."""
         if event.button.id == "edit-save":
@@ -0,0 +1,88 @@
+"""Export options modal screen."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Container, Horizontal
+from textual.screen import ModalScreen
+from textual.widgets import Button, Checkbox, Input, RadioButton, RadioSet, Static
+
+from tui_notes.export import available_export_formats, default_export_path
+
+
+class ExportScreen(ModalScreen[dict[str, Any] | None]):
+    """Modal screen that asks for the export format, destination and scope."""
+
+    BINDINGS = [
+        Binding("escape", "cancel", "Cancel"),
+    ]
+
+    def __init__(self, fmt: str = "markdown", all_boards: bool = False) -> None:
+        """Initialize with the options of the previous export.
+
+        Args:
+            fmt: Format selected initially.
+            all_boards: Whether every board is exported, or only the active one.
+        """
+        super().__init__()
+        self._format = fmt
+        self._all_boards = all_boards
+
+    def compose(self) -> ComposeResult:
+        """Compose the export dialog layout."""
+        with Container(id="export-modal"):
+            yield Static("Export notes", id="export-title")
+            with RadioSet(id="export-format"):
+                for name in available_export_formats():
+                    yield RadioButton(name, value=name == self._format, name=name)
+            yield Checkbox("All boards", self._all_boards, id="export-all")
+            yield Input(str(default_export_path(self._format)), id="export-path")
+            with Horizontal(id="export-buttons"):
+                yield Button("Export", variant="primary", id="export-ok")
+                yield Button("Cancel", variant="default", id="export-cancel")
+
+    def on_mount(self) -> None:
+        """Start in the destination field."""
+        self.query_one("#export-path", Input).focus()
+
+    def on_radio_set_changed(self, event: RadioSet.Changed) -> None:
+        """Switch the destination's extension along with the format."""
+        path_input = self.query_one("#export-path", Input)
+        old_default = default_export_path(self._format)
+        self._format = event.pressed.name or self._format
+        path = Path(path_input.value).expanduser()
+        if path.stem == old_default.stem:
+            new_default = default_export_path(self._format)
+            path_input.value = str(path.with_suffix(new_default.suffix))
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Export when Enter is pressed in the destination field."""
+        self._submit()
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Handle Export or Cancel button clicks."""
+        if event.button.id == "export-ok":
+            self._submit()
+        else:
+            self.dismiss(None)
+
+    def action_cancel(self) -> None:
+        """Dismiss without exporting."""
+        self.dismiss(None)
+
+    def _submit(self) -> None:
+        """Dismiss with the chosen options, unless no destination was given."""
+        path = self.query_one("#export-path", Input).value.strip()
+        if not path:
+            return
+        self.dismiss(
+            {
+                "format": self._format,
+                "path": path,
+                "all_boards": self.query_one("#export-all", Checkbox).value,
+            }
+        )
@@ -29,15 +29,27 @@ class HelpScreen(ModalScreen[None]):
 ║  e / Enter  Edit selected note       ║
 ║  d          Delete selected note     ║
 ║  c          Change note color        ║
+║  u / U      Undo / redo              ║
+║  h          History of selected note ║
 ║                                      ║
 ║  Organization                        ║
 ║  m          Move mode (swap notes)   ║
 ║  Escape     Cancel move mode         ║
 ║                                      ║
+║  Boards                              ║
+║  [ / ]      Previous / next board    ║
+║  n          New board                ║
+║  N          Rename board             ║
+║  D          Delete board             ║
+║  o          Overview of all notes    ║
+║  /          Search all notes         ║
+║  Ctrl+P     Jump to note by title    ║
+║                                      ║
 ║  File                                ║
 ║  Ctrl+S     Save notes               ║
 ║  Ctrl+R     Reload notes             ║
-║  Ctrl+E     Export to markdown       ║
+║  Ctrl+E     Export notes             ║
+║  i          Import notes             ║
 ║                                      ║
 ║  Other                               ║
 ║  ?          Show this help           ║
@@ -0,0 +1,138 @@
+"""Modal screen browsing the revisions of a note."""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable
+
+from rich.text import Text
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Container, Horizontal, VerticalScroll
+from textual.screen import ModalScreen
+from textual.widgets import Button, OptionList, Static
+from textual.widgets.option_list import Option
+from textual.worker import Worker, WorkerState
+
+
+def describe_revision(revision: dict[str, Any]) -> Text:
+    """Summarize one revision in a line.
+
+    Args:
+        revision: A revision as listed by NoteHistory.revisions.
+
+    Returns:
+        Its number, when it was saved, its title and its length.
+    """
+    when = time.strftime("%Y-%m-%d %H:%M", time.localtime(revision["time"]))
+    label = Text(f"#{revision['rev']:<4} {when}  ", style="dim")
+    label.append(revision["title"] or "(untitled)", style="bold")
+    label.append(f"  {revision['length']} chars", style="dim")
+    return label
+
+
+class HistoryScreen(ModalScreen[dict | None]):
+    """List the saved revisions of a note and show the highlighted one.
+
+    The list and every shown revision are read in worker threads.
+    Dismisses with the title and content of the revision to restore, or
+    None when closed.
+    """
+
+    BINDINGS = [
+        Binding("escape", "close", "Close"),
+    ]
+
+    def __init__(
+        self,
+        title: str,
+        lister: Callable[[], list[dict[str, Any]]],
+        reader: Callable[[int], dict[str, Any]],
+    ) -> None:
+        """Initialize with the functions that read the note's history.
+
+        Args:
+            title: The note's current title, for the heading.
+            lister: Returns the revisions as NoteHistory.revisions does.
+            reader: Reconstructs a revision by number as NoteHistory.revision does.
+        """
+        super().__init__()
+        self._title = title
+        self._lister = lister
+        self._reader = reader
+        self._revisions: list[dict[str, Any]] = []
+        self._shown: dict[str, Any] | None = None
+
+    def compose(self) -> ComposeResult:
+        """Compose the browser layout."""
+        with Container(id="history-modal"):
+            yield Static(f"History of {self._title or '(untitled)'}", id="history-heading")
+            yield OptionList(id="history-list")
+            with VerticalScroll(id="history-preview"):
+                yield Static("Loading history…", id="history-content")
+            with Horizontal(id="history-buttons"):
+                yield Button("Restore", variant="primary", id="history-restore", disabled=True)
+                yield Button("Close", variant="default", id="history-close")
+
+    def on_mount(self) -> None:
+        """Start reading the list of revisions."""
+        self.query_one("#history-list", OptionList).focus()
+        self.run_worker(self._lister, name="history-list", thread=True, exit_on_error=False)
+
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        """Show the revision list or a reconstructed revision once it is read."""
+        content = self.query_one("#history-content", Static)
+        if event.state == WorkerState.ERROR:
+            content.update(f"Could not read the history: {event.worker.error}")
+        elif event.state != WorkerState.SUCCESS:
+            return
+        elif event.worker.name == "history-list":
+            self._revisions = event.worker.result or []
+            options = self.query_one("#history-list", OptionList)
+            options.add_options(
+                Option(describe_revision(revision), id=str(revision["rev"]))
+                for revision in self._revisions
+            )
+            if self._revisions:
+                options.highlighted = 0
+            else:
+                content.update("No saved revisions yet.")
+        elif event.worker.name == "history-revision":
+            self._shown = event.worker.result
+            if self._shown is not None:
+                content.update(Text(self._shown["content"]))
+                self.query_one("#history-restore", Button).disabled = False
+
+    def on_option_list_option_highlighted(self, event: OptionList.OptionHighlighted) -> None:
+        """Reconstruct the highlighted revision, dropping any still being read."""
+        self._shown = None
+        self.query_one("#history-restore", Button).disabled = True
+        rev = self._revisions[event.option_index]["rev"]
+        self.run_worker(
+            lambda: self._reader(rev),
+            name="history-revision",
+            group="history-revision",
+            thread=True,
+            exclusive=True,
+            exit_on_error=False,
+        )
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        """Restore the chosen revision once it is shown."""
+        self._restore()
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Restore the shown revision or close."""
+        if event.button.id == "history-restore":
+            self._restore()
+        else:
+            self.dismiss(None)
+
+    def _restore(self) -> None:
+        """Dismiss with the shown revision, if it finished loading."""
+        if self._shown is not None:
+            self.dismiss({"title": self._shown["title"], "content": self._shown["content"]})
+
+    def action_close(self) -> None:
+        """Return to the board without restoring anything."""
+        self.dismiss(None)
@@ -0,0 +1,89 @@
+"""Overview screen listing the notes of every board."""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.screen import ModalScreen
+from textual.widgets import Footer, Header, Static
+from textual.worker import Worker, WorkerState
+
+from tui_notes.widgets import VirtualNoteGrid
+
+
+class OverviewScreen(ModalScreen[dict | None]):
+    """Screen showing the notes of all boards in one scrollable grid.
+
+    Notes are loaded in a background thread and shown in a
+    VirtualNoteGrid, so the screen stays responsive with many boards.
+    It is modal so the board's own key bindings stay inactive.
+    Dismisses with the selected note (which carries its board id), or
+    None when closed.
+    """
+
+    BINDINGS = [
+        Binding("escape", "close", "Close"),
+        Binding("o", "close", "Close", show=False),
+    ]
+
+    def __init__(self, loader: Callable[[], list[dict[str, Any]]]) -> None:
+        """Initialize with the function that collects the notes.
+
+        Args:
+            loader: Called in a worker thread; returns note dicts with
+                board and board_name keys added.
+        """
+        super().__init__()
+        self._loader = loader
+
+    def compose(self) -> ComposeResult:
+        """Compose the overview layout."""
+        yield Header()
+        yield Static("Loading notes…", id="overview-status")
+        yield VirtualNoteGrid(id="overview-grid")
+        yield Footer()
+
+    def on_mount(self) -> None:
+        """Focus the grid and start loading the notes."""
+        grid = self.query_one(VirtualNoteGrid)
+        grid.focus()
+        self.watch(grid, "cursor", self._update_status, init=False)
+        self.run_worker(
+            self._loader,
+            name="overview-load",
+            thread=True,
+            exclusive=True,
+            exit_on_error=False,
+        )
+
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        """Show the loaded notes once the worker finishes."""
+        if event.worker.name != "overview-load":
+            return
+        if event.state == WorkerState.ERROR:
+            self.query_one("#overview-status", Static).update("Could not load notes.")
+        elif event.state == WorkerState.SUCCESS:
+            self.query_one(VirtualNoteGrid).set_notes(event.worker.result or [])
+            self._update_status()
+
+    def on_virtual_note_grid_selected(self, event: VirtualNoteGrid.Selected) -> None:
+        """Close the overview and hand the chosen note to the app."""
+        self.dismiss(event.note)
+
+    def _update_status(self) -> None:
+        """Show the cursor position among all notes."""
+        grid = self.query_one(VirtualNoteGrid)
+        note = grid.current_note()
+        status = self.query_one("#overview-status", Static)
+        if note is None:
+            status.update("No notes yet.")
+        else:
+            status.update(
+                f"Note {grid.cursor + 1} of {grid.note_count} · {note.get('board_name', '')}"
+            )
+
+    def action_close(self) -> None:
+        """Return to the board."""
+        self.dismiss(None)
@@ -0,0 +1,60 @@
+"""Single-line text prompt modal screen."""
+
+from __future__ import annotations
+
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Container, Horizontal
+from textual.screen import ModalScreen
+from textual.widgets import Button, Input, Static
+
+
+class PromptScreen(ModalScreen[str | None]):
+    """Modal screen that asks for a single line of text."""
+
+    BINDINGS = [
+        Binding("escape", "cancel", "Cancel"),
+    ]
+
+    def __init__(self, message: str, value: str = "") -> None:
+        """Initialize with a prompt message and an initial value.
+
+        Args:
+            message: The question to display.
+            value: Text pre-filled in the input.
+        """
+        super().__init__()
+        self._message = message
+        self._value = value
+
+    def compose(self) -> ComposeResult:
+        """Compose the prompt layout."""
+        with Container(id="prompt-modal"):
+            yield Static(self._message, id="prompt-message")
+            yield Input(value=self._value, id="prompt-input")
+            with Horizontal(id="prompt-buttons"):
+                yield Button("OK", variant="primary", id="prompt-ok")
+                yield Button("Cancel", variant="default", id="prompt-cancel")
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Dismiss with the entered text when Enter is pressed."""
+        self._submit(event.value)
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        """Handle OK or Cancel button clicks."""
+        if event.button.id == "prompt-ok":
+            self._submit(self.query_one("#prompt-input", Input).value)
+        else:
+            self.dismiss(None)
+
+    def action_cancel(self) -> None:
+        """Dismiss without a value."""
+        self.dismiss(None)
+
+    def _submit(self, value: str) -> None:
+        """Dismiss with the stripped value, or None if it is blank.
+
+        Args:
+            value: Text from the input.
+        """
+        self.dismiss(value.strip() or None)
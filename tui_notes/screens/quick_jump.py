@@ -0,0 +1,117 @@
+"""Fuzzy quick-jump palette screen."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from rich.text import Text
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Container
+from textual.screen import ModalScreen
+from textual.widgets import Input, OptionList
+from textual.widgets.option_list import Option
+from textual.worker import get_current_worker
+
+from tui_notes.search import SearchIndex
+
+
+class QuickJumpScreen(ModalScreen[dict | None]):
+    """Palette that fuzzy-matches note titles of every board as you type.
+
+    Ranking runs in a thread worker. Each keystroke starts a new worker in
+    the same exclusive group, which cancels the previous one, so stale
+    rankings never reach the list and typing never waits for them.
+    """
+
+    BINDINGS = [
+        Binding("escape", "cancel", "Cancel"),
+        Binding("down", "move(1)", "Next", show=False),
+        Binding("up", "move(-1)", "Previous", show=False),
+    ]
+
+    def __init__(self, index: SearchIndex, board_names: dict[str, str]) -> None:
+        """Initialize with the index to query.
+
+        Args:
+            index: Search index covering all boards.
+            board_names: Board display names keyed by board id.
+        """
+        super().__init__()
+        self._index = index
+        self._board_names = board_names
+        self._results: list[dict[str, Any]] = []
+
+    def compose(self) -> ComposeResult:
+        """Compose the palette layout."""
+        with Container(id="quick-jump-modal"):
+            yield Input(placeholder="Jump to note…", id="quick-jump-input")
+            yield OptionList(id="quick-jump-results")
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """Rank titles for the new query in the background."""
+        query = event.value
+        self.run_worker(
+            lambda: self._rank(query),
+            name="quick-jump-rank",
+            group="quick-jump",
+            thread=True,
+            exclusive=True,
+            exit_on_error=False,
+        )
+
+    def _rank(self, query: str) -> None:
+        """Worker: rank titles and hand the results to the UI thread.
+
+        Args:
+            query: Text typed by the user.
+        """
+        worker = get_current_worker()
+        results = self._index.fuzzy(query, cancelled=lambda: worker.is_cancelled)
+        if not worker.is_cancelled:
+            self.app.call_from_thread(self._show_results, results)
+
+    def _show_results(self, results: list[dict[str, Any]]) -> None:
+        """List ranked titles with the matched characters highlighted.
+
+        Args:
+            results: Results of SearchIndex.fuzzy.
+        """
+        self._results = results
+        options = []
+        for idx, result in enumerate(results):
+            label = Text(result["title"])
+            for position in result["positions"]:
+                label.stylize("bold reverse", position, position + 1)
+            label.append(f"  {self._board_names.get(result['board'], '')}", style="dim")
+            options.append(Option(label, id=str(idx)))
+        option_list = self.query_one("#quick-jump-results", OptionList)
+        option_list.clear_options()
+        option_list.add_options(options)
+        if options:
+            option_list.highlighted = 0
+
+    def action_move(self, step: int) -> None:
+        """Move the highlight while focus stays in the input.
+
+        Args:
+            step: 1 for the next result, -1 for the previous one.
+        """
+        option_list = self.query_one("#quick-jump-results", OptionList)
+        if self._results:
+            current = option_list.highlighted or 0
+            option_list.highlighted = max(0, min(len(self._results) - 1, current + step))
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Jump to the highlighted result."""
+        highlighted = self.query_one("#quick-jump-results", OptionList).highlighted
+        if highlighted is not None and highlighted < len(self._results):
+            self.dismiss(self._results[highlighted])
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        """Jump to a clicked result."""
+        self.dismiss(self._results[event.option_index])
+
+    def action_cancel(self) -> None:
+        """Dismiss without jumping."""
+        self.dismiss(None)
@@ -0,0 +1,88 @@
+"""Full-text search modal screen."""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from rich.text import Text
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Container
+from textual.screen import ModalScreen
+from textual.widgets import Input, OptionList, Static
+from textual.widgets.option_list import Option
+
+from tui_notes.search import SearchIndex, tokenize
+
+
+class SearchScreen(ModalScreen[dict | None]):
+    """Modal screen that searches the notes of every board as you type."""
+
+    BINDINGS = [
+        Binding("escape", "cancel", "Cancel"),
+        Binding("down", "focus_results", "Results", show=False),
+    ]
+
+    def __init__(self, index: SearchIndex, board_names: dict[str, str]) -> None:
+        """Initialize with the index to query.
+
+        Args:
+            index: Search index covering all boards.
+            board_names: Board display names keyed by board id.
+        """
+        super().__init__()
+        self._index = index
+        self._board_names = board_names
+        self._results: list[dict[str, Any]] = []
+
+    def compose(self) -> ComposeResult:
+        """Compose the search layout."""
+        with Container(id="search-modal"):
+            yield Input(placeholder="Search notes", id="search-input")
+            yield OptionList(id="search-results")
+            yield Static("", id="search-status")
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """Run the query and list the matches with the query words highlighted."""
+        self._results = self._index.search(event.value)
+        words = tokenize(event.value)
+        pattern = (
+            re.compile(r"\b(?:" + "|".join(re.escape(w) for w in words) + r")\w*", re.I)
+            if words
+            else None
+        )
+        options = []
+        for idx, result in enumerate(self._results):
+            label = Text(result["title"], style="bold")
+            label.append(f"  {self._board_names.get(result['board'], '')}", style="dim")
+            if result["preview"]:
+                label.append(f"\n{result['preview']}")
+            if pattern is not None:
+                label.highlight_regex(pattern, style="reverse")
+            options.append(Option(label, id=str(idx)))
+        results = self.query_one("#search-results", OptionList)
+        results.clear_options()
+        results.add_options(options)
+        if options:
+            results.highlighted = 0
+        status = f"{len(self._results)} match(es)" if words else ""
+        self.query_one("#search-status", Static).update(status)
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Jump to the highlighted match when Enter is pressed in the input."""
+        highlighted = self.query_one("#search-results", OptionList).highlighted
+        if highlighted is not None and highlighted < len(self._results):
+            self.dismiss(self._results[highlighted])
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        """Jump to the chosen match."""
+        self.dismiss(self._results[event.option_index])
+
+    def action_focus_results(self) -> None:
+        """Move focus from the input to the result list."""
+        self.query_one("#search-results", OptionList).focus()
+
+    def action_cancel(self) -> None:
+        """Dismiss without jumping."""
+        self.dismiss(None)
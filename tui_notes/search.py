@@ -0,0 +1,491 @@
+"""Incremental full-text and fuzzy title search over the notes of every board.
+
+SearchIndex keeps an inverted index from words to notes, plus one from
+title trigrams to notes for fuzzy matching. Notes are
+added, changed and removed one at a time, so an edit only re-tokenizes
+the edited note. The index is persisted next to notes.json together
+with a fingerprint of every note, so a cold start only re-tokenizes the
+notes that changed since the index was written.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import heapq
+import json
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from tui_notes import storage
+from tui_notes.changes import note_key
+from tui_notes.constants import FUZZY_MAX_CANDIDATES, SEARCH_MAX_RESULTS
+from tui_notes.files import write_json
+
+INDEX_VERSION = 2
+"""Format version of the persisted index; other versions are ignored."""
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase words.
+
+    Args:
+        text: Text to split.
+
+    Returns:
+        Words in order of appearance, duplicates included.
+    """
+    return _WORD_RE.findall(text.casefold())
+
+
+def trigrams(text: str, partial: bool = False) -> set[str]:
+    """Return the character trigrams of a text.
+
+    Text is padded so word starts produce their own trigrams, which makes
+    one or two typed characters enough to find candidates.
+
+    Args:
+        text: Text to split.
+        partial: Whether the text may still be typed further (no end padding).
+
+    Returns:
+        Set of lowercase three-character strings.
+    """
+    padded = "  " + " ".join(_WORD_RE.findall(text.casefold())) + ("" if partial else " ")
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def fuzzy_score(query: str, title: str) -> tuple[int, list[int]] | None:
+    """Score how well a query matches a title as an in-order subsequence.
+
+    Consecutive characters and characters at the start of a word earn
+    bonuses, so "shp" matches "Shopping" and "dt" prefers "Dentist trip"
+    over "Edited".
+
+    Args:
+        query: Lowercase query.
+        title: Lowercase title.
+
+    Returns:
+        The score and the matched character positions, or None if the
+        query is not a subsequence of the title.
+    """
+    score = 0
+    positions: list[int] = []
+    start = 0
+    for char in query:
+        if char.isspace():
+            continue
+        idx = title.find(char, start)
+        if idx < 0:
+            return None
+        score += 1
+        if positions and idx == positions[-1] + 1:
+            score += 5
+        if idx == 0 or not title[idx - 1].isalnum():
+            score += 8
+        positions.append(idx)
+        start = idx + 1
+    return score - len(title) // 10, positions
+
+
+def _fingerprint(note: dict[str, Any]) -> str:
+    """Return a short hash of the searchable text of a note.
+
+    Args:
+        note: Note dict with title and content.
+
+    Returns:
+        Hex digest that changes whenever the title, content or
+        out-of-line body changes.
+    """
+    text = f"{note.get('title', '')}\0{note.get('content', '')}\0{note.get('blob', '')}"
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _get_index_file() -> Path:
+    """Return the path of the persisted search index.
+
+    Returns:
+        Path to search-index.json next to notes.json.
+    """
+    return storage.data_file_path().with_name("search-index.json")
+
+
+class SearchIndex:
+    """Inverted index over note titles and contents, keyed by board and note id.
+
+    All methods are thread-safe so boards can be indexed from a worker
+    while the UI thread updates single notes.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._postings: dict[str, set[tuple[str, str]]] = {}
+        self._trigrams: dict[str, set[tuple[str, str]]] = {}
+        self._docs: dict[tuple[str, str], dict[str, Any]] = {}
+        self._vocabulary: list[str] | None = None
+        self._indexed_boards: set[str] = set()
+        self._lock = threading.Lock()
+        self.dirty = False
+
+    def __len__(self) -> int:
+        """Return the number of indexed notes."""
+        return len(self._docs)
+
+    @property
+    def boards(self) -> set[str]:
+        """Ids of the boards whose notes have been indexed, empty boards included."""
+        with self._lock:
+            return set(self._indexed_boards)
+
+    def update_note(self, board: str, note: dict[str, Any]) -> None:
+        """Index a new or changed note.
+
+        Unchanged notes cost one hash; changed notes only touch the
+        postings of words that were added or removed.
+
+        Args:
+            board: Board the note belongs to.
+            note: Note dict with title and content.
+        """
+        with self._lock:
+            self._update(board, note)
+
+    def remove_note(self, board: str, note_id: str) -> None:
+        """Drop a note from the index.
+
+        Args:
+            board: Board the note belongs to.
+            note_id: Id of the note.
+        """
+        with self._lock:
+            self._remove((board, note_id))
+
+    def sync_board(self, board: str, notes: list[dict[str, Any]]) -> None:
+        """Make the index match a board's loaded notes.
+
+        Notes whose fingerprint is unchanged are skipped, new and changed
+        notes are re-tokenized and notes no longer on the board are dropped.
+
+        Args:
+            board: Board id.
+            notes: All notes of the board.
+        """
+        with self._lock:
+            if board not in self._indexed_boards:
+                self._indexed_boards.add(board)
+                self.dirty = True
+            keep = set()
+            for note in notes:
+                keep.add(self._update(board, note))
+            for ref in [ref for ref in self._docs if ref[0] == board and ref not in keep]:
+                self._remove(ref)
+
+    def remove_board(self, board: str) -> None:
+        """Drop every note of a board.
+
+        Args:
+            board: Board id.
+        """
+        self.sync_board(board, [])
+        with self._lock:
+            self._indexed_boards.discard(board)
+
+    def search(self, query: str, limit: int = SEARCH_MAX_RESULTS) -> list[dict[str, Any]]:
+        """Find the notes that contain every word of a query.
+
+        The last word also matches as a prefix, so results appear while
+        a word is still being typed.
+
+        Args:
+            query: Free text typed by the user.
+            limit: Maximum number of results.
+
+        Returns:
+            Dicts with board, id, title and preview keys; notes that
+            match in their title come first.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        with self._lock:
+            matches: set[tuple[str, str]] | None = None
+            for word in words[:-1]:
+                refs = self._postings.get(word, set())
+                matches = set(refs) if matches is None else matches & refs
+                if not matches:
+                    return []
+            prefixed = self._prefix_matches(words[-1])
+            matches = prefixed if matches is None else matches & prefixed
+            ranked = heapq.nsmallest(
+                limit, matches, key=lambda ref: self._rank(ref, words[:-1], words[-1])
+            )
+            return [
+                {
+                    "board": ref[0],
+                    "id": ref[1],
+                    "title": self._docs[ref]["title"],
+                    "preview": self._docs[ref]["preview"],
+                }
+                for ref in ranked
+            ]
+
+    def fuzzy(
+        self,
+        query: str,
+        limit: int = SEARCH_MAX_RESULTS,
+        cancelled: Callable[[], bool] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Rank note titles by how well they fuzzy-match a query.
+
+        Candidates come from the trigram index, ordered by the number of
+        trigrams they share with the query; only the best
+        FUZZY_MAX_CANDIDATES of them are scored.
+
+        Args:
+            query: Text typed by the user.
+            limit: Maximum number of results.
+            cancelled: Polled during scoring; returning True aborts the search.
+
+        Returns:
+            Dicts with board, id, title and positions (matched character
+            indexes in the title), best match first. Empty if cancelled.
+        """
+        needle = query.casefold().strip()
+        if not needle:
+            return []
+        scored = []
+        for number, (ref, count, title) in enumerate(self._fuzzy_candidates(needle)):
+            if cancelled is not None and number % 256 == 0 and cancelled():
+                return []
+            match = fuzzy_score(needle, title.casefold())
+            score, positions = match if match is not None else (0, [])
+            scored.append((-(score + 4 * count), title.casefold(), ref, title, positions))
+        return [
+            {"board": ref[0], "id": ref[1], "title": title, "positions": positions}
+            for _, _, ref, title, positions in heapq.nsmallest(limit, scored)
+        ]
+
+    def _fuzzy_candidates(self, needle: str) -> list[tuple[tuple[str, str], int, str]]:
+        """Return the notes sharing the most title trigrams with a query.
+
+        Args:
+            needle: Lowercase query.
+
+        Returns:
+            Reference, shared trigram count and title of each candidate.
+        """
+        shared: Counter[tuple[str, str]] = Counter()
+        with self._lock:
+            for gram in trigrams(needle, partial=True):
+                shared.update(self._trigrams.get(gram, ()))
+            return [
+                (ref, count, self._docs[ref]["title"])
+                for ref, count in shared.most_common(FUZZY_MAX_CANDIDATES)
+            ]
+
+    def save(self, path: Path | None = None) -> None:
+        """Persist the index if it changed since it was loaded or saved.
+
+        Args:
+            path: Destination file. Defaults to search-index.json next to notes.json.
+
+        Raises:
+            OSError: If the file cannot be written.
+        """
+        with self._lock:
+            if not self.dirty:
+                return
+            boards: dict[str, dict[str, Any]] = {board: {} for board in self._indexed_boards}
+            for (board, note_id), doc in self._docs.items():
+                boards.setdefault(board, {})[note_id] = doc
+            write_json(path or _get_index_file(), {"version": INDEX_VERSION, "boards": boards})
+            self.dirty = False
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> SearchIndex:
+        """Load a persisted index without re-tokenizing any note.
+
+        Args:
+            path: Index file. Defaults to search-index.json next to notes.json.
+
+        Returns:
+            The loaded index, or an empty one if the file is missing,
+            unreadable or from another format version.
+        """
+        index = cls()
+        try:
+            data = json.loads((path or _get_index_file()).read_text(encoding="utf-8"))
+            if data.get("version") != INDEX_VERSION:
+                return index
+            for board, docs in data["boards"].items():
+                index._indexed_boards.add(board)
+                for note_id, doc in docs.items():
+                    index._add((board, note_id), doc)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return cls()
+        index.dirty = False
+        if path is None:
+            index._consume_stale_marks()
+        return index
+
+    def _consume_stale_marks(self) -> None:
+        """Forget the boards that mark_index_stale reported and delete the marks."""
+        stale_file = storage.stale_file_path()
+        try:
+            stale = set(stale_file.read_text(encoding="utf-8").split())
+            stale_file.unlink()
+        except OSError:
+            return
+        if stale & self._indexed_boards:
+            self._indexed_boards -= stale
+            self.dirty = True
+
+    def _update(self, board: str, note: dict[str, Any]) -> tuple[str, str]:
+        """Index a note; the caller holds the lock.
+
+        Args:
+            board: Board id.
+            note: Note dict.
+
+        Returns:
+            The reference of the note.
+        """
+        ref = (board, note_key(note))
+        fingerprint = _fingerprint(note)
+        old = self._docs.get(ref)
+        if old is not None and old["hash"] == fingerprint:
+            return ref
+        content = note.get("content", "")
+        try:
+            # Out-of-line bodies are indexed in full, not just their preview.
+            body = storage.read_body(note)
+        except OSError:
+            # Index the preview for now; an empty hash makes the next update retry.
+            body, fingerprint = content, ""
+        doc = {
+            "hash": fingerprint,
+            "title": note.get("title", ""),
+            "preview": content.strip().splitlines()[0][:80] if content.strip() else "",
+            "title_words": sorted(set(tokenize(note.get("title", "")))),
+            "words": sorted(set(tokenize(f"{note.get('title', '')} {body}"))),
+        }
+        if old is None:
+            self._add(ref, doc)
+            return ref
+        old_words, new_words = set(old["words"]), set(doc["words"])
+        self._docs[ref] = doc
+        self._unlink(self._postings, ref, old_words - new_words)
+        self._link(self._postings, ref, new_words - old_words)
+        if old["title"] != doc["title"]:
+            old_grams, new_grams = trigrams(old["title"]), trigrams(doc["title"])
+            self._unlink(self._trigrams, ref, old_grams - new_grams)
+            self._link(self._trigrams, ref, new_grams - old_grams)
+        self.dirty = True
+        return ref
+
+    def _add(self, ref: tuple[str, str], doc: dict[str, Any]) -> None:
+        """Add a document and its postings; the caller holds the lock.
+
+        Args:
+            ref: Board id and note id.
+            doc: Document with hash, title, preview, title_words and words keys.
+        """
+        self._docs[ref] = doc
+        self._link(self._postings, ref, doc["words"])
+        self._link(self._trigrams, ref, trigrams(doc["title"]))
+        self.dirty = True
+
+    def _remove(self, ref: tuple[str, str]) -> None:
+        """Remove a document and its postings; the caller holds the lock.
+
+        Args:
+            ref: Board id and note id.
+        """
+        doc = self._docs.pop(ref, None)
+        if doc is not None:
+            self._unlink(self._postings, ref, doc["words"])
+            self._unlink(self._trigrams, ref, trigrams(doc["title"]))
+            self.dirty = True
+
+    def _link(
+        self, postings: dict[str, set[tuple[str, str]]], ref: tuple[str, str], keys: Iterable[str]
+    ) -> None:
+        """Add a note to some posting lists.
+
+        Args:
+            postings: Word or trigram postings to update.
+            ref: Board id and note id.
+            keys: Words or trigrams the note now contains.
+        """
+        for key in keys:
+            refs = postings.get(key)
+            if refs is None:
+                postings[key] = {ref}
+                if postings is self._postings:
+                    self._vocabulary = None
+            else:
+                refs.add(ref)
+
+    def _unlink(
+        self, postings: dict[str, set[tuple[str, str]]], ref: tuple[str, str], keys: Iterable[str]
+    ) -> None:
+        """Remove a note from some posting lists.
+
+        Args:
+            postings: Word or trigram postings to update.
+            ref: Board id and note id.
+            keys: Words or trigrams the note no longer contains.
+        """
+        for key in keys:
+            refs = postings.get(key)
+            if refs is not None:
+                refs.discard(ref)
+                if not refs:
+                    del postings[key]
+                    if postings is self._postings:
+                        self._vocabulary = None
+
+    def _prefix_matches(self, prefix: str) -> set[tuple[str, str]]:
+        """Return the notes containing a word that starts with a prefix.
+
+        Args:
+            prefix: Start of a word.
+
+        Returns:
+            References of matching notes.
+        """
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        matches: set[tuple[str, str]] = set()
+        start = bisect.bisect_left(vocabulary, prefix)
+        for word in vocabulary[start:]:
+            if not word.startswith(prefix):
+                break
+            matches |= self._postings[word]
+        return matches
+
+    def _rank(self, ref: tuple[str, str], words: list[str], prefix: str) -> tuple[bool, str]:
+        """Return the sort key of a matching note; the caller holds the lock.
+
+        Args:
+            ref: Board id and note id.
+            words: Complete query words.
+            prefix: Last, possibly partial, query word.
+
+        Returns:
+            Key that sorts notes matching in the title first, then by title.
+        """
+        doc = self._docs[ref]
+        title_words = doc["title_words"]
+        in_title = all(word in title_words for word in words) and any(
+            word.startswith(prefix) for word in title_words
+        )
+        return (not in_title, doc["title"].casefold())
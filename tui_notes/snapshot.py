@@ -0,0 +1,193 @@
+"""The snapshot format: one board's notes as a pretty-printed JSON document.
+
+A snapshot holds a header (format version, board id and revision) and
+the board's notes in a "post_its" list. Reading validates every note, so
+a hand-edited or truncated file yields the notes that are still valid.
+"""
+
+from __future__ import annotations
+
+import json
+from json.encoder import encode_basestring
+from pathlib import Path
+from typing import Any
+
+from tui_notes.blobs import DIGEST_PATTERN
+from tui_notes.constants import DEFAULT_BOARD
+from tui_notes.files import write_text
+
+SCHEMA_VERSION = "2.0"
+"""Version written to notes and board files. Version 1.0 files hold the default board."""
+
+
+_SCALAR_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+def validate_note(note: Any) -> dict[str, Any] | None:
+    """Validate and normalize a single note dictionary.
+
+    Args:
+        note: Raw note data from JSON.
+
+    Returns:
+        Normalized note dict, or None if invalid.
+    """
+    if not isinstance(note, dict):
+        return None
+    if "position" not in note or "title" not in note:
+        return None
+    validated = {
+        "position": int(note["position"]),
+        "title": str(note["title"]),
+        "content": str(note.get("content", "")),
+        "color_index": int(note.get("color_index", note["position"] % 6)),
+    }
+    if note.get("id"):
+        validated["id"] = str(note["id"])
+    blob = note.get("blob")
+    if isinstance(blob, str) and DIGEST_PATTERN.fullmatch(blob):
+        validated["blob"] = blob
+    return validated
+
+
+def write_snapshot(
+    path: Path,
+    post_its: list[dict[str, Any]],
+    board: str = DEFAULT_BOARD,
+    revision: int = 0,
+    fragments: dict[str, tuple[dict[str, Any], str]] | None = None,
+) -> None:
+    """Write a full snapshot of one board's notes.
+
+    Args:
+        path: Destination JSON file.
+        post_its: List of note dicts.
+        board: Board id recorded in the file.
+        revision: Revision recorded in the file.
+        fragments: Cache of encoded notes, see encode_snapshot.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    write_text(path, encode_snapshot(post_its, board, revision, fragments))
+
+
+def encode_snapshot(
+    post_its: list[dict[str, Any]],
+    board: str,
+    revision: int,
+    fragments: dict[str, tuple[dict[str, Any], str]] | None = None,
+) -> str:
+    """Encode a snapshot exactly as json.dumps(..., indent=2) would.
+
+    Args:
+        post_its: List of note dicts.
+        board: Board id recorded in the file.
+        revision: Revision recorded in the file.
+        fragments: Encoded text of each note keyed by note id, with a copy
+            of the note it encodes. A note equal to its cached copy reuses
+            the text; the cache is updated to the notes given.
+
+    Returns:
+        The JSON document.
+    """
+    header = {"version": SCHEMA_VERSION, "board": board, "revision": revision, "post_its": []}
+    document = json.dumps(header, indent=2, ensure_ascii=False)
+    if fragments is None:
+        fragments = {}
+    if not post_its:
+        fragments.clear()
+        return document
+    parts = []
+    seen = set()
+    for note in post_its:
+        key = note.get("id") or f"@{note['position']}"
+        seen.add(key)
+        cached = fragments.get(key)
+        if cached is None or cached[0] != note:
+            cached = fragments[key] = (dict(note), encode_note(note))
+        parts.append(cached[1])
+    if len(fragments) > len(seen):
+        for key in fragments.keys() - seen:
+            del fragments[key]
+    # The header ends in '"post_its": []\n}'; open the list and splice the notes in.
+    return f"{document[:-4]}[\n    " + ",\n    ".join(parts) + "\n  ]\n}"
+
+
+def encode_note(note: dict[str, Any]) -> str:
+    """Encode one note as it appears in the post_its list of a snapshot.
+
+    Notes are flat, so their members are encoded one by one: strings
+    with the C string encoder and ints with str, instead of the
+    pure-Python encoder json.dumps falls back to when indenting.
+
+    Args:
+        note: Note dict.
+
+    Returns:
+        The note's JSON text, indented for the post_its list.
+    """
+    if not note or any(isinstance(value, (dict, list, tuple)) for value in note.values()):
+        return json.dumps(note, indent=2, ensure_ascii=False).replace("\n", "\n    ")
+    members = [
+        f"{encode_basestring(str(key))}: {_encode_scalar(value)}" for key, value in note.items()
+    ]
+    return "{\n      " + ",\n      ".join(members) + "\n    }"
+
+
+def _encode_scalar(value: Any) -> str:
+    """Encode a string, int or other scalar as JSON.
+
+    Args:
+        value: The value.
+
+    Returns:
+        Its JSON text.
+    """
+    kind = type(value)
+    if kind is str:
+        return encode_basestring(value)
+    if kind is int:
+        return str(value)
+    return _SCALAR_ENCODER.encode(value)
+
+
+def read_snapshot(path: Path) -> list[dict[str, Any]]:
+    """Read and validate a full notes snapshot.
+
+    Args:
+        path: JSON file written by write_snapshot.
+
+    Returns:
+        List of validated note dicts. Empty list if the file doesn't
+        exist, is corrupted, or contains no valid notes.
+    """
+    return read_versioned_snapshot(path)[0]
+
+
+def read_versioned_snapshot(path: Path) -> tuple[list[dict[str, Any]], int]:
+    """Read and validate a full notes snapshot and its revision.
+
+    Args:
+        path: JSON file written by write_snapshot.
+
+    Returns:
+        List of validated note dicts, empty if the file doesn't exist,
+        is corrupted, or contains no valid notes, and the revision in
+        the header, 0 for files written before revisions.
+    """
+    if not path.exists():
+        return [], 0
+
+    try:
+        raw = path.read_text(encoding="utf-8")
+        data = json.loads(raw)
+        if not isinstance(data, dict) or "post_its" not in data:
+            return [], 0
+        notes = data["post_its"]
+        if not isinstance(notes, list):
+            return [], 0
+        revision = int(data.get("revision") or 0)
+        return [v for note in notes if (v := validate_note(note)) is not None], revision
+    except (json.JSONDecodeError, OSError, ValueError, TypeError):
+        return [], 0
@@ -0,0 +1,398 @@
+"""SQLite storage engine for tui-notes.
+
+Each note is one row. A save diffs the board against the rows already
+stored and applies the resulting change records as single-row
+statements inside one transaction, so an edit, recolor or swap touches
+only the notes involved. A board's revision is a row of the meta table
+updated in the same transaction.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from tui_notes.changes import diff_notes, note_key
+from tui_notes.constants import DEFAULT_BOARD
+from tui_notes.snapshot import read_snapshot, validate_note
+from tui_notes.storage import (
+    StorageEngine,
+    _board_file,
+    _read_board_index,
+    get_durability,
+    get_sync_policy,
+)
+
+_NOTES_TABLE = """
+CREATE TABLE IF NOT EXISTS notes (
+    id TEXT NOT NULL,
+    board TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    color_index INTEGER NOT NULL,
+    blob TEXT,
+    PRIMARY KEY (board, id)
+)
+"""
+"""Notes table, keyed per board because notes saved without an id get a position key."""
+
+_NOTES_INDEX = "CREATE INDEX IF NOT EXISTS notes_board_position ON notes (board, position)"
+
+_SCHEMA = f"""
+{_NOTES_TABLE};
+{_NOTES_INDEX};
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_SYNCHRONOUS = {"none": "OFF", "batched": "NORMAL", "strict": "FULL"}
+"""SQLite synchronous level per durability mode; batched mode fsyncs the WAL itself."""
+
+
+class SqliteStore(StorageEngine):
+    """One row per note in a WAL-mode SQLite database."""
+
+    def __init__(self, db_file: Path, legacy_file: Path | None = None) -> None:
+        """Initialize the engine. The database is opened on first use.
+
+        Args:
+            db_file: Path to the SQLite database.
+            legacy_file: notes.json to import once into an empty database.
+        """
+        self.db_file = db_file
+        self.legacy_file = legacy_file
+        self._conn: sqlite3.Connection | None = None
+        self._boards: dict[str, dict[str, dict[str, Any]]] = {}
+        self._revisions: dict[str, int] = {}
+        self._synchronous = ""
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_data_file(cls, data_file: Path) -> SqliteStore:
+        """Create the engine that keeps notes.db next to notes.json.
+
+        Args:
+            data_file: Path to notes.json, imported on first use.
+
+        Returns:
+            A new SqliteStore.
+        """
+        return cls(data_file.with_suffix(".db"), legacy_file=data_file)
+
+    def load(self, board: str = DEFAULT_BOARD) -> list[dict[str, Any]]:
+        """Load a board's notes ordered by position.
+
+        Raises:
+            OSError: If the database cannot be read.
+        """
+        with self._lock:
+            return self._load(board)
+
+    def save(self, post_its: list[dict[str, Any]], board: str = DEFAULT_BOARD) -> None:
+        """Apply the notes of the board that changed as single-row statements.
+
+        Raises:
+            OSError: If the database cannot be written.
+        """
+        with self._lock:
+            self._save(post_its, board, None)
+
+    def load_versioned(self, board: str = DEFAULT_BOARD) -> tuple[list[dict[str, Any]], int]:
+        """Load a board's notes and its revision from the meta table.
+
+        Raises:
+            OSError: If the database cannot be read.
+        """
+        with self._lock:
+            return self._load(board), self._revisions[board]
+
+    def save_versioned(
+        self, post_its: list[dict[str, Any]], board: str = DEFAULT_BOARD, revision: int = 0
+    ) -> int:
+        """Apply the changed notes and record the revision in one transaction.
+
+        Raises:
+            OSError: If the database cannot be written.
+        """
+        with self._lock:
+            self._save(post_its, board, revision)
+            return self._revisions[board]
+
+    def delete_board(self, board: str) -> None:
+        """Delete every row of a board.
+
+        Raises:
+            OSError: If the database cannot be written.
+        """
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("DELETE FROM notes WHERE board = ?", (board,))
+                    conn.execute("DELETE FROM meta WHERE key = ?", (f"revision:{board}",))
+            except sqlite3.Error as exc:
+                raise OSError(f"SQLite write failed: {exc}") from exc
+            get_sync_policy().committed(self._wal_file(), renamed=False)
+            self._boards.pop(board, None)
+            self._revisions.pop(board, None)
+
+    def watch_paths(self, board: str = DEFAULT_BOARD) -> list[Path]:
+        """Return the database and its write-ahead log, shared by all boards."""
+        return [self.db_file, self._wal_file()]
+
+    def _wal_file(self) -> Path:
+        """Return the database's write-ahead log."""
+        return self.db_file.with_name(self.db_file.name + "-wal")
+
+    def _save(self, post_its: list[dict[str, Any]], board: str, revision: int | None) -> None:
+        """Write the changed notes of a board; the caller holds the lock.
+
+        Args:
+            post_its: The complete list of notes for the board.
+            board: Board id.
+            revision: Revision to record with the changes, if any.
+
+        Raises:
+            OSError: If the database cannot be written.
+        """
+        if board not in self._boards:
+            self._load(board)
+        new = [v for note in post_its if (v := validate_note(note)) is not None]
+        records = diff_notes(self._boards[board], new)
+        if not records:
+            return
+
+        conn = self._connect()
+        try:
+            with conn:
+                for record in records:
+                    self._execute(conn, record, board)
+                if revision is not None:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                        (f"revision:{board}", str(revision)),
+                    )
+        except sqlite3.Error as exc:
+            raise OSError(f"SQLite write failed: {exc}") from exc
+        get_sync_policy().committed(self._wal_file(), renamed=False)
+        self._boards[board] = {note_key(note): note for note in new}
+        if revision is not None:
+            self._revisions[board] = revision
+
+    def _load(self, board: str) -> list[dict[str, Any]]:
+        """Read a board's rows and revision and remember them as its current state.
+
+        Args:
+            board: Board id.
+
+        Returns:
+            List of note dicts ordered by position.
+        """
+        try:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT id, position, title, content, color_index, blob FROM notes "
+                "WHERE board = ? ORDER BY position",
+                (board,),
+            )
+            notes = []
+            for row in rows:
+                note = {
+                    "id": row[0],
+                    "position": row[1],
+                    "title": row[2],
+                    "content": row[3],
+                    "color_index": row[4],
+                }
+                if row[5]:
+                    note["blob"] = row[5]
+                notes.append(note)
+            row = conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (f"revision:{board}",)
+            ).fetchone()
+        except sqlite3.Error as exc:
+            raise OSError(f"SQLite read failed: {exc}") from exc
+        self._boards[board] = {note_key(note): dict(note) for note in notes}
+        self._revisions[board] = int(row[0]) if row is not None else 0
+        return notes
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._boards.clear()
+            self._revisions.clear()
+
+    @staticmethod
+    def _execute(conn: sqlite3.Connection, record: dict[str, Any], board: str) -> None:
+        """Run the single-row statement for one change record.
+
+        Args:
+            conn: Open database connection inside a transaction.
+            record: A record produced by diff_notes.
+            board: Board the record belongs to.
+        """
+        op = record["op"]
+        if op == "add":
+            note = record["note"]
+            conn.execute(
+                "INSERT OR REPLACE INTO notes "
+                "(id, board, position, title, content, color_index, blob) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    note_key(note),
+                    board,
+                    note["position"],
+                    note["title"],
+                    note["content"],
+                    note["color_index"],
+                    note.get("blob"),
+                ),
+            )
+        elif op == "edit":
+            fields = [field for field in ("title", "content", "blob") if field in record]
+            assignments = ", ".join(f"{field} = ?" for field in fields)
+            conn.execute(
+                f"UPDATE notes SET {assignments} WHERE board = ? AND id = ?",
+                (*[record[field] for field in fields], board, record["id"]),
+            )
+        elif op == "recolor":
+            conn.execute(
+                "UPDATE notes SET color_index = ? WHERE board = ? AND id = ?",
+                (record["color_index"], board, record["id"]),
+            )
+        elif op == "move":
+            conn.execute(
+                "UPDATE notes SET position = ? WHERE board = ? AND id = ?",
+                (record["position"], board, record["id"]),
+            )
+        elif op == "delete":
+            conn.execute("DELETE FROM notes WHERE board = ? AND id = ?", (board, record["id"]))
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and run the one-shot migration.
+
+        The synchronous level follows the durability mode, also when the
+        mode changes while the database is open.
+
+        Returns:
+            The shared connection.
+
+        Raises:
+            OSError: If the database cannot be opened.
+        """
+        synchronous = _SYNCHRONOUS[get_durability()]
+        if self._conn is not None:
+            if synchronous != self._synchronous:
+                self._conn.execute(f"PRAGMA synchronous = {synchronous}")
+                self._synchronous = synchronous
+            return self._conn
+        try:
+            self.db_file.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        except sqlite3.Error as exc:
+            raise OSError(f"Cannot open {self.db_file}: {exc}") from exc
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute(f"PRAGMA synchronous = {synchronous}")
+            conn.executescript(_SCHEMA)
+            columns = {row[1]: row[5] for row in conn.execute("PRAGMA table_info(notes)")}
+            if "blob" not in columns:
+                conn.execute("ALTER TABLE notes ADD COLUMN blob TEXT")
+            if not columns["board"]:
+                _key_notes_by_board(conn)
+            if self.legacy_file is not None:
+                migrate_json(conn, self.legacy_file)
+        except sqlite3.Error as exc:
+            # Not kept, so the next call retries instead of using a half-migrated database.
+            conn.close()
+            raise OSError(f"Cannot open {self.db_file}: {exc}") from exc
+        self._conn = conn
+        self._synchronous = synchronous
+        return conn
+
+
+def _key_notes_by_board(conn: sqlite3.Connection) -> None:
+    """Rebuild a notes table keyed by id alone into one keyed by (board, id).
+
+    Args:
+        conn: Open database connection.
+
+    Raises:
+        sqlite3.Error: If the table cannot be rebuilt; it is left as it was.
+    """
+    conn.execute("BEGIN")
+    try:
+        conn.execute("DROP INDEX IF EXISTS notes_board_position")
+        conn.execute("ALTER TABLE notes RENAME TO notes_by_id")
+        conn.execute(_NOTES_TABLE)
+        conn.execute(
+            "INSERT INTO notes (id, board, position, title, content, color_index, blob) "
+            "SELECT id, board, position, title, content, color_index, blob FROM notes_by_id"
+        )
+        conn.execute("DROP TABLE notes_by_id")
+        conn.execute(_NOTES_INDEX)
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def migrate_json(conn: sqlite3.Connection, json_file: Path) -> int:
+    """Import the boards written by the JSON engine into the database once.
+
+    Every board in the boards.json next to notes.json is read from its
+    file. Each import is recorded in the meta table, so notes deleted
+    later are not resurrected by running the migration again.
+
+    Args:
+        conn: Open database connection with the schema created.
+        json_file: notes.json written by the JSON engine.
+
+    Returns:
+        Number of notes imported.
+    """
+    done = {row[0] for row in conn.execute("SELECT key FROM meta WHERE key LIKE 'json_migrated%'")}
+    imported = 0
+    for entry in _read_board_index(json_file.with_name("boards.json")):
+        board = entry["id"]
+        # Databases created before boards were migrated mark the default board without a suffix.
+        key = "json_migrated" if board == DEFAULT_BOARD else f"json_migrated:{board}"
+        if key in done:
+            continue
+        path = _board_file(json_file, board)
+        notes = read_snapshot(path)
+        with conn:
+            # Claiming the key first makes a second process migrating at
+            # the same time skip the board instead of importing it again.
+            claim = conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES (?, ?)", (key, str(path))
+            )
+            if not claim.rowcount:
+                continue
+            conn.executemany(
+                "INSERT OR IGNORE INTO notes "
+                "(id, board, position, title, content, color_index, blob) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        note_key(note),
+                        board,
+                        note["position"],
+                        note["title"],
+                        note["content"],
+                        note["color_index"],
+                        note.get("blob"),
+                    )
+                    for note in notes
+                ],
+            )
+        imported += len(notes)
+    return imported
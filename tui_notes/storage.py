@@ -1,10 +1,95 @@
-"""Persistence layer for tui-notes. Saves/loads post-its as JSON."""
+"""Persistence layer for tui-notes. Saves/loads post-its as JSON.
 
+load_notes and save_notes delegate to a pluggable StorageEngine. The
+default engine rewrites notes.json; alternative engines are registered
+with register_storage_engine and selected with set_storage_engine.
+
+Several processes may write the same board. Every read and write holds
+a short advisory lock on the board's lock file, and a save is a
+compare-and-swap: if the board changed since this process last read or
+wrote it, the save is merged note by note with what is stored instead
+of replacing it, and raises ConflictError when both sides changed the
+same note.
+
+Bodies longer than BLOB_MIN_CHARS are stored out of line in a
+content-addressed blob store (tui_notes.blobs). The note then keeps a
+preview in "content" and the blob reference in "blob"; read_body
+returns the full text.
+
+The default engine's file format is in tui_notes.snapshot, the atomic
+writes and board locks every engine uses in tui_notes.files. Every file
+written goes through one SyncPolicy (tui_notes.durability), selected
+with set_durability, which decides whether and when it is fsynced.
+
+While a process is attached to the notes daemon (tui_notes.daemon), the
+facade functions send their calls to it instead; if the daemon goes
+away, they detach and use the files again.
+"""
+
+from __future__ import annotations
+
+import importlib
 import json
 import os
 import platform
+import uuid
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from tui_notes.blobs import BlobStore
+from tui_notes.constants import (
+    BLOB_MIN_CHARS,
+    BLOB_PREVIEW_CHARS,
+    BLOB_PRUNE_SECONDS,
+    DEFAULT_BOARD,
+    DEFAULT_BOARD_NAME,
+    DEFAULT_STORAGE_ENGINE,
+)
+from tui_notes.engine import StorageEngine
+from tui_notes.files import (
+    board_lock,
+    get_sync_policy,
+    lock_file,
+    read_token,
+    write_json,
+    write_token,
+)
+from tui_notes.instrumentation import timed
+from tui_notes.snapshot import (
+    SCHEMA_VERSION,
+    read_snapshot,
+    read_versioned_snapshot,
+    validate_note,
+    write_snapshot,
+)
+
+if TYPE_CHECKING:
+    from tui_notes.daemon import DaemonClient
+
+_storage_engine: str = os.environ.get("TUI_NOTES_STORAGE", DEFAULT_STORAGE_ENGINE)
+_engine_factories: dict[str, Callable[[Path], StorageEngine]] = {}
+_engines: dict[tuple[str, Path], StorageEngine] = {}
+_bases: dict[tuple[str, Path, str], tuple[Any, int, list[dict[str, Any]]]] = {}
+_daemon: DaemonClient | None = None  # pylint: disable=invalid-name
+
+
+class ConflictError(Exception):
+    """A save found notes that another writer changed differently since they were read."""
+
+    def __init__(
+        self, board: str, conflicts: list[dict[str, Any]], notes: list[dict[str, Any]]
+    ) -> None:
+        """Initialize the error.
+
+        Args:
+            board: Board id.
+            conflicts: Conflicts as reported by changes.merge_notes.
+            notes: The notes the save tried to write.
+        """
+        super().__init__(f"{len(conflicts)} note(s) on board {board!r} were changed elsewhere")
+        self.board = board
+        self.conflicts = conflicts
+        self.notes = notes
 
 
 def _get_data_dir() -> Path:
@@ -33,72 +118,788 @@ def _get_data_file() -> Path:
     return _get_data_dir() / "notes.json"
 
 
-def save_notes(post_its: list[dict[str, Any]]) -> None:
-    """Save post-its to JSON file using atomic write.
+def data_file_path() -> Path:
+    """Return the path to notes.json in the data directory in use.
+
+    Modules that keep their files next to the notes build their paths
+    from this, so a redirected data directory is honoured everywhere.
+
+    Returns:
+        Path to notes.json inside the data directory.
+    """
+    return _get_data_file()
+
+
+def boards_file_path() -> Path:
+    """Return the path to the board index file.
+
+    Returns:
+        Path to boards.json inside the data directory.
+    """
+    return _get_data_dir() / "boards.json"
+
+
+def stale_file_path() -> Path:
+    """Return the path of the list of boards changed outside the TUI.
+
+    Returns:
+        Path to search-index.stale inside the data directory.
+    """
+    return _get_data_dir() / "search-index.stale"
+
+
+def _get_blob_store() -> BlobStore:
+    """Return the store of out-of-line note bodies.
+
+    Returns:
+        BlobStore in the blobs directory next to notes.json.
+    """
+    return BlobStore(_get_data_file().parent / "blobs", get_sync_policy())
+
+
+def _board_file(data_file: Path, board: str) -> Path:
+    """Return the JSON file that holds one board's notes.
+
+    The default board keeps using notes.json so existing data needs no
+    migration; every other board gets its own file, which lets a board
+    be loaded without parsing the others.
+
+    Args:
+        data_file: Path to notes.json.
+        board: Board id.
+
+    Returns:
+        Path to the board's JSON file.
+    """
+    if board == DEFAULT_BOARD:
+        return data_file
+    return data_file.parent / "boards" / f"{board}.json"
+
+
+class JsonStore(StorageEngine):
+    """Default engine: one JSON file per board, rewritten atomically on every save.
+
+    The encoded text of every note is cached per board, so a save only
+    encodes the notes that changed and splices the cached text of the
+    rest into the file.
+    """
+
+    def __init__(self, data_file: Path) -> None:
+        """Initialize the engine.
+
+        Args:
+            data_file: Path to notes.json.
+        """
+        self.data_file = data_file
+        self._fragments: dict[str, dict[str, tuple[dict[str, Any], str]]] = {}
+
+    def load(self, board: str = DEFAULT_BOARD) -> list[dict[str, Any]]:
+        """Load a board's notes from its JSON file."""
+        return read_snapshot(_board_file(self.data_file, board))
+
+    def save(self, post_its: list[dict[str, Any]], board: str = DEFAULT_BOARD) -> None:
+        """Rewrite a board's JSON file with the given notes."""
+        write_snapshot(
+            _board_file(self.data_file, board),
+            post_its,
+            board,
+            fragments=self._fragments.setdefault(board, {}),
+        )
+
+    def load_versioned(self, board: str = DEFAULT_BOARD) -> tuple[list[dict[str, Any]], int]:
+        """Load a board's notes and the revision in the file header."""
+        return read_versioned_snapshot(_board_file(self.data_file, board))
+
+    def save_versioned(
+        self, post_its: list[dict[str, Any]], board: str = DEFAULT_BOARD, revision: int = 0
+    ) -> int:
+        """Rewrite a board's JSON file, recording the revision in the header."""
+        write_snapshot(
+            _board_file(self.data_file, board),
+            post_its,
+            board,
+            revision,
+            fragments=self._fragments.setdefault(board, {}),
+        )
+        return revision
+
+    def delete_board(self, board: str) -> None:
+        """Delete a board's JSON file."""
+        _board_file(self.data_file, board).unlink(missing_ok=True)
+        self._fragments.pop(board, None)
+
+    def close(self) -> None:
+        """Drop the cached note encodings."""
+        self._fragments.clear()
+
+    def watch_paths(self, board: str = DEFAULT_BOARD) -> list[Path]:
+        """Return the board's JSON file."""
+        return [_board_file(self.data_file, board)]
+
+
+def _lazy_engine(module: str, class_name: str) -> Callable[[Path], StorageEngine]:
+    """Return a factory that imports its engine module on first use.
+
+    Args:
+        module: Dotted module path of the engine.
+        class_name: Engine class providing a for_data_file constructor.
+
+    Returns:
+        Factory called with the notes.json path.
+    """
+
+    def create(data_file: Path) -> StorageEngine:
+        engine_cls = getattr(importlib.import_module(module), class_name)
+        return engine_cls.for_data_file(data_file)
+
+    return create
+
+
+def register_storage_engine(name: str, factory: Callable[[Path], StorageEngine]) -> None:
+    """Make a storage engine available to set_storage_engine.
+
+    Args:
+        name: Engine name used by --storage and TUI_NOTES_STORAGE.
+        factory: Called with the notes.json path to create the engine.
+    """
+    _engine_factories[name] = factory
+
+
+def available_storage_engines() -> list[str]:
+    """Return the names of all registered storage engines.
+
+    Returns:
+        Sorted engine names.
+    """
+    return sorted(_engine_factories)
+
+
+def get_storage_engine() -> str:
+    """Return the name of the active storage engine.
+
+    Returns:
+        One of available_storage_engines().
+    """
+    return _storage_engine
+
 
-    Writes to a temporary file first, then atomically replaces the
-    target file to prevent data corruption on failures.
+def set_storage_engine(name: str) -> None:
+    """Select the storage engine used by load_notes and save_notes.
+
+    Args:
+        name: One of available_storage_engines().
+
+    Raises:
+        ValueError: If the engine name is unknown.
+    """
+    global _storage_engine  # pylint: disable=global-statement
+    if name not in _engine_factories:
+        raise ValueError(f"Unknown storage engine: {name!r}")
+    _storage_engine = name
+
+
+def get_engine() -> StorageEngine:
+    """Return the active engine instance for the current data directory.
+
+    Returns:
+        A StorageEngine shared by all callers using the same notes file.
+
+    Raises:
+        ValueError: If the active engine name is unknown.
+    """
+    data_file = _get_data_file()
+    key = (_storage_engine, data_file)
+    engine = _engines.get(key)
+    if engine is None:
+        factory = _engine_factories.get(_storage_engine)
+        if factory is None:
+            raise ValueError(f"Unknown storage engine: {_storage_engine!r}")
+        engine = factory(data_file)
+        _engines[key] = engine
+    return engine
+
+
+def get_durability() -> str:
+    """Return the active durability mode.
+
+    Returns:
+        One of tui_notes.durability.DURABILITY_MODES.
+    """
+    return get_sync_policy().mode
+
+
+def set_durability(mode: str) -> None:
+    """Select when saved files are fsynced; pending batched syncs are done first.
+
+    Args:
+        mode: One of tui_notes.durability.DURABILITY_MODES.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    get_sync_policy().set_mode(mode)
+
+
+def daemon_socket_path() -> Path:
+    """Return the socket the notes daemon listens on.
+
+    Kept here rather than in tui_notes.daemon so a start can check for a
+    running daemon without importing it.
+
+    Returns:
+        $TUI_NOTES_SOCKET if set, else daemon.sock in the data directory.
+    """
+    env = os.environ.get("TUI_NOTES_SOCKET")
+    if env:
+        return Path(env)
+    return _get_data_dir() / "daemon.sock"
+
+
+def attach_daemon(client: DaemonClient) -> None:
+    """Send the facade's calls to the notes daemon from now on.
+
+    Args:
+        client: A client connected to the daemon.
+    """
+    global _daemon  # pylint: disable=global-statement
+    detach_daemon()
+    _daemon = client
+
+
+def detach_daemon() -> None:
+    """Disconnect from the notes daemon, if attached, and use the files again."""
+    global _daemon  # pylint: disable=global-statement
+    client, _daemon = _daemon, None
+    if client is not None:
+        client.close()
+
+
+def get_daemon() -> DaemonClient | None:
+    """Return the daemon client the facade uses, if attached.
+
+    Returns:
+        The client, or None while the files are used directly.
+    """
+    return _daemon
+
+
+def _daemon_call(op: str, **args: Any) -> tuple[bool, Any]:
+    """Send a facade call to the daemon, detaching if it went away.
+
+    Args:
+        op: The daemon operation.
+        **args: Its arguments.
+
+    Returns:
+        Whether the daemon answered, and its result.
+
+    Raises:
+        ConflictError: If a save conflicts with another writer's changes.
+        OSError: If the daemon's storage failed or it did not answer in time.
+    """
+    client = _daemon
+    if client is None:
+        return False, None
+    try:
+        return True, client.call(op, **args)
+    except ConnectionError:
+        # The daemon wrote through before answering, so the files are current.
+        detach_daemon()
+        return False, None
+
+
+def close_storage() -> None:
+    """Close every engine instance created so far and forget the boards it read.
+
+    Saves still waiting for a batched fsync are synced first, and the
+    daemon connection, if any, is closed.
+    """
+    detach_daemon()
+    get_sync_policy().flush()
+    for engine in _engines.values():
+        engine.close()
+    _engines.clear()
+    _bases.clear()
+
+
+@timed("storage.save_notes")
+def save_notes(
+    post_its: list[dict[str, Any]], board: str = DEFAULT_BOARD, prefer: str | None = None
+) -> list[dict[str, Any]]:
+    """Save one board's post-its with the active storage engine.
+
+    The JSON engine rewrites the board's file atomically; the journal and
+    SQLite engines persist only the notes that changed since the last save.
+
+    The save only replaces the board if it is still as this process last
+    loaded or saved it. Otherwise another writer saved in between, and
+    the notes are merged with the stored board (see changes.merge_notes),
+    so changes to different notes are all kept.
 
     Args:
         post_its: List of dicts with keys: position, title, content, color_index.
+        board: Board id.
+        prefer: How to settle notes both writers changed: None raises
+            ConflictError, "mine", "theirs" or "both" are passed to
+            merge_notes.
+
+    Returns:
+        The notes as saved; they differ from post_its if another
+        writer's changes were merged in, or a long body was moved out
+        of line.
 
     Raises:
+        ConflictError: If both writers changed the same note and prefer
+            is None. Nothing is written.
         OSError: If the file cannot be written.
     """
-    data_dir = _get_data_dir()
-    data_dir.mkdir(parents=True, exist_ok=True)
+    notes = _prepare_notes(post_its)
+    answered, saved = _daemon_call("save", board=board, notes=notes, prefer=prefer)
+    if answered:
+        return saved
+    return _save_local(notes, board, prefer)
 
-    data = {"version": "1.0", "post_its": post_its}
 
-    tmp_file = _get_data_file().with_suffix(".tmp")
-    try:
-        tmp_file.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
-        tmp_file.replace(_get_data_file())
-    except OSError:
-        tmp_file.unlink(missing_ok=True)
-        raise
+def _save_local(
+    notes: list[dict[str, Any]], board: str, prefer: str | None
+) -> list[dict[str, Any]]:
+    """Save one board's post-its to the files, never through the daemon; see save_notes.
 
+    Args:
+        notes: Note dicts as returned by _prepare_notes.
+        board: Board id.
+        prefer: How to settle conflicts.
 
-def _validate_note(note: Any) -> dict[str, Any] | None:
-    """Validate and normalize a single note dictionary.
+    Returns:
+        The notes as saved.
+
+    Raises:
+        ConflictError: If both writers changed the same note and prefer is None.
+        OSError: If the file cannot be written.
+    """
+    engine = get_engine()
+    key = _base_key(board)
+    with board_lock(lock_file(key[1], board)) as fd:
+        base = _bases.get(key)
+        stamp = (read_token(fd), engine.stamp(board))
+        if base is not None and stamp[1] is not None and stamp == base[0]:
+            saved, revision, stored = notes, base[1], base[2]
+        else:
+            saved, revision, stored = _merge_stored(engine, board, base, notes, prefer)
+        revision = engine.save_versioned(saved, board, revision + 1)
+        token = write_token(fd)
+        # After a merge the caller still holds its own notes, so the next
+        # save must be merged again until the caller loads the board.
+        _bases[key] = ((token, engine.stamp(board)) if saved == notes else None, revision, notes)
+        _record_changes(board, stored, saved)
+    return saved
+
+
+def update_board(
+    board: str,
+    update: Callable[[list[dict[str, Any]]], list[dict[str, Any]]],
+    origin: str | None = None,
+) -> list[dict[str, Any]]:
+    """Change a board's stored notes in one step, holding its lock throughout.
+
+    Unlike save_notes there is nothing to merge: update gets the notes
+    as stored and returns them changed. The files are written directly,
+    even while a daemon is attached; it notices through its watcher.
+    The bases of save_notes are left alone, so this process's next save
+    of the board is merged with the change.
 
     Args:
-        note: Raw note data from JSON.
+        board: Board id.
+        update: Returns the notes to store, given the stored ones.
+        origin: Tag for the change-feed records of the write.
 
     Returns:
-        Normalized note dict, or None if invalid.
+        The notes as saved.
+
+    Raises:
+        OSError: If the board cannot be read or written.
     """
-    if not isinstance(note, dict):
-        return None
-    if "position" not in note or "title" not in note:
-        return None
-    return {
-        "position": int(note["position"]),
-        "title": str(note["title"]),
-        "content": str(note.get("content", "")),
-        "color_index": int(note.get("color_index", note["position"] % 6)),
-    }
+    engine = get_engine()
+    with board_lock(lock_file(_base_key(board)[1], board)) as fd:
+        stored, revision = engine.load_versioned(board)
+        notes = _prepare_notes(update(stored))
+        if notes == stored:
+            return stored
+        engine.save_versioned(notes, board, revision + 1)
+        write_token(fd)
+        _record_changes(board, stored, notes, origin)
+    return notes
+
 
+def _record_changes(
+    board: str,
+    before: list[dict[str, Any]],
+    after: list[dict[str, Any]],
+    origin: str | None = None,
+) -> None:
+    """Append the notes a save changed to the change feed, once sync is set up.
+
+    Args:
+        board: Board id.
+        before: The board's notes before the save.
+        after: The board's notes as saved.
+        origin: Tag for the records, see feed.diff_records.
+
+    Raises:
+        OSError: If the feed cannot be written.
+    """
+    # pylint: disable-next=import-outside-toplevel,cyclic-import
+    from tui_notes.feed import ChangeFeed, diff_records, feed_enabled
+
+    if feed_enabled():
+        ChangeFeed().append(diff_records(board, before, after, origin))
+
+
+def _merge_stored(
+    engine: StorageEngine,
+    board: str,
+    base: tuple[Any, int, list[dict[str, Any]]] | None,
+    notes: list[dict[str, Any]],
+    prefer: str | None,
+) -> tuple[list[dict[str, Any]], int, list[dict[str, Any]]]:
+    """Read a board that may have changed and merge the notes being saved into it.
+
+    Args:
+        engine: The active engine.
+        board: Board id.
+        base: The board as this process last loaded or saved it, if ever.
+        notes: The validated notes being saved.
+        prefer: How to settle conflicts, see save_notes.
+
+    Returns:
+        The notes to write, the stored revision and the stored notes.
+
+    Raises:
+        ConflictError: If both sides changed the same note and prefer is None.
+    """
+    stored, revision = engine.load_versioned(board)
+    if base is None:
+        return notes, revision, stored
+    # pylint: disable-next=import-outside-toplevel,cyclic-import
+    from tui_notes.changes import merge_notes
+
+    saved, conflicts = merge_notes(base[2], notes, stored, prefer)
+    if conflicts:
+        raise ConflictError(board, conflicts, notes)
+    return saved, revision, stored
+
+
+def _prepare_notes(post_its: Iterable[Any]) -> list[dict[str, Any]]:
+    """Validate the notes of a save and store their long bodies out of line.
+
+    Args:
+        post_its: Note dicts handed to a save.
+
+    Returns:
+        New dicts of the valid notes; a body longer than BLOB_MIN_CHARS
+        is replaced by its preview and blob reference.
+
+    Raises:
+        OSError: If a body cannot be stored out of line.
+    """
+    notes = [v for note in post_its if (v := validate_note(note)) is not None]
+    for note in notes:
+        if "blob" not in note and len(note["content"]) > BLOB_MIN_CHARS:
+            note["content"], note["blob"] = split_body(note["content"])
+    return notes
 
-def load_notes() -> list[dict[str, Any]]:
-    """Load post-its from JSON file.
+
+@timed("storage.load_notes")
+def load_notes(board: str = DEFAULT_BOARD) -> list[dict[str, Any]]:
+    """Load one board's post-its with the active storage engine.
+
+    Only the requested board is read, however many boards exist.
+
+    Args:
+        board: Board id.
 
     Returns:
         List of validated note dicts. Empty list if file doesn't
         exist, is corrupted, or contains no valid notes.
+
+    Raises:
+        OSError: If the daemon failed to read the board; files that
+            cannot be read count as empty.
     """
-    data_file = _get_data_file()
-    if not data_file.exists():
-        return []
+    answered, notes = _daemon_call("load", board=board)
+    if answered:
+        return notes
+    return _load_local(board)
+
+
+def _load_local(board: str) -> list[dict[str, Any]]:
+    """Load one board's post-its from the files, never through the daemon; see load_notes.
+
+    Args:
+        board: Board id.
+
+    Returns:
+        List of validated note dicts.
+    """
+    engine = get_engine()
+    key = _base_key(board)
+    with board_lock(lock_file(key[1], board), shared=True) as fd:
+        notes, revision = engine.load_versioned(board)
+        _bases[key] = ((read_token(fd), engine.stamp(board)), revision, notes)
+    return [dict(note) for note in notes]
 
+
+def _base_key(board: str) -> tuple[str, Path, str]:
+    """Return the key of a board's last loaded or saved state in _bases.
+
+    Args:
+        board: Board id.
+
+    Returns:
+        Engine name, notes file and board id.
+    """
+    return _storage_engine, _get_data_file(), board
+
+
+def new_board_id() -> str:
+    """Return a fresh id for a board, safe to use in file names.
+
+    Returns:
+        A short random hex string.
+    """
+    return uuid.uuid4().hex[:12]
+
+
+def load_boards() -> list[dict[str, str]]:
+    """Load the ordered board index.
+
+    Returns:
+        List of {"id", "name"} dicts. A single default board when no
+        index exists yet or the index is unreadable.
+    """
     try:
-        raw = data_file.read_text(encoding="utf-8")
-        data = json.loads(raw)
-        if not isinstance(data, dict) or "post_its" not in data:
-            return []
-        notes = data["post_its"]
-        if not isinstance(notes, list):
-            return []
-        return [v for note in notes if (v := _validate_note(note)) is not None]
-    except (json.JSONDecodeError, OSError, ValueError):
+        answered, boards = _daemon_call("boards")
+    except OSError:
+        answered, boards = False, None
+    return boards if answered else load_boards_local()
+
+
+def load_boards_local() -> list[dict[str, str]]:
+    """Load the ordered board index from its file, never through the daemon; see load_boards.
+
+    Returns:
+        List of {"id", "name"} dicts.
+    """
+    return _read_board_index(boards_file_path())
+
+
+def _read_board_index(path: Path) -> list[dict[str, str]]:
+    """Read a board index file.
+
+    Args:
+        path: boards.json.
+
+    Returns:
+        List of {"id", "name"} dicts. A single default board when the
+        file does not exist or is unreadable.
+    """
+    default = [{"id": DEFAULT_BOARD, "name": DEFAULT_BOARD_NAME}]
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        boards = [
+            {"id": str(board["id"]), "name": str(board.get("name") or board["id"])}
+            for board in data["boards"]
+            if isinstance(board, dict) and board.get("id")
+        ]
+    except (OSError, ValueError, KeyError, TypeError):
+        return default
+    return boards or default
+
+
+def save_boards(boards: list[dict[str, str]]) -> None:
+    """Save the ordered board index.
+
+    Args:
+        boards: List of {"id", "name"} dicts.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    if not _daemon_call("save_boards", boards=boards)[0]:
+        save_boards_local(boards)
+
+
+def save_boards_local(boards: list[dict[str, str]]) -> None:
+    """Save the ordered board index to its file, never through the daemon; see save_boards.
+
+    Args:
+        boards: List of {"id", "name"} dicts.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    write_json(boards_file_path(), {"version": SCHEMA_VERSION, "boards": boards})
+
+
+def watch_paths(board: str = DEFAULT_BOARD) -> list[Path]:
+    """Return the files holding a board's notes with the active storage engine.
+
+    Args:
+        board: Board id.
+
+    Returns:
+        Files to watch for changes made by other programs; none while
+        attached to the daemon, which reports changes itself.
+    """
+    if _daemon is not None:
         return []
+    return get_engine().watch_paths(board)
+
+
+def delete_board(board: str) -> None:
+    """Remove a board's notes with the active storage engine.
+
+    The board index is not touched; callers update it with save_boards.
+
+    Args:
+        board: Board id.
+
+    Raises:
+        OSError: If the board cannot be removed.
+    """
+    if not _daemon_call("delete_board", board=board)[0]:
+        _delete_board_local(board)
+
+
+def _delete_board_local(board: str) -> None:
+    """Remove a board's notes from the files, never through the daemon; see delete_board.
+
+    Args:
+        board: Board id.
+
+    Raises:
+        OSError: If the board cannot be removed.
+    """
+    # pylint: disable-next=import-outside-toplevel,cyclic-import
+    from tui_notes.feed import feed_enabled
+
+    engine = get_engine()
+    with board_lock(lock_file(_base_key(board)[1], board)) as fd:
+        # Read only to record a tombstone for each note.
+        stored = engine.load(board) if feed_enabled() else []
+        engine.delete_board(board)
+        write_token(fd)
+        _record_changes(board, stored, [])
+    _bases.pop(_base_key(board), None)
+
+
+def split_body(content: str) -> tuple[str, str | None]:
+    """Store a body out of line if it is too long to keep in the board.
+
+    Args:
+        content: The note's full body.
+
+    Returns:
+        The text to keep in the note's content, a preview if the body was
+        stored out of line, and the blob reference, or None if the body
+        stays inline.
+
+    Raises:
+        OSError: If the blob cannot be written.
+    """
+    if len(content) <= BLOB_MIN_CHARS:
+        return content, None
+    return content[:BLOB_PREVIEW_CHARS], _get_blob_store().put(content)
+
+
+def read_body(note: dict[str, Any]) -> str:
+    """Return a note's full body, reading it from the blob store if it is out of line.
+
+    Args:
+        note: Note dict.
+
+    Returns:
+        The body.
+
+    Raises:
+        OSError: If the blob is missing or unreadable.
+    """
+    blob = note.get("blob")
+    if not blob:
+        return note.get("content", "")
+    try:
+        return _get_blob_store().get(blob)
+    except ValueError as exc:
+        raise OSError(str(exc)) from exc
+
+
+def with_body(note: dict[str, Any]) -> dict[str, Any]:
+    """Return a note with its full body inline, e.g. for export.
+
+    Args:
+        note: Note dict.
+
+    Returns:
+        The note itself if its body is inline, else a copy without the
+        blob reference and with the full body as content.
+
+    Raises:
+        OSError: If the blob is missing or unreadable.
+    """
+    if not note.get("blob"):
+        return note
+    full = {key: value for key, value in note.items() if key != "blob"}
+    full["content"] = read_body(note)
+    return full
+
+
+def prune_blobs(min_age: float = BLOB_PRUNE_SECONDS) -> int:
+    """Delete out-of-line bodies that no note of any board refers to.
+
+    Args:
+        min_age: Seconds an unreferenced blob must be old to be deleted,
+            so bodies of unsaved edits and recent undo steps survive.
+
+    Returns:
+        Number of blobs deleted.
+
+    Raises:
+        OSError: If a board cannot be read; nothing is deleted then.
+    """
+    engine = get_engine()
+    keep = {
+        note["blob"]
+        for board in load_boards()
+        for note in engine.load(board["id"])
+        if note.get("blob")
+    }
+    return _get_blob_store().prune(keep, min_age)
+
+
+def mark_index_stale(boards: Iterable[str]) -> None:
+    """Record that boards changed without updating the search index.
+
+    Used by the headless CLI so it never has to load the index. The TUI
+    treats these boards as unindexed on its next start and re-indexes
+    them in the background.
+
+    Args:
+        boards: Ids of the changed boards.
+    """
+    lines = "".join(f"{board}\n" for board in boards)
+    if not lines:
+        return
+    path = stale_file_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as fh:
+            fh.write(lines)
+    except OSError:
+        # The notes themselves are saved; search only lags until the
+        # board is next opened in the TUI.
+        pass
+
+
+register_storage_engine("json", JsonStore)
+register_storage_engine("journal", _lazy_engine("tui_notes.journal", "JournalStore"))
+register_storage_engine("sqlite", _lazy_engine("tui_notes.sqlite_store", "SqliteStore"))
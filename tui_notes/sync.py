@@ -0,0 +1,693 @@
+"""Sync of the notes with other machines through a shared change feed.
+
+A target holds a feed of batches numbered from 1, each the changes one
+machine pushed at once: for every note its board, id, time, the machine
+("replica") that changed it and its new version, or None for a deleted
+note. A target is a directory, which may be on a mounted share, or the
+reference HTTP server in this module, which keeps such a directory.
+
+A sync reads what changed locally since the last sync from the local
+change feed (see tui_notes.feed), pulls the batches other machines pushed
+since then, applies them to the boards and pushes the local changes as
+one new batch. Both sides cost in proportion to the changes, not to the
+size of the boards; only the first sync with a target pushes every note.
+A push only succeeds on top of the newest batch, so a machine that was
+overtaken pulls again first.
+
+A note changed on both sides is settled per note: the newer change
+wins, and for changes made in the same instant the one of the replica
+whose id sorts last, so every machine settles it the same way. A pulled
+note that finds no free slot on its board is kept and applied by a later
+sync instead.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from tui_notes import storage
+from tui_notes.changes import merge_notes
+from tui_notes.constants import SYNC_MAX_ATTEMPTS, SYNC_PULL_LIMIT, SYNC_TIMEOUT_SECONDS
+from tui_notes.feed import ChangeFeed
+from tui_notes.files import board_lock, write_text
+from tui_notes.snapshot import validate_note
+from tui_notes.storage import (
+    get_sync_policy,
+    load_boards_local,
+    read_body,
+    save_boards_local,
+    update_board,
+)
+
+
+class StaleFeedError(Exception):
+    """A push was refused because another machine pushed since the last pull."""
+
+
+def _get_sync_dir() -> Path:
+    """Return the directory holding the state of every sync target.
+
+    Returns:
+        Path to the sync directory next to notes.json.
+    """
+    return storage.data_file_path().with_name("sync")
+
+
+# ── Targets ─────────────────────────────────────────────────────
+
+
+class SyncTarget(ABC):
+    """Where the batches of a change feed are kept."""
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Return a stable name of the target, e.g. its absolute path."""
+
+    @abstractmethod
+    def pull(self, since: int) -> tuple[list[dict[str, Any]], int]:
+        """Return the batches after one.
+
+        Args:
+            since: Number of the last batch already pulled, 0 for none.
+
+        Returns:
+            The batches in order, and the number of the last one.
+
+        Raises:
+            OSError: If the target cannot be read.
+        """
+
+    @abstractmethod
+    def push(self, base: int, batch: dict[str, Any]) -> int:
+        """Add a batch after the newest one.
+
+        Args:
+            base: Number of the newest batch, as returned by pull.
+            batch: The batch.
+
+        Returns:
+            The number of the new batch.
+
+        Raises:
+            StaleFeedError: If base is no longer the newest batch.
+            OSError: If the target cannot be written.
+        """
+
+
+class DirectoryTarget(SyncTarget):
+    """A feed kept as one JSON file per batch in a directory.
+
+    A batch is written under a temporary name and hard-linked to its
+    number, which fails if another machine took the number first.
+    """
+
+    def __init__(self, root: Path) -> None:
+        """Initialize the target; nothing is read or written until it is used.
+
+        Args:
+            root: The directory; it is created on the first push.
+        """
+        self.root = root.expanduser().absolute()
+
+    @property
+    def name(self) -> str:
+        """Return the absolute path of the directory."""
+        return str(self.root)
+
+    def pull(self, since: int, limit: int | None = None) -> tuple[list[dict[str, Any]], int]:
+        """Return the batches after one, reading only their files; see SyncTarget.pull.
+
+        Args:
+            since: Number of the last batch already pulled.
+            limit: Most batches to return.
+
+        Returns:
+            The batches in order, and the number of the last one.
+
+        Raises:
+            OSError: If a batch cannot be read.
+        """
+        batches: list[dict[str, Any]] = []
+        seq = since
+        while limit is None or len(batches) < limit:
+            try:
+                data = self._batch(seq + 1).read_bytes()
+            except FileNotFoundError:
+                break
+            try:
+                batch = json.loads(data)
+            except ValueError as exc:
+                raise OSError(f"Sync batch {seq + 1} is corrupt: {exc}") from exc
+            if not isinstance(batch, dict):
+                raise OSError(f"Sync batch {seq + 1} is corrupt: not an object")
+            batches.append(batch)
+            seq += 1
+        return batches, seq
+
+    def push(self, base: int, batch: dict[str, Any]) -> int:
+        """Write a batch after the newest one; see SyncTarget.push.
+
+        Args:
+            base: Number of the newest batch.
+            batch: The batch.
+
+        Returns:
+            The number of the new batch.
+
+        Raises:
+            StaleFeedError: If base is no longer the newest batch.
+            OSError: If the batch cannot be written.
+        """
+        seq = base + 1
+        path = self._batch(seq)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+        durability = get_sync_policy()
+        try:
+            with open(tmp, "wb") as fh:
+                fh.write(json.dumps({**batch, "seq": seq}, ensure_ascii=False).encode("utf-8"))
+                durability.sync_file(fh)
+            os.link(tmp, path)
+        except FileExistsError as exc:
+            raise StaleFeedError(f"Batch {seq} was pushed by another machine") from exc
+        finally:
+            tmp.unlink(missing_ok=True)
+        durability.committed(path)
+        return seq
+
+    def _batch(self, seq: int) -> Path:
+        """Return the file of a batch."""
+        return self.root / "batches" / f"{seq:012d}.json"
+
+
+class HttpTarget(SyncTarget):
+    """A feed kept by a sync server, such as SyncServer."""
+
+    def __init__(self, url: str, timeout: float = SYNC_TIMEOUT_SECONDS) -> None:
+        """Initialize the target; nothing is sent until it is used.
+
+        Args:
+            url: The server's base URL.
+            timeout: Seconds to wait for an answer.
+        """
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    @property
+    def name(self) -> str:
+        """Return the server's base URL."""
+        return self.url
+
+    def pull(self, since: int) -> tuple[list[dict[str, Any]], int]:
+        """Fetch the batches after one, a page at a time; see SyncTarget.pull."""
+        batches: list[dict[str, Any]] = []
+        seq = since
+        while True:
+            page = self._request("GET", f"/batches?since={seq}")
+            if not isinstance(page.get("batches"), list) or not all(
+                isinstance(batch, dict) for batch in page["batches"]
+            ):
+                raise OSError("Sync server sent an invalid answer")
+            batches.extend(page["batches"])
+            seq += len(page["batches"])
+            if not page.get("more") or not page["batches"]:
+                return batches, seq
+
+    def push(self, base: int, batch: dict[str, Any]) -> int:
+        """Send a batch to append after the newest one; see SyncTarget.push."""
+        answer = self._request("POST", "/batches", {"base": base, "batch": batch})
+        try:
+            return int(answer["seq"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise OSError("Sync server sent an invalid answer") from exc
+
+    def _request(self, method: str, path: str, body: Any = None) -> dict[str, Any]:
+        """Send one request and decode the answer.
+
+        Args:
+            method: HTTP method.
+            path: Path below the base URL, with the query.
+            body: JSON body, if any.
+
+        Returns:
+            The decoded answer.
+
+        Raises:
+            StaleFeedError: If the server refused a push as stale.
+            OSError: If the server cannot be reached or fails.
+        """
+        data = None if body is None else json.dumps(body, ensure_ascii=False).encode("utf-8")
+        request = urllib.request.Request(
+            self.url + path, data=data, method=method, headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                answer = json.loads(response.read())
+        except urllib.error.HTTPError as exc:
+            if exc.code == 409:
+                raise StaleFeedError("Another machine pushed first") from exc
+            raise OSError(f"Sync server answered {exc.code} {exc.reason}") from exc
+        except ValueError as exc:
+            raise OSError(f"Sync server sent an invalid answer: {exc}") from exc
+        except http.client.HTTPException as exc:
+            # E.g. IncompleteRead when the connection drops mid-answer.
+            raise OSError(f"Sync server connection failed: {exc!r}") from exc
+        if not isinstance(answer, dict):
+            raise OSError("Sync server sent an invalid answer")
+        return answer
+
+
+def open_target(spec: str) -> SyncTarget:
+    """Return the target a command line names.
+
+    Args:
+        spec: An http:// or https:// URL, or a directory.
+
+    Returns:
+        The target.
+    """
+    if spec.startswith(("http://", "https://")):
+        return HttpTarget(spec)
+    return DirectoryTarget(Path(spec))
+
+
+# ── Reference server ────────────────────────────────────────────
+
+
+class _SyncHandler(BaseHTTPRequestHandler):
+    """Serve GET and POST /batches from the server's DirectoryTarget."""
+
+    server: SyncServer
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Answer a pull with at most SYNC_PULL_LIMIT batches."""
+        url = urlsplit(self.path)
+        if url.path != "/batches":
+            self._answer(404, {"error": "not found"})
+            return
+        try:
+            since = int(parse_qs(url.query).get("since", ["0"])[0])
+            batches, _ = self.server.target.pull(since, SYNC_PULL_LIMIT)
+        except ValueError:
+            self._answer(400, {"error": "since must be a number"})
+            return
+        except OSError as exc:
+            self._answer(500, {"error": str(exc)})
+            return
+        self._answer(200, {"batches": batches, "more": len(batches) == SYNC_PULL_LIMIT})
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Append a pushed batch, or refuse it as stale."""
+        if urlsplit(self.path).path != "/batches":
+            self._answer(404, {"error": "not found"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            base, batch = int(body["base"]), body["batch"]
+            if not isinstance(batch, dict) or not isinstance(batch.get("changes"), list):
+                raise ValueError("batch must be an object with a list of changes")
+        except (KeyError, TypeError, ValueError) as exc:
+            self._answer(400, {"error": str(exc)})
+            return
+        try:
+            seq = self.server.target.push(base, batch)
+        except StaleFeedError as exc:
+            self._answer(409, {"error": str(exc)})
+            return
+        except OSError as exc:
+            self._answer(500, {"error": str(exc)})
+            return
+        self._answer(200, {"seq": seq})
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        """Log nothing; the reference server runs in tests and terminals."""
+
+    def _answer(self, status: int, body: dict[str, Any]) -> None:
+        """Send a JSON answer."""
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class SyncServer(ThreadingHTTPServer):
+    """Reference sync server keeping the feed in a directory, for tests and trusted networks.
+
+    GET /batches?since=N returns {"batches": [...], "more": bool}; POST
+    /batches with {"base": N, "batch": {...}} returns {"seq": N + 1}, or
+    409 if N is not the newest batch. There is no authentication.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, root: Path, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Listen on a port; call serve_forever, e.g. in a thread, to answer.
+
+        Args:
+            root: Directory of the feed.
+            host: Address to listen on.
+            port: Port to listen on, 0 for any free one.
+
+        Raises:
+            OSError: If the port cannot be opened.
+        """
+        self.target = DirectoryTarget(root)
+        super().__init__((host, port), _SyncHandler)
+
+    @property
+    def url(self) -> str:
+        """Return the base URL clients sync with."""
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+
+# ── Sync ────────────────────────────────────────────────────────
+
+
+class NoteSync:
+    """Two-way sync of every board with one target.
+
+    The state of each target, where the last sync left the local feed
+    and the target's, is kept in the sync directory. run may be called
+    from a worker thread; concurrent runs for a target wait for each
+    other, also across processes.
+    """
+
+    def __init__(self, target: SyncTarget) -> None:
+        """Initialize the sync; nothing is read until run.
+
+        Args:
+            target: Where to sync to.
+        """
+        self.target = target
+        self.key = hashlib.sha1(target.name.encode("utf-8")).hexdigest()[:16]
+        self._state_file = _get_sync_dir() / f"{self.key}.json"
+        self._lock = threading.Lock()
+
+    def run(self) -> dict[str, Any]:
+        """Pull the target's new changes, apply them and push the local ones.
+
+        Nothing is recorded unless the push succeeds, so an interrupted
+        sync is simply repeated by the next one.
+
+        Returns:
+            A summary: "pulled" changes applied here, "pushed" changes,
+            "conflicts" settled, "waiting" changes without a free slot
+            yet, "boards" the ids of the boards changed here, and whether
+            "new_boards" were added to the board index.
+
+        Raises:
+            OSError: If the target, the feed or the boards cannot be read
+                or written, or other machines kept pushing first.
+        """
+        with self._lock, board_lock(self._state_file.parent.parent / "locks" / ".sync.lock"):
+            state = self._load_state()
+            feed = ChangeFeed()
+            if state is None:
+                # Record saves from now on, then push every note once.
+                cursor = feed.enable()
+                state = {
+                    "target": self.target.name,
+                    "replica": uuid.uuid4().hex,
+                    "local": cursor,
+                    "remote": 0,
+                    "waiting": [],
+                }
+                records = self._snapshot()
+            else:
+                records, cursor = feed.read(state["local"])
+            names = {board["id"]: board["name"] for board in load_boards_local()}
+            pending = self._outgoing(records, names, state["replica"])
+            summary: dict[str, Any] = {
+                "pulled": 0,
+                "pushed": 0,
+                "conflicts": 0,
+                "waiting": 0,
+                "boards": [],
+                "new_boards": False,
+            }
+            for _ in range(SYNC_MAX_ATTEMPTS):
+                batches, seq = self.target.pull(state["remote"])
+                incoming = {(c["board"], c["id"]): c for c in state["waiting"]}
+                for batch in batches:
+                    if batch.get("replica") != state["replica"]:
+                        incoming.update(_incoming(batch))
+                summary["conflicts"] += _settle(pending, incoming)
+                state["waiting"] = self._apply(list(incoming.values()), names, summary)
+                state["remote"] = seq
+                if not pending:
+                    break
+                batch = {
+                    "replica": state["replica"],
+                    "time": time.time(),
+                    "changes": list(pending.values()),
+                }
+                try:
+                    state["remote"] = self.target.push(seq, batch)
+                except StaleFeedError:
+                    continue
+                summary["pushed"] = len(pending)
+                pending = {}
+                break
+            if pending:
+                raise OSError("Other machines kept pushing first; try again later")
+            state["local"] = cursor
+            summary["waiting"] = len(state["waiting"])
+            write_text(self._state_file, json.dumps(state, ensure_ascii=False))
+        return summary
+
+    def _load_state(self) -> dict[str, Any] | None:
+        """Read where the last sync with the target left off, None before the first one."""
+        try:
+            state = json.loads(self._state_file.read_text(encoding="utf-8"))
+            state["local"], state["remote"] = int(state["local"]), int(state["remote"])
+            state["replica"] = str(state["replica"])
+            state["waiting"] = [c for c in state.get("waiting", []) if _valid_change(c)]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return state
+
+    def _snapshot(self) -> list[dict[str, Any]]:
+        """Return a feed record for every note, for the first sync with a target."""
+        engine = storage.get_engine()
+        now = time.time()
+        return [
+            {"board": board["id"], "id": note["id"], "time": now, "note": note}
+            for board in load_boards_local()
+            for note in engine.load(board["id"])
+            if note.get("id")
+        ]
+
+    def _outgoing(
+        self, records: list[dict[str, Any]], names: dict[str, str], replica: str
+    ) -> dict[tuple[str, str], dict[str, Any]]:
+        """Turn local feed records into the changes to push, one per note.
+
+        A note's latest record counts. One written by applying this
+        target's changes means the target already has that version.
+
+        Args:
+            records: Records of the local feed, oldest first.
+            names: Board names by id.
+            replica: This machine's replica id for the target.
+
+        Returns:
+            The changes keyed by board and note id, with full bodies.
+        """
+        latest: dict[tuple[str, str], dict[str, Any]] = {}
+        for record in records:
+            key = (record["board"], record["id"])
+            latest.pop(key, None)
+            if record.get("origin") != self.key:
+                latest[key] = record
+        pending = {}
+        for key, record in latest.items():
+            note = record.get("note")
+            if isinstance(note, dict):
+                note = dict(note)
+                if note.get("blob"):
+                    try:
+                        note["content"] = read_body(note)
+                    except OSError:
+                        pass  # The body is gone; its preview is all there is.
+                    note.pop("blob")
+            pending[key] = {
+                "board": record["board"],
+                "board_name": names.get(record["board"], record["board"]),
+                "id": record["id"],
+                "time": float(record.get("time", 0)),
+                "replica": replica,
+                "note": note if isinstance(note, dict) else None,
+            }
+        return pending
+
+    def _apply(
+        self, changes: list[dict[str, Any]], names: dict[str, str], summary: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        """Apply pulled changes to the boards, each board in one write.
+
+        Args:
+            changes: The changes, one per note.
+            names: Board names by id; boards that are new here are added.
+            summary: Summary of the run, updated in place.
+
+        Returns:
+            The changes that found no free slot on their board.
+
+        Raises:
+            OSError: If a board or the board index cannot be written.
+        """
+        by_board: dict[str, list[dict[str, Any]]] = {}
+        for change in changes:
+            if change["board"] in names or change["note"] is not None:
+                by_board.setdefault(change["board"], []).append(change)
+        waiting: list[dict[str, Any]] = []
+        for board, board_changes in by_board.items():
+            unplaced = _apply_board(board, board_changes, self.key)
+            waiting.extend(unplaced)
+            summary["pulled"] += len(board_changes) - len(unplaced)
+            if board not in summary["boards"]:
+                summary["boards"].append(board)
+        added = [
+            {"id": board, "name": str(board_changes[0].get("board_name") or board)}
+            for board, board_changes in by_board.items()
+            if board not in names
+        ]
+        if added:
+            save_boards_local(load_boards_local() + added)
+            names.update((board["id"], board["name"]) for board in added)
+            summary["new_boards"] = True
+        return waiting
+
+
+def _apply_board(board: str, changes: list[dict[str, Any]], origin: str) -> list[dict[str, Any]]:
+    """Apply pulled changes to one board.
+
+    Args:
+        board: Board id.
+        changes: Its changes, one per note.
+        origin: Tag for the feed records of the write.
+
+    Returns:
+        The changes whose notes found no free slot.
+
+    Raises:
+        OSError: If the board cannot be written.
+    """
+    unplaced: list[dict[str, Any]] = []
+
+    def update(stored: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        unplaced.clear()
+        by_id = {change["id"]: change for change in changes}
+        notes = [note for note in stored if note.get("id") not in by_id]
+        for change in changes:
+            note = change["note"] and validate_note({**change["note"], "id": change["id"]})
+            if note:
+                notes.append(note)
+        # Every note takes the pulled side; notes in the way move to free slots.
+        merged, clashes = merge_notes(stored, notes, stored)
+        unplaced.extend(by_id[c["id"]] for c in clashes if c["id"] in by_id)
+        return merged
+
+    update_board(board, update, origin)
+    return unplaced
+
+
+def _incoming(batch: dict[str, Any]) -> dict[tuple[str, str], dict[str, Any]]:
+    """Return the well-formed changes of a pulled batch, keyed by board and note id."""
+    changes = batch.get("changes")
+    if not isinstance(changes, list):
+        return {}
+    return {(c["board"], c["id"]): c for c in changes if _valid_change(c)}
+
+
+def _valid_change(change: Any) -> bool:
+    """Return whether a change from a target has the fields a sync relies on.
+
+    The note of a change must be None or pass validate_note, so a change
+    another machine or a hand-edited batch got wrong is skipped instead of
+    failing every sync with the target.
+    """
+    if not (
+        isinstance(change, dict)
+        and isinstance(change.get("board"), str)
+        and isinstance(change.get("id"), str)
+        and isinstance(change.get("time"), (int, float))
+        and isinstance(change.get("replica"), str)
+        and "note" in change
+    ):
+        return False
+    if change["note"] is None:
+        return True
+    try:
+        return validate_note(change["note"]) is not None
+    except (ValueError, TypeError):
+        return False
+
+
+def _settle(
+    pending: dict[tuple[str, str], dict[str, Any]],
+    incoming: dict[tuple[str, str], dict[str, Any]],
+) -> int:
+    """Keep only the winning side of every note changed both here and on the target.
+
+    Args:
+        pending: Local changes to push; losers are removed.
+        incoming: Pulled changes to apply; losers are removed.
+
+    Returns:
+        Number of notes both sides changed differently.
+    """
+    conflicts = 0
+    for key in [key for key in incoming if key in pending]:
+        mine, theirs = pending[key], incoming[key]
+        if _same_note(mine["note"], theirs["note"]):
+            del pending[key], incoming[key]
+            continue
+        conflicts += 1
+        if (mine["time"], mine["replica"]) >= (theirs["time"], theirs["replica"]):
+            del incoming[key]
+        else:
+            del pending[key]
+    return conflicts
+
+
+def _same_note(mine: dict[str, Any] | None, theirs: dict[str, Any] | None) -> bool:
+    """Return whether two versions of a note, or two deletions, are alike."""
+    if mine is None or theirs is None:
+        return mine is theirs
+    fields = ("title", "content", "color_index", "position")
+    return all(mine.get(field) == theirs.get(field) for field in fields)
+
+
+def prune_feed() -> int:
+    """Delete the local feed segments every sync target has read past.
+
+    Returns:
+        Number of segments deleted.
+    """
+    cursors = []
+    for path in _get_sync_dir().glob("*.json"):
+        try:
+            cursors.append(int(json.loads(path.read_text(encoding="utf-8"))["local"]))
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+    if not cursors:
+        return 0
+    return ChangeFeed().prune(min(cursors))
@@ -0,0 +1,410 @@
+"""Undo and redo history of the notes boards.
+
+Every change is recorded as the per-note steps that turn the board
+before it into the board after it, never as a copy of the board. A text
+edit keeps only the span of the title or body that changed, so typing a
+word into a long note costs a few bytes. The history of all boards
+shares one memory budget; once it is exceeded the oldest steps are
+forgotten.
+
+Steps are tuples:
+
+- ``("add", note)`` and ``("delete", note)`` carry the whole note.
+- ``("text", id, field, start, removed, inserted)`` replaces a span.
+- ``("set", id, field, old, new)`` changes the color or position.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+from tui_notes import storage
+from tui_notes.changes import splice
+from tui_notes.constants import MAX_NOTES, UNDO_MAX_BYTES
+from tui_notes.files import write_json
+from tui_notes.snapshot import validate_note
+
+UNDO_VERSION = 1
+"""Format version of the persisted history; other versions are ignored."""
+
+TEXT_FIELDS = ("title", "content")
+"""Note fields recorded as spans of text."""
+
+VALUE_FIELDS = ("color_index", "position", "blob")
+"""Note fields recorded as old and new value; a blob of None means the body is inline."""
+
+Step = tuple[Any, ...]
+Entry = tuple[Step, ...]
+
+
+class UndoError(Exception):
+    """A history entry no longer matches the board, e.g. after another program edited it."""
+
+
+def _get_undo_file() -> Path:
+    """Return the path of the persisted undo history.
+
+    Returns:
+        Path to undo-history.json next to notes.json.
+    """
+    return storage.data_file_path().with_name("undo-history.json")
+
+
+def diff_steps(before: list[dict[str, Any]], after: list[dict[str, Any]]) -> Entry:
+    """Compute the steps that turn one board state into another.
+
+    Args:
+        before: The board's notes before the change.
+        after: The board's notes after the change.
+
+    Returns:
+        The steps, empty if nothing changed.
+    """
+    old = {note["id"]: note for note in before}
+    new = {note["id"]: note for note in after}
+    steps: list[Step] = [("delete", dict(note)) for key, note in old.items() if key not in new]
+    for key, note in new.items():
+        previous = old.get(key)
+        if previous is None:
+            steps.append(("add", dict(note)))
+            continue
+        for field in TEXT_FIELDS:
+            if note[field] != previous[field]:
+                steps.append(("text", key, field, *splice(previous[field], note[field])))
+        for field in VALUE_FIELDS:
+            if note.get(field) != previous.get(field):
+                steps.append(("set", key, field, previous.get(field), note.get(field)))
+    return tuple(steps)
+
+
+def apply_steps(notes: list[dict[str, Any]], steps: Entry, reverse: bool) -> list[dict[str, Any]]:
+    """Replay steps forwards or backwards on a board.
+
+    Args:
+        notes: The board's notes; left unchanged.
+        steps: Steps recorded by diff_steps.
+        reverse: Undo the steps instead of redoing them.
+
+    Returns:
+        The board's notes after the steps, ordered by position.
+
+    Raises:
+        UndoError: If a step does not fit the board, or the result would
+            put two notes in one slot.
+    """
+    board = {note["id"]: dict(note) for note in notes}
+    for step in reversed(steps) if reverse else steps:
+        _apply_step(board, step, reverse)
+    positions = [note["position"] for note in board.values()]
+    if len(set(positions)) != len(positions) or not all(0 <= p < MAX_NOTES for p in positions):
+        raise UndoError("The slots were changed elsewhere.")
+    return sorted(board.values(), key=lambda note: note["position"])
+
+
+def _apply_step(board: dict[str, dict[str, Any]], step: Step, reverse: bool) -> None:
+    """Replay one step on a board in place.
+
+    Args:
+        board: Notes keyed by id.
+        step: A step recorded by diff_steps.
+        reverse: Undo the step instead of redoing it.
+
+    Raises:
+        UndoError: If the step does not fit the board.
+    """
+    if step[0] in ("add", "delete"):
+        note = step[1]
+        if (step[0] == "add") != reverse:
+            if note["id"] in board:
+                raise UndoError("The note is already on the board.")
+            board[note["id"]] = dict(note)
+        elif board.pop(note["id"], None) is None:
+            raise UndoError("The note is no longer on the board.")
+        return
+    target = board.get(step[1])
+    if target is None:
+        raise UndoError("The note is no longer on the board.")
+    if step[0] == "text":
+        _, _, field, start, removed, inserted = step
+        removed, inserted = (inserted, removed) if reverse else (removed, inserted)
+        text = target[field]
+        if text[start : start + len(removed)] != removed:
+            raise UndoError("The note was changed elsewhere.")
+        target[field] = text[:start] + inserted + text[start + len(removed) :]
+    else:
+        _, _, field, old, new = step
+        old, new = (new, old) if reverse else (old, new)
+        if target.get(field) != old:
+            raise UndoError("The note was changed elsewhere.")
+        if new is None:
+            target.pop(field, None)
+        else:
+            target[field] = new
+
+
+def _is_step(step: Step) -> bool:
+    """Check the shape of a step read from the persisted history.
+
+    Args:
+        step: A step as loaded from JSON.
+
+    Returns:
+        True if the step can be replayed.
+    """
+    kind = step[0] if step else None
+    if kind in ("add", "delete"):
+        return len(step) == 2 and validate_note(step[1]) == step[1]
+    if kind == "text":
+        return (
+            len(step) == 6
+            and step[2] in TEXT_FIELDS
+            and isinstance(step[3], int)
+            and all(isinstance(part, str) for part in step[4:])
+        )
+    if kind == "set":
+        return len(step) == 5 and step[2] in VALUE_FIELDS
+    return False
+
+
+def entry_size(steps: Entry) -> int:
+    """Estimate the memory an entry holds.
+
+    Args:
+        steps: Steps recorded by diff_steps.
+
+    Returns:
+        Approximate size in bytes, including the strings it references.
+    """
+    size = sys.getsizeof(steps)
+    for step in steps:
+        size += sys.getsizeof(step)
+        for part in step[1:]:
+            if isinstance(part, dict):
+                size += sys.getsizeof(part) + sum(sys.getsizeof(v) for v in part.values())
+            elif isinstance(part, str):
+                size += sys.getsizeof(part)
+    return size
+
+
+class UndoLog:
+    """Per-board undo and redo stacks under one shared memory budget.
+
+    Entries are numbered in the order they were recorded, so eviction
+    can always drop the oldest entry of any board. ``path`` is the file a
+    loaded history is saved back to; a new history has none and lives in
+    memory only.
+    """
+
+    def __init__(self, max_bytes: int = UNDO_MAX_BYTES) -> None:
+        """Initialize an empty history.
+
+        Args:
+            max_bytes: Approximate memory budget of all entries. An entry
+                larger than the budget on its own is not kept.
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.path: Path | None = None
+        self._undo: dict[str, deque[tuple[int, int, Entry]]] = {}
+        self._redo: dict[str, deque[tuple[int, int, Entry]]] = {}
+        self._counter = 0
+
+    def can_undo(self, board: str) -> bool:
+        """Whether the board has a change to undo."""
+        return bool(self._undo.get(board))
+
+    def can_redo(self, board: str) -> bool:
+        """Whether the board has an undone change to redo."""
+        return bool(self._redo.get(board))
+
+    def record(self, board: str, before: list[dict[str, Any]], after: list[dict[str, Any]]) -> bool:
+        """Record a change of a board and forget what could be redone.
+
+        Args:
+            board: Board id.
+            before: The board's notes before the change.
+            after: The board's notes after the change.
+
+        Returns:
+            True if anything changed.
+        """
+        steps = diff_steps(before, after)
+        if not steps:
+            return False
+        for item in self._redo.pop(board, []):
+            self.size -= item[1]
+        self._push(self._undo.setdefault(board, deque()), steps)
+        return True
+
+    def undo(self, board: str, notes: list[dict[str, Any]]) -> list[dict[str, Any]] | None:
+        """Undo the board's latest change.
+
+        Args:
+            board: Board id.
+            notes: The board's notes as they are now.
+
+        Returns:
+            The notes with the change undone, or None if there is nothing to undo.
+
+        Raises:
+            UndoError: If the change no longer fits the board. The board's
+                history is forgotten.
+        """
+        return self._step(board, notes, self._undo, self._redo, reverse=True)
+
+    def redo(self, board: str, notes: list[dict[str, Any]]) -> list[dict[str, Any]] | None:
+        """Redo the board's latest undone change.
+
+        Args:
+            board: Board id.
+            notes: The board's notes as they are now.
+
+        Returns:
+            The notes with the change redone, or None if there is nothing to redo.
+
+        Raises:
+            UndoError: If the change no longer fits the board. The board's
+                history is forgotten.
+        """
+        return self._step(board, notes, self._redo, self._undo, reverse=False)
+
+    def forget(self, board: str) -> None:
+        """Drop a board's history, e.g. because the board was deleted.
+
+        Args:
+            board: Board id.
+        """
+        for stack in (self._undo.pop(board, ()), self._redo.pop(board, ())):
+            self.size -= sum(item[1] for item in stack)
+
+    def _step(
+        self,
+        board: str,
+        notes: list[dict[str, Any]],
+        source: dict[str, deque[tuple[int, int, Entry]]],
+        target: dict[str, deque[tuple[int, int, Entry]]],
+        reverse: bool,
+    ) -> list[dict[str, Any]] | None:
+        """Replay the top entry of one stack and move it to the other.
+
+        Args:
+            board: Board id.
+            notes: The board's notes as they are now.
+            source: The stacks to take the entry from.
+            target: The stacks to put the entry on.
+            reverse: Undo the entry instead of redoing it.
+
+        Returns:
+            The notes after the entry, or None if the source stack is empty.
+
+        Raises:
+            UndoError: If the entry no longer fits the board.
+        """
+        stack = source.get(board)
+        if not stack:
+            return None
+        item = stack.pop()
+        try:
+            result = apply_steps(notes, item[2], reverse)
+        except UndoError:
+            self.size -= item[1]
+            self.forget(board)
+            raise
+        target.setdefault(board, deque()).append(item)
+        return result
+
+    def _push(self, stack: deque[tuple[int, int, Entry]], steps: Entry) -> None:
+        """Put a new entry on an undo stack and evict entries over the budget.
+
+        Args:
+            stack: The board's undo stack.
+            steps: The entry's steps.
+        """
+        self._counter += 1
+        item = (self._counter, entry_size(steps), steps)
+        stack.append(item)
+        self.size += item[1]
+        while self.size > self.max_bytes and self._evict():
+            pass
+
+    def _evict(self) -> bool:
+        """Forget the oldest entry of all boards, undo entries first.
+
+        Returns:
+            False if there was nothing left to forget.
+        """
+        boards = [board for board, stack in self._undo.items() if stack]
+        if boards:
+            oldest = min(boards, key=lambda board: self._undo[board][0][0])
+            self.size -= self._undo[oldest].popleft()[1]
+            return True
+        boards = [board for board, stack in self._redo.items() if stack]
+        if boards:
+            # The bottom of a redo stack is the change furthest in the future.
+            oldest = min(boards, key=lambda board: self._redo[board][0][0])
+            self.size -= self._redo[oldest].popleft()[1]
+            return True
+        return False
+
+    def save(self, path: Path | None = None) -> None:
+        """Persist the history.
+
+        Args:
+            path: Destination file. Defaults to the file the history was
+                loaded from, or undo-history.json next to notes.json.
+
+        Raises:
+            OSError: If the file cannot be written.
+        """
+        boards = {
+            board: {
+                "undo": [list(item[2]) for item in self._undo.get(board, ())],
+                "redo": [list(item[2]) for item in self._redo.get(board, ())],
+            }
+            for board in self._undo.keys() | self._redo.keys()
+        }
+        write_json(
+            path or self.path or _get_undo_file(), {"version": UNDO_VERSION, "boards": boards}
+        )
+
+    @classmethod
+    def load(cls, path: Path | None = None, max_bytes: int = UNDO_MAX_BYTES) -> UndoLog:
+        """Load a persisted history.
+
+        Args:
+            path: History file. Defaults to undo-history.json next to notes.json.
+            max_bytes: Memory budget of the loaded history.
+
+        Returns:
+            The loaded history, or an empty one if the file is missing,
+            unreadable or from another format version. Either way it is
+            saved back to the same file.
+        """
+        path = path or _get_undo_file()
+        log = cls(max_bytes)
+        log.path = path
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("version") != UNDO_VERSION:
+                return log
+            for board, stacks in data["boards"].items():
+                for name, store in (("undo", log._undo), ("redo", log._redo)):
+                    for steps in stacks[name]:
+                        entry = tuple(tuple(step) for step in steps)
+                        if not all(_is_step(step) for step in entry):
+                            raise ValueError("malformed undo step")
+                        log._counter += 1
+                        item = (log._counter, entry_size(entry), entry)
+                        store.setdefault(board, deque()).append(item)
+                        log.size += item[1]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            log = cls(max_bytes)
+            log.path = path
+            return log
+        while log.size > log.max_bytes and log._evict():
+            pass
+        return log
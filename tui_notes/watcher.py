@@ -0,0 +1,295 @@
+"""Detect changes other programs make to the files holding the active board.
+
+On Linux the watcher asks the kernel for inotify events on the parent
+directories of the watched files, through ctypes so no extra package is
+needed; elsewhere, or when inotify is unavailable, it polls. Either way
+an event only triggers a fingerprint check: a file counts as changed
+when its mtime or size moved and its content hash differs from the last
+one seen, so touching a file or rewriting it with the same content does
+nothing. Writes made by the app itself run inside writing(), which
+keeps the check out while they happen and takes their result as known;
+trigger() reports a change anyway, e.g. when a save merged in another
+program's edits.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from tui_notes.constants import WATCH_POLL_SECONDS, WATCH_SETTLE_SECONDS
+
+Fingerprint = tuple[int, int, bytes]
+"""mtime in nanoseconds, size and content hash of a file."""
+
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def fingerprint(path: Path) -> Fingerprint | None:
+    """Return a file's fingerprint.
+
+    Args:
+        path: File to fingerprint.
+
+    Returns:
+        mtime, size and BLAKE2 hash, or None if the file does not exist.
+    """
+    try:
+        stat = path.stat()
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 16), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, digest.digest()
+
+
+class _Inotify:
+    """Minimal ctypes binding of the Linux inotify API."""
+
+    def __init__(self) -> None:
+        """Open an inotify instance.
+
+        Raises:
+            OSError: If inotify is not available.
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: dict[str, int] = {}
+
+    def watch_dirs(self, dirs: set[str]) -> set[str]:
+        """Watch exactly the given directories.
+
+        Args:
+            dirs: Directories to watch.
+
+        Returns:
+            The directories that could not be watched, e.g. because they
+            do not exist yet.
+        """
+        for path in set(self._watches) - dirs:
+            self._libc.inotify_rm_watch(self.fd, self._watches.pop(path))
+        failed = set()
+        for path in dirs - set(self._watches):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), _IN_MASK)
+            if wd < 0:
+                failed.add(path)
+            else:
+                self._watches[path] = wd
+        return failed
+
+    def read_names(self) -> set[str]:
+        """Drain pending events.
+
+        Returns:
+            Names of the directory entries the events were about.
+        """
+        names: set[str] = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return names
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                _wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                names.add(os.fsdecode(data[offset : offset + length].rstrip(b"\0")))
+                offset += length
+
+    def close(self) -> None:
+        """Close the inotify instance."""
+        os.close(self.fd)
+
+
+class FileWatcher:  # pylint: disable=too-many-instance-attributes
+    """Call back from a background thread when watched files change."""
+
+    def __init__(
+        self,
+        on_change: Callable[[], None],
+        *,
+        poll_interval: float = WATCH_POLL_SECONDS,
+        settle: float = WATCH_SETTLE_SECONDS,
+        use_inotify: bool = True,
+    ) -> None:
+        """Initialize the watcher; nothing is watched until start().
+
+        Args:
+            on_change: Called from the watcher thread after a change.
+            poll_interval: Seconds between checks when polling.
+            settle: Seconds without events before a burst of inotify
+                events is checked, so one save triggers one callback.
+            use_inotify: Whether to try inotify before falling back to polling.
+        """
+        self._on_change = on_change
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self._use_inotify = use_inotify
+        self._inotify: _Inotify | None = None
+        self._paths: list[Path] = []
+        self._known: dict[Path, Fingerprint | None] = {}
+        self._unwatched = False
+        self._triggered = False
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._wake_r, self._wake_w = os.pipe()
+
+    @property
+    def backend(self) -> str:
+        """ "inotify" or "polling"."""
+        return "inotify" if self._inotify is not None else "polling"
+
+    def start(self) -> None:
+        """Start the watcher thread."""
+        if self._use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError):
+                self._inotify = None
+        self._update_watches()
+        self._thread = threading.Thread(target=self._run, name="tui-notes-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the watcher thread and release its resources."""
+        self._stop.set()
+        os.write(self._wake_w, b"x")
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    def watch(self, paths: Iterable[Path]) -> None:
+        """Replace the watched files, taking their current state as known.
+
+        Args:
+            paths: Files to watch; they need not exist yet.
+        """
+        paths = list(paths)
+        with self._lock:
+            self._paths = paths
+            self._known = {path: fingerprint(path) for path in paths}
+        self._update_watches()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """Wrap a write of the watched files made by the app itself.
+
+        Checks wait until the write is done, and its result becomes the
+        known state, so the app's own saves are never reported.
+
+        Yields:
+            None.
+        """
+        with self._lock:
+            try:
+                yield
+            finally:
+                self._known = {path: fingerprint(path) for path in self._paths}
+
+    def trigger(self) -> None:
+        """Call back from the watcher thread as if the files had changed."""
+        with self._lock:
+            self._triggered = True
+        os.write(self._wake_w, b"x")
+
+    def check(self) -> bool:
+        """Compare the watched files with their known state.
+
+        Returns:
+            True if any file changed since the last check, watch() or
+            rebaseline(); the new state becomes the known one.
+        """
+        changed = False
+        with self._lock:
+            for path in self._paths:
+                old = self._known.get(path)
+                try:
+                    stat = path.stat()
+                except OSError:
+                    new = None
+                else:
+                    if old is not None and old[:2] == (stat.st_mtime_ns, stat.st_size):
+                        continue
+                    new = fingerprint(path)
+                if (old and old[2]) != (new and new[2]):
+                    changed = True
+                self._known[path] = new
+        return changed
+
+    def _update_watches(self) -> None:
+        """Point inotify at the parent directories of the watched files."""
+        if self._inotify is None:
+            return
+        with self._lock:
+            dirs = {str(path.parent) for path in self._paths}
+            self._unwatched = bool(self._inotify.watch_dirs(dirs))
+        os.write(self._wake_w, b"x")
+
+    def _wait(self) -> bool:
+        """Block until watched files may have changed or stop() is called.
+
+        Returns:
+            True if the files should be checked.
+        """
+        if self._inotify is None:
+            ready = select.select([self._wake_r], [], [], self.poll_interval)[0]
+            if ready:
+                os.read(self._wake_r, 4096)
+            return not self._stop.is_set()
+        with self._lock:
+            names = {path.name for path in self._paths}
+        timeout = self.poll_interval if self._unwatched else None
+        ready = select.select([self._inotify.fd, self._wake_r], [], [], timeout)[0]
+        if self._wake_r in ready:
+            os.read(self._wake_r, 4096)
+        if self._stop.is_set():
+            return False
+        if not ready:
+            self._update_watches()
+            return True
+        if self._inotify.fd not in ready or not names & self._inotify.read_names():
+            return self._triggered
+        # Let the burst of events of one save settle before checking.
+        while select.select([self._inotify.fd], [], [], self.settle)[0]:
+            self._inotify.read_names()
+        return True
+
+    def _run(self) -> None:
+        """Thread entry point."""
+        while not self._stop.is_set():
+            if not self._wait():
+                continue
+            changed = self.check()
+            with self._lock:
+                changed, self._triggered = changed or self._triggered, False
+            if changed:
+                self._on_change()
@@ -1,6 +1,40 @@
 """Widget components for tui-notes."""
 
-from tui_notes.widgets.empty_slot import EmptySlot
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from tui_notes.widgets.post_it import PostIt
 
-__all__ = ["EmptySlot", "PostIt"]
+if TYPE_CHECKING:
+    from tui_notes.widgets.debug_overlay import DebugOverlay
+    from tui_notes.widgets.virtual_grid import VirtualNoteGrid
+
+__all__ = ["DebugOverlay", "PostIt", "VirtualNoteGrid"]
+
+_MODULES = {
+    "DebugOverlay": "debug_overlay",
+    "VirtualNoteGrid": "virtual_grid",
+}
+"""Widgets the main grid does not need, imported on first use."""
+
+
+def __getattr__(name: str) -> Any:
+    """Import a lazily loaded widget on first use.
+
+    Args:
+        name: Attribute requested from the package.
+
+    Returns:
+        The widget class.
+
+    Raises:
+        AttributeError: If the name is not a widget of this package.
+    """
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    widget = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = widget
+    return widget
@@ -0,0 +1,64 @@
+"""Hidden debug overlay with live performance figures."""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from textual.widgets import Static
+
+from tui_notes import instrumentation
+
+REFRESH_SECONDS = 0.5
+"""How often the overlay re-reads the metrics while it is shown."""
+
+
+class DebugOverlay(Static):
+    """Floating panel showing save latency, pending writes and frame times.
+
+    Showing the overlay enables instrumentation if it was off, so the
+    figures start filling in from that moment on.
+    """
+
+    def __init__(self, pending_writes: Callable[[], int], **kwargs: Any) -> None:
+        """Initialize the overlay.
+
+        Args:
+            pending_writes: Returns the number of snapshots not yet on disk.
+            **kwargs: Additional keyword arguments passed to Static.
+        """
+        super().__init__("", **kwargs)
+        self._pending_writes = pending_writes
+
+    def on_mount(self) -> None:
+        """Start refreshing while the overlay is shown."""
+        self.set_interval(REFRESH_SECONDS, self.refresh_figures)
+
+    def toggle(self) -> None:
+        """Show or hide the overlay."""
+        self.display = not self.display
+        if self.display:
+            instrumentation.enable()
+            self.refresh_figures()
+
+    def refresh_figures(self) -> None:
+        """Re-render the figures from the active metrics."""
+        metrics = instrumentation.active()
+        if not self.display or metrics is None:
+            return
+        lines = []
+        for label, name in (
+            ("save", "storage.save_notes"),
+            ("save delay", "saver.delay"),
+            ("load", "storage.load_notes"),
+            ("key", "app.on_key"),
+            ("frame", "app.frame"),
+        ):
+            histogram = metrics.histogram(name)
+            lines.append(
+                f"{label:<10} last {histogram.last * 1000:7.1f}  "
+                f"p95 {histogram.percentile(95) * 1000:7.1f} ms"
+            )
+        counters = metrics.as_dict()["counters"]
+        mounts = sum(value for name, value in counters.items() if name.startswith("mount."))
+        lines.append(f"pending writes {self._pending_writes()}   mounts {mounts}")
+        self.update("\n".join(lines))
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import uuid
 from typing import Any
 
 from textual.app import ComposeResult
@@ -9,23 +10,39 @@ from textual.containers import Container
 from textual.reactive import reactive
 from textual.widgets import Static
 
+from tui_notes import instrumentation
 from tui_notes.constants import NUM_COLORS
 
+EMPTY_SLOT_TEXT = "Press 'a' to add a note"
+"""Placeholder shown by a widget of the grid that holds no note."""
 
-class PostIt(Container, can_focus=True):
-    """A single post-it note widget with reactive title, content, and color."""
+
+class PostIt(Container, can_focus=True):  # pylint: disable=too-many-instance-attributes
+    """A single post-it note widget with reactive title, content, and color.
+
+    The dict returned by to_dict is cached until a reactive or the note
+    id changes, so serializing a board only builds dicts for the notes
+    that changed since the last save. A note whose body is stored out of
+    line holds only a preview in content and the reference in blob.
+
+    The widgets of the main grid stay in their slots for good: clear
+    turns one into an empty slot (the empty-slot class) and bind shows
+    a note in it again, so no widget is mounted or removed.
+    """
 
     title: reactive[str] = reactive("")
     content: reactive[str] = reactive("")
     position: reactive[int] = reactive(0)
     color_index: reactive[int] = reactive(0)
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
         self,
         position: int,
         title: str = "",
         content: str = "",
         color_index: int | None = None,
+        note_id: str | None = None,
+        blob: str | None = None,
         **kwargs: Any,
     ) -> None:
         """Initialize a post-it note.
@@ -35,39 +52,147 @@ class PostIt(Container, can_focus=True):
             title: Note title. Defaults to 'Note {position + 1}'.
             content: Note body text.
             color_index: Color palette index (0-5). Defaults to position % 6.
+            note_id: Stable identity that follows the note across moves. Generated if omitted.
+            blob: Reference of the full body if content is only a preview.
             **kwargs: Additional keyword arguments passed to Container.
         """
         super().__init__(**kwargs)
+        self._empty = False
+        self._snapshot: dict[str, Any] | None = None
+        self._note_id = note_id or uuid.uuid4().hex
+        self._blob = blob
         self.position = position
         self.title = title or f"Note {position + 1}"
         self.content = content
         self.color_index = color_index if color_index is not None else position % NUM_COLORS
-        self.add_class(f"post-it-{self.color_index}")
+        self._show_color()
+
+    @classmethod
+    def empty_slot(cls, position: int) -> PostIt:
+        """Create a widget that shows an empty slot until a note is bound to it.
+
+        Args:
+            position: Grid position index (0-8).
+
+        Returns:
+            A new, empty PostIt.
+        """
+        widget = cls(position)
+        widget.clear()
+        return widget
 
     def compose(self) -> ComposeResult:
         """Compose the post-it layout with title and content labels."""
         yield Static(self.title, classes="post-it-title")
-        yield Static(self.content or "( empty )", classes="post-it-content")
+        yield Static(self._body_label(), classes="post-it-content")
+
+    def on_mount(self) -> None:
+        """Count the mount for the debug overlay and --profile."""
+        instrumentation.count("mount.PostIt")
+
+    @property
+    def note_id(self) -> str:
+        """Stable identity of the note shown in this widget."""
+        return self._note_id
+
+    @note_id.setter
+    def note_id(self, value: str) -> None:
+        self._note_id = value
+        self._snapshot = None
+
+    @property
+    def blob(self) -> str | None:
+        """Reference of the out-of-line body, or None if content is the whole body."""
+        return self._blob
+
+    @blob.setter
+    def blob(self, value: str | None) -> None:
+        self._blob = value
+        self._snapshot = None
+        self._refresh_body()
+
+    @property
+    def empty(self) -> bool:
+        """Whether this widget shows an empty slot rather than a note."""
+        return self._empty
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the note changed since to_dict last serialized it."""
+        return self._snapshot is None
+
+    def watch_position(self) -> None:
+        """Mark the note dirty when it moves."""
+        self._snapshot = None
 
     def watch_title(self, new_title: str) -> None:
         """Update the title label when the reactive property changes."""
+        self._snapshot = None
         try:
             self.query_one(".post-it-title", Static).update(new_title)
         except Exception:  # noqa: BLE001 - widget may not be composed yet
             pass
 
-    def watch_content(self, new_content: str) -> None:
+    def watch_content(self) -> None:
         """Update the content label when the reactive property changes."""
+        self._snapshot = None
+        self._refresh_body()
+
+    def _body_label(self) -> str:
+        """Return the text shown for the body; a preview is marked as cut."""
+        if self._empty:
+            return EMPTY_SLOT_TEXT
+        if self._blob is not None:
+            return f"{self.content}…"
+        return self.content or "( empty )"
+
+    def _refresh_body(self) -> None:
+        """Show the current body in the content label."""
         try:
-            self.query_one(".post-it-content", Static).update(new_content or "( empty )")
+            self.query_one(".post-it-content", Static).update(self._body_label())
         except Exception:  # noqa: BLE001 - widget may not be composed yet
             pass
 
-    def watch_color_index(self, new_color: int) -> None:
+    def watch_color_index(self) -> None:
         """Swap CSS color class when the color index changes."""
+        self._snapshot = None
+        self._show_color()
+
+    def _show_color(self) -> None:
+        """Set the CSS class of the note's color; an empty slot has none."""
         for i in range(NUM_COLORS):
             self.remove_class(f"post-it-{i}")
-        self.add_class(f"post-it-{new_color}")
+        if not self._empty:
+            self.add_class(f"post-it-{self.color_index}")
+
+    def bind(self, data: dict[str, Any]) -> None:
+        """Show another note in this widget by updating its reactives in place.
+
+        Args:
+            data: Dictionary with position, title, content, and optional
+                color_index, id and blob.
+        """
+        position = data["position"]
+        color_index = data.get("color_index")
+        self._empty = False
+        self.remove_class("empty-slot")
+        self.note_id = data.get("id") or uuid.uuid4().hex
+        self.position = position
+        self.title = data["title"] or f"Note {position + 1}"
+        self.content = data.get("content", "")
+        self.blob = data.get("blob")
+        self.color_index = color_index if color_index is not None else position % NUM_COLORS
+        self._show_color()
+
+    def clear(self) -> None:
+        """Show an empty slot instead of the note, keeping the widget for the next one."""
+        self._empty = True
+        self.add_class("empty-slot")
+        self.remove_class("moving")
+        self.title = ""
+        self.content = ""
+        self.blob = None
+        self._show_color()
 
     def to_dict(self, grid_index: int | None = None) -> dict[str, Any]:
         """Serialize this post-it to a dictionary for persistence.
@@ -76,21 +201,31 @@ class PostIt(Container, can_focus=True):
             grid_index: Override position with actual grid index. If None, uses self.position.
 
         Returns:
-            Dictionary with position, title, content, and color_index keys.
+            Dictionary with id, position, title, content, and color_index
+            keys, and blob if the body is out of line. It is shared until
+            the note changes and must not be modified.
         """
-        return {
-            "position": grid_index if grid_index is not None else self.position,
-            "title": self.title,
-            "content": self.content,
-            "color_index": self.color_index,
-        }
+        position = grid_index if grid_index is not None else self.position
+        snapshot = self._snapshot
+        if snapshot is None or snapshot["position"] != position:
+            snapshot = {
+                "id": self._note_id,
+                "position": position,
+                "title": self.title,
+                "content": self.content,
+                "color_index": self.color_index,
+            }
+            if self._blob is not None:
+                snapshot["blob"] = self._blob
+            self._snapshot = snapshot
+        return snapshot
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "PostIt":
         """Create a PostIt instance from a persistence dictionary.
 
         Args:
-            data: Dictionary with position, title, content, and optional color_index.
+            data: Dictionary with position, title, content, and optional color_index and id.
 
         Returns:
             A new PostIt instance.
@@ -100,4 +235,6 @@ class PostIt(Container, can_focus=True):
             title=data["title"],
             content=data.get("content", ""),
             color_index=data.get("color_index"),
+            note_id=data.get("id"),
+            blob=data.get("blob"),
         )
@@ -0,0 +1,247 @@
+"""Virtualized note grid that recycles a fixed pool of PostIt widgets."""
+
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Grid
+from textual.events import MouseScrollDown, MouseScrollUp, Resize
+from textual.message import Message
+from textual.reactive import reactive
+from textual.widget import Widget
+
+from tui_notes.constants import GRID_COLUMNS, OVERVIEW_OVERSCAN_ROWS, OVERVIEW_ROW_HEIGHT
+from tui_notes.widgets.post_it import PostIt
+
+
+class VirtualNoteGrid(
+    Widget, can_focus=True
+):  # pylint: disable=too-many-public-methods,too-many-instance-attributes
+    """Scrollable grid of notes backed by a pool of recycled PostIt widgets.
+
+    Only the rows that fit in the viewport, plus a few overscan rows, have
+    widgets. Scrolling rebinds the pooled widgets to other notes through
+    their reactives instead of mounting and removing widgets, so the
+    widget count stays the same however many notes there are.
+    """
+
+    BINDINGS = [
+        Binding("up", "cursor_up", "Up", show=False),
+        Binding("down", "cursor_down", "Down", show=False),
+        Binding("left", "cursor_left", "Left", show=False),
+        Binding("right", "cursor_right", "Right", show=False),
+        Binding("pageup", "page_up", "Page up", show=False),
+        Binding("pagedown", "page_down", "Page down", show=False),
+        Binding("home", "first", "First", show=False),
+        Binding("end", "last", "Last", show=False),
+        Binding("enter", "select", "Open"),
+    ]
+
+    cursor: reactive[int] = reactive(0)
+    top_row: reactive[int] = reactive(0)
+
+    class Selected(Message):
+        """Posted when a note is chosen with Enter."""
+
+        def __init__(self, note: dict[str, Any]) -> None:
+            """Initialize with the chosen note.
+
+            Args:
+                note: The note dict under the cursor.
+            """
+            super().__init__()
+            self.note = note
+
+    def __init__(
+        self,
+        notes: Sequence[dict[str, Any]] = (),
+        columns: int = GRID_COLUMNS,
+        row_height: int = OVERVIEW_ROW_HEIGHT,
+        overscan: int = OVERVIEW_OVERSCAN_ROWS,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the grid.
+
+        Args:
+            notes: Note dicts to display, in order.
+            columns: Notes per row.
+            row_height: Height in cells of one row.
+            overscan: Rows bound below the viewport in addition to the visible ones.
+            **kwargs: Additional keyword arguments passed to Widget.
+        """
+        super().__init__(**kwargs)
+        self._notes: Sequence[dict[str, Any]] = notes
+        self.columns = columns
+        self.row_height = row_height
+        self.overscan = overscan
+        self._visible_rows = 1
+        self._pool: list[PostIt] = []
+
+    def compose(self) -> ComposeResult:
+        """Compose the grid body that holds the widget pool."""
+        body = Grid(classes="virtual-grid-body")
+        body.styles.grid_size_columns = self.columns
+        body.styles.grid_rows = str(self.row_height)
+        yield body
+
+    @property
+    def pool_size(self) -> int:
+        """Number of PostIt widgets currently allocated."""
+        return len(self._pool)
+
+    @property
+    def note_count(self) -> int:
+        """Number of notes in the grid."""
+        return len(self._notes)
+
+    @property
+    def row_count(self) -> int:
+        """Number of rows needed for all notes."""
+        return -(-len(self._notes) // self.columns)
+
+    @property
+    def max_top_row(self) -> int:
+        """Largest top row that still fills the viewport."""
+        return max(0, self.row_count - self._visible_rows)
+
+    def set_notes(self, notes: Sequence[dict[str, Any]]) -> None:
+        """Replace the displayed notes, keeping the cursor in range.
+
+        Args:
+            notes: Note dicts to display, in order.
+        """
+        self._notes = notes
+        self.cursor = min(self.cursor, max(0, len(notes) - 1))
+        self.top_row = min(self.top_row, self.max_top_row)
+        self._rebind()
+
+    def current_note(self) -> dict[str, Any] | None:
+        """Return the note under the cursor.
+
+        Returns:
+            The note dict, or None if there are no notes.
+        """
+        if 0 <= self.cursor < len(self._notes):
+            return self._notes[self.cursor]
+        return None
+
+    def on_resize(self, event: Resize) -> None:
+        """Grow or shrink the pool to the rows that fit, then rebind."""
+        self._visible_rows = max(1, event.size.height // self.row_height)
+        wanted = (self._visible_rows + self.overscan) * self.columns
+        body = self.query_one(".virtual-grid-body", Grid)
+        if wanted > len(self._pool):
+            extra = [self._new_widget() for _ in range(wanted - len(self._pool))]
+            self._pool.extend(extra)
+            body.mount_all(extra)
+        elif wanted < len(self._pool):
+            for widget in self._pool[wanted:]:
+                widget.remove()
+            del self._pool[wanted:]
+        self.top_row = min(self.top_row, self.max_top_row)
+        self._scroll_to_cursor()
+        self._rebind()
+
+    @staticmethod
+    def _new_widget() -> PostIt:
+        """Create a pooled, non-focusable PostIt.
+
+        Returns:
+            A PostIt that is bound to real note data later.
+        """
+        widget = PostIt(position=0)
+        widget.can_focus = False
+        return widget
+
+    def _rebind(self) -> None:
+        """Bind each pooled widget to the note it currently stands for."""
+        first = self.top_row * self.columns
+        for offset, widget in enumerate(self._pool):
+            index = first + offset
+            if index < len(self._notes):
+                note = self._notes[index]
+                widget.bind(note)
+                widget.border_title = note.get("board_name")
+                widget.set_class(index == self.cursor, "-cursor")
+                widget.remove_class("-unbound")
+            else:
+                widget.set_class(False, "-cursor")
+                widget.add_class("-unbound")
+
+    def _scroll_to_cursor(self) -> None:
+        """Move the viewport so the cursor row is visible."""
+        row = self.cursor // self.columns
+        if row < self.top_row:
+            self.top_row = row
+        elif row >= self.top_row + self._visible_rows:
+            self.top_row = row - self._visible_rows + 1
+
+    def watch_cursor(self) -> None:
+        """Keep the cursor visible and move the highlight."""
+        top_row = self.top_row
+        self._scroll_to_cursor()
+        if self.top_row == top_row:
+            self._rebind()
+
+    def watch_top_row(self) -> None:
+        """Rebind the pool after scrolling."""
+        self._rebind()
+
+    def _move_cursor(self, delta: int) -> None:
+        """Move the cursor by a number of notes, clamped to the notes.
+
+        Args:
+            delta: Notes to move; negative moves backwards.
+        """
+        if self._notes:
+            self.cursor = max(0, min(len(self._notes) - 1, self.cursor + delta))
+
+    def action_cursor_up(self) -> None:
+        """Move the cursor one row up."""
+        self._move_cursor(-self.columns)
+
+    def action_cursor_down(self) -> None:
+        """Move the cursor one row down."""
+        self._move_cursor(self.columns)
+
+    def action_cursor_left(self) -> None:
+        """Move the cursor to the previous note."""
+        self._move_cursor(-1)
+
+    def action_cursor_right(self) -> None:
+        """Move the cursor to the next note."""
+        self._move_cursor(1)
+
+    def action_page_up(self) -> None:
+        """Move the cursor one viewport up."""
+        self._move_cursor(-self.columns * self._visible_rows)
+
+    def action_page_down(self) -> None:
+        """Move the cursor one viewport down."""
+        self._move_cursor(self.columns * self._visible_rows)
+
+    def action_first(self) -> None:
+        """Move the cursor to the first note."""
+        self._move_cursor(-len(self._notes))
+
+    def action_last(self) -> None:
+        """Move the cursor to the last note."""
+        self._move_cursor(len(self._notes))
+
+    def action_select(self) -> None:
+        """Post the note under the cursor as selected."""
+        note = self.current_note()
+        if note is not None:
+            self.post_message(self.Selected(note))
+
+    def on_mouse_scroll_down(self, event: MouseScrollDown) -> None:
+        """Scroll one row down without moving the cursor."""
+        event.stop()
+        self.top_row = min(self.top_row + 1, self.max_top_row)
+
+    def on_mouse_scroll_up(self, event: MouseScrollUp) -> None:
+        """Scroll one row up without moving the cursor."""
+        event.stop()
+        self.top_row = max(self.top_row - 1, 0)